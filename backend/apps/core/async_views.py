@@ -0,0 +1,59 @@
+"""
+APIView DRF dont les handlers (get/post/...) sont des coroutines.
+
+DRF 3.15 ne sait pas exécuter de handler asynchrone : `dispatch` est réécrit ici pour
+- faire l'authentification / les permissions (accès ORM) dans un thread via sync_to_async,
+- attendre le handler sur la boucle d'événements (ASGI) sans bloquer de thread pendant les appels réseau.
+
+Django marque la vue comme coroutine (View.view_is_async) dès que tous les handlers sont async.
+Servie en WSGI, la vue tourne sur une boucle créée par async_to_sync pour la seule requête : `dispatch`
+l'enregistre dans `request_loop` (contextvar) pour que les clients réseau n'y gardent pas de connexion.
+"""
+
+import asyncio
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.wsgi import WSGIRequest
+from rest_framework.views import APIView
+
+# Boucle propre à la requête en cours (vue async servie en WSGI) ; None sous ASGI (boucle du serveur)
+request_loop: ContextVar[asyncio.AbstractEventLoop | None] = ContextVar("request_loop", default=None)
+
+
+def is_request_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    """True si `loop` a été créée pour la seule requête en cours et disparaîtra avec elle."""
+    return request_loop.get() is loop
+
+
+class AsyncAPIView(APIView):
+    async def dispatch(self, request, *args, **kwargs):
+        token = request_loop.set(asyncio.get_running_loop() if isinstance(request, WSGIRequest) else None)
+        try:
+            return await self._dispatch(request, *args, **kwargs)
+        finally:
+            request_loop.reset(token)
+
+    async def _dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
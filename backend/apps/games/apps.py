@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class GamesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.games"
+
+    def ready(self):
+        # Projection GameStats tenue à jour depuis UserGame, Rating et Review
+        from . import game_stats  # noqa: F401
+
+        return super().ready()
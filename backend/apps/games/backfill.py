@@ -0,0 +1,161 @@
+"""
+Exécution commune des commandes de backfill (backfill_genres, backfill_game_media, backfill_player_counts,
+populate_name_fr).
+
+- Les jeux sont parcourus par pagination keyset sur la clé primaire (pk > dernier pk vu), sans OFFSET
+  ni liste complète des ids en mémoire.
+- Chaque lot (au plus BACKFILL_BATCH_MAX jeux, soit une requête IGDB `where id = (...)`) est récupéré
+  en amont dans un pool borné de threads. Les appels IGDB passent par igdb_request, donc sous le
+  limiteur de débit partagé entre workers (igdb_transport) ; le pool ne fait que recouvrir les latences.
+- Les lots sont écrits dans l'ordre, dans le thread principal, chacun dans une transaction avec le point
+  de reprise (IgdbSyncState `backfill:<nom>`, watermark = dernier pk traité). Une commande interrompue
+  reprend après le dernier lot écrit ; le point de reprise est supprimé quand le parcours arrive au bout.
+- En dry-run, les appels amont sont faits mais ni la base ni le point de reprise ne sont modifiés.
+
+Un lot dont l'appel amont échoue est signalé (on_error) puis dépassé : les sélections « jeux incomplets »
+le reprendront à l'exécution suivante.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from apps.games.models import IgdbSyncState
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_MAX = 500  # maximum IGDB par requête
+BACKFILL_WORKERS = 4
+CHECKPOINT_PREFIX = "backfill"
+
+Rows = list[dict[str, Any]]
+
+
+@dataclass
+class BackfillStats:
+    processed: int = 0
+    updated: int = 0
+    errors: int = 0
+    failed_batches: int = 0
+
+
+def add_backfill_arguments(parser, *, batch_size: int = BACKFILL_BATCH_MAX, workers: int = BACKFILL_WORKERS) -> None:
+    """Options communes : --dry-run, --limit, --batch-size, --workers, --restart."""
+    parser.add_argument("--dry-run", action="store_true", help="Fetch data and log intent without saving to the database.")
+    parser.add_argument("--limit", type=int, default=0, help="Limit the number of games to process.")
+    parser.add_argument("--batch-size", type=int, default=batch_size, help=f"Games per upstream request (max {BACKFILL_BATCH_MAX}).")
+    parser.add_argument("--workers", type=int, default=workers, help="Concurrent upstream requests.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint left by an interrupted run.")
+
+
+def checkpoint_name(name: str) -> str:
+    return f"{CHECKPOINT_PREFIX}:{name}"
+
+
+def _next_batch(queryset: QuerySet, fields: Sequence[str], after: int, size: int) -> Rows:
+    return list(queryset.filter(pk__gt=after).order_by("pk").values(*fields)[:size])
+
+
+def run_backfill(
+    name: str,
+    queryset: QuerySet,
+    fetch: Callable[[Rows], Any],
+    write: Callable[[Rows, Any, bool], tuple[int, int, int]],
+    *,
+    fields: Sequence[str] = ("id", "igdb_id"),
+    batch_size: int = BACKFILL_BATCH_MAX,
+    workers: int = BACKFILL_WORKERS,
+    limit: int = 0,
+    dry_run: bool = False,
+    restart: bool = False,
+    on_batch: Callable[[BackfillStats], None] | None = None,
+    on_error: Callable[[Rows, Exception], None] | None = None,
+) -> BackfillStats:
+    """
+    Parcourt `queryset` par lots. `fetch(rows)` tourne dans le pool (appels amont uniquement, sans accès à la base) ;
+    `write(rows, fetched, dry_run)` écrit le lot en masse et retourne (traités, mis à jour, erreurs).
+    """
+    batch_size = min(max(batch_size, 1), BACKFILL_BATCH_MAX)
+    workers = max(workers, 1)
+    fields = ("id", *[f for f in fields if f != "id"])
+    state_name = checkpoint_name(name)
+    if restart and not dry_run:
+        IgdbSyncState.objects.filter(name=state_name).delete()
+    state = IgdbSyncState.objects.filter(name=state_name).first()
+    after = state.watermark if state and not restart else 0
+
+    stats = BackfillStats()
+    remaining = limit if limit and limit > 0 else None
+    exhausted = False
+
+    def next_rows() -> Rows:
+        nonlocal after, remaining, exhausted
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        if exhausted or size <= 0:
+            return []
+        rows = _next_batch(queryset, fields, after, size)
+        exhausted = len(rows) < size
+        if rows:
+            after = rows[-1]["id"]
+            if remaining is not None:
+                remaining -= len(rows)
+        return rows
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"backfill-{name}") as pool:
+        inflight: deque = deque()
+
+        def fill() -> None:
+            while len(inflight) < workers and (rows := next_rows()):
+                inflight.append((rows, pool.submit(fetch, rows)))
+
+        fill()
+        while inflight:
+            rows, future = inflight.popleft()
+            fill()
+            try:
+                fetched = future.result()
+            except Exception as exc:
+                stats.failed_batches += 1
+                if on_error is not None:
+                    on_error(rows, exc)
+                else:
+                    logger.warning("Backfill %s: lot de %d jeux en échec.", name, len(rows), exc_info=True)
+                fetched = None
+            state = _write_batch(state, state_name, rows, fetched, write, dry_run, stats)
+            if on_batch is not None:
+                on_batch(stats)
+
+    if exhausted and state is not None and not dry_run:
+        state.delete()
+    return stats
+
+
+def _write_batch(state, state_name: str, rows: Rows, fetched, write, dry_run: bool, stats: BackfillStats):
+    """Écrit un lot (sauf si son appel amont a échoué) et avance le point de reprise dans la même transaction."""
+    if dry_run:
+        if fetched is not None:
+            _accumulate(stats, write(rows, fetched, True))
+        return state
+    with transaction.atomic():
+        if fetched is not None:
+            _accumulate(stats, write(rows, fetched, False))
+        if state is None:
+            state, _ = IgdbSyncState.objects.get_or_create(name=state_name)
+        state.watermark = rows[-1]["id"]
+        state.games_synced += len(rows)
+        state.save(update_fields=["watermark", "games_synced", "updated_at"])
+    return state
+
+
+def _accumulate(stats: BackfillStats, deltas: tuple[int, int, int]) -> None:
+    processed, updated, errors = deltas
+    stats.processed += processed
+    stats.updated += updated
+    stats.errors += errors
@@ -0,0 +1,214 @@
+"""
+Disjoncteurs des services amont (IGDB, Wikidata, MyMemory), partagés entre workers via le cache Django (Redis).
+
+- Fermé : les appels passent ; les échecs (erreur réseau, 429 / 5xx, appel plus lent que slow_call_seconds)
+  et le nombre d'appels sont comptés sur une fenêtre de window_seconds.
+- Ouvert : dès failure_threshold échecs représentant au moins failure_rate des appels de la fenêtre, les appels
+  échouent immédiatement (CircuitOpenError) pendant open_seconds ; l'appelant sert son repli (cache périmé,
+  catalogue local, texte non traduit) au lieu d'immobiliser un worker jusqu'au timeout.
+- Semi-ouvert : passé ce délai, un seul appel d'essai par probe_interval_seconds, tous workers confondus ;
+  un succès referme le disjoncteur, un échec le rouvre.
+
+Si Redis est indisponible, les disjoncteurs laissent passer les appels.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from decouple import config as env_config
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_BREAKER_OPEN_SECONDS = env_config("CIRCUIT_BREAKER_OPEN_SECONDS", default=30, cast=int)
+UPSTREAM_ERROR_STATUS_CODES = {429, 500, 502, 503, 504}
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+_KEY_PREFIX = "breaker"
+_STATE_TTL = 60 * 60  # sans appel pendant 1 h après l'ouverture, le disjoncteur repart fermé
+_METRICS_TTL = 7 * 24 * 60 * 60
+
+
+class CircuitOpenError(RuntimeError):
+    """Appel refusé sans contacter le service : disjoncteur ouvert (ou essai semi-ouvert déjà en cours)."""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"{upstream} indisponible (disjoncteur ouvert, nouvel essai dans {retry_in:.0f}s).")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+def is_upstream_error_response(resp) -> bool:
+    """Réponse signalant un service amont en difficulté (429 / 5xx), à compter comme un échec."""
+    return getattr(resp, "status_code", 200) in UPSTREAM_ERROR_STATUS_CODES
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        failure_rate: float = 0.5,
+        window_seconds: int = 30,
+        open_seconds: int = CIRCUIT_BREAKER_OPEN_SECONDS,
+        slow_call_seconds: float | None = None,
+        probe_interval_seconds: int = 5,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+
+    def _key(self, field: str) -> str:
+        return f"{_KEY_PREFIX}:{self.name}:{field}"
+
+    def _incr(self, field: str, timeout: int) -> int:
+        key = self._key(field)
+        cache.add(key, 0, timeout=timeout)
+        return cache.incr(key)
+
+    def _count(self, field: str) -> None:
+        try:
+            self._incr(field, _METRICS_TTL)
+        except Exception:
+            logger.debug("Disjoncteur %s: compteur %s indisponible.", self.name, field, exc_info=True)
+
+    # --- État ---
+
+    def state(self) -> str:
+        try:
+            open_until = cache.get(self._key("open_until"))
+        except Exception:
+            return STATE_CLOSED
+        if open_until is None:
+            return STATE_CLOSED
+        return STATE_OPEN if time.time() < open_until else STATE_HALF_OPEN
+
+    def before_call(self) -> None:
+        """Lève CircuitOpenError si l'appel ne doit pas partir (ouvert, ou semi-ouvert avec un essai déjà en cours)."""
+        if not settings.CIRCUIT_BREAKERS_ENABLED:
+            return
+        now = time.time()
+        try:
+            open_until = cache.get(self._key("open_until"))
+            if open_until is None:
+                return
+            if now >= open_until and cache.add(self._key("probe"), 1, timeout=self.probe_interval_seconds):
+                logger.info("Disjoncteur %s: appel d'essai (semi-ouvert).", self.name)
+                return
+        except Exception:
+            logger.debug("Disjoncteur %s: état illisible, appel autorisé.", self.name, exc_info=True)
+            return
+        self._count("rejected")
+        raise CircuitOpenError(self.name, max(open_until - now, 0.0))
+
+    def record_success(self, latency_s: float = 0.0) -> None:
+        if not settings.CIRCUIT_BREAKERS_ENABLED:
+            return
+        if self.slow_call_seconds is not None and latency_s > self.slow_call_seconds:
+            self._count("slow_calls")
+            self.record_failure()
+            return
+        try:
+            if cache.get(self._key("open_until")) is not None:
+                cache.delete_many([self._key(f) for f in ("open_until", "probe", "calls", "failures")])
+                logger.warning("Disjoncteur %s: service rétabli, disjoncteur refermé.", self.name)
+                return
+            self._incr("calls", self.window_seconds)
+        except Exception:
+            logger.debug("Disjoncteur %s: succès non enregistré.", self.name, exc_info=True)
+
+    def record_failure(self) -> None:
+        if not settings.CIRCUIT_BREAKERS_ENABLED:
+            return
+        try:
+            calls = self._incr("calls", self.window_seconds)
+            failures = self._incr("failures", self.window_seconds)
+            open_until = cache.get(self._key("open_until"))
+            if open_until is not None:
+                if time.time() >= open_until:
+                    self._open("échec de l'appel d'essai")
+                return
+            if failures >= self.failure_threshold and failures / calls >= self.failure_rate:
+                self._open(f"{failures} échec(s) sur {calls} appel(s) en {self.window_seconds}s")
+        except Exception:
+            logger.debug("Disjoncteur %s: échec non enregistré.", self.name, exc_info=True)
+
+    def _open(self, reason: str) -> None:
+        cache.set(self._key("open_until"), time.time() + self.open_seconds, timeout=self.open_seconds + _STATE_TTL)
+        cache.delete_many([self._key(f) for f in ("probe", "calls", "failures")])
+        self._count("opened")
+        logger.warning("Disjoncteur %s ouvert pour %ds (%s).", self.name, self.open_seconds, reason)
+
+    def reset(self) -> None:
+        cache.delete_many([self._key(f) for f in ("open_until", "probe", "calls", "failures", "rejected", "opened", "slow_calls")])
+
+    # --- Appels ---
+
+    def call(self, fn: Callable[..., Any], /, *args, is_failure: Callable[[Any], bool] | None = None, **kwargs) -> Any:
+        """Exécute fn sous le disjoncteur ; un résultat pour lequel is_failure(résultat) est vrai compte comme un échec."""
+        self.before_call()
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        if is_failure is not None and is_failure(result):
+            self.record_failure()
+        else:
+            self.record_success(time.monotonic() - started)
+        return result
+
+    async def abefore_call(self) -> None:
+        await sync_to_async(self.before_call, thread_sensitive=False)()
+
+    async def arecord_success(self, latency_s: float = 0.0) -> None:
+        await sync_to_async(self.record_success, thread_sensitive=False)(latency_s)
+
+    async def arecord_failure(self) -> None:
+        await sync_to_async(self.record_failure, thread_sensitive=False)()
+
+    async def acall(self, afn: Callable[..., Awaitable[Any]], /, *args, is_failure: Callable[[Any], bool] | None = None, **kwargs) -> Any:
+        await self.abefore_call()
+        started = time.monotonic()
+        try:
+            result = await afn(*args, **kwargs)
+        except Exception:
+            await self.arecord_failure()
+            raise
+        if is_failure is not None and is_failure(result):
+            await self.arecord_failure()
+        else:
+            await self.arecord_success(time.monotonic() - started)
+        return result
+
+    def snapshot(self) -> dict:
+        """État et compteurs (tous workers) pour check_igdb --metrics."""
+        fields = ("calls", "failures", "rejected", "opened", "slow_calls")
+        try:
+            values = cache.get_many([self._key(f) for f in fields])
+        except Exception:
+            values = {}
+        return {"state": self.state(), **{f: int(values.get(self._key(f)) or 0) for f in fields}}
+
+
+# Latence hors attente du limiteur de débit ; timeout IGDB 10 s, Wikidata 3 s, MyMemory 10 s.
+IGDB_BREAKER = CircuitBreaker("igdb", failure_threshold=5, slow_call_seconds=5.0)
+WIKIDATA_BREAKER = CircuitBreaker("wikidata", failure_threshold=3, slow_call_seconds=2.0)
+MYMEMORY_BREAKER = CircuitBreaker("mymemory", failure_threshold=5, slow_call_seconds=6.0)
+# Rattrapages hors ligne (populate_name_fr, timeout 15 s) : leurs requêtes lentes n'ouvrent pas le disjoncteur du trafic en ligne.
+WIKIDATA_BACKFILL_BREAKER = CircuitBreaker("wikidata_backfill", failure_threshold=3)
+BREAKERS = (IGDB_BREAKER, WIKIDATA_BREAKER, MYMEMORY_BREAKER, WIKIDATA_BACKFILL_BREAKER)
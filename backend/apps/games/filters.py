@@ -2,12 +2,32 @@
 Filtres personnalisés pour l'application Games.
 """
 
+from contextlib import contextmanager
+
 import django_filters
-from django.contrib.postgres.search import TrigramWordSimilarity
-from django.db.models import Q
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.functions import Greatest
+from rest_framework.filters import OrderingFilter
 
 from apps.games.models import Game
 
+# Seuil des opérateurs trigram (%>) de la recherche : plus permissif que le défaut pg_trgm (0.6) pour tolérer les fautes
+SEARCH_WORD_SIMILARITY_THRESHOLD = 0.3
+
+
+@contextmanager
+def search_similarity_threshold():
+    """
+    Transaction dans laquelle pg_trgm.word_similarity_threshold vaut SEARCH_WORD_SIMILARITY_THRESHOLD (SET LOCAL) :
+    le réglage ne touche que les requêtes de recherche et ne survit pas à la transaction (compatible pgbouncer).
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)", [str(SEARCH_WORD_SIMILARITY_THRESHOLD)])
+        yield
+
 
 class GameFilter(django_filters.FilterSet):
     """
@@ -29,14 +49,15 @@ class GameFilter(django_filters.FilterSet):
     - /api/games/?min_players=2    # Jeux jouables à 2 joueurs minimum
     - /api/games/?max_players=4    # Jeux acceptant jusqu'à 4 joueurs
     - /api/games/?min_age=12&min_players=2  # Combinaison de filtres
+    - /api/games/?search=zelda     # Recherche approchée sur name / name_fr, plein texte sur la description
     """
 
     # Filtre pour genres (Many-to-Many)
     # BaseInFilter permet d'accepter plusieurs valeurs séparées par des virgules
-    genre = django_filters.BaseInFilter(field_name="genres__id", lookup_expr="in", help_text="Filtrer par IDs de genres (ex: 1,2,3)")
+    genre = django_filters.BaseInFilter(method="filter_genre", help_text="Filtrer par IDs de genres (ex: 1,2,3)")
 
     # Filtre pour plateformes (Many-to-Many)
-    platform = django_filters.BaseInFilter(field_name="platforms__id", lookup_expr="in", help_text="Filtrer par IDs de plateformes (ex: 1,2,3)")
+    platform = django_filters.BaseInFilter(method="filter_platform", help_text="Filtrer par IDs de plateformes (ex: 1,2,3)")
 
     # Filtres numériques
     # min_age__gte : retourne les jeux dont l'âge minimum requis >= valeur demandée
@@ -56,19 +77,53 @@ class GameFilter(django_filters.FilterSet):
 
     search = django_filters.CharFilter(method="filter_search", label="Recherche par nom (sous-chaîne)")
 
+    @staticmethod
+    def _has_any(queryset, through, column, ids):
+        """
+        Semi-jointure EXISTS sur la table de liaison M2M : un jeu ressort une seule fois quel que soit
+        le nombre d'IDs correspondants, sans JOIN ni DISTINCT sur le catalogue.
+        """
+        if not ids:
+            return queryset
+        return queryset.filter(Exists(through.objects.filter(game_id=OuterRef("pk"), **{f"{column}__in": ids})))
+
+    def filter_genre(self, queryset, name, value):
+        return self._has_any(queryset, Game.genres.through, "genre_id", value)
+
+    def filter_platform(self, queryset, name, value):
+        return self._has_any(queryset, Game.platforms.through, "platform_id", value)
+
     def filter_search(self, queryset, name, value):
+        """
+        Préfiltre servi par les index GIN (opérateur trigram %> sur name / name_fr, tsvector pondéré),
+        puis classement des seules lignes retenues (similarité du titre + rang plein texte).
+        Le queryset doit être évalué dans search_similarity_threshold() (seuil trigram 0.3).
+        """
         if not value or not str(value).strip():
             return queryset
         v = str(value).strip()
+        query = SearchQuery(v, config="simple", search_type="websearch")
         return (
-            queryset.annotate(
-                sim_name=TrigramWordSimilarity(v, "name"),
-                sim_name_fr=TrigramWordSimilarity(v, "name_fr"),
+            queryset.filter(Q(name__trigram_word_similar=v) | Q(name_fr__trigram_word_similar=v) | Q(search_vector=query))
+            .annotate(
+                search_rank=Greatest(TrigramWordSimilarity(v, "name"), TrigramWordSimilarity(v, "name_fr")) + SearchRank(F("search_vector"), query)
             )
-            .filter(Q(sim_name__gte=0.3) | Q(sim_name_fr__gte=0.3))
-            .order_by("-sim_name")
+            .order_by("-search_rank")
         )
 
     class Meta:
         model = Game
         fields = ["genre", "platform", "min_age", "min_players", "max_players", "search"]
+
+
+class GameOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter dont le tri par défaut (sans ?ordering) suit la pertinence quand ?search est renseigné :
+    le tri par défaut de la vue (-popularity_score) écraserait sinon le classement de GameFilter.filter_search.
+    """
+
+    def get_default_ordering(self, view):
+        request = getattr(view, "request", None)
+        if request is not None and str(request.query_params.get("search", "")).strip():
+            return ["-search_rank", "-popularity_score"]
+        return super().get_default_ordering(view)
@@ -0,0 +1,183 @@
+"""
+Maintenance de la projection GameStats (statistiques servies par GameStatsView).
+
+Chaque écriture de UserGame, Rating ou Review ajuste la ligne du jeu par différence, en un UPDATE
+d'expressions F (pas de perte de mise à jour entre écritures concurrentes). La ligne est créée à la
+première activité du jeu ; les suppressions ne font que décrémenter une ligne existante (une création
+pendant la suppression en cascade d'un jeu violerait la clé étrangère).
+
+Les écritures en masse (QuerySet.update, bulk_create, SQL brut) contournent ces signaux :
+rebuild_game_stats recalcule la projection depuis les tables sources.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.games.models import Game, GameStats, Rating, star_bucket
+from apps.library.models import UserGame
+from apps.reviews.models import Review
+
+REBUILD_BATCH_SIZE = 1000
+
+STATUS_FIELDS = {
+    UserGame.GameStatus.EN_COURS: "owners_en_cours",
+    UserGame.GameStatus.TERMINE: "owners_termine",
+    UserGame.GameStatus.ABANDONNE: "owners_abandonne",
+}
+STAR_FIELDS = {star: f"stars_{star}" for star in range(1, 6)}
+STATS_FIELDS = ["owners_count", *STATUS_FIELDS.values(), *STAR_FIELDS.values(), "reviews_count", "last_review_at"]
+
+
+def apply_stats_delta(game_id: int, deltas: dict[str, int], *, create: bool = True, **values) -> None:
+    """Ajoute `deltas` (champ -> incrément) à la ligne du jeu et affecte `values` ; crée la ligne si besoin et `create`."""
+    changes = {field: F(field) + delta for field, delta in deltas.items() if field and delta}
+    changes.update(values)
+    if not changes or GameStats.objects.filter(pk=game_id).update(**changes) or not create:
+        return
+    GameStats.objects.bulk_create([GameStats(game_id=game_id)], ignore_conflicts=True)
+    GameStats.objects.filter(pk=game_id).update(**changes)
+
+
+def _move(previous: tuple | None, current: tuple | None, field_map: dict, total_field: str | None = None) -> None:
+    """Retire l'état `previous` (jeu, clé) et ajoute `current` ; rien si les deux sont identiques."""
+    if previous == current:
+        return
+    if previous and current and previous[0] == current[0]:
+        # Même jeu : un seul UPDATE, le total ne change pas
+        apply_stats_delta(current[0], {field_map.get(previous[1]): -1, field_map.get(current[1]): 1})
+        return
+    if previous:
+        apply_stats_delta(previous[0], {field_map.get(previous[1]): -1, total_field: -1}, create=False)
+    if current:
+        apply_stats_delta(current[0], {field_map.get(current[1]): 1, total_field: 1})
+
+
+# ---------- UserGame ----------
+
+
+@receiver(pre_save, sender=UserGame)
+def remember_user_game_state(sender, instance: UserGame, **kwargs):
+    if instance._state.adding:
+        instance._stats_previous = None
+        return
+    snapshot = getattr(instance, "_stats_snapshot", None)
+    if snapshot is None:
+        snapshot = UserGame.objects.filter(pk=instance.pk).values_list("game_id", "status").first()
+    instance._stats_previous = snapshot
+
+
+@receiver(post_save, sender=UserGame)
+def update_stats_on_user_game_save(sender, instance: UserGame, created: bool, **kwargs):
+    previous = None if created else getattr(instance, "_stats_previous", None)
+    current = (instance.game_id, instance.status)
+    _move(previous, current, STATUS_FIELDS, "owners_count")
+    instance._stats_snapshot = current
+
+
+@receiver(post_delete, sender=UserGame)
+def update_stats_on_user_game_delete(sender, instance: UserGame, **kwargs):
+    game_id, status = getattr(instance, "_stats_snapshot", None) or (instance.game_id, instance.status)
+    apply_stats_delta(game_id, {STATUS_FIELDS.get(status): -1, "owners_count": -1}, create=False)
+
+
+# ---------- Rating (histogramme étoiles) ----------
+
+
+def _star_state(key: tuple | None) -> tuple | None:
+    """(jeu, étoiles) d'une clé Rating (game_id, normalized_value, étoiles) ; None hors notes étoiles."""
+    return (key[0], key[2]) if key and key[2] is not None else None
+
+
+@receiver(post_save, sender=Rating)
+def update_stats_on_rating_save(sender, instance: Rating, created: bool, **kwargs):
+    previous = None if created else getattr(instance, "_stats_previous", None)
+    _move(_star_state(previous), _star_state(instance._stats_key()), STAR_FIELDS)
+
+
+@receiver(post_delete, sender=Rating)
+def update_stats_on_rating_delete(sender, instance: Rating, **kwargs):
+    game_id, _, star = getattr(instance, "_stats_snapshot", None) or instance._stats_key()
+    if star is not None:
+        apply_stats_delta(game_id, {STAR_FIELDS[star]: -1}, create=False)
+
+
+# ---------- Review ----------
+
+
+def _last_review_at():
+    reviews = Review.objects.filter(game_id=OuterRef("pk")).order_by().values("game_id")
+    return Subquery(reviews.annotate(last=Max("date_created")).values("last"))
+
+
+@receiver(post_save, sender=Review)
+def update_stats_on_review_save(sender, instance: Review, created: bool, **kwargs):
+    if created:
+        apply_stats_delta(instance.game_id, {"reviews_count": 1}, last_review_at=Greatest(F("last_review_at"), instance.date_created))
+
+
+@receiver(post_delete, sender=Review)
+def update_stats_on_review_delete(sender, instance: Review, **kwargs):
+    apply_stats_delta(instance.game_id, {"reviews_count": -1}, create=False, last_review_at=_last_review_at())
+
+
+# ---------- Reconstruction ----------
+
+
+def rebuild_game_stats(game_ids: Iterable[int] | None = None, *, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    Recalcule la projection depuis UserGame, Rating et Review, par lots de jeux (pagination keyset sur l'id) :
+    3 agrégats groupés et un upsert par lot ; les lignes des jeux sans activité sont supprimées.
+    Retourne le nombre de jeux ayant une ligne de statistiques.
+    """
+    games = Game.objects.order_by("pk")
+    if game_ids is not None:
+        games = games.filter(pk__in=list(game_ids))
+    rebuilt = 0
+    after = 0
+    while batch := list(games.filter(pk__gt=after).values_list("pk", flat=True)[:batch_size]):
+        after = batch[-1]
+        with transaction.atomic():
+            rows = _compute_stats(batch)
+            GameStats.objects.filter(game_id__in=batch).exclude(game_id__in=list(rows)).delete()
+            GameStats.objects.bulk_create(rows.values(), update_conflicts=True, unique_fields=["game"], update_fields=STATS_FIELDS)
+        rebuilt += len(rows)
+    return rebuilt
+
+
+def _compute_stats(game_ids: list[int]) -> dict[int, GameStats]:
+    rows: dict[int, GameStats] = {}
+
+    def row(game_id: int) -> GameStats:
+        return rows.setdefault(game_id, GameStats(game_id=game_id))
+
+    owners = UserGame.objects.filter(game_id__in=game_ids).order_by().values("game_id", "status").annotate(n=Count("id"))
+    for entry in owners:
+        stats = row(entry["game_id"])
+        stats.owners_count += entry["n"]
+        if field := STATUS_FIELDS.get(entry["status"]):
+            setattr(stats, field, entry["n"])
+
+    stars = (
+        Rating.objects.filter(game_id__in=game_ids, rating_type=Rating.RATING_TYPE_ETOILES)
+        .order_by()
+        .values("game_id", "value")
+        .annotate(n=Count("id"))
+    )
+    for entry in stars:
+        field = STAR_FIELDS[star_bucket(Rating.RATING_TYPE_ETOILES, entry["value"])]
+        stats = row(entry["game_id"])
+        setattr(stats, field, getattr(stats, field) + entry["n"])
+
+    reviews = Review.objects.filter(game_id__in=game_ids).order_by().values("game_id").annotate(n=Count("id"), last=Max("date_created"))
+    for entry in reviews:
+        stats = row(entry["game_id"])
+        stats.reviews_count, stats.last_review_at = entry["n"], entry["last"]
+
+    return rows
@@ -0,0 +1,99 @@
+"""
+Complétion asynchrone des jeux « stub » (sans description, ou sans aucun genre ni plateforme).
+
+Les vues de détail ne contactent plus IGDB : elles renvoient la fiche telle quelle avec `healing: true`
+et mettent en file (tâche Celery heal_stub_game) une seule complétion par igdb_id. La clé Redis
+`games:heal:pending:<igdb_id>` déduplique les demandes concurrentes jusqu'à la fin de la tâche
+(au plus HEAL_PENDING_SECONDS si le worker la perd). Si Redis est indisponible, chaque demande est mise en file.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+
+from apps.games import igdb_client
+from apps.games.igdb_proxy_constants import FIELDS_GAME_DETAIL
+from apps.games.models import Game
+from apps.games.services import get_or_create_game_from_igdb
+
+logger = logging.getLogger(__name__)
+
+HEAL_PENDING_SECONDS = 10 * 60
+
+_PENDING_PREFIX = "games:heal:pending"
+
+
+def _pending_key(igdb_id: int) -> str:
+    return f"{_PENDING_PREFIX}:{igdb_id}"
+
+
+def _release(igdb_id: int) -> None:
+    try:
+        cache.delete(_pending_key(igdb_id))
+    except Exception:
+        logger.debug("Complétion: clé d'attente %s non libérée.", igdb_id, exc_info=True)
+
+
+def is_stub_game(game: Game) -> bool:
+    """Sans requête si genres et plateformes sont préchargés (prefetch_related), sinon une seule requête EXISTS."""
+    if not game.description:
+        return True
+    prefetched = getattr(game, "_prefetched_objects_cache", {})
+    if "genres" in prefetched and "platforms" in prefetched:
+        return not prefetched["genres"] and not prefetched["platforms"]
+    linked = Q(Exists(Game.genres.through.objects.filter(game_id=OuterRef("pk")))) | Q(
+        Exists(Game.platforms.through.objects.filter(game_id=OuterRef("pk")))
+    )
+    return not Game.objects.filter(pk=game.pk).filter(linked).exists()
+
+
+def request_stub_healing(game: Game) -> bool:
+    """Met en file la complétion du jeu si aucune n'est en attente ; True si une complétion est (déjà) en file."""
+    if not settings.GAMES_STUB_HEALING_ENABLED or not game.igdb_id:
+        return False
+    key = _pending_key(game.igdb_id)
+    try:
+        if not cache.add(key, 1, timeout=HEAL_PENDING_SECONDS):
+            return True
+    except Exception:
+        logger.debug("Complétion: déduplication indisponible pour %s.", game.igdb_id, exc_info=True)
+    from apps.games.tasks import heal_stub_game as heal_task
+
+    try:
+        heal_task.delay(game.igdb_id)
+    except Exception:
+        logger.warning("Complétion: mise en file impossible pour le jeu IGDB %s.", game.igdb_id, exc_info=True)
+        _release(game.igdb_id)
+        return False
+    return True
+
+
+def heal_stub_game(igdb_id: int) -> bool:
+    """Recharge le jeu depuis IGDB et complète la fiche locale ; libère la clé d'attente dans tous les cas."""
+    try:
+        data = igdb_client.igdb_request("games", f"{FIELDS_GAME_DETAIL} where id = {igdb_id}; limit 1;")
+        if not data or not isinstance(data, list):
+            return False
+        from apps.games.igdb_wikidata import enrich_with_wikidata_display_name
+
+        norm = enrich_with_wikidata_display_name(data)[0]
+        get_or_create_game_from_igdb(
+            igdb_id=igdb_id,
+            name=norm.get("name"),
+            cover_url=norm.get("cover_url"),
+            release_date=norm.get("release_date"),
+            summary=norm.get("summary"),
+            platforms=norm.get("platforms"),
+            genres=norm.get("genres"),
+            screenshots=norm.get("screenshots"),
+            videos=norm.get("videos"),
+            min_players=norm.get("min_players"),
+            max_players=norm.get("max_players"),
+        )
+        return True
+    finally:
+        _release(igdb_id)
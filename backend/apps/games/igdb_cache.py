@@ -0,0 +1,270 @@
+"""
+Cache partagé (Redis via le cache Django) des réponses brutes IGDB, appliqué dans igdb_client.igdb_request.
+
+- Clé : endpoint + corps APICalypse canonicalisé (espaces, ordre des clauses, ordre des champs).
+- TTL « frais » par endpoint (IGDB_CACHE_TTLS, surchargeable par IGDB_CACHE_TTL_<ENDPOINT>),
+  puis fenêtre de péremption IGDB_CACHE_STALE_SECONDS pendant laquelle l'entrée périmée est servie
+  pendant qu'un seul worker la rafraîchit en arrière-plan (stale-while-revalidate).
+- Single-flight : sur un miss, un seul worker interroge IGDB, les autres attendent son résultat.
+- Compteurs hit / stale / miss / coalesced par endpoint dans les métriques de igdb_transport.
+
+Les erreurs IGDB ne sont jamais mises en cache. acached_call est la variante pour les vues asynchrones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from decouple import config as env_config
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.games import igdb_transport
+
+logger = logging.getLogger(__name__)
+
+IGDB_CACHE_DEFAULT_TTL = 600
+IGDB_CACHE_STALE_SECONDS = env_config("IGDB_CACHE_STALE_SECONDS", default=24 * 60 * 60, cast=int)
+IGDB_CACHE_LOCK_SECONDS = 30  # durée max d'un rafraîchissement avant qu'un autre worker reprenne la main
+IGDB_CACHE_SINGLE_FLIGHT_WAIT_SECONDS = 5.0
+IGDB_CACHE_POLL_SECONDS = 0.05
+
+_DEFAULT_TTLS = {
+    "games": 60 * 60,
+    "games/count": 15 * 60,
+    "multiquery": 15 * 60,
+    "covers": 24 * 60 * 60,
+    "screenshots": 24 * 60 * 60,
+    "artworks": 24 * 60 * 60,
+    "game_videos": 24 * 60 * 60,
+    "platforms": 24 * 60 * 60,
+    "genres": 24 * 60 * 60,
+    "themes": 24 * 60 * 60,
+    "game_modes": 24 * 60 * 60,
+    "player_perspectives": 24 * 60 * 60,
+    "franchises": 24 * 60 * 60,
+    "collections": 24 * 60 * 60,
+    "age_ratings": 24 * 60 * 60,
+    "multiplayer_modes": 24 * 60 * 60,
+}
+
+# TTL « frais » (secondes) par endpoint ; 0 désactive le cache pour cet endpoint.
+IGDB_CACHE_TTLS = {
+    endpoint: env_config(f"IGDB_CACHE_TTL_{endpoint.upper().replace('/', '_')}", default=ttl, cast=int) for endpoint, ttl in _DEFAULT_TTLS.items()
+}
+
+_KEY_PREFIX = "igdb:resp"
+_background_refreshes: set[asyncio.Task] = set()  # références fortes : une tâche non référencée peut être collectée
+_STRING_OR_SPACE_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\s+')
+
+
+def ttl_for(endpoint: str) -> int:
+    return IGDB_CACHE_TTLS.get(endpoint, IGDB_CACHE_DEFAULT_TTL)
+
+
+def _split_outside_strings(body: str, sep: str) -> list[str]:
+    parts, current, in_string, escaped = [], [], False, False
+    for ch in body:
+        if in_string:
+            current.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            current.append(ch)
+        elif ch == sep:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return parts
+
+
+def canonicalize_query(endpoint: str, query: str | bytes) -> str:
+    """
+    Forme canonique d'une requête APICalypse : espaces réduits hors chaînes, clauses triées,
+    liste de `fields` triée. Les corps /multiquery ne sont que normalisés (l'ordre des blocs compte).
+    """
+    text = query.decode("utf-8") if isinstance(query, bytes) else query
+    text = _STRING_OR_SPACE_RE.sub(lambda m: m.group(0) if m.group(0).startswith('"') else " ", text).strip()
+    if endpoint == "multiquery":
+        return text
+
+    clauses = []
+    for raw in _split_outside_strings(text, ";"):
+        clause = raw.strip()
+        if not clause:
+            continue
+        if clause.startswith("fields "):
+            fields = sorted({f.strip() for f in clause[len("fields ") :].split(",") if f.strip()})
+            clause = "fields " + ",".join(fields)
+        clauses.append(clause)
+    return "; ".join(sorted(clauses)) + ";" if clauses else ""
+
+
+def cache_key(endpoint: str, query: str | bytes) -> str:
+    digest = hashlib.sha256(canonicalize_query(endpoint, query).encode("utf-8")).hexdigest()
+    return f"{_KEY_PREFIX}:{endpoint}:{digest}"
+
+
+def _store(key: str, endpoint: str, data: Any) -> None:
+    ttl = ttl_for(endpoint)
+    entry = {"data": data, "fresh_until": time.time() + ttl}
+    try:
+        cache.set(key, entry, timeout=ttl + IGDB_CACHE_STALE_SECONDS)
+    except Exception:
+        logger.warning("IGDB cache: écriture impossible pour %s.", endpoint, exc_info=True)
+
+
+def _get_entry(key: str) -> dict | None:
+    try:
+        entry = cache.get(key)
+    except Exception:
+        logger.warning("IGDB cache: lecture impossible, appel direct.", exc_info=True)
+        return None
+    return entry if isinstance(entry, dict) and "data" in entry else None
+
+
+def try_lock(lock_key: str, timeout: int = IGDB_CACHE_LOCK_SECONDS) -> bool:
+    """Verrou distribué (SET NX) ; True si ce process l'a obtenu."""
+    try:
+        return bool(cache.add(lock_key, 1, timeout=timeout))
+    except Exception:
+        return True  # fail-open : sans cache, chaque worker appelle IGDB
+
+
+def release_lock(lock_key: str) -> None:
+    try:
+        cache.delete(lock_key)
+    except Exception:
+        pass
+
+
+def _refresh(key: str, lock_key: str, endpoint: str, fetch: Callable[[], Any]) -> None:
+    try:
+        _store(key, endpoint, fetch())
+    except Exception:
+        logger.warning("IGDB cache: rafraîchissement en arrière-plan échoué pour %s.", endpoint, exc_info=True)
+    finally:
+        release_lock(lock_key)
+
+
+def _spawn_refresh(key: str, lock_key: str, endpoint: str, fetch: Callable[[], Any]) -> None:
+    threading.Thread(target=_refresh, args=(key, lock_key, endpoint, fetch), daemon=True, name="igdb-cache-refresh").start()
+
+
+def _wait_for_entry(key: str) -> dict | None:
+    deadline = time.monotonic() + IGDB_CACHE_SINGLE_FLIGHT_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(IGDB_CACHE_POLL_SECONDS)
+        entry = _get_entry(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def cached_call(endpoint: str, query: str | bytes, fetch: Callable[[], Any]) -> Any:
+    """Retourne la réponse IGDB en cache pour (endpoint, query), sinon appelle `fetch` une seule fois pour tous les workers."""
+    if not settings.IGDB_CACHE_ENABLED or ttl_for(endpoint) <= 0:
+        return fetch()
+
+    key = cache_key(endpoint, query)
+    lock_key = f"{key}:lock"
+    entry = _get_entry(key)
+
+    if entry is not None:
+        if entry.get("fresh_until", 0) > time.time():
+            igdb_transport.record_cache_event(endpoint, "cache_hits")
+            return entry["data"]
+        igdb_transport.record_cache_event(endpoint, "cache_stale")
+        if try_lock(lock_key):
+            _spawn_refresh(key, lock_key, endpoint, fetch)
+        return entry["data"]
+
+    igdb_transport.record_cache_event(endpoint, "cache_misses")
+    owns_lock = try_lock(lock_key)
+    if not owns_lock:
+        entry = _wait_for_entry(key)
+        if entry is not None:
+            igdb_transport.record_cache_event(endpoint, "cache_coalesced")
+            return entry["data"]
+    try:
+        data = fetch()
+        _store(key, endpoint, data)
+        return data
+    finally:
+        if owns_lock:
+            release_lock(lock_key)
+
+
+async def _arefresh(key: str, lock_key: str, endpoint: str, afetch: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        data = await afetch()
+        await sync_to_async(_store, thread_sensitive=False)(key, endpoint, data)
+    except Exception:
+        logger.warning("IGDB cache: rafraîchissement en arrière-plan échoué pour %s.", endpoint, exc_info=True)
+    finally:
+        await sync_to_async(release_lock, thread_sensitive=False)(lock_key)
+
+
+def _aspawn_refresh(key: str, lock_key: str, endpoint: str, afetch: Callable[[], Awaitable[Any]]) -> None:
+    task = asyncio.get_running_loop().create_task(_arefresh(key, lock_key, endpoint, afetch))
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+async def _await_entry(key: str) -> dict | None:
+    deadline = time.monotonic() + IGDB_CACHE_SINGLE_FLIGHT_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(IGDB_CACHE_POLL_SECONDS)
+        entry = await sync_to_async(_get_entry, thread_sensitive=False)(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+async def acached_call(endpoint: str, query: str | bytes, afetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Même logique que cached_call ; les accès Redis passent par un thread pour ne pas bloquer la boucle."""
+    if not settings.IGDB_CACHE_ENABLED or ttl_for(endpoint) <= 0:
+        return await afetch()
+
+    key = cache_key(endpoint, query)
+    lock_key = f"{key}:lock"
+    record = sync_to_async(igdb_transport.record_cache_event, thread_sensitive=False)
+    entry = await sync_to_async(_get_entry, thread_sensitive=False)(key)
+
+    if entry is not None:
+        if entry.get("fresh_until", 0) > time.time():
+            await record(endpoint, "cache_hits")
+            return entry["data"]
+        await record(endpoint, "cache_stale")
+        if await sync_to_async(try_lock, thread_sensitive=False)(lock_key):
+            _aspawn_refresh(key, lock_key, endpoint, afetch)
+        return entry["data"]
+
+    await record(endpoint, "cache_misses")
+    owns_lock = await sync_to_async(try_lock, thread_sensitive=False)(lock_key)
+    if not owns_lock:
+        entry = await _await_entry(key)
+        if entry is not None:
+            await record(endpoint, "cache_coalesced")
+            return entry["data"]
+    try:
+        data = await afetch()
+        await sync_to_async(_store, thread_sensitive=False)(key, endpoint, data)
+        return data
+    finally:
+        if owns_lock:
+            await sync_to_async(release_lock, thread_sensitive=False)(lock_key)
@@ -10,20 +10,44 @@ Flux identique à Node :
 
 Variables d'environnement (comme en Node) : TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET.
 En option : IGDB_ACCESS_TOKEN + IGDB_CLIENT_ID si pas de Twitch.
+Le token Twitch est partagé entre process via le cache Django et renouvelé avant expiration.
+
+igdb_multiquery regroupe plusieurs requêtes (ex. liste + count) en un seul aller-retour via /multiquery.
+
+Les appels IGDB passent par igdb_cache (cache Redis partagé, stale-while-revalidate, single-flight)
+puis igdb_transport (session keep-alive, limiteur de débit partagé, retry).
+aigdb_request / aigdb_multiquery en sont les variantes asynchrones (vues ASGI, httpx).
 """
 
+import logging
+import threading
 import time
+from typing import Any, Awaitable, Callable
 from urllib.parse import urlencode
 
 import requests
+from asgiref.sync import sync_to_async
 from decouple import config as env_config
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 
+from apps.games import igdb_cache, igdb_transport
+
+logger = logging.getLogger(__name__)
+
 IGDB_BASE_URL = "https://api.igdb.com/v4"
 TWITCH_TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+IGDB_TIMEOUT_SECONDS = 10
+IGDB_MULTIQUERY_MAX = 10  # limite IGDB du nombre de sous-requêtes par /multiquery
 
-_twitch_token_cache = {"access_token": None, "expires_at": 0}
+_twitch_token_cache = {"access_token": None, "expires_at": 0}  # copie locale du token partagé
 _TOKEN_BUFFER_MS = 60_000  # comme Node : renouveler 60s avant expiration
+_TOKEN_REFRESH_AHEAD_MS = 15 * 60_000  # renouvellement anticipé en arrière-plan dans cette fenêtre
+
+# Token partagé entre workers gunicorn / Celery / commandes (cache Django) : un seul process le renouvelle.
+TWITCH_TOKEN_CACHE_PREFIX = "igdb:twitch_token"
+TWITCH_TOKEN_LOCK_SECONDS = 15
+TWITCH_TOKEN_WAIT_SECONDS = 5.0
 
 
 def _clear_twitch_token_cache():
@@ -31,22 +55,20 @@ def _clear_twitch_token_cache():
     _twitch_token_cache["expires_at"] = 0
 
 
-def get_twitch_access_token():
-    """
-    Même logique que getAccessToken() dans server.ts (Express).
-    Utilise uniquement TWITCH_CLIENT_ID et TWITCH_CLIENT_SECRET.
-    """
-    now_ms = time.time() * 1000
-    if _twitch_token_cache["access_token"] and now_ms < _twitch_token_cache["expires_at"] - _TOKEN_BUFFER_MS:
-        return _twitch_token_cache["access_token"]
-
+def _twitch_credentials() -> tuple[str, str]:
     # Comme Node : uniquement ces deux variables
     client_id = (env_config("TWITCH_CLIENT_ID", default="") or "").strip()
     client_secret = (env_config("TWITCH_CLIENT_SECRET", default="") or "").strip()
-
     if not client_id or not client_secret:
         raise ImproperlyConfigured("TWITCH_CLIENT_ID et TWITCH_CLIENT_SECRET sont requis (.env, comme pour le serveur Express).")
+    return client_id, client_secret
+
+
+def _twitch_token_key(client_id: str) -> str:
+    return f"{TWITCH_TOKEN_CACHE_PREFIX}:{client_id}"
 
+
+def _fetch_twitch_token(client_id: str, client_secret: str) -> dict:
     # Même body que Node : URLSearchParams(client_id, client_secret, grant_type)
     body = urlencode(
         {
@@ -68,10 +90,114 @@ def get_twitch_access_token():
 
     if not access_token:
         raise ImproperlyConfigured("Twitch OAuth n'a pas renvoyé d'access_token.")
+    return {"access_token": access_token, "expires_at": time.time() * 1000 + expires_in * 1000}
+
+
+def _read_shared_token(key: str) -> dict | None:
+    try:
+        entry = cache.get(key)
+    except Exception:
+        logger.warning("Token Twitch: lecture du cache partagé impossible.", exc_info=True)
+        return None
+    return entry if isinstance(entry, dict) and entry.get("access_token") else None
+
+
+def _publish_token(key: str, entry: dict) -> None:
+    _twitch_token_cache.update(entry)
+    timeout = max(1, int((entry["expires_at"] - time.time() * 1000) / 1000))
+    try:
+        cache.set(key, entry, timeout=timeout)
+    except Exception:
+        logger.warning("Token Twitch: écriture du cache partagé impossible.", exc_info=True)
+
+
+def _is_usable(entry: dict | None, now_ms: float) -> bool:
+    return bool(entry) and now_ms < entry["expires_at"] - _TOKEN_BUFFER_MS
+
+
+def _refresh_twitch_token(key: str, lock_key: str, client_id: str, client_secret: str) -> None:
+    try:
+        _publish_token(key, _fetch_twitch_token(client_id, client_secret))
+    except Exception:
+        logger.warning("Token Twitch: renouvellement anticipé échoué, le token courant reste servi.", exc_info=True)
+    finally:
+        igdb_cache.release_lock(lock_key)
+
+
+def _wait_for_shared_token(key: str) -> dict | None:
+    deadline = time.monotonic() + TWITCH_TOKEN_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(igdb_cache.IGDB_CACHE_POLL_SECONDS)
+        entry = _read_shared_token(key)
+        if _is_usable(entry, time.time() * 1000):
+            return entry
+    return None
+
+
+def get_twitch_access_token():
+    """
+    Même logique que getAccessToken() dans server.ts (Express).
+    Utilise uniquement TWITCH_CLIENT_ID et TWITCH_CLIENT_SECRET.
+
+    Le token est partagé via le cache Django : un worker qui démarre réutilise celui des autres.
+    Il est renouvelé en arrière-plan avant expiration (_TOKEN_REFRESH_AHEAD_MS) par un seul process
+    (verrou distribué) ; sans token valide, un seul process appelle Twitch et les autres attendent.
+    """
+    now_ms = time.time() * 1000
+    if _twitch_token_cache["access_token"] and now_ms < _twitch_token_cache["expires_at"] - _TOKEN_REFRESH_AHEAD_MS:
+        return _twitch_token_cache["access_token"]
+
+    client_id, client_secret = _twitch_credentials()
+    key = _twitch_token_key(client_id)
+    lock_key = f"{key}:lock"
+
+    entry = _read_shared_token(key) or (dict(_twitch_token_cache) if _twitch_token_cache["access_token"] else None)
+    if _is_usable(entry, now_ms):
+        _twitch_token_cache.update(entry)
+        if now_ms >= entry["expires_at"] - _TOKEN_REFRESH_AHEAD_MS and igdb_cache.try_lock(lock_key, TWITCH_TOKEN_LOCK_SECONDS):
+            threading.Thread(
+                target=_refresh_twitch_token,
+                args=(key, lock_key, client_id, client_secret),
+                daemon=True,
+                name="twitch-token-refresh",
+            ).start()
+        return entry["access_token"]
+
+    owns_lock = igdb_cache.try_lock(lock_key, TWITCH_TOKEN_LOCK_SECONDS)
+    if not owns_lock:
+        entry = _wait_for_shared_token(key)
+        if entry is not None:
+            _twitch_token_cache.update(entry)
+            return entry["access_token"]
+    try:
+        entry = _fetch_twitch_token(client_id, client_secret)
+        _publish_token(key, entry)
+        return entry["access_token"]
+    finally:
+        if owns_lock:
+            igdb_cache.release_lock(lock_key)
+
+
+def invalidate_twitch_token(rejected_token: str) -> None:
+    """
+    Après un 401 IGDB : oublie le token rejeté. Le token partagé n'est supprimé que s'il est
+    toujours celui-ci, pour ne pas jeter celui qu'un autre worker vient de renouveler.
+    """
+    _clear_twitch_token_cache()
+    client_id = (env_config("TWITCH_CLIENT_ID", default="") or "").strip()
+    if not client_id:
+        return
+    key = _twitch_token_key(client_id)
+    entry = _read_shared_token(key)
+    if entry is not None and entry["access_token"] == rejected_token:
+        try:
+            cache.delete(key)
+        except Exception:
+            logger.warning("Token Twitch: suppression du cache partagé impossible.", exc_info=True)
 
-    _twitch_token_cache["access_token"] = access_token
-    _twitch_token_cache["expires_at"] = now_ms + (expires_in * 1000)
-    return access_token
+
+def _bearer_token(headers: dict) -> str:
+    return (headers.get("Authorization") or "").removeprefix("Bearer ").strip()
 
 
 def get_igdb_headers():
@@ -105,25 +231,121 @@ def igdb_request(endpoint: str, query: str):
     """
     POST vers IGDB, comme axios.post dans server.ts :
     body = chaîne de requête (texte brut), headers = Client-ID, Authorization, Content-Type: text/plain
+    Réponse servie par igdb_cache si possible ; sinon envoi via igdb_transport
+    (session partagée, limite 4 req/s commune aux workers, retry sur 429/5xx).
     """
-    url = f"{IGDB_BASE_URL}/{endpoint.lstrip('/')}"
-    headers = get_igdb_headers()
+    endpoint = endpoint.lstrip("/")
+    return igdb_cache.cached_call(endpoint, query, lambda: _igdb_request_uncached(endpoint, query))
+
+
+def _encode_body(query: str | bytes) -> bytes:
     # Body en texte brut (Node envoie la string telle quelle)
-    body = query if isinstance(query, bytes) else query.encode("utf-8")
+    return query if isinstance(query, bytes) else query.encode("utf-8")
+
 
-    resp = requests.post(url, data=body, headers=headers, timeout=10)
+def _raise_igdb_error(endpoint: str, resp) -> None:
+    try:
+        detail = resp.json()
+    except Exception:
+        detail = resp.text
+    raise RuntimeError(f"IGDB error {resp.status_code} on {endpoint}: {detail}")
+
+
+def _igdb_request_uncached(endpoint: str, query: str):
+    url = f"{IGDB_BASE_URL}/{endpoint}"
+    headers = get_igdb_headers()
+    body = _encode_body(query)
+
+    resp = igdb_transport.post(endpoint, url, body, headers, IGDB_TIMEOUT_SECONDS)
 
     if not resp.ok:
         if resp.status_code == 401:
-            _clear_twitch_token_cache()
+            invalidate_twitch_token(_bearer_token(headers))
             headers = get_igdb_headers()
-            resp = requests.post(url, data=body, headers=headers, timeout=10)
+            resp = igdb_transport.post(endpoint, url, body, headers, IGDB_TIMEOUT_SECONDS)
             if resp.ok:
                 return resp.json()
-        try:
-            detail = resp.json()
-        except Exception:
-            detail = resp.text
-        raise RuntimeError(f"IGDB error {resp.status_code} on {endpoint}: {detail}")
+        _raise_igdb_error(endpoint, resp)
 
     return resp.json()
+
+
+async def aigdb_request(endpoint: str, query: str):
+    """Variante asynchrone de igdb_request (même cache, même limiteur, même gestion du 401)."""
+    endpoint = endpoint.lstrip("/")
+    return await igdb_cache.acached_call(endpoint, query, lambda: _aigdb_request_uncached(endpoint, query))
+
+
+async def _aigdb_request_uncached(endpoint: str, query: str):
+    url = f"{IGDB_BASE_URL}/{endpoint}"
+    # Le token Twitch peut nécessiter un appel OAuth synchrone : hors de la boucle d'événements
+    headers = await sync_to_async(get_igdb_headers, thread_sensitive=False)()
+    body = _encode_body(query)
+
+    resp = await igdb_transport.apost(endpoint, url, body, headers, IGDB_TIMEOUT_SECONDS)
+
+    if not igdb_transport.response_ok(resp):
+        if resp.status_code == 401:
+            await sync_to_async(invalidate_twitch_token, thread_sensitive=False)(_bearer_token(headers))
+            headers = await sync_to_async(get_igdb_headers, thread_sensitive=False)()
+            resp = await igdb_transport.apost(endpoint, url, body, headers, IGDB_TIMEOUT_SECONDS)
+            if igdb_transport.response_ok(resp):
+                return resp.json()
+        _raise_igdb_error(endpoint, resp)
+
+    return resp.json()
+
+
+def build_multiquery_body(queries: dict[str, tuple[str, str]]) -> str:
+    """
+    Corps APICalypse /multiquery : {nom: (endpoint, requête)} ->
+    query games "nom" { fields ...; where ...; };
+    """
+    blocks = []
+    for name, (endpoint, query) in queries.items():
+        body = query.strip()
+        if body and not body.endswith(";"):
+            body += ";"
+        blocks.append(f'query {endpoint.strip("/")} "{name}" {{ {body} }};')
+    return "\n".join(blocks)
+
+
+def _check_multiquery_size(queries: dict[str, tuple[str, str]]) -> None:
+    if len(queries) > IGDB_MULTIQUERY_MAX:
+        raise ValueError(f"IGDB multiquery: {len(queries)} sous-requêtes (max {IGDB_MULTIQUERY_MAX}).")
+
+
+def _parse_multiquery_response(queries: dict[str, tuple[str, str]], data: Any) -> dict[str, Any]:
+    out: dict[str, Any] = {name: 0 if endpoint.rstrip("/").endswith("/count") else [] for name, (endpoint, _) in queries.items()}
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict) or item.get("name") not in out:
+            continue
+        name = item["name"]
+        if isinstance(out[name], int):
+            out[name] = int(item.get("count") or 0)
+        elif isinstance(item.get("result"), list):
+            out[name] = item["result"]
+    return out
+
+
+def igdb_multiquery(queries: dict[str, tuple[str, str]], request_fn: Callable[[str, str], Any] | None = None) -> dict[str, Any]:
+    """
+    Envoie jusqu'à IGDB_MULTIQUERY_MAX requêtes en un seul POST /multiquery.
+    Retourne {nom: list} pour les endpoints de données et {nom: int} pour les endpoints */count
+    (liste vide / 0 si IGDB n'a rien renvoyé pour ce nom).
+    request_fn permet aux helpers du proxy de passer leur igdb_request (mockable dans les tests).
+    """
+    if not queries:
+        return {}
+    _check_multiquery_size(queries)
+    request_fn = request_fn or igdb_request
+    return _parse_multiquery_response(queries, request_fn("multiquery", build_multiquery_body(queries)))
+
+
+async def aigdb_multiquery(queries: dict[str, tuple[str, str]], request_fn: Callable[[str, str], Awaitable[Any]] | None = None) -> dict[str, Any]:
+    """Variante asynchrone de igdb_multiquery (request_fn par défaut : aigdb_request)."""
+    if not queries:
+        return {}
+    _check_multiquery_size(queries)
+    request_fn = request_fn or aigdb_request
+    return _parse_multiquery_response(queries, await request_fn("multiquery", build_multiquery_body(queries)))
@@ -2,13 +2,30 @@
 Dérivés âge / joueurs depuis les payloads IGDB (aligné sur import_igdb_popular).
 
 Utilisé par l’import et le proxy IGDB pour post-filtrer comme GameFilter (gte/lte/gte).
+afilter_games_raw_by_demographics est la variante asynchrone (age_ratings et multiplayer_modes en parallèle).
+
+Les valeurs dérivées sont conservées par id IGDB dans IgdbGameDemographics : le post-filtre lit la table
+et n'interroge IGDB que pour les jeux absents ; la tâche refresh_igdb_demographics les tient à jour.
 """
 
 from __future__ import annotations
 
-from typing import Any, Callable
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.games.models import IgdbGameDemographics
+
+logger = logging.getLogger(__name__)
 
 IgdbRequestFn = Callable[[str, str], Any]
+AsyncIgdbRequestFn = Callable[[str, str], Awaitable[Any]]
+Demographics = tuple[int | None, int | None, int | None]  # (min_age, min_players, max_players)
+
+_NO_DEMOGRAPHICS: Demographics = (None, None, None)
 
 
 def index_multiplayer_by_game(mp_list: list[dict]) -> dict[int, list[dict]]:
@@ -79,37 +96,21 @@ def compute_player_counts(game_data: dict[str, Any], mp_by_game: dict[int, list[
     return min_players, max_players
 
 
-def fetch_age_ratings_map(igdb_request: IgdbRequestFn, ids: list[int]) -> dict[int, dict]:
-    if not ids:
-        return {}
-    result: dict[int, dict] = {}
+def _id_chunks(ids: list[int]) -> list[str]:
     unique_ids = list(set(ids))
-    for i in range(0, len(unique_ids), 500):
-        chunk = unique_ids[i : i + 500]
-        ids_str = ",".join(str(x) for x in chunk)
-        query = f"""
+    return [",".join(str(x) for x in unique_ids[i : i + 500]) for i in range(0, len(unique_ids), 500)]
+
+
+def _age_ratings_query(ids_str: str) -> str:
+    return f"""
             fields id, category, rating;
             where id = ({ids_str});
             limit 500;
         """
-        data = igdb_request("age_ratings", query)
-        if not isinstance(data, list):
-            continue
-        for ar in data:
-            if isinstance(ar, dict) and ar.get("id") is not None:
-                result[int(ar["id"])] = ar
-    return result
 
 
-def fetch_multiplayer_modes_raw(igdb_request: IgdbRequestFn, ids: list[int]) -> list[dict]:
-    if not ids:
-        return []
-    result: list[dict] = []
-    unique_ids = list(set(ids))
-    for i in range(0, len(unique_ids), 500):
-        chunk = unique_ids[i : i + 500]
-        ids_str = ",".join(str(x) for x in chunk)
-        query = f"""
+def _multiplayer_modes_query(ids_str: str) -> str:
+    return f"""
             fields
             id,
             game,
@@ -123,64 +124,207 @@ def fetch_multiplayer_modes_raw(igdb_request: IgdbRequestFn, ids: list[int]) ->
             where id = ({ids_str});
             limit 500;
         """
-        data = igdb_request("multiplayer_modes", query)
+
+
+def _add_age_ratings(result: dict[int, dict], data: Any) -> None:
+    if not isinstance(data, list):
+        return
+    for ar in data:
+        if isinstance(ar, dict) and ar.get("id") is not None:
+            result[int(ar["id"])] = ar
+
+
+def fetch_age_ratings_map(igdb_request: IgdbRequestFn, ids: list[int]) -> dict[int, dict]:
+    result: dict[int, dict] = {}
+    for ids_str in _id_chunks(ids):
+        _add_age_ratings(result, igdb_request("age_ratings", _age_ratings_query(ids_str)))
+    return result
+
+
+def fetch_multiplayer_modes_raw(igdb_request: IgdbRequestFn, ids: list[int]) -> list[dict]:
+    result: list[dict] = []
+    for ids_str in _id_chunks(ids):
+        data = igdb_request("multiplayer_modes", _multiplayer_modes_query(ids_str))
+        if isinstance(data, list):
+            result.extend(data)
+    return result
+
+
+async def afetch_age_ratings_map(igdb_request: AsyncIgdbRequestFn, ids: list[int]) -> dict[int, dict]:
+    result: dict[int, dict] = {}
+    for data in await asyncio.gather(*(igdb_request("age_ratings", _age_ratings_query(c)) for c in _id_chunks(ids))):
+        _add_age_ratings(result, data)
+    return result
+
+
+async def afetch_multiplayer_modes_raw(igdb_request: AsyncIgdbRequestFn, ids: list[int]) -> list[dict]:
+    result: list[dict] = []
+    for data in await asyncio.gather(*(igdb_request("multiplayer_modes", _multiplayer_modes_query(c)) for c in _id_chunks(ids))):
         if isinstance(data, list):
             result.extend(data)
     return result
 
 
+def derive_demographics(games_raw: list[dict[str, Any]], age_ratings_map: dict[int, dict], mp_list: list[dict]) -> dict[int, Demographics]:
+    """{igdb_game_id: (min_age, min_players, max_players)} pour des jeux IGDB bruts (champs age_ratings, multiplayer_modes)."""
+    mp_by_game = index_multiplayer_by_game(mp_list)
+    out: dict[int, Demographics] = {}
+    for g in games_raw:
+        mn, mx = compute_player_counts(g, mp_by_game)
+        out[int(g["id"])] = (compute_min_age(g, age_ratings_map), mn, mx)
+    return out
+
+
+def load_demographics(igdb_ids: list[int]) -> dict[int, Demographics]:
+    """Valeurs connues localement ; {} si la table est indisponible (le filtre repasse alors par IGDB)."""
+    if not settings.IGDB_DEMOGRAPHICS_STORE_ENABLED or not igdb_ids:
+        return {}
+    try:
+        rows = IgdbGameDemographics.objects.filter(igdb_id__in=set(igdb_ids)).values_list("igdb_id", "min_age", "min_players", "max_players")
+        return {igdb_id: (ma, mn, mx) for igdb_id, ma, mn, mx in rows}
+    except Exception:
+        logger.warning("IgdbGameDemographics: lecture impossible, appel IGDB.", exc_info=True)
+        return {}
+
+
+def save_demographics(values: dict[int, Demographics]) -> None:
+    """Upsert des valeurs dérivées (updated_at remis à maintenant)."""
+    if not settings.IGDB_DEMOGRAPHICS_STORE_ENABLED or not values:
+        return
+    rows = [IgdbGameDemographics(igdb_id=igdb_id, min_age=ma, min_players=mn, max_players=mx) for igdb_id, (ma, mn, mx) in values.items()]
+    try:
+        IgdbGameDemographics.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["igdb_id"],
+            update_fields=["min_age", "min_players", "max_players", "updated_at"],
+        )
+    except Exception:
+        logger.warning("IgdbGameDemographics: écriture impossible pour %d jeu(x).", len(rows), exc_info=True)
+
+
+def _games_demographics_query(ids_str: str) -> str:
+    return f"""
+            fields id, age_ratings, multiplayer_modes;
+            where id = ({ids_str});
+            limit 500;
+        """
+
+
+def refresh_stored_demographics(igdb_request: IgdbRequestFn, igdb_ids: list[int]) -> tuple[int, int]:
+    """
+    Recalcule depuis IGDB les valeurs des jeux `igdb_ids` et les enregistre.
+    Les lignes des jeux qu'IGDB ne renvoie plus sont supprimées. Retourne (mis à jour, supprimés).
+    """
+    games_raw: list[dict] = []
+    for ids_str in _id_chunks(igdb_ids):
+        data = igdb_request("games", _games_demographics_query(ids_str))
+        if isinstance(data, list):
+            games_raw.extend(g for g in data if isinstance(g, dict) and g.get("id") is not None)
+
+    age_ids, mp_ids = _demographic_ids(games_raw)
+    values = derive_demographics(games_raw, fetch_age_ratings_map(igdb_request, age_ids), fetch_multiplayer_modes_raw(igdb_request, mp_ids))
+    save_demographics(values)
+
+    gone = set(igdb_ids) - set(values)
+    deleted = IgdbGameDemographics.objects.filter(igdb_id__in=gone).delete()[0] if gone else 0
+    return len(values), deleted
+
+
 def _numeric_filter_result(
-    game_data: dict[str, Any],
-    age_ratings_map: dict[int, dict],
-    mp_by_game: dict[int, list[dict]],
+    values: Demographics,
     min_age: int | None,
     min_players: int | None,
     max_players: int | None,
-) -> tuple[bool, int | None, int | None, int | None]:
+) -> bool:
     """Même sémantique que GameFilter (min_age gte, min_players lte, max_players gte)."""
-    ma = compute_min_age(game_data, age_ratings_map)
-    mn, mx = compute_player_counts(game_data, mp_by_game)
-
+    ma, mn, mx = values
     if min_age is not None and (ma is None or ma < min_age):
-        return False, ma, mn, mx
+        return False
     if min_players is not None and (mn is None or mn > min_players):
-        return False, ma, mn, mx
+        return False
     if max_players is not None and (mx is None or mx < max_players):
-        return False, ma, mn, mx
-    return True, ma, mn, mx
+        return False
+    return True
 
 
-def filter_games_raw_by_demographics(
-    igdb_request: IgdbRequestFn,
-    games_raw: list[dict[str, Any]],
-    min_age: int | None,
-    min_players: int | None,
-    max_players: int | None,
-) -> list[dict[str, Any]]:
-    """Post-filtre une liste de jeux IGDB bruts. Sans filtre numérique, retour inchangé."""
-    if not games_raw:
-        return games_raw
-    if min_age is None and min_players is None and max_players is None:
-        return games_raw
+def _has_demographic_filters(min_age: int | None, min_players: int | None, max_players: int | None) -> bool:
+    return min_age is not None or min_players is not None or max_players is not None
+
 
+def _demographic_ids(games_raw: list[dict[str, Any]]) -> tuple[list[int], list[int]]:
     age_ids: list[int] = []
     mp_ids: list[int] = []
     for g in games_raw:
         age_ids.extend(g.get("age_ratings") or [])
         mp_ids.extend(g.get("multiplayer_modes") or [])
+    return age_ids, mp_ids
 
-    age_map = fetch_age_ratings_map(igdb_request, age_ids)
-    mp_list = fetch_multiplayer_modes_raw(igdb_request, mp_ids)
-    mp_by_game = index_multiplayer_by_game(mp_list)
 
+def _missing_games(games_raw: list[dict[str, Any]], known: dict[int, Demographics]) -> list[dict[str, Any]]:
+    return [g for g in games_raw if int(g["id"]) not in known]
+
+
+def _keep_matching_games(
+    games_raw: list[dict[str, Any]],
+    demographics: dict[int, Demographics],
+    min_age: int | None,
+    min_players: int | None,
+    max_players: int | None,
+) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
     for g in games_raw:
-        ok, ma, mn, mx = _numeric_filter_result(g, age_map, mp_by_game, min_age, min_players, max_players)
-        if not ok:
+        values = demographics.get(int(g["id"]), _NO_DEMOGRAPHICS)
+        if not _numeric_filter_result(values, min_age, min_players, max_players):
             continue
         ng = dict(g)
-        ng["_ludokan_min_age"] = ma
-        ng["_ludokan_min_players"] = mn
-        ng["_ludokan_max_players"] = mx
+        ng["_ludokan_min_age"], ng["_ludokan_min_players"], ng["_ludokan_max_players"] = values
         out.append(ng)
     return out
+
+
+def filter_games_raw_by_demographics(
+    igdb_request: IgdbRequestFn,
+    games_raw: list[dict[str, Any]],
+    min_age: int | None,
+    min_players: int | None,
+    max_players: int | None,
+) -> list[dict[str, Any]]:
+    """
+    Post-filtre une liste de jeux IGDB bruts. Sans filtre numérique, retour inchangé.
+    Les valeurs viennent d'IgdbGameDemographics ; seuls les jeux absents déclenchent age_ratings / multiplayer_modes.
+    """
+    if not games_raw or not _has_demographic_filters(min_age, min_players, max_players):
+        return games_raw
+
+    demographics = load_demographics([int(g["id"]) for g in games_raw])
+    missing = _missing_games(games_raw, demographics)
+    if missing:
+        age_ids, mp_ids = _demographic_ids(missing)
+        fetched = derive_demographics(missing, fetch_age_ratings_map(igdb_request, age_ids), fetch_multiplayer_modes_raw(igdb_request, mp_ids))
+        save_demographics(fetched)
+        demographics.update(fetched)
+    return _keep_matching_games(games_raw, demographics, min_age, min_players, max_players)
+
+
+async def afilter_games_raw_by_demographics(
+    igdb_request: AsyncIgdbRequestFn,
+    games_raw: list[dict[str, Any]],
+    min_age: int | None,
+    min_players: int | None,
+    max_players: int | None,
+) -> list[dict[str, Any]]:
+    """Comme filter_games_raw_by_demographics ; age_ratings et multiplayer_modes sont demandés en parallèle."""
+    if not games_raw or not _has_demographic_filters(min_age, min_players, max_players):
+        return games_raw
+
+    demographics = await sync_to_async(load_demographics)([int(g["id"]) for g in games_raw])
+    missing = _missing_games(games_raw, demographics)
+    if missing:
+        age_ids, mp_ids = _demographic_ids(missing)
+        age_map, mp_list = await asyncio.gather(afetch_age_ratings_map(igdb_request, age_ids), afetch_multiplayer_modes_raw(igdb_request, mp_ids))
+        fetched = derive_demographics(missing, age_map, mp_list)
+        await sync_to_async(save_demographics)(fetched)
+        demographics.update(fetched)
+    return _keep_matching_games(games_raw, demographics, min_age, min_players, max_players)
@@ -0,0 +1,145 @@
+"""
+Service local-first des listes du proxy IGDB (trending, séries, franchises) depuis le miroir du catalogue.
+
+Les jeux stockés sont renvoyés sous la forme des payloads IGDB bruts (mêmes champs que FIELDS_GAMES_LIST) :
+la suite du traitement (noms français, normalize_igdb_game, données utilisateur) est celle des réponses IGDB.
+Chaque fonction retourne None quand la base ne peut pas répondre (miroir en retard, filtre non stocké
+localement, série inconnue, aucun résultat) : la vue interroge alors IGDB.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+
+from decouple import config as env_config
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Prefetch, QuerySet
+from django.utils import timezone
+
+from apps.games.igdb_mirror import MIRROR_STATE_NAME
+from apps.games.models import Collection, Franchise, Game, IgdbSyncState, Platform
+from apps.games.views_igdb_helpers import IgdbFilters
+
+logger = logging.getLogger(__name__)
+
+# Retard maximal du miroir (secondes entre son dernier `updated_at` IGDB et maintenant) pour servir en local
+LOCAL_CATALOGUE_MAX_LAG_SECONDS = env_config("IGDB_LOCAL_CATALOGUE_MAX_LAG_SECONDS", default=24 * 60 * 60, cast=int)
+
+_RELATED_MODELS = {"collections": Collection, "franchises": Franchise}
+
+
+def local_catalogue_is_fresh() -> bool:
+    """True si le miroir a rattrapé IGDB à LOCAL_CATALOGUE_MAX_LAG_SECONDS près."""
+    if not settings.IGDB_LOCAL_CATALOGUE_ENABLED:
+        return False
+    try:
+        watermark = IgdbSyncState.objects.filter(name=MIRROR_STATE_NAME).values_list("watermark", flat=True).first()
+    except Exception:
+        logger.warning("Catalogue local: état du miroir illisible, appel IGDB.", exc_info=True)
+        return False
+    return watermark is not None and watermark >= time.time() - LOCAL_CATALOGUE_MAX_LAG_SECONDS
+
+
+def _has_related(relation, igdb_ids: list[int]) -> Exists:
+    through = relation.through
+    target = relation.field.m2m_reverse_field_name()
+    return Exists(through.objects.filter(game_id=OuterRef("pk"), **{f"{target}__igdb_id__in": igdb_ids}))
+
+
+def _filtered_games(filters: IgdbFilters) -> QuerySet | None:
+    """Traduit IgdbFilters en filtres ORM ; None si un filtre porte sur une donnée non stockée (thèmes, modes, perspectives)."""
+    if filters.theme_ids or filters.game_mode_ids or filters.player_perspective_ids:
+        return None
+    qs = Game.objects.filter(igdb_id__isnull=False)
+    if filters.genre_ids:
+        qs = qs.filter(_has_related(Game.genres, filters.genre_ids))
+    if filters.platform_ids:
+        qs = qs.filter(_has_related(Game.platforms, filters.platform_ids))
+    if filters.min_rating is not None:
+        qs = qs.filter(igdb_total_rating__gte=filters.min_rating)
+    if filters.release_year_min is not None:
+        qs = qs.filter(release_date__gte=datetime.date(filters.release_year_min, 1, 1))
+    if filters.release_year_max is not None:
+        qs = qs.filter(release_date__lte=datetime.date(filters.release_year_max, 12, 31))
+    # Même sémantique que le post-filtre démographique (min_age gte, min_players lte, max_players gte)
+    if filters.min_age is not None:
+        qs = qs.filter(min_age__gte=filters.min_age)
+    if filters.min_players is not None:
+        qs = qs.filter(min_players__lte=filters.min_players)
+    if filters.max_players is not None:
+        qs = qs.filter(max_players__gte=filters.max_players)
+    return qs
+
+
+def _sorted_games(qs: QuerySet, sort: str) -> QuerySet:
+    """Équivalent ORM de TRENDING_SORTS (igdb_id départage les égalités pour une pagination stable)."""
+    if sort == "rating":
+        return qs.filter(igdb_rating_count__gt=50, igdb_total_rating__isnull=False).order_by("-igdb_total_rating", "igdb_id")
+    if sort == "recent":
+        return qs.filter(release_date__lt=timezone.now().date(), igdb_rating_count__gt=0).order_by("-release_date", "igdb_id")
+    if sort == "most_rated":
+        return qs.filter(igdb_rating_count__gt=100, igdb_total_rating__isnull=False).order_by("-igdb_rating_count", "igdb_id")
+    if sort == "name":
+        return qs.order_by("name", "igdb_id")
+    return qs.filter(igdb_rating_count__gt=0).order_by("-igdb_rating_count", "igdb_id")
+
+
+def _with_platforms(qs: QuerySet) -> QuerySet:
+    return qs.prefetch_related(Prefetch("platforms", queryset=Platform.objects.only("igdb_id", "name")))
+
+
+def game_as_igdb_payload(game: Game, with_demographics: bool = False) -> dict:
+    """Jeu local au format d'une réponse IGDB /games (FIELDS_GAMES_LIST)."""
+    release_ts = None
+    if game.release_date:
+        release_ts = int(datetime.datetime.combine(game.release_date, datetime.time(), tzinfo=datetime.timezone.utc).timestamp())
+    payload = {
+        "id": game.igdb_id,
+        "name": game.name,
+        "summary": game.description or None,
+        "cover": {"url": game.cover_url} if game.cover_url else None,
+        "first_release_date": release_ts,
+        "platforms": [{"id": p.igdb_id, "name": p.name} for p in game.platforms.all()],
+        "total_rating": game.igdb_total_rating,
+        "total_rating_count": game.igdb_rating_count,
+    }
+    if with_demographics:
+        payload["_ludokan_min_age"] = game.min_age
+        payload["_ludokan_min_players"] = game.min_players
+        payload["_ludokan_max_players"] = game.max_players
+    return payload
+
+
+def local_trending_page(limit: int, offset: int, filters: IgdbFilters, *, require_fresh: bool = True) -> tuple[list, int] | None:
+    """(payloads IGDB, total) servis par la base, ou None si IGDB doit répondre."""
+    if not settings.IGDB_LOCAL_CATALOGUE_ENABLED or (require_fresh and not local_catalogue_is_fresh()):
+        return None
+    qs = _filtered_games(filters)
+    if qs is None:
+        return None
+    try:
+        qs = _sorted_games(qs, filters.sort)
+        total = qs.count()
+        if not total:
+            return None
+        page = _with_platforms(qs)[offset : offset + limit]
+        return [game_as_igdb_payload(g, filters.has_demographics) for g in page], total
+    except Exception:
+        logger.warning("Catalogue local: lecture trending impossible, appel IGDB.", exc_info=True)
+        return None
+
+
+def local_related_games(relation: str, igdb_id: int, limit: int, offset: int, *, require_fresh: bool = True) -> list | None:
+    """Jeux d'une série (`collections`) ou franchise (`franchises`) IGDB, triés comme le proxy (total_rating_count desc)."""
+    if not settings.IGDB_LOCAL_CATALOGUE_ENABLED or (require_fresh and not local_catalogue_is_fresh()):
+        return None
+    try:
+        if not _RELATED_MODELS[relation].objects.filter(igdb_id=igdb_id, games__isnull=False).exists():
+            return None
+        qs = Game.objects.filter(**{f"{relation}__igdb_id": igdb_id}).order_by("-igdb_rating_count", "igdb_id")
+        return [game_as_igdb_payload(g) for g in _with_platforms(qs)[offset : offset + limit]]
+    except Exception:
+        logger.warning("Catalogue local: lecture %s impossible, appel IGDB.", relation, exc_info=True)
+        return None
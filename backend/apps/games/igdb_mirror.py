@@ -0,0 +1,242 @@
+"""
+Miroir incrémental du catalogue IGDB dans Postgres.
+
+Les jeux IGDB (version_parent = null) sont parcourus par `updated_at` croissant depuis le point de reprise
+IgdbSyncState ; chaque page est upsertée en masse (genres, plateformes, séries, franchises, éditeurs, jeux,
+liens M2M, captures, vidéos) et le point de reprise avance dans la même transaction : un crash reprend à la
+dernière page validée.
+
+Quand une page pleine ne contient qu'une seule seconde `updated_at` (mise à jour massive côté IGDB),
+cette seconde est parcourue par id croissant (cursor_id) avant de reprendre le tri par date.
+
+`request_games_page` et `upsert_games_page` sont aussi l'écriture de la commande import_igdb_popular,
+qui ne garde que sa propre pagination (id croissant) et son point de reprise.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from django.db import transaction
+
+from apps.games.igdb_demographics import compute_min_age, compute_player_counts, save_demographics
+from apps.games.models import Collection, Franchise, Game, GameScreenshot, GameVideo, Genre, IgdbSyncState, Platform, Publisher
+from apps.games.services import _get_igdb_publisher, _resolve_igdb_terms
+
+logger = logging.getLogger(__name__)
+
+IgdbRequestFn = Callable[[str, str], Any]
+
+MIRROR_STATE_NAME = "games"
+MIRROR_PAGE_SIZE = 500  # maximum IGDB par requête
+MIRROR_MAX_PAGES = 20  # pages par exécution planifiée (≈ 10 000 jeux)
+
+_GAME_FIELDS = """
+    id, name, summary, first_release_date, updated_at, total_rating, total_rating_count, game_status,
+    cover.url, genres.name, platforms.name, collections.name, franchises.name,
+    screenshots.url, videos.name, videos.video_id,
+    involved_companies.publisher, involved_companies.company.name,
+    age_ratings.category, age_ratings.rating,
+    multiplayer_modes.offlinemax, multiplayer_modes.onlinemax, multiplayer_modes.offlinecoopmax,
+    multiplayer_modes.onlinecoopmax, multiplayer_modes.offlinecoop, multiplayer_modes.onlinecoop,
+    multiplayer_modes.campaigncoop
+"""
+
+# Colonnes de Game réécrites à chaque passage ; name_fr / description_fr restent locales,
+# popularity_score est calculé par apps.games.popularity.
+_GAME_UPDATE_FIELDS = [
+    "name",
+    "description",
+    "release_date",
+    "cover_url",
+    "igdb_rating_count",
+    "igdb_total_rating",
+    "status",
+    "min_age",
+    "min_players",
+    "max_players",
+    "publisher",
+    "updated_at",
+]
+
+# Game.status d'après games.game_status IGDB (absent ou inconnu : « released »)
+_STATUSES = {0: "released", 2: "alpha", 3: "beta", 4: "early_access", 5: "offline", 6: "cancelled", 7: "rumored", 8: "delisted"}
+
+
+def _games_page_query(where: str, sort: str, limit: int) -> str:
+    return f"fields {_GAME_FIELDS.strip()}; where version_parent = null & {where}; sort {sort} asc; limit {limit};"
+
+
+def request_games_page(igdb_request: IgdbRequestFn, where: str, sort: str, limit: int | None = None) -> list[dict]:
+    """Page de jeux IGDB (champs développés, prêts pour upsert_games_page), au plus `limit` (défaut MIRROR_PAGE_SIZE)."""
+    data = igdb_request("games", _games_page_query(where, sort, limit or MIRROR_PAGE_SIZE))
+    if not isinstance(data, list):
+        raise RuntimeError(f"IGDB games: réponse inattendue ({type(data).__name__}).")
+    return [g for g in data if isinstance(g, dict) and g.get("id") is not None]
+
+
+def fetch_next_page(igdb_request: IgdbRequestFn, watermark: int, cursor_id: int | None) -> tuple[list[dict], int, int | None, bool]:
+    """
+    Page suivante à appliquer depuis (watermark, cursor_id).
+    Retourne (jeux, nouveau watermark, nouveau cursor_id, terminé).
+    """
+    if cursor_id is not None:
+        games = request_games_page(igdb_request, f"updated_at = {watermark} & id > {cursor_id}", "id")
+        if len(games) < MIRROR_PAGE_SIZE:
+            return games, watermark, None, False
+        return games, watermark, max(g["id"] for g in games), False
+
+    games = request_games_page(igdb_request, f"updated_at > {watermark}", "updated_at")
+    if len(games) < MIRROR_PAGE_SIZE:
+        return games, max([watermark] + [g.get("updated_at") or 0 for g in games]), None, True
+
+    last = max(g.get("updated_at") or 0 for g in games)
+    kept = [g for g in games if (g.get("updated_at") or 0) < last]
+    if not kept:
+        # Page entière sur la même seconde : on la reparcourt par id.
+        return [], last, 0, False
+    # Les jeux de la dernière seconde (page tronquée) seront relus à la page suivante.
+    return kept, max(g.get("updated_at") or 0 for g in kept), None, False
+
+
+def _https(url: str | None, size: str) -> str | None:
+    if not url:
+        return None
+    url = "https:" + url if url.startswith("//") else url
+    return url.replace("t_thumb", size)
+
+
+def _cover_url(game_data: dict) -> str | None:
+    cover = game_data.get("cover")
+    return _https(cover.get("url"), "t_cover_big") if isinstance(cover, dict) else None
+
+
+def _screenshot_rows(game_pk: int, game_data: dict) -> list[GameScreenshot]:
+    shots = [s for s in _entities(game_data, "screenshots") if s.get("url")]
+    return [GameScreenshot(game_id=game_pk, url=_https(s["url"], "t_screenshot_big"), position=i, igdb_id=s["id"]) for i, s in enumerate(shots)]
+
+
+def _video_rows(game_pk: int, game_data: dict) -> list[GameVideo]:
+    return [
+        GameVideo(game_id=game_pk, igdb_id=v["id"], name=(v.get("name") or "")[:255], video_id=v["video_id"][:32])
+        for v in _entities(game_data, "videos")
+        if v.get("video_id")
+    ]
+
+
+def _release_date(game_data: dict):
+    ts = game_data.get("first_release_date")
+    return datetime.fromtimestamp(ts, tz=timezone.utc).date() if ts else None
+
+
+def _entities(game_data: dict, key: str) -> list[dict]:
+    return [e for e in game_data.get(key) or [] if isinstance(e, dict) and e.get("id") is not None]
+
+
+def _publisher_company(game_data: dict) -> dict | None:
+    for ic in _entities(game_data, "involved_companies"):
+        company = ic.get("company")
+        if ic.get("publisher") and isinstance(company, dict) and company.get("id") is not None and company.get("name"):
+            return company
+    return None
+
+
+def _demographics(game_data: dict) -> tuple[int | None, int | None, int | None]:
+    ratings = _entities(game_data, "age_ratings")
+    flat = {"id": game_data["id"], "age_ratings": [ar["id"] for ar in ratings]}
+    min_players, max_players = compute_player_counts(flat, {game_data["id"]: _entities(game_data, "multiplayer_modes")})
+    return compute_min_age(flat, {ar["id"]: ar for ar in ratings}), min_players, max_players
+
+
+# Relations M2M de Game reprises telles quelles d'IGDB : (clé IGDB, modèle lié, manager de Game)
+_LINKED_ENTITIES = (
+    ("genres", Genre, Game.genres),
+    ("platforms", Platform, Game.platforms),
+    ("collections", Collection, Game.collections),
+    ("franchises", Franchise, Game.franchises),
+)
+
+
+def _replace_links(games_raw: list[dict], game_pks: dict[int, int], key: str, model, descriptor) -> None:
+    """Remplace les liens `key` des jeux de la page par ceux renvoyés par IGDB."""
+    related = _resolve_igdb_terms(model, {e["id"]: e["name"] for gd in games_raw for e in _entities(gd, key) if e.get("name")})
+    through = descriptor.through
+    column = f"{model._meta.model_name}_id"
+    through.objects.filter(game_id__in=game_pks.values()).delete()
+    through.objects.bulk_create(
+        [through(game_id=game_pks[gd["id"]], **{column: related[e["id"]]}) for gd in games_raw for e in _entities(gd, key) if e["id"] in related],
+        ignore_conflicts=True,
+    )
+
+
+def _game_row(game_data: dict, publisher_pk: int, demographics) -> Game:
+    min_age, min_players, max_players = demographics
+    return Game(
+        igdb_id=game_data["id"],
+        name=(game_data.get("name") or f"Unknown Game ({game_data['id']})")[:255],
+        description=game_data.get("summary") or "",
+        release_date=_release_date(game_data),
+        cover_url=_cover_url(game_data),
+        igdb_rating_count=game_data.get("total_rating_count") or 0,
+        igdb_total_rating=game_data.get("total_rating"),
+        status=_STATUSES.get(game_data.get("game_status"), "released"),
+        min_age=min_age,
+        min_players=min_players,
+        max_players=max_players,
+        publisher_id=publisher_pk,
+    )
+
+
+def upsert_games_page(games_raw: list[dict]) -> dict[int, tuple]:
+    """Upsert en masse d'une page de jeux IGDB (appelé dans une transaction). Retourne les âges / joueurs dérivés."""
+    companies = {gd["id"]: _publisher_company(gd) for gd in games_raw}
+    publishers = _resolve_igdb_terms(Publisher, {c["id"]: c["name"] for c in companies.values() if c})
+    default_publisher_pk = _get_igdb_publisher().pk
+
+    demographics = {gd["id"]: _demographics(gd) for gd in games_raw}
+    rows = [_game_row(gd, publishers.get((companies[gd["id"]] or {}).get("id"), default_publisher_pk), demographics[gd["id"]]) for gd in games_raw]
+    Game.objects.bulk_create(rows, batch_size=MIRROR_PAGE_SIZE, update_conflicts=True, unique_fields=["igdb_id"], update_fields=_GAME_UPDATE_FIELDS)
+    game_pks = dict(Game.objects.filter(igdb_id__in=demographics).values_list("igdb_id", "pk"))
+    pks = list(game_pks.values())
+
+    for key, model, descriptor in _LINKED_ENTITIES:
+        _replace_links(games_raw, game_pks, key, model, descriptor)
+
+    GameScreenshot.objects.filter(game_id__in=pks).delete()
+    GameScreenshot.objects.bulk_create([row for gd in games_raw for row in _screenshot_rows(game_pks[gd["id"]], gd)])
+    GameVideo.objects.filter(game_id__in=pks).delete()
+    GameVideo.objects.bulk_create([row for gd in games_raw for row in _video_rows(game_pks[gd["id"]], gd)], ignore_conflicts=True)
+    return demographics
+
+
+def sync_catalogue(
+    igdb_request: IgdbRequestFn, max_pages: int = MIRROR_MAX_PAGES, on_page: Callable[[IgdbSyncState, int], None] | None = None
+) -> int:
+    """
+    Avance le miroir d'au plus `max_pages` pages depuis le point de reprise. Retourne le nombre de jeux upsertés.
+    Chaque page et l'avancée du point de reprise sont validées ensemble.
+    """
+    state, _ = IgdbSyncState.objects.get_or_create(name=MIRROR_STATE_NAME)
+    synced = 0
+    for _page in range(max_pages):
+        games_raw, watermark, cursor_id, done = fetch_next_page(igdb_request, state.watermark, state.cursor_id)
+        with transaction.atomic():
+            demographics = upsert_games_page(games_raw) if games_raw else {}
+            state.watermark, state.cursor_id = watermark, cursor_id
+            state.games_synced += len(games_raw)
+            state.save(update_fields=["watermark", "cursor_id", "games_synced", "updated_at"])
+        save_demographics(demographics)
+        synced += len(games_raw)
+        if on_page is not None:
+            on_page(state, len(games_raw))
+        if done:
+            break
+    return synced
+
+
+def reset_watermark(watermark: int = 0) -> IgdbSyncState:
+    """Repositionne le point de reprise (0 = tout le catalogue)."""
+    state, _ = IgdbSyncState.objects.update_or_create(name=MIRROR_STATE_NAME, defaults={"watermark": watermark, "cursor_id": None})
+    return state
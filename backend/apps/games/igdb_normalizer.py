@@ -1,10 +1,8 @@
 from datetime import datetime
 from typing import Any
 
-from django.db.models import Prefetch
-
-from apps.games.models import Game, Rating
-from apps.library.models import UserGame, UserLibrary, UserLibraryEntry
+from apps.games.models import Game
+from apps.games.user_overlays import GameOverlayLoader
 
 
 def _extract_release_date(first_release_date: Any) -> str | None:
@@ -141,10 +139,11 @@ def normalize_igdb_game(g: dict[str, Any]) -> dict[str, Any]:
     return out
 
 
-def enrich_normalized_games(normalized_games: list[dict[str, Any]], user=None) -> list[dict[str, Any]]:
+def enrich_normalized_games(normalized_games: list[dict[str, Any]], user=None, loader: GameOverlayLoader | None = None) -> list[dict[str, Any]]:
     """
     Enrichit une liste de NormalizedGame (issus d'IGDB) avec les données locales Django
     si elles existent (django_id, user_library, user_rating).
+    Les données utilisateur passent par un GameOverlayLoader (un seul lot pour toute la liste).
     PAS de création ni de modification en base ici.
     """
     if not normalized_games:
@@ -155,27 +154,12 @@ def enrich_normalized_games(normalized_games: list[dict[str, Any]], user=None) -
         return normalized_games
 
     # On récupère les jeux existants en base
-    matching_games = Game.objects.filter(igdb_id__in=igdb_ids)
+    matching_games = Game.objects.filter(igdb_id__in=igdb_ids).only("id", "igdb_id", "min_players", "max_players")
     game_map = {g.igdb_id: g for g in matching_games}
 
-    # Si utilisateur connecté, on pré-récupère ses données pour éviter le N+1
-    user_games_map = {}
-    ratings_map = {}
-    if user and user.is_authenticated:
-        user_games = UserGame.objects.filter(user=user, game__igdb_id__in=igdb_ids).prefetch_related(
-            Prefetch(
-                "library_entries",
-                queryset=UserLibraryEntry.objects.select_related("library").only(
-                    "library_id",
-                    "user_game_id",
-                    "library__system_key",
-                ),
-            )
-        )
-        user_games_map = {ug.game.igdb_id: ug for ug in user_games}
-
-        user_ratings = Rating.objects.filter(user=user, game__igdb_id__in=igdb_ids)
-        ratings_map = {r.game.igdb_id: r for r in user_ratings}
+    if loader is None:
+        loader = GameOverlayLoader(user)
+    loader.prime(g.id for g in game_map.values())
 
     for g in normalized_games:
         igdb_id = g.get("igdb_id")
@@ -188,22 +172,12 @@ def enrich_normalized_games(normalized_games: list[dict[str, Any]], user=None) -
         g["max_players"] = django_game.max_players
 
         # Injection des données utilisateur
-        if igdb_id in user_games_map:
-            ug = user_games_map[igdb_id]
-            g["user_library"] = {
-                "id": ug.id,
-                "status": ug.status,
-                "is_favorite": ug.is_favorite,
-                "collection_ids": [
-                    e.library_id for e in ug.library_entries.all() if getattr(e.library, "system_key", None) != UserLibrary.SystemKey.MA_LUDOTHEQUE
-                ],
-            }
-
-        if igdb_id in ratings_map:
-            r = ratings_map[igdb_id]
-            g["user_rating"] = {
-                "value": float(r.value),
-                "rating_type": r.rating_type,
-            }
+        user_library = loader.user_library(django_game.id)
+        if user_library is not None:
+            g["user_library"] = user_library
+
+        user_rating = loader.user_rating(django_game.id)
+        if user_rating is not None:
+            g["user_rating"] = user_rating
 
     return normalized_games
@@ -33,5 +33,7 @@ TRENDING_SORTS = {
 
 MYMEMORY_URL = "https://api.mymemory.translated.net/get"
 MAX_TRANSLATE_TEXT_LEN = 20_000
+TRANSLATE_MAX_CONCURRENCY = 4  # appels MyMemory simultanés par requête
+TRANSLATE_CACHE_TTL = 30 * 86400  # 30 jours (morceaux traduits, clé = hash du contenu)
 TRENDING_CACHE_TTL = 120  # secondes (2 min)
 PLATFORMS_CACHE_TTL = 86400  # 24h
@@ -0,0 +1,338 @@
+"""
+Transport HTTP partagé vers IGDB, utilisé par igdb_client.igdb_request.
+
+- Session requests keep-alive unique par processus (pas de handshake TCP+TLS à chaque appel).
+- Limiteur de débit partagé entre workers gunicorn/celery via le cache Django (Redis) :
+  seau de IGDB_RATE_LIMIT_PER_SECOND jetons, rechargé à chaque seconde.
+- Retry avec backoff exponentiel + jitter sur 429 / 5xx / erreurs réseau.
+- Variante asynchrone (apost) sur un httpx.AsyncClient par boucle d'événements, pour les vues ASGI :
+  même limiteur, même politique de retry, mêmes métriques. Le client est fermé (aclose) à l'arrêt de sa
+  boucle. Sous WSGI, async_to_sync crée une boucle par requête (marquée par AsyncAPIView.dispatch) :
+  apost y délègue à la session requests.
+- Compteurs par endpoint (appels, erreurs, latence, attente de throttling, hits du cache igdb_cache)
+  stockés dans le cache pour être agrégés sur tous les workers (voir get_transport_metrics).
+- Disjoncteur partagé (circuit_breaker.IGDB_BREAKER) : pendant un incident IGDB, les appels échouent
+  immédiatement (CircuitOpenError) au lieu d'attendre le timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from decouple import config as env_config
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from apps.core.async_views import is_request_loop
+from apps.games.circuit_breaker import IGDB_BREAKER, is_upstream_error_response
+
+logger = logging.getLogger(__name__)
+
+IGDB_RATE_LIMIT_PER_SECOND = env_config("IGDB_RATE_LIMIT_PER_SECOND", default=4, cast=int)
+IGDB_RATE_LIMIT_MAX_WAIT_SECONDS = 5.0  # au-delà, on laisse partir l'appel (le retry 429 prend le relais)
+IGDB_MAX_RETRIES = 3
+IGDB_RETRY_BASE_DELAY_SECONDS = 0.25
+IGDB_RETRY_MAX_DELAY_SECONDS = 4.0
+IGDB_POOL_MAXSIZE = 10
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_RATE_LIMIT_KEY_PREFIX = "igdb:ratelimit"
+_METRICS_KEY_PREFIX = "igdb:metrics"
+_METRICS_ENDPOINTS_KEY = f"{_METRICS_KEY_PREFIX}:endpoints"
+_METRICS_TTL = 7 * 24 * 60 * 60
+METRIC_FIELDS = ("calls", "errors", "retries", "latency_ms_total", "throttled", "throttle_wait_ms_total")
+CACHE_METRIC_FIELDS = ("cache_hits", "cache_stale", "cache_misses", "cache_coalesced")
+
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_session() -> requests.Session:
+    """Session keep-alive du processus courant (recréée après un fork)."""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=IGDB_POOL_MAXSIZE, max_retries=0)
+            session.mount("https://", adapter)
+            _session = session
+            _session_pid = pid
+    return _session
+
+
+def _reset_session() -> None:
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def is_ephemeral_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    """Boucle créée par async_to_sync pour une seule requête (vue async servie en WSGI par gunicorn)."""
+    return is_request_loop(loop)
+
+
+async def _client_lifetime(client: httpx.AsyncClient):
+    """Générateur rattaché à la boucle : loop.shutdown_asyncgens() (fin d'asyncio.run, arrêt du serveur) ferme le client."""
+    try:
+        yield client
+    finally:
+        await client.aclose()
+
+
+async def aget_async_client() -> httpx.AsyncClient:
+    """Client httpx keep-alive de la boucle d'événements courante (un client ne peut pas changer de boucle)."""
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None or entry[0].is_closed:
+        limits = httpx.Limits(max_connections=IGDB_POOL_MAXSIZE, max_keepalive_connections=IGDB_POOL_MAXSIZE)
+        client = httpx.AsyncClient(limits=limits)
+        lifetime = _client_lifetime(client)
+        await lifetime.__anext__()
+        entry = _async_clients[loop] = (client, lifetime)
+    return entry[0]
+
+
+# --- Limiteur de débit ---
+
+
+def _try_take_token(now: float) -> bool:
+    """Prend un jeton dans le seau de la seconde courante. Fail-open si le cache est indisponible."""
+    key = f"{_RATE_LIMIT_KEY_PREFIX}:{int(now)}"
+    try:
+        cache.add(key, 0, timeout=2)
+        return cache.incr(key) <= IGDB_RATE_LIMIT_PER_SECOND
+    except Exception:
+        logger.warning("IGDB rate limiter: cache indisponible, appel non limité.", exc_info=True)
+        return True
+
+
+def _throttle_delay(started: float) -> float:
+    """0 si un créneau est obtenu (ou si l'attente max est atteinte), sinon délai avant de retenter."""
+    now = time.time()
+    if _try_take_token(now):
+        return 0.0
+    waited = time.monotonic() - started
+    if waited >= IGDB_RATE_LIMIT_MAX_WAIT_SECONDS:
+        logger.warning("IGDB rate limiter: attente max atteinte (%.2fs), appel envoyé.", waited)
+        return 0.0
+    # Attente jusqu'à la seconde suivante + jitter pour étaler les workers en concurrence
+    return (1.0 - (now % 1.0)) + random.uniform(0, 0.05)
+
+
+def acquire_rate_limit_slot() -> float:
+    """Bloque jusqu'à obtenir un créneau d'appel IGDB. Retourne le temps attendu (secondes)."""
+    if IGDB_RATE_LIMIT_PER_SECOND <= 0:
+        return 0.0
+    started = time.monotonic()
+    while delay := _throttle_delay(started):
+        time.sleep(delay)
+    return time.monotonic() - started
+
+
+async def aacquire_rate_limit_slot() -> float:
+    """Version asynchrone : attend le créneau sans bloquer la boucle d'événements."""
+    if IGDB_RATE_LIMIT_PER_SECOND <= 0:
+        return 0.0
+    started = time.monotonic()
+    while delay := await sync_to_async(_throttle_delay, thread_sensitive=False)(started):
+        await asyncio.sleep(delay)
+    return time.monotonic() - started
+
+
+# --- Métriques ---
+
+
+def _metric_key(endpoint: str, field: str) -> str:
+    return f"{_METRICS_KEY_PREFIX}:{endpoint}:{field}"
+
+
+def _incr_metric(endpoint: str, field: str, delta: int = 1) -> None:
+    key = _metric_key(endpoint, field)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=_METRICS_TTL)
+        cache.incr(key, delta)
+
+
+def _register_metric_endpoint(endpoint: str) -> None:
+    endpoints = cache.get(_METRICS_ENDPOINTS_KEY) or []
+    if endpoint not in endpoints:
+        cache.set(_METRICS_ENDPOINTS_KEY, sorted({*endpoints, endpoint}), timeout=_METRICS_TTL)
+
+
+def record_call_metrics(endpoint: str, latency_s: float, throttle_wait_s: float, retries: int, failed: bool) -> None:
+    """Agrège les compteurs d'un appel. Ne lève jamais (les métriques ne doivent pas casser un appel)."""
+    try:
+        _register_metric_endpoint(endpoint)
+        _incr_metric(endpoint, "calls")
+        _incr_metric(endpoint, "latency_ms_total", int(latency_s * 1000))
+        if failed:
+            _incr_metric(endpoint, "errors")
+        if retries:
+            _incr_metric(endpoint, "retries", retries)
+        if throttle_wait_s > 0.001:
+            _incr_metric(endpoint, "throttled")
+            _incr_metric(endpoint, "throttle_wait_ms_total", int(throttle_wait_s * 1000))
+    except Exception:
+        logger.debug("IGDB metrics: échec d'écriture des compteurs.", exc_info=True)
+
+
+def record_cache_event(endpoint: str, field: str) -> None:
+    """Compte un événement du cache de réponses (cache_hits, cache_stale, cache_misses, cache_coalesced)."""
+    try:
+        _register_metric_endpoint(endpoint)
+        _incr_metric(endpoint, field)
+    except Exception:
+        logger.debug("IGDB metrics: échec d'écriture des compteurs.", exc_info=True)
+
+
+def get_transport_metrics() -> dict[str, dict]:
+    """
+    Compteurs agrégés (tous workers) par endpoint IGDB :
+    calls, errors, retries, latency_ms_total, latency_ms_avg, throttled, throttle_wait_ms_total,
+    cache_hits, cache_stale, cache_misses, cache_coalesced, cache_hit_ratio.
+    """
+    out: dict[str, dict] = {}
+    for endpoint in cache.get(_METRICS_ENDPOINTS_KEY) or []:
+        keys = {field: _metric_key(endpoint, field) for field in METRIC_FIELDS + CACHE_METRIC_FIELDS}
+        values = cache.get_many(list(keys.values()))
+        stats = {field: int(values.get(key) or 0) for field, key in keys.items()}
+        stats["latency_ms_avg"] = round(stats["latency_ms_total"] / stats["calls"], 1) if stats["calls"] else 0.0
+        lookups = stats["cache_hits"] + stats["cache_stale"] + stats["cache_misses"]
+        served = stats["cache_hits"] + stats["cache_stale"] + stats["cache_coalesced"]
+        stats["cache_hit_ratio"] = round(served / lookups, 3) if lookups else 0.0
+        out[endpoint] = stats
+    return out
+
+
+def reset_transport_metrics() -> None:
+    endpoints = cache.get(_METRICS_ENDPOINTS_KEY) or []
+    fields = METRIC_FIELDS + CACHE_METRIC_FIELDS
+    cache.delete_many([_metric_key(e, f) for e in endpoints for f in fields] + [_METRICS_ENDPOINTS_KEY])
+
+
+# --- Envoi ---
+
+
+def _retry_delay(attempt: int, resp=None) -> float:
+    """Backoff exponentiel avec full jitter ; respecte Retry-After si IGDB le fournit."""
+    headers = getattr(resp, "headers", None) or {}
+    retry_after = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if retry_after:
+        try:
+            return min(float(retry_after), IGDB_RETRY_MAX_DELAY_SECONDS)
+        except (TypeError, ValueError):
+            pass
+    cap = min(IGDB_RETRY_BASE_DELAY_SECONDS * (2**attempt), IGDB_RETRY_MAX_DELAY_SECONDS)
+    return random.uniform(0, cap)
+
+
+def response_ok(resp) -> bool:
+    """requests expose `ok`, httpx `is_success`."""
+    if resp is None:
+        return False
+    ok = getattr(resp, "ok", None)
+    return bool(getattr(resp, "is_success", False) if ok is None else ok)
+
+
+def _should_retry(resp, attempt: int) -> bool:
+    return getattr(resp, "status_code", 200) in RETRYABLE_STATUS_CODES and attempt < IGDB_MAX_RETRIES
+
+
+def _breaker_failed(resp) -> bool:
+    """Issue comptée par le disjoncteur : erreur réseau (pas de réponse) ou 429 / 5xx après les retries."""
+    return resp is None or is_upstream_error_response(resp)
+
+
+def post(endpoint: str, url: str, body: bytes, headers: dict, timeout: float):
+    """
+    POST IGDB via la session partagée, sous le limiteur de débit, avec retry sur 429/5xx.
+    Retourne la dernière réponse (ok ou non) ; lève l'erreur réseau si tous les essais échouent,
+    CircuitOpenError sans appel si le disjoncteur IGDB est ouvert.
+    """
+    IGDB_BREAKER.before_call()
+    session = get_session()
+    throttle_wait = 0.0
+    started = time.monotonic()
+    resp = None
+    attempt = 0
+    try:
+        while True:
+            throttle_wait += acquire_rate_limit_slot()
+            try:
+                resp = session.post(url, data=body, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= IGDB_MAX_RETRIES:
+                    raise
+                resp = None
+            else:
+                if not _should_retry(resp, attempt):
+                    return resp
+            delay = _retry_delay(attempt, resp)
+            logger.info("IGDB %s: retry %d dans %.2fs (status=%s)", endpoint, attempt + 1, delay, getattr(resp, "status_code", "network"))
+            time.sleep(delay)
+            attempt += 1
+    finally:
+        latency = time.monotonic() - started - throttle_wait
+        record_call_metrics(endpoint, latency, throttle_wait, attempt, not response_ok(resp))
+        if _breaker_failed(resp):
+            IGDB_BREAKER.record_failure()
+        else:
+            IGDB_BREAKER.record_success(latency)
+
+
+async def apost(endpoint: str, url: str, body: bytes, headers: dict, timeout: float):
+    """
+    Équivalent asynchrone de post() (httpx) : ne bloque pas le worker ASGI pendant l'appel IGDB.
+    Sur une boucle éphémère (WSGI), un client httpx ne servirait qu'une requête : l'appel passe par
+    post() et la session keep-alive du processus, dans un thread.
+    """
+    if is_ephemeral_loop(asyncio.get_running_loop()):
+        return await sync_to_async(post, thread_sensitive=False)(endpoint, url, body, headers, timeout)
+    await IGDB_BREAKER.abefore_call()
+    client = await aget_async_client()
+    throttle_wait = 0.0
+    started = time.monotonic()
+    resp = None
+    attempt = 0
+    try:
+        while True:
+            throttle_wait += await aacquire_rate_limit_slot()
+            try:
+                resp = await client.post(url, content=body, headers=headers, timeout=timeout)
+            except httpx.TransportError:
+                if attempt >= IGDB_MAX_RETRIES:
+                    raise
+                resp = None
+            else:
+                if not _should_retry(resp, attempt):
+                    return resp
+            delay = _retry_delay(attempt, resp)
+            logger.info("IGDB %s: retry %d dans %.2fs (status=%s)", endpoint, attempt + 1, delay, getattr(resp, "status_code", "network"))
+            await asyncio.sleep(delay)
+            attempt += 1
+    finally:
+        latency = time.monotonic() - started - throttle_wait
+        await sync_to_async(record_call_metrics, thread_sensitive=False)(endpoint, latency, throttle_wait, attempt, not response_ok(resp))
+        if _breaker_failed(resp):
+            await IGDB_BREAKER.arecord_failure()
+        else:
+            await IGDB_BREAKER.arecord_success(latency)
@@ -0,0 +1,182 @@
+"""
+Cache des réponses /api/igdb/trending/ et préchauffage des combinaisons les plus demandées.
+
+Chaque requête trending est comptée par clé de cache (filtres / limit / offset / enrich) sur une fenêtre
+de TRENDING_REQUESTS_WINDOW_SECONDS. La tâche planifiée warm_igdb_trending_cache re-rend les
+TRENDING_WARMUP_TOP_N clés les plus demandées peu avant leur expiration : le premier visiteur après
+l'expiration ne paie plus IGDB + Wikidata et une page très consultée ne provoque plus de rafale d'appels.
+Le dernier rapport (couverture, durée) est lisible via `check_igdb --metrics`.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import time
+from typing import Callable
+
+from decouple import config as env_config
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.games import igdb_client
+from apps.games.igdb_local_catalogue import local_trending_page
+from apps.games.igdb_proxy_constants import TRENDING_CACHE_TTL
+from apps.games.views_igdb_helpers import IgdbFilters, trending_enrich_for_response, trending_fetch_page
+
+logger = logging.getLogger(__name__)
+
+TRENDING_WARMUP_TOP_N = env_config("IGDB_TRENDING_WARMUP_TOP_N", default=20, cast=int)
+TRENDING_WARMUP_INTERVAL_SECONDS = 60  # période de la tâche Celery beat
+# Re-rendu quand il reste moins d'une période (+ marge) avant l'expiration : l'entrée n'expire jamais entre deux passages
+TRENDING_WARMUP_REFRESH_AHEAD_SECONDS = TRENDING_WARMUP_INTERVAL_SECONDS + 15
+TRENDING_REQUESTS_WINDOW_SECONDS = 24 * 60 * 60
+TRENDING_REGISTRY_MAX_KEYS = 500
+# Un enregistrement perdu (écritures concurrentes du registre) est rattrapé à la N-ième requête suivante
+_REGISTER_EVERY_N_REQUESTS = 50
+
+_KEY_PREFIX = "igdb:trending"
+_REQUESTS_PREFIX = "igdb:trending:requests"
+_RENDERED_PREFIX = "igdb:trending:rendered"
+_REGISTRY_KEY = "igdb:trending:registry"
+_METRICS_PREFIX = "igdb:trending:metrics"
+_REPORT_KEY = "igdb:trending:warmup:report"
+
+
+def trending_cache_key(filters: IgdbFilters, limit: int, offset: int, enrich: bool) -> str:
+    return f"{_KEY_PREFIX}:{filters}:{limit}:{offset}:{enrich}"
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def fetch_trending_page(limit: int, offset: int, filters: IgdbFilters) -> tuple[list, int]:
+    """Page trending (payloads IGDB bruts, total) : miroir local à jour, sinon IGDB, sinon miroir même en retard."""
+    local = local_trending_page(limit, offset, filters)
+    if local is not None:
+        return local
+    try:
+        return trending_fetch_page(igdb_client.igdb_request, limit, offset, filters)
+    except Exception:
+        stale = local_trending_page(limit, offset, filters, require_fresh=False)
+        if stale is None:
+            raise
+        logger.warning("IGDB trending indisponible, réponse servie par le catalogue local.")
+        return stale
+
+
+def render_trending_response(filters: IgdbFilters, limit: int, offset: int, enrich: bool, enrich_fn: Callable, user=None) -> dict:
+    """Calcule la réponse trending et la met en cache (TRENDING_CACHE_TTL) avec son heure de rendu."""
+    arr, total_count = fetch_trending_page(limit, offset, filters)
+    res = {"results": trending_enrich_for_response(arr, enrich, enrich_fn, user), "total_count": total_count}
+    key = trending_cache_key(filters, limit, offset, enrich)
+    cache.set_many({key: res, f"{_RENDERED_PREFIX}:{_digest(key)}": time.time()}, TRENDING_CACHE_TTL)
+    return res
+
+
+def _incr(key: str, timeout: int) -> int:
+    cache.add(key, 0, timeout=timeout)
+    return cache.incr(key)
+
+
+def record_trending_request(filters: IgdbFilters, limit: int, offset: int, enrich: bool, hit: bool) -> None:
+    """Compte une requête trending (par clé de cache) et le hit / miss du cache ; sans effet si Redis est indisponible."""
+    if not settings.IGDB_TRENDING_WARMUP_ENABLED:
+        return
+    digest = _digest(trending_cache_key(filters, limit, offset, enrich))
+    try:
+        count = _incr(f"{_REQUESTS_PREFIX}:{digest}", TRENDING_REQUESTS_WINDOW_SECONDS)
+        _incr(f"{_METRICS_PREFIX}:{'hits' if hit else 'misses'}", TRENDING_REQUESTS_WINDOW_SECONDS)
+        if count == 1 or count % _REGISTER_EVERY_N_REQUESTS == 0:
+            _register(digest, {"filters": dataclasses.asdict(filters), "limit": limit, "offset": offset, "enrich": enrich})
+    except Exception:
+        logger.debug("Trending: comptage des requêtes indisponible.", exc_info=True)
+
+
+def _register(digest: str, params: dict) -> None:
+    registry = cache.get(_REGISTRY_KEY) or {}
+    if digest in registry or len(registry) >= TRENDING_REGISTRY_MAX_KEYS:
+        return
+    registry[digest] = params
+    cache.set(_REGISTRY_KEY, registry, TRENDING_REQUESTS_WINDOW_SECONDS)
+
+
+def _ranked_candidates() -> tuple[list[tuple[str, dict, int]], int]:
+    """[(digest, paramètres, requêtes)] par nombre de requêtes décroissant, et le total des requêtes de la fenêtre."""
+    registry = cache.get(_REGISTRY_KEY) or {}
+    counts = cache.get_many([f"{_REQUESTS_PREFIX}:{d}" for d in registry])
+    live = {d: p for d, p in registry.items() if counts.get(f"{_REQUESTS_PREFIX}:{d}")}
+    if len(live) != len(registry):
+        # Clés sans requête sur la fenêtre : on libère leur place dans le registre
+        cache.set(_REGISTRY_KEY, live, TRENDING_REQUESTS_WINDOW_SECONDS)
+    ranked = sorted(((d, p, int(counts[f"{_REQUESTS_PREFIX}:{d}"])) for d, p in live.items()), key=lambda c: c[2], reverse=True)
+    return ranked, sum(c[2] for c in ranked)
+
+
+def warm_trending_cache(enrich_fn: Callable, top_n: int | None = None) -> dict:
+    """
+    Re-rend les `top_n` clés trending les plus demandées dont l'entrée expire dans moins de
+    TRENDING_WARMUP_REFRESH_AHEAD_SECONDS (ou a déjà expiré). Retourne et mémorise le rapport du passage.
+    """
+    started = time.monotonic()
+    top_n = TRENDING_WARMUP_TOP_N if top_n is None else top_n
+    ranked, total_requests = _ranked_candidates()
+    selected = ranked[:top_n]
+    rendered_at = cache.get_many([f"{_RENDERED_PREFIX}:{d}" for d, _params, _count in selected])
+    refresh_before = time.time() - (TRENDING_CACHE_TTL - TRENDING_WARMUP_REFRESH_AHEAD_SECONDS)
+
+    refreshed = skipped_fresh = failed = 0
+    for digest, params, _count in selected:
+        if rendered_at.get(f"{_RENDERED_PREFIX}:{digest}", 0) > refresh_before:
+            skipped_fresh += 1
+            continue
+        try:
+            filters = IgdbFilters(**params["filters"])
+            render_trending_response(filters, params["limit"], params["offset"], params["enrich"], enrich_fn)
+            refreshed += 1
+        except Exception:
+            failed += 1
+            logger.warning("Trending: préchauffage de %s échoué.", params, exc_info=True)
+
+    covered = sum(count for _d, _p, count in selected)
+    report = {
+        "candidates": len(ranked),
+        "warmed_keys": len(selected),
+        "refreshed": refreshed,
+        "skipped_fresh": skipped_fresh,
+        "failed": failed,
+        "requests_total": total_requests,
+        "requests_covered": covered,
+        "coverage": round(covered / total_requests, 3) if total_requests else 0.0,
+        "duration_ms": round((time.monotonic() - started) * 1000),
+        "finished_at": int(time.time()),
+    }
+    try:
+        cache.set(_REPORT_KEY, report, TRENDING_REQUESTS_WINDOW_SECONDS)
+    except Exception:
+        logger.debug("Trending: rapport de préchauffage non mémorisé.", exc_info=True)
+    logger.info(
+        "Trending: %d/%d clé(s) re-rendue(s) (%d encore fraîche(s), %d échec(s)), couverture %.0f%% des requêtes, %d ms.",
+        refreshed,
+        len(selected),
+        skipped_fresh,
+        failed,
+        report["coverage"] * 100,
+        report["duration_ms"],
+    )
+    return report
+
+
+def get_trending_warmup_metrics() -> dict:
+    """Dernier rapport de préchauffage (vide si aucun) et ratio hit / miss du cache trending sur la fenêtre."""
+    values = cache.get_many([_REPORT_KEY, f"{_METRICS_PREFIX}:hits", f"{_METRICS_PREFIX}:misses"])
+    hits = int(values.get(f"{_METRICS_PREFIX}:hits") or 0)
+    misses = int(values.get(f"{_METRICS_PREFIX}:misses") or 0)
+    return {
+        "last_warmup": values.get(_REPORT_KEY) or {},
+        "cache_hits": hits,
+        "cache_misses": misses,
+        "cache_hit_ratio": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+    }
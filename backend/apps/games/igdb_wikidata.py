@@ -1,141 +1,357 @@
 """
 Enrichissement des noms de jeux IGDB avec les libellés français Wikidata.
-Cache en mémoire avec TTL 7 jours (comportement aligné sur l'ancien proxy Express).
+Cache à deux niveaux : LRU borné par process puis Redis partagé entre workers (TTL 7 jours,
+24 h pour les titres sans libellé français), avec compteurs de hits (get_wikidata_cache_metrics).
+Les titres manquants sont résolus par une requête SPARQL groupée (VALUES) par page de résultats ;
+build_french_labels_query est partagé avec la commande populate_name_fr.
+Les Game.name_fr déjà renseignés sont lus en premier ; les libellés résolus sont recopiés en base
+en arrière-plan (tasks.persist_games_name_fr) pour que le catalogue se passe peu à peu de Wikidata.
+Les requêtes SPARQL passent par un disjoncteur partagé (WIKIDATA_BREAKER) : Wikidata en panne,
+les jeux sont renvoyés sans nom français sans attendre le timeout.
 """
 
+import hashlib
+import logging
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from urllib.parse import quote
+from collections import OrderedDict
 
 import requests
+from decouple import config as env_config
+from django.conf import settings
+from django.core.cache import cache
 
+from apps.games.circuit_breaker import WIKIDATA_BREAKER, CircuitBreaker, CircuitOpenError, is_upstream_error_response
 from apps.games.igdb_normalizer import normalize_igdb_game
+from apps.games.models import Game
 
 WIKIDATA_SPARQL_URL = "https://query.wikidata.org/sparql"
 WIKIDATA_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 jours
-WIKIDATA_BATCH_CONCURRENCY = 10  # plus de requêtes en parallèle pour réduire le temps total
+WIKIDATA_NEGATIVE_TTL_SECONDS = 24 * 60 * 60  # titre sans libellé français : re-vérifié chaque jour
+WIKIDATA_LOCAL_CACHE_MAX_ENTRIES = env_config("WIKIDATA_LOCAL_CACHE_MAX_ENTRIES", default=5000, cast=int)
+WIKIDATA_SHARED_KEY_PREFIX = "wikidata:fr"
+WIKIDATA_BATCH_SIZE = 50  # titres par requête SPARQL (VALUES) : une page de résultats = un aller-retour
 WIKIDATA_TIMEOUT_SECONDS = 3  # fail fast pour ne pas bloquer la réponse (était 8s)
 USER_AGENT = "LudoKan/1.0 (contact: dev@ludokan.local)"
 
-# Cache: name_en -> (value: str | None, expires_at: float)
-_wikidata_cache = {}
-_cache_lock = None  # pas de lock pour l'instant; en production on pourrait utiliser threading.Lock
+logger = logging.getLogger(__name__)
+
+_METRICS_KEY_PREFIX = "wikidata:metrics"
+_METRICS_TTL = 7 * 24 * 60 * 60
+CACHE_METRIC_FIELDS = ("local_hits", "shared_hits", "negative_hits", "misses")
+
+# Cache local (par process, LRU borné) : name_en -> (value, expires_at) ; value "" = pas de libellé français
+_wikidata_cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _ttl_for(value: str | None) -> int:
+    return WIKIDATA_TTL_SECONDS if value else WIKIDATA_NEGATIVE_TTL_SECONDS
 
 
 def _cache_get(name_en: str):
-    entry = _wikidata_cache.get(name_en)
-    if entry is None:
-        return None
-    value, expires_at = entry
-    if time.time() > expires_at:
-        del _wikidata_cache[name_en]
-        return None
-    return value
+    with _cache_lock:
+        entry = _wikidata_cache.get(name_en)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.time() > expires_at:
+            del _wikidata_cache[name_en]
+            return None
+        _wikidata_cache.move_to_end(name_en)
+        return value
+
+
+def _local_set(name_en: str, value: str | None) -> None:
+    with _cache_lock:
+        _wikidata_cache[name_en] = (value or "", time.time() + _ttl_for(value))
+        _wikidata_cache.move_to_end(name_en)
+        while len(_wikidata_cache) > WIKIDATA_LOCAL_CACHE_MAX_ENTRIES:
+            _wikidata_cache.popitem(last=False)
+
+
+def _shared_key(name_en: str) -> str:
+    return f"{WIKIDATA_SHARED_KEY_PREFIX}:{hashlib.sha1(name_en.encode('utf-8')).hexdigest()}"
+
+
+def _shared_get_many(names: list[str]) -> dict[str, str]:
+    if not settings.WIKIDATA_SHARED_CACHE_ENABLED or not names:
+        return {}
+    keys = {_shared_key(n): n for n in names}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception:
+        logger.warning("Wikidata: lecture du cache partagé impossible.", exc_info=True)
+        return {}
+    return {keys[k]: v for k, v in found.items() if isinstance(v, str)}
+
+
+def _cache_set_many(labels: dict[str, str | None]) -> None:
+    """Écrit les libellés (et les absences de libellé, TTL plus court) dans les deux niveaux de cache."""
+    for name, value in labels.items():
+        _local_set(name, value)
+    if not settings.WIKIDATA_SHARED_CACHE_ENABLED or not labels:
+        return
+    positives = {_shared_key(n): v for n, v in labels.items() if v}
+    negatives = {_shared_key(n): "" for n, v in labels.items() if not v}
+    try:
+        if positives:
+            cache.set_many(positives, timeout=WIKIDATA_TTL_SECONDS)
+        if negatives:
+            cache.set_many(negatives, timeout=WIKIDATA_NEGATIVE_TTL_SECONDS)
+    except Exception:
+        logger.warning("Wikidata: écriture du cache partagé impossible.", exc_info=True)
 
 
 def _cache_set(name_en: str, value: str | None):
-    _wikidata_cache[name_en] = (value, time.time() + WIKIDATA_TTL_SECONDS)
+    _cache_set_many({name_en: value})
+
+
+def _record_cache_metrics(counts: dict[str, int]) -> None:
+    try:
+        for field, delta in counts.items():
+            if delta:
+                key = f"{_METRICS_KEY_PREFIX}:{field}"
+                cache.add(key, 0, timeout=_METRICS_TTL)
+                cache.incr(key, delta)
+    except Exception:
+        logger.debug("Wikidata: compteurs de cache indisponibles.", exc_info=True)
+
+
+def get_wikidata_cache_metrics() -> dict[str, float]:
+    """Compteurs agrégés (tous workers) : local_hits, shared_hits, negative_hits (inclus dans les hits), misses, hit_ratio."""
+    keys = {field: f"{_METRICS_KEY_PREFIX}:{field}" for field in CACHE_METRIC_FIELDS}
+    values = cache.get_many(list(keys.values()))
+    stats: dict[str, float] = {field: int(values.get(key) or 0) for field, key in keys.items()}
+    hits = stats["local_hits"] + stats["shared_hits"]
+    lookups = hits + stats["misses"]
+    stats["hit_ratio"] = round(hits / lookups, 3) if lookups else 0.0
+    return stats
+
+
+def reset_wikidata_cache_metrics() -> None:
+    cache.delete_many([f"{_METRICS_KEY_PREFIX}:{field}" for field in CACHE_METRIC_FIELDS])
 
 
 def _escape_sparql_string(s: str) -> str:
     return s.replace("\\", "\\\\").replace('"', '\\"')
 
 
+def _title_search_variants(title: str) -> set[str]:
+    variants = {title}
+    cleaned = title.replace("Version", "").replace("Edition", "").replace("  ", " ").strip()
+    if cleaned and cleaned != title:
+        variants.add(cleaned)
+    return variants
+
+
+def _values_lines(titles: list[str], *, fuzzy: bool) -> list[str]:
+    lines: list[str] = []
+    for t in titles:
+        safe_t = _escape_sparql_string(t)
+        if not fuzzy:
+            lines.append(f'("{safe_t}"@en "{safe_t}")')
+            continue
+        for v in _title_search_variants(t):
+            lines.append(f'("{_escape_sparql_string(v)}" "{safe_t}")')
+    return lines
+
+
+def build_french_labels_query(titles: list[str], *, fuzzy: bool = False) -> str:
+    """
+    Requête SPARQL unique (VALUES) : ?originalName -> ?frLabel pour une liste de titres anglais.
+    - par défaut : libellé anglais exact, résolu par l'index Wikidata (rapide, enrichissement en ligne) ;
+    - fuzzy=True : variantes sans « Version » / « Edition », casse ignorée, alias, jeux vidéo uniquement
+      (plus lent, pour la commande populate_name_fr).
+    """
+    joined = chr(10).join(_values_lines(titles, fuzzy=fuzzy))
+    if not fuzzy:
+        return f"""
+SELECT ?originalName ?frLabel WHERE {{
+  VALUES (?searchName ?originalName) {{
+    {joined}
+  }}
+  ?item rdfs:label ?searchName;
+        rdfs:label ?frLabel.
+  FILTER(LANG(?frLabel) = "fr")
+}}
+""".strip()
+    return f"""
+PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
+SELECT ?originalName ?frLabel WHERE {{
+  VALUES (?searchName ?originalName) {{
+    {joined}
+  }}
+  ?item wdt:P31 wd:Q7889.
+  {{
+    ?item rdfs:label ?enLabel FILTER(LANG(?enLabel) = "en")
+    FILTER(LCASE(STR(?enLabel)) = LCASE(STR(?searchName)))
+  }} UNION {{
+    ?item skos:altLabel ?enAlt FILTER(LANG(?enAlt) = "en")
+    FILTER(LCASE(STR(?enAlt)) = LCASE(STR(?searchName)))
+  }}
+  OPTIONAL {{ ?item rdfs:label ?frLabel FILTER(LANG(?frLabel) = "fr") }}
+}}
+""".strip()
+
+
+def fetch_wikidata_bindings(sparql: str, timeout: float = WIKIDATA_TIMEOUT_SECONDS, breaker: CircuitBreaker = WIKIDATA_BREAKER) -> list:
+    """
+    Exécute une requête SPARQL sous `breaker` ; liste vide si Wikidata répond en erreur (les exceptions réseau
+    remontent, CircuitOpenError si le disjoncteur est ouvert).
+    """
+    r = breaker.call(
+        requests.get,
+        WIKIDATA_SPARQL_URL,
+        params={"format": "json", "query": sparql},
+        headers={"Accept": "application/sparql+json", "User-Agent": USER_AGENT},
+        timeout=timeout,
+        is_failure=is_upstream_error_response,
+    )
+    if not r.ok:
+        return []
+    return ((r.json() or {}).get("results") or {}).get("bindings") or []
+
+
+def merge_french_bindings(bindings: list, out: dict[str, str | None]) -> None:
+    """Reporte dans out le premier libellé français non vide trouvé pour chaque titre d'origine."""
+    for b in bindings:
+        original = b.get("originalName", {}).get("value")
+        fr = b.get("frLabel", {}).get("value")
+        if original and isinstance(fr, str) and fr.strip() and not out.get(original):
+            out[original] = fr.strip()
+
+
 def _unique_trimmed_names(names_en: list[str]) -> list[str]:
     return list(dict.fromkeys((n or "").strip() for n in names_en if (n or "").strip()))
 
 
 def _partition_cache_hits(unique: list[str]) -> tuple[dict[str, str | None], list[str]]:
-    """Remplit result avec les entrées trouvées en cache ; retourne les noms à interroger."""
+    """
+    Remplit result avec les entrées en cache (local puis Redis, y compris les absences de libellé) ;
+    retourne les noms à interroger.
+    """
     result: dict[str, str | None] = {}
-    to_fetch: list[str] = []
+    local_misses: list[str] = []
+    counts = dict.fromkeys(CACHE_METRIC_FIELDS, 0)
     for n in unique:
         cached = _cache_get(n)
         if cached is not None:
             result[n] = cached if cached else None
+            counts["local_hits"] += 1
+            counts["negative_hits"] += not cached
+        else:
+            local_misses.append(n)
+
+    shared = _shared_get_many(local_misses)
+    to_fetch: list[str] = []
+    for n in local_misses:
+        if n in shared:
+            _local_set(n, shared[n])
+            result[n] = shared[n] or None
+            counts["shared_hits"] += 1
+            counts["negative_hits"] += not shared[n]
         else:
             to_fetch.append(n)
+    counts["misses"] = len(to_fetch)
+    _record_cache_metrics(counts)
     return result, to_fetch
 
 
-def _fetch_batch_parallel(batch: list[str], result: dict[str, str | None]) -> None:
-    """Exécute fetch_french_label_for_one en parallèle pour un lot et met à jour result + cache."""
-    if not batch:
-        return
-    with ThreadPoolExecutor(max_workers=len(batch)) as executor:
-        future_to_name = {executor.submit(fetch_french_label_for_one, name): name for name in batch}
-        for future in as_completed(future_to_name):
-            name = future_to_name[future]
-            try:
-                fr = future.result()
-            except Exception:
-                fr = None
-            result[name] = fr
-            if fr is not None:
-                _cache_set(name, fr)
+def _resolve_pages(unique: list[str]) -> tuple[dict[str, str | None], list[str]]:
+    """Une requête SPARQL par page ; retourne les libellés et les titres effectivement résolus par Wikidata."""
+    result: dict[str, str | None] = dict.fromkeys(unique)
+    answered: list[str] = []
+    for i in range(0, len(unique), WIKIDATA_BATCH_SIZE):
+        page = unique[i : i + WIKIDATA_BATCH_SIZE]
+        try:
+            merge_french_bindings(fetch_wikidata_bindings(build_french_labels_query(page)), result)
+        except CircuitOpenError:
+            logger.info("Wikidata: disjoncteur ouvert, %d titre(s) non résolu(s).", len(unique) - i)
+            break
+        except Exception:
+            logger.warning("Wikidata: échec de la requête pour %d titre(s).", len(page), exc_info=True)
+            continue
+        answered.extend(page)
+    return result, answered
+
+
+def fetch_french_labels(names_en: list[str]) -> dict[str, str | None]:
+    """
+    Libellés français Wikidata pour une liste de noms anglais : une requête SPARQL par page
+    de WIKIDATA_BATCH_SIZE titres. Une page en erreur laisse ses titres à None.
+    """
+    return _resolve_pages(_unique_trimmed_names(names_en))[0]
 
 
 def fetch_french_label_for_one(name_en: str) -> str | None:
     """Récupère le libellé français Wikidata pour un nom anglais (SPARQL)."""
     if not name_en or not name_en.strip():
         return None
-    escaped = _escape_sparql_string(name_en.strip())
-    sparql = f"""
-SELECT ?frLabel WHERE {{
-  ?item rdfs:label "{escaped}"@en;
-        rdfs:label ?frLabel.
-  FILTER(LANG(?frLabel) = "fr")
-}}
-LIMIT 1
-""".strip()
-    url = f"{WIKIDATA_SPARQL_URL}?format=json&query={quote(sparql)}"
-    try:
-        resp = requests.get(
-            url,
-            headers={"Accept": "application/sparql+json", "User-Agent": USER_AGENT},
-            timeout=WIKIDATA_TIMEOUT_SECONDS,
-        )
-        if not resp.ok:
-            return None
-        data = resp.json()
-        bindings = (data or {}).get("results", {}).get("bindings") or []
-        if not bindings:
-            return None
-        fr = bindings[0].get("frLabel", {}).get("value")
-        return fr.strip() if isinstance(fr, str) and fr.strip() else None
-    except Exception:
-        return None
+    return fetch_french_labels([name_en]).get(name_en.strip())
 
 
 def wikidata_french_labels_by_english_titles(names_en: list[str]) -> dict[str, str | None]:
     """
     Pour une liste de noms anglais, retourne un dict name_en -> name_fr (ou None).
-    Utilise le cache et des requêtes parallèles par lots de WIKIDATA_BATCH_CONCURRENCY.
+    Utilise le cache (local puis Redis) puis une requête SPARQL groupée par page de titres manquants.
+    Les titres sans libellé français sont mémorisés (TTL court) ; pas ceux d'une page en erreur.
     """
     result, to_fetch = _partition_cache_hits(_unique_trimmed_names(names_en))
-    for i in range(0, len(to_fetch), WIKIDATA_BATCH_CONCURRENCY):
-        batch = to_fetch[i : i + WIKIDATA_BATCH_CONCURRENCY]
-        _fetch_batch_parallel(batch, result)
+    if not to_fetch:
+        return result
+    fetched, answered = _resolve_pages(to_fetch)
+    _cache_set_many({name: fetched[name] for name in answered})
+    result.update(fetched)
     return result
 
 
+def _local_names_fr(igdb_ids: list[int]) -> dict[int, str]:
+    """name_fr déjà connus en base (chaîne vide si le jeu est stocké sans nom français)."""
+    if not igdb_ids:
+        return {}
+    try:
+        return dict(Game.objects.filter(igdb_id__in=igdb_ids).values_list("igdb_id", "name_fr"))
+    except Exception:
+        logger.warning("Wikidata: lecture des name_fr locaux impossible.", exc_info=True)
+        return {}
+
+
+def _queue_names_fr_write_through(names_fr: dict[int, str]) -> None:
+    """Persiste en arrière-plan (Celery) les libellés résolus pour les jeux stockés sans name_fr."""
+    if not names_fr or not settings.WIKIDATA_WRITE_THROUGH_ENABLED:
+        return
+    from apps.games.tasks import persist_games_name_fr
+
+    try:
+        persist_games_name_fr.delay([[igdb_id, name_fr] for igdb_id, name_fr in names_fr.items()])
+    except Exception:
+        logger.warning("Wikidata: mise en file de %d name_fr impossible.", len(names_fr), exc_info=True)
+
+
 def enrich_with_wikidata_display_name(games: list[dict]) -> list[dict]:
     """
     Enrichit une liste de jeux IGDB avec display_name, name_fr, name_en.
+    Les name_fr déjà en base sont utilisés tels quels ; Wikidata n'est interrogé que pour les autres,
+    et les libellés trouvés pour des jeux stockés sans name_fr y sont écrits en arrière-plan.
     En cas de timeout ou d'erreur Wikidata, retourne les jeux sans enrichissement (name_fr = None).
     """
     if not games:
         return []
-    names_en = [str(g.get("name") or "").strip() for g in games]
+    local = _local_names_fr([g["id"] for g in games if isinstance(g.get("id"), int)])
+    names_en = [str(g.get("name") or "").strip() for g in games if not local.get(g.get("id"))]
     try:
-        fr_map = wikidata_french_labels_by_english_titles(names_en)
+        fr_map = wikidata_french_labels_by_english_titles(names_en) if names_en else {}
     except Exception:
         fr_map = {}
 
     out = []
+    to_persist: dict[int, str] = {}
     for g in games:
         name_en = str(g.get("name") or "").strip()
-        name_fr = fr_map.get(name_en) if name_en in fr_map else None
+        name_fr = local.get(g.get("id")) or (fr_map.get(name_en) if name_en in fr_map else None)
+        if name_fr and local.get(g.get("id")) == "":
+            to_persist[g["id"]] = name_fr
 
         g_updated = {
             **g,
@@ -144,6 +360,7 @@ def enrich_with_wikidata_display_name(games: list[dict]) -> list[dict]:
             "name_en": name_en,
         }
         out.append(normalize_igdb_game(g_updated))
+    _queue_names_fr_write_through(to_persist)
     return out
 
 
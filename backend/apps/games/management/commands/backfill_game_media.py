@@ -1,20 +1,20 @@
 import logging
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 from apps.games import igdb_client
+from apps.games.backfill import add_backfill_arguments, run_backfill
 from apps.games.igdb_normalizer import normalize_igdb_game
-from apps.games.models import Game
-from apps.games.services import get_or_create_game_from_igdb
+from apps.games.models import Game, GameScreenshot
+from apps.games.services import upsert_games_from_igdb
 
 logger = logging.getLogger(__name__)
 
 
-def _collect_igdb_ids(game_id, igdb_id_param, limit, min_screenshots=0):
-    """Return list of IGDB ids to backfill (games must have igdb_id set)."""
-    from django.db.models import Count
-
+def _games_queryset(game_id, igdb_id_param, min_screenshots=0):
+    """Games to backfill (games must have igdb_id set)."""
     qs = Game.objects.filter(igdb_id__isnull=False)
 
     if game_id:
@@ -23,15 +23,10 @@ def _collect_igdb_ids(game_id, igdb_id_param, limit, min_screenshots=0):
         qs = qs.filter(igdb_id=igdb_id_param)
 
     if min_screenshots > 0:
-        qs = qs.annotate(sc_count=Count("screenshots", distinct=True)).filter(sc_count__lt=min_screenshots)
-
-    if not game_id and not igdb_id_param:
-        qs = qs.order_by("id")
+        screenshots = GameScreenshot.objects.filter(game_id=OuterRef("pk")).order_by().values("game_id").annotate(n=Count("id")).values("n")
+        qs = qs.annotate(sc_count=Coalesce(Subquery(screenshots), 0)).filter(sc_count__lt=min_screenshots)
 
-    if limit and limit > 0:
-        qs = qs[:limit]
-
-    return list(qs.values_list("igdb_id", flat=True))
+    return qs
 
 
 class Command(BaseCommand):
@@ -48,12 +43,6 @@ class Command(BaseCommand):
             type=int,
             help="Target a specific game by its IGDB ID.",
         )
-        parser.add_argument(
-            "--limit",
-            type=int,
-            default=0,
-            help="Limit the number of games to process.",
-        )
         parser.add_argument(
             "--only-missing",
             action="store_true",
@@ -65,22 +54,19 @@ class Command(BaseCommand):
             default=4,
             help="Minimum screenshots threshold for --only-missing (default: 4).",
         )
-        parser.add_argument(
-            "--dry-run",
-            action="store_true",
-            help="Fetch data and log intent without saving to the database.",
-        )
+        add_backfill_arguments(parser)
 
     def handle(self, *args, **options):
         game_id = options["game_id"]
         igdb_id_param = options["igdb_id"]
         limit = options["limit"]
-        dry_run = options["dry_run"]
         only_missing = options["only_missing"]
         min_screenshots = options["min_screenshots"] if only_missing else 0
 
-        igdb_ids = _collect_igdb_ids(game_id, igdb_id_param, limit, min_screenshots)
-        total_games = len(igdb_ids)
+        queryset = _games_queryset(game_id, igdb_id_param, min_screenshots)
+        total_games = queryset.count()
+        if limit and limit > 0:
+            total_games = min(total_games, limit)
 
         if total_games == 0:
             self.stdout.write(self.style.WARNING("No games found matching criteria."))
@@ -89,52 +75,59 @@ class Command(BaseCommand):
         label = f"games with <{min_screenshots} screenshots" if only_missing else "games"
         self.stdout.write(f"Preparing to process {total_games} {label}...")
 
-        chunk_size = 50
-        processed_count = 0
-        success_count = 0
-        error_count = 0
-
-        for i in range(0, total_games, chunk_size):
-            chunk = set(igdb_ids[i : i + chunk_size])
-            try:
-                dp, ds, de = self._process_igdb_chunk(chunk, dry_run)
-                processed_count += dp
-                success_count += ds
-                error_count += de
-            except Exception as e:
-                logger.exception(f"Failed to query IGDB for chunk {i}-{i+chunk_size}: {e}")
-                self.stdout.write(self.style.ERROR(f"Chunk error: {e}"))
-
-            if (i // chunk_size + 1) % 20 == 0 or i + chunk_size >= total_games:
-                self.stdout.write(
-                    f"  → Progression: {min(i + chunk_size, total_games)}/{total_games} ({success_count} updated, {error_count} errors)"
-                )
-
-        self.stdout.write(self.style.SUCCESS(f"\nFinished backfill. Processed: {processed_count}, Success: {success_count}, Errors: {error_count}"))
-
-    def _process_igdb_chunk(self, chunk, dry_run):
-        """Fetch one IGDB chunk and apply updates. Returns (processed, success, error) deltas."""
-        chunk_list_str = ",".join(map(str, chunk))
-        query = f"fields name,screenshots.url,videos.video_id,videos.name; where id = ({chunk_list_str}); limit {len(chunk)};"
+        # Les ciblages --game-id / --igdb-id ne reprennent pas un parcours complet interrompu.
+        targeted = bool(game_id or igdb_id_param)
+        stats = run_backfill(
+            f"game_media:{min_screenshots}" if not targeted else f"game_media:{game_id}:{igdb_id_param}",
+            queryset,
+            self._fetch_igdb_chunk,
+            self._write_igdb_chunk,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            limit=limit,
+            dry_run=options["dry_run"],
+            restart=options["restart"] or targeted,
+            on_batch=lambda stats: self._report_progress(stats, total_games),
+            on_error=self._chunk_error,
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"\nFinished backfill. Processed: {stats.processed}, Success: {stats.updated}, Errors: {stats.errors}"))
+
+    def _report_progress(self, stats, total_games):
+        self.stdout.write(f"  → Progression: {stats.processed}/{total_games} ({stats.updated} updated, {stats.errors} errors)")
+
+    def _chunk_error(self, rows, exc):
+        logger.error(f"Failed to query IGDB for games {rows[0]['id']}-{rows[-1]['id']}: {exc}", exc_info=exc)
+        self.stdout.write(self.style.ERROR(f"Chunk error: {exc}"))
+
+    def _fetch_igdb_chunk(self, rows):
+        """Fetch one IGDB chunk (worker thread, no database access)."""
+        chunk_list_str = ",".join(str(row["igdb_id"]) for row in rows)
+        query = f"fields name,screenshots.url,videos.video_id,videos.name; where id = ({chunk_list_str}); limit {len(rows)};"
         igdb_raw_data = igdb_client.igdb_request("games", query)
 
         if not isinstance(igdb_raw_data, list):
-            self.stdout.write(self.style.ERROR(f"Expected list from IGDB, got {type(igdb_raw_data)}"))
-            return (0, 0, 0)
+            raise ValueError(f"Expected list from IGDB, got {type(igdb_raw_data)}")
+        return igdb_raw_data
 
-        processed = success = errors = 0
+    def _write_igdb_chunk(self, rows, igdb_raw_data, dry_run):
+        """Apply one fetched chunk. Returns (processed, success, error) deltas."""
+        processed = success = 0
+        payloads = []
         for igdb_game in igdb_raw_data:
-            p, s, e = self._apply_one_igdb_game(igdb_game, dry_run)
+            p, s, payload = self._prepare_igdb_game(igdb_game, dry_run)
             processed += p
             success += s
-            errors += e
-        return (processed, success, errors)
+            if payload:
+                payloads.append(payload)
+        s, e = self._persist_game_media(payloads)
+        return (processed, success + s, e)
 
-    def _apply_one_igdb_game(self, igdb_game, dry_run):
-        """Returns (processed_delta, success_delta, error_delta)."""
+    def _prepare_igdb_game(self, igdb_game, dry_run):
+        """Returns (processed_delta, success_delta, payload to upsert or None)."""
         current_igdb_id = igdb_game.get("id")
         if not current_igdb_id:
-            return (0, 0, 0)
+            return (0, 0, None)
 
         norm = normalize_igdb_game(igdb_game)
         screenshots = norm.get("screenshots")
@@ -142,23 +135,27 @@ class Command(BaseCommand):
 
         if not screenshots and not videos:
             self.stdout.write(f"Ignoring IGDB ID {current_igdb_id} (No media found)")
-            return (1, 0, 0)
+            return (1, 0, None)
 
         if dry_run:
             self.stdout.write(
                 self.style.SUCCESS(f"[DRY-RUN] Target IGDB ID {current_igdb_id}: Found {len(screenshots or [])} screens, {len(videos or [])} videos.")
             )
-            return (1, 1, 0)
+            return (1, 1, None)
 
-        return self._persist_game_media(current_igdb_id, screenshots, videos)
+        return (1, 0, {"igdb_id": current_igdb_id, "screenshots": screenshots, "videos": videos})
 
-    def _persist_game_media(self, current_igdb_id, screenshots, videos):
+    def _persist_game_media(self, payloads):
+        """Sync the media of the whole chunk in one batch. Returns (success_delta, error_delta)."""
+        if not payloads:
+            return (0, 0)
         try:
-            with transaction.atomic():
-                get_or_create_game_from_igdb(igdb_id=current_igdb_id, screenshots=screenshots, videos=videos)
-            self.stdout.write(self.style.SUCCESS(f"Successfully synced media for IGDB ID {current_igdb_id}"))
-            return (1, 1, 0)
+            upsert_games_from_igdb(payloads)
         except Exception as e:
-            logger.exception(f"Failed to sync IGDB ID {current_igdb_id}: {e}")
-            self.stdout.write(self.style.ERROR(f"Error for IGDB ID {current_igdb_id}: {e}"))
-            return (1, 0, 1)
+            logger.exception(f"Failed to sync IGDB IDs {[p['igdb_id'] for p in payloads]}: {e}")
+            for payload in payloads:
+                self.stdout.write(self.style.ERROR(f"Error for IGDB ID {payload['igdb_id']}: {e}"))
+            return (0, len(payloads))
+        for payload in payloads:
+            self.stdout.write(self.style.SUCCESS(f"Successfully synced media for IGDB ID {payload['igdb_id']}"))
+        return (len(payloads), 0)
@@ -1,24 +1,22 @@
 import logging
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db.models import Exists, OuterRef
 
 from apps.games import igdb_client
+from apps.games.backfill import add_backfill_arguments, run_backfill
 from apps.games.igdb_normalizer import normalize_igdb_game
 from apps.games.models import Game
-from apps.games.services import get_or_create_game_from_igdb
+from apps.games.services import upsert_games_from_igdb
 
 logger = logging.getLogger(__name__)
 
 
-def _collect_igdb_ids(only_missing, limit):
+def _games_queryset(only_missing):
     qs = Game.objects.filter(igdb_id__isnull=False)
     if only_missing:
-        qs = qs.filter(genres__isnull=True).distinct()
-    qs = qs.order_by("id")
-    if limit and limit > 0:
-        qs = qs[:limit]
-    return list(qs.values_list("igdb_id", flat=True))
+        qs = qs.exclude(Exists(Game.genres.through.objects.filter(game_id=OuterRef("pk"))))
+    return qs
 
 
 class Command(BaseCommand):
@@ -30,25 +28,16 @@ class Command(BaseCommand):
             action="store_true",
             help="Process all games, not just those missing genres.",
         )
-        parser.add_argument(
-            "--limit",
-            type=int,
-            default=0,
-            help="Limit the number of games to process.",
-        )
-        parser.add_argument(
-            "--dry-run",
-            action="store_true",
-            help="Fetch data and log intent without saving to the database.",
-        )
+        add_backfill_arguments(parser)
 
     def handle(self, *args, **options):
         only_missing = not options["all"]
         limit = options["limit"]
-        dry_run = options["dry_run"]
 
-        igdb_ids = _collect_igdb_ids(only_missing, limit)
-        total = len(igdb_ids)
+        queryset = _games_queryset(only_missing)
+        total = queryset.count()
+        if limit and limit > 0:
+            total = min(total, limit)
 
         if total == 0:
             self.stdout.write(self.style.SUCCESS("No games to process."))
@@ -57,62 +46,76 @@ class Command(BaseCommand):
         label = "all games" if not only_missing else "games missing genres"
         self.stdout.write(f"Processing {total} {label}...")
 
-        chunk_size = 50
-        processed = success = errors = 0
-
-        for i in range(0, total, chunk_size):
-            chunk = igdb_ids[i : i + chunk_size]
-            try:
-                p, s, e = self._process_chunk(chunk, dry_run)
-                processed += p
-                success += s
-                errors += e
-            except Exception as exc:
-                logger.exception(f"Chunk {i}-{i + chunk_size} failed: {exc}")
-                self.stdout.write(self.style.ERROR(f"Chunk error: {exc}"))
-
-        self.stdout.write(self.style.SUCCESS(f"\nDone. Processed: {processed}, Updated: {success}, Errors: {errors}"))
-
-    def _process_chunk(self, chunk, dry_run):
-        ids_str = ",".join(map(str, chunk))
-        query = f"fields id,genres.id,genres.name; where id = ({ids_str}); limit {len(chunk)};"
-        raw = igdb_client.igdb_request("games", query)
+        stats = run_backfill(
+            "genres" if only_missing else "genres:all",
+            queryset,
+            self._fetch_chunk,
+            self._write_chunk,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            limit=limit,
+            dry_run=options["dry_run"],
+            restart=options["restart"],
+            on_error=self._chunk_error,
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"\nDone. Processed: {stats.processed}, Updated: {stats.updated}, Errors: {stats.errors}"))
+
+    def _chunk_error(self, rows, exc):
+        logger.error(f"Chunk {rows[0]['id']}-{rows[-1]['id']} failed: {exc}", exc_info=exc)
+        self.stdout.write(self.style.ERROR(f"Chunk error: {exc}"))
 
+    def _fetch_chunk(self, rows):
+        ids_str = ",".join(str(row["igdb_id"]) for row in rows)
+        query = f"fields id,genres.id,genres.name; where id = ({ids_str}); limit {len(rows)};"
+        raw = igdb_client.igdb_request("games", query)
         if not isinstance(raw, list):
-            self.stdout.write(self.style.ERROR(f"Unexpected IGDB response: {type(raw)}"))
-            return (0, 0, 0)
+            raise ValueError(f"Unexpected IGDB response: {type(raw)}")
+        return raw
 
-        p = s = e = 0
+    def _write_chunk(self, rows, raw, dry_run):
+        p = s = 0
+        payloads = []
         for igdb_game in raw:
-            dp, ds, de = self._apply(igdb_game, dry_run)
+            dp, ds, payload = self._prepare(igdb_game, dry_run)
             p += dp
             s += ds
-            e += de
-        return (p, s, e)
+            if payload:
+                payloads.append(payload)
+        ds, de = self._persist(payloads)
+        return (p, s + ds, de)
 
-    def _apply(self, igdb_game, dry_run):
+    def _prepare(self, igdb_game, dry_run):
+        """Returns (processed_delta, success_delta, payload to upsert or None)."""
         igdb_id = igdb_game.get("id")
         if not igdb_id:
-            return (0, 0, 0)
+            return (0, 0, None)
 
         norm = normalize_igdb_game(igdb_game)
         genres = norm.get("genres")
 
         if not genres:
             self.stdout.write(f"  IGDB {igdb_id}: no genres returned, skipping.")
-            return (1, 0, 0)
+            return (1, 0, None)
 
         if dry_run:
             names = ", ".join(g["name"] for g in genres)
             self.stdout.write(self.style.SUCCESS(f"  [DRY-RUN] IGDB {igdb_id}: would set genres [{names}]"))
-            return (1, 1, 0)
+            return (1, 1, None)
+
+        return (1, 0, {"igdb_id": igdb_id, "genres": genres})
 
+    def _persist(self, payloads):
+        """Upsert the whole chunk in one batch. Returns (success_delta, error_delta)."""
+        if not payloads:
+            return (0, 0)
         try:
-            with transaction.atomic():
-                get_or_create_game_from_igdb(igdb_id=igdb_id, genres=genres)
-            self.stdout.write(self.style.SUCCESS(f"  IGDB {igdb_id}: genres updated."))
-            return (1, 1, 0)
+            upsert_games_from_igdb(payloads)
         except Exception as exc:
-            logger.exception(f"Failed for IGDB {igdb_id}: {exc}")
-            self.stdout.write(self.style.ERROR(f"  IGDB {igdb_id}: error — {exc}"))
-            return (1, 0, 1)
+            logger.exception(f"Failed for IGDB {[p['igdb_id'] for p in payloads]}: {exc}")
+            for payload in payloads:
+                self.stdout.write(self.style.ERROR(f"  IGDB {payload['igdb_id']}: error — {exc}"))
+            return (0, len(payloads))
+        for payload in payloads:
+            self.stdout.write(self.style.SUCCESS(f"  IGDB {payload['igdb_id']}: genres updated."))
+        return (len(payloads), 0)
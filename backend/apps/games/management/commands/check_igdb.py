@@ -3,6 +3,7 @@ Commande de diagnostic pour l'authentification IGDB/Twitch.
 
 Usage (dans le conteneur ou en local) :
     python manage.py check_igdb
+    python manage.py check_igdb --metrics   # compteurs du transport IGDB, du cache Wikidata, du préchauffage trending et des disjoncteurs
 
 Vérifie que TWITCH_CLIENT_ID / TWITCH_CLIENT_SECRET (ou IGDB_ACCESS_TOKEN) sont
 correctement configurés et que l'appel à l'API IGDB fonctionne.
@@ -11,7 +12,7 @@ correctement configurés et que l'appel à l'API IGDB fonctionne.
 from decouple import config as env_config
 from django.core.management.base import BaseCommand
 
-from apps.games import igdb_client
+from apps.games import circuit_breaker, igdb_client, igdb_transport, igdb_trending, igdb_wikidata
 
 
 def _read_twitch_env():
@@ -24,7 +25,20 @@ def _read_twitch_env():
 class Command(BaseCommand):
     help = "Vérifier la configuration et l'authentification IGDB/Twitch"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--metrics",
+            action="store_true",
+            help="Afficher uniquement les compteurs du transport IGDB (tous workers confondus)",
+        )
+
     def handle(self, *args, **options):
+        if options.get("metrics"):
+            self._print_transport_metrics()
+            self._print_wikidata_cache_metrics()
+            self._print_trending_warmup_metrics()
+            self._print_circuit_breakers()
+            return
         self.stdout.write("\n=== Diagnostic IGDB ===\n")
         twitch_id, twitch_secret, manual_token = _read_twitch_env()
 
@@ -34,6 +48,56 @@ class Command(BaseCommand):
             return
         self._run_igdb_smoke_test(twitch_id, twitch_secret, manual_token)
 
+    def _print_transport_metrics(self) -> None:
+        self.stdout.write("\n=== Transport IGDB ===\n")
+        metrics = igdb_transport.get_transport_metrics()
+        if not metrics:
+            self.stdout.write("Aucun appel IGDB enregistré.")
+            return
+        for endpoint, m in metrics.items():
+            self.stdout.write(
+                f"  {endpoint}: {m['calls']} appel(s), {m['errors']} erreur(s), {m['retries']} retry, "
+                f"latence moy. {m['latency_ms_avg']} ms, throttling {m['throttled']}x / {m['throttle_wait_ms_total']} ms"
+            )
+            if m.get("cache_hits") or m.get("cache_stale") or m.get("cache_misses"):
+                self.stdout.write(
+                    f"    cache: {m['cache_hits']} hit, {m['cache_stale']} périmé(s), {m['cache_misses']} miss "
+                    f"({m['cache_coalesced']} mutualisé(s)), ratio {m['cache_hit_ratio']:.0%}"
+                )
+
+    def _print_wikidata_cache_metrics(self) -> None:
+        m = igdb_wikidata.get_wikidata_cache_metrics()
+        if not (m["local_hits"] or m["shared_hits"] or m["misses"]):
+            return
+        self.stdout.write("\n=== Cache Wikidata (noms FR) ===\n")
+        self.stdout.write(
+            f"  {m['local_hits']} hit local, {m['shared_hits']} hit Redis ({m['negative_hits']} sans libellé), "
+            f"{m['misses']} miss, ratio {m['hit_ratio']:.0%}"
+        )
+
+    def _print_trending_warmup_metrics(self) -> None:
+        m = igdb_trending.get_trending_warmup_metrics()
+        report = m["last_warmup"]
+        if not (report or m["cache_hits"] or m["cache_misses"]):
+            return
+        self.stdout.write("\n=== Préchauffage trending ===\n")
+        self.stdout.write(f"  cache: {m['cache_hits']} hit, {m['cache_misses']} miss, ratio {m['cache_hit_ratio']:.0%}")
+        if report:
+            self.stdout.write(
+                f"  dernier passage: {report['refreshed']}/{report['warmed_keys']} clé(s) re-rendue(s) "
+                f"({report['skipped_fresh']} encore fraîche(s), {report['failed']} échec(s)) sur {report['candidates']} demandée(s), "
+                f"couverture {report['coverage']:.0%} des requêtes, {report['duration_ms']} ms"
+            )
+
+    def _print_circuit_breakers(self) -> None:
+        self.stdout.write("\n=== Disjoncteurs ===\n")
+        for breaker in circuit_breaker.BREAKERS:
+            m = breaker.snapshot()
+            self.stdout.write(
+                f"  {breaker.name}: {m['state']}, {m['opened']} ouverture(s), {m['rejected']} appel(s) refusé(s), "
+                f"{m['slow_calls']} lent(s) ; fenêtre en cours : {m['failures']} échec(s) / {m['calls']} appel(s)"
+            )
+
     def _print_mode_and_validate(self, twitch_id: str, twitch_secret: str, manual_token: str) -> bool:
         if twitch_id and twitch_secret:
             self.stdout.write("Mode: Option 1 (Twitch OAuth)")
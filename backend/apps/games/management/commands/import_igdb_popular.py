@@ -1,28 +1,45 @@
 import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from apps.games.igdb_client import igdb_request
-from apps.games.igdb_demographics import (
-    compute_min_age,
-    compute_player_counts,
-    fetch_age_ratings_map,
-    fetch_multiplayer_modes_raw,
-    index_multiplayer_by_game,
-)
-from apps.games.models import Game, Genre, Platform, Publisher
+from apps.games.igdb_demographics import save_demographics
+from apps.games.igdb_mirror import request_games_page, upsert_games_page
+from apps.games.models import Game, Genre, IgdbSyncState, Platform
+
+IGDB_PAGE_MAX = 500  # maximum IGDB par requête
+CHECKPOINT_PREFIX = "import_popular"
+
+
+@dataclass
+class _Page:
+    """Une page de jeux IGDB (champs développés du miroir), récupérée hors transaction."""
+
+    after_id: int
+    requested: int
+    games_data: list
+    igdb_seconds: float
 
 
 class Command(BaseCommand):
-    help = "Importe des jeux récents et populaires depuis IGDB (avec genres, plateformes, publishers, covers et status)."
+    help = "Importe des jeux récents depuis IGDB (avec genres, plateformes, séries, franchises, éditeurs, covers, médias et status)."
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--limit",
             type=int,
             default=500,
-            help="Nombre de jeux à récupérer (max 500 par requête IGDB).",
+            help="Nombre de jeux à importer (0 = tous les jeux correspondants, sans limite).",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=IGDB_PAGE_MAX,
+            help=f"Jeux par page IGDB, chaque page étant écrite dans sa propre transaction (max {IGDB_PAGE_MAX}).",
         )
         parser.add_argument(
             "--from-year",
@@ -41,16 +58,23 @@ class Command(BaseCommand):
             action="store_true",
             help="Sauter l'import des genres et plateformes (utile pour les imports successifs).",
         )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignorer le point de reprise d'un import interrompu et repartir du premier jeu.",
+        )
 
-    @transaction.atomic
     def handle(self, *args, **options):
-        limit = min(options["limit"], 500)  # IGDB max 500 par requête
+        limit = max(options["limit"], 0)
+        page_size = min(max(options["page_size"], 1), IGDB_PAGE_MAX)
         from_year = options["from_year"]
         genre_id = options["genre_id"]
         skip_meta = options["skip_meta"]
+        self.verbosity = options.get("verbosity", 1)
 
         label = f"genre IGDB {genre_id}" if genre_id else "tous genres"
-        self.stdout.write(self.style.MIGRATE_HEADING(f"Import IGDB : {limit} jeux populaires depuis {from_year} ({label})"))
+        count_label = f"{limit} jeux" if limit else "tous les jeux"
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Import IGDB : {count_label} depuis {from_year} ({label})"))
 
         if not skip_meta:
             # 1) Importer / mettre à jour tous les genres + plateformes
@@ -59,8 +83,8 @@ class Command(BaseCommand):
         else:
             self.stdout.write("  (--skip-meta : import genres/plateformes ignoré)")
 
-        # 2) Importer les jeux + publishers + covers + lier genres/plateformes
-        self.import_games_and_publishers(limit, from_year, genre_id)
+        # 2) Importer les jeux (upsert du miroir IGDB : relations, éditeurs, médias), page par page
+        self.import_games_and_publishers(limit, from_year, genre_id, page_size=page_size, restart=options["restart"])
 
     # ------------------------------------------------------------------
     # GENRES
@@ -85,15 +109,8 @@ class Command(BaseCommand):
                 self.stdout.write("  → Aucun genre supplémentaire reçu, fin.")
                 break
 
-            for g in data:
-                Genre.objects.update_or_create(
-                    igdb_id=g["id"],
-                    defaults={
-                        "name": g["name"].strip(),
-                        "description": "",
-                    },
-                )
-                total_count += 1
+            self._upsert_named(Genre, data)
+            total_count += len(data)
 
             self.stdout.write(f"    ✓ {len(data)} genres traités dans ce batch ({total_count} au total).")
 
@@ -127,15 +144,8 @@ class Command(BaseCommand):
                 self.stdout.write("  → Aucune plateforme supplémentaire reçue, fin.")
                 break
 
-            for p in data:
-                Platform.objects.update_or_create(
-                    igdb_id=p["id"],
-                    defaults={
-                        "name": p["name"].strip(),
-                        "description": "",
-                    },
-                )
-                total_count += 1
+            self._upsert_named(Platform, data)
+            total_count += len(data)
 
             self.stdout.write(f"    ✓ {len(data)} plateformes traitées dans ce batch ({total_count} au total).")
 
@@ -146,48 +156,101 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.SUCCESS(f"✓ Plateformes importées / à jour : {total_count}"))
 
+    def _upsert_named(self, model, data):
+        """Upsert en masse d'un batch de genres / plateformes (nom mis à jour, description remise à vide)."""
+        rows = {item["id"]: model(igdb_id=item["id"], name=item["name"].strip(), description="") for item in data}
+        model.objects.bulk_create(rows.values(), update_conflicts=True, unique_fields=["igdb_id"], update_fields=["name", "description"])
+
     # ------------------------------------------------------------------
     # GAMES + PUBLISHERS + M2M + COVERS + STATUS
     # ------------------------------------------------------------------
-    def import_games_and_publishers(self, limit: int, from_year: int, genre_id: int | None = None):
-        self.stdout.write("\n=== Étape 3/3 : Import des jeux populaires récents ===")
+    def import_games_and_publishers(
+        self, limit: int, from_year: int, genre_id: int | None = None, page_size: int = IGDB_PAGE_MAX, restart: bool = False
+    ):
+        """
+        Pipeline par pages : la page suivante est récupérée sur IGDB (thread dédié) pendant que la page
+        courante est écrite en base par igdb_mirror.upsert_games_page (mêmes colonnes, relations et médias que le miroir),
+        chaque page dans sa propre transaction avec le point de reprise.
+        Pagination keyset sur l'id IGDB (`id > dernier id`, tri par id) : contrairement à un offset dans un tri
+        par note, l'ordre ne bouge pas quand les notes IGDB changent entre deux pages ou deux exécutions.
+        La popularité est calculée localement (apps.games.popularity), pas par l'ordre d'import.
+        Un import interrompu reprend après le dernier jeu validé ; le point de reprise est supprimé en fin d'import.
+        """
+        self.stdout.write("\n=== Étape 3/3 : Import des jeux récents ===")
 
         _, from_ts = self._compute_from_timestamp(from_year)
+        state = self._checkpoint(from_year, genre_id, restart)
+        last_id, done = state.watermark, state.games_synced
+        if last_id:
+            self.stdout.write(f"  → Reprise après le jeu IGDB {last_id}, {done} jeux déjà importés (point de reprise « {state.name} »).")
+
+        created = updated = 0
+        igdb_seconds = db_seconds = 0.0
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="igdb-import") as pool:
+            pending = self._submit_page(pool, from_ts, genre_id, last_id, done, limit, page_size)
+            while pending is not None:
+                page = pending.result()
+                igdb_seconds += page.igdb_seconds
+                if not page.games_data:
+                    break
+
+                last_id = max(g["id"] for g in page.games_data)
+                done += len(page.games_data)
+                more = len(page.games_data) == page.requested and (not limit or done < limit)
+                pending = self._submit_page(pool, from_ts, genre_id, last_id, done, limit, page_size) if more else None
+
+                db_started = time.monotonic()
+                try:
+                    c, u = self._write_page(page, state, last_id)
+                except Exception as exc:
+                    raise CommandError(
+                        f"Écriture de la page après le jeu IGDB {page.after_id} impossible ({exc}) ; relancer la commande pour reprendre."
+                    ) from exc
+                db_seconds += time.monotonic() - db_started
+                created, updated = created + c, updated + u
+
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"    → Progression: {done} jeux traités ({created} créés, {updated} mis à jour) "
+                    f"— {(created + updated) / elapsed if elapsed else 0:.0f} jeux/s, IGDB {igdb_seconds:.1f}s, BD {db_seconds:.1f}s"
+                )
 
-        query = self._build_games_query(limit, from_ts, genre_id)
-
-        self.stdout.write("  → Appel à l'API IGDB /games...")
-        games_data = igdb_request("games", query)
-        total_games = len(games_data)
-        self.stdout.write(f"    ✓ {total_games} jeux reçus depuis IGDB.")
-
-        if not games_data:
+        state.delete()
+        if not created and not updated:
             self.stdout.write(self.style.WARNING("Aucun jeu reçu, arrêt de l'étape 3."))
             return
-
-        involved_ids, cover_ids, age_rating_ids, mp_modes_ids = self._collect_related_ids(games_data)
-
-        (
-            involved_map,
-            publishers_map,
-            covers_map,
-            age_ratings_map,
-            mp_by_game,
-        ) = self._build_related_maps(
-            involved_ids,
-            cover_ids,
-            age_rating_ids,
-            mp_modes_ids,
+        self._report(created, updated, time.monotonic() - started, igdb_seconds, db_seconds)
+
+    def _report(self, created, updated, elapsed, igdb_seconds, db_seconds):
+        rate = (created + updated) / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Jeux importés : {created} créés, {updated} mis à jour "
+                f"en {elapsed:.1f}s ({rate:.0f} jeux/s ; IGDB {igdb_seconds:.1f}s, BD {db_seconds:.1f}s)."
+            )
         )
 
-        self._sync_games(
-            games_data,
-            involved_map,
-            publishers_map,
-            covers_map,
-            age_ratings_map,
-            mp_by_game,
-        )
+    def _checkpoint(self, from_year: int, genre_id: int | None, restart: bool) -> IgdbSyncState:
+        """Point de reprise propre aux paramètres de l'import ; watermark = dernier id IGDB écrit, games_synced = jeux écrits."""
+        name = f"{CHECKPOINT_PREFIX}:{from_year}:{genre_id if genre_id is not None else 'all'}"
+        if restart:
+            IgdbSyncState.objects.filter(name=name).delete()
+        state, _ = IgdbSyncState.objects.get_or_create(name=name)
+        return state
+
+    def _submit_page(self, pool, from_ts: int, genre_id: int | None, after_id: int, done: int, limit: int, page_size: int):
+        count = min(page_size, limit - done) if limit else page_size
+        if count <= 0:
+            return None
+        return pool.submit(self._fetch_page, from_ts, genre_id, after_id, count)
+
+    def _fetch_page(self, from_ts: int, genre_id: int | None, after_id: int, count: int) -> _Page:
+        """Appel IGDB d'une page (requête développée du miroir : entités liées incluses) ; aucun accès à la base."""
+        started = time.monotonic()
+        games_data = request_games_page(igdb_request, self._games_where(from_ts, genre_id, after_id), "id", limit=count)
+        return _Page(after_id=after_id, requested=count, games_data=games_data, igdb_seconds=time.monotonic() - started)
 
     def _compute_from_timestamp(self, from_year: int):
         """Retourne (datetime, timestamp) du 1er janvier de l'année donnée."""
@@ -196,415 +259,20 @@ class Command(BaseCommand):
         self.stdout.write(f"  → Récupération des jeux avec first_release_date >= {from_dt.date()} (timestamp {from_ts})")
         return from_dt, from_ts
 
-    def _build_games_query(self, limit: int, from_ts: int, genre_id: int | None = None) -> str:
-        """Construit la requête IGDB pour récupérer les jeux."""
+    def _games_where(self, from_ts: int, genre_id: int | None = None, after_id: int = 0) -> str:
+        """Filtre IGDB d'une page de jeux : ids IGDB strictement supérieurs à `after_id` (tri par id)."""
         genre_filter = f" & genres = ({genre_id})" if genre_id is not None else ""
-        return f"""
-            fields
-              id,
-              name,
-              summary,
-              first_release_date,
-              rating,
-              aggregated_rating,
-              total_rating,
-              total_rating_count,
-              game_status,
-              age_ratings,
-              multiplayer_modes,
-              cover,
-              genres,
-              platforms,
-              involved_companies;
-            where
-              first_release_date != null &
-              first_release_date >= {from_ts} &
-              version_parent = null{genre_filter};
-            sort total_rating desc;
-            limit {limit};
-        """
-
-    def _collect_related_ids(self, games_data):
-        """Collecte et déduplique les IDs liés aux jeux (companies, covers, ratings, modes)."""
-        self.stdout.write("  → Collecte des IDs de involved_companies, covers, age_ratings, multiplayer_modes...")
-        involved_ids = []
-        cover_ids = []
-        age_rating_ids = []
-        mp_modes_ids = []
-
-        for g in games_data:
-            involved_ids.extend(g.get("involved_companies", []))
-            cover_id = g.get("cover")
-            if cover_id:
-                cover_ids.append(cover_id)
-
-            age_rating_ids.extend(g.get("age_ratings") or [])
-            mp_modes_ids.extend(g.get("multiplayer_modes") or [])
-
-        involved_ids = list(set(involved_ids))
-        cover_ids = list(set(cover_ids))
-        age_rating_ids = list(set(age_rating_ids))
-        mp_modes_ids = list(set(mp_modes_ids))
-
-        self.stdout.write(f"    ✓ {len(involved_ids)} IDs involved_companies uniques trouvés.")
-        self.stdout.write(f"    ✓ {len(cover_ids)} IDs de covers uniques trouvés.")
-        self.stdout.write(f"    ✓ {len(age_rating_ids)} IDs d'age_ratings uniques trouvés.")
-        self.stdout.write(f"    ✓ {len(mp_modes_ids)} IDs de multiplayer_modes uniques trouvés.")
-
-        return involved_ids, cover_ids, age_rating_ids, mp_modes_ids
-
-    def _build_related_maps(
-        self,
-        involved_ids,
-        cover_ids,
-        age_rating_ids,
-        mp_modes_ids,
-    ):
-        """
-        Récupère toutes les entités liées (involved_companies, companies, publishers,
-        covers, age_ratings, multiplayer_modes) et retourne les mappings utiles.
-        """
-        # 2) Récupérer involved_companies
-        self.stdout.write("  → Récupération des involved_companies...")
-        involved_map = self.fetch_involved_companies(involved_ids)
-        self.stdout.write(f"    ✓ {len(involved_map)} involved_companies chargées.")
-
-        # 3) IDs de companies (publishers uniquement)
-        self.stdout.write("  → Extraction des IDs de companies (publishers)...")
-        company_ids = {ic["company"] for ic in involved_map.values() if ic.get("publisher")}
-        self.stdout.write(f"    ✓ {len(company_ids)} companies marquées comme publishers.")
-
-        # 4) Récupérer les companies IGDB
-        self.stdout.write("  → Récupération des companies publishers depuis IGDB...")
-        companies_map = self.fetch_companies(list(company_ids))
-        self.stdout.write(f"    ✓ {len(companies_map)} companies (publishers) récupérées.")
-
-        # 5) Synchroniser les Publisher Django
-        self.stdout.write("  → Synchronisation des Publisher Django...")
-        publishers_map = self.ensure_publishers(companies_map)
-        self.stdout.write(f"    ✓ {len(publishers_map)} Publisher Django synchronisés.")
-
-        # 6) Récupérer les covers
-        self.stdout.write("  → Récupération des covers depuis IGDB...")
-        covers_map = self.fetch_covers(cover_ids)
-        self.stdout.write(f"    ✓ {len(covers_map)} covers récupérées.")
-
-        # 7) Récupérer les age_ratings
-        self.stdout.write("  → Récupération des age_ratings depuis IGDB...")
-        age_ratings_map = self.fetch_age_ratings(age_rating_ids)
-        self.stdout.write(f"    ✓ {len(age_ratings_map)} age_ratings récupérés.")
-
-        # 8) Récupérer les multiplayer_modes
-        self.stdout.write("  → Récupération des multiplayer_modes depuis IGDB...")
-        mp_modes_list = self.fetch_multiplayer_modes(mp_modes_ids)
-        mp_by_game = self.index_multiplayer_by_game(mp_modes_list)
-        self.stdout.write(f"    ✓ {len(mp_modes_list)} multiplayer_modes récupérés.")
-
-        return involved_map, publishers_map, covers_map, age_ratings_map, mp_by_game
-
-    def _sync_games(
-        self,
-        games_data,
-        involved_map,
-        publishers_map,
-        covers_map,
-        age_ratings_map,
-        mp_by_game,
-    ):
-        """Crée / met à jour les jeux ainsi que leurs relations M2M."""
-        self.stdout.write("  → Création / mise à jour des jeux et des relations M2M...")
-        created = 0
-        updated = 0
-        error_count = 0
-        total_games = len(games_data)
-
-        for idx, g in enumerate(games_data, start=1):
-            try:
-                is_created = self._upsert_single_game(
-                    g,
-                    involved_map,
-                    publishers_map,
-                    covers_map,
-                    age_ratings_map,
-                    mp_by_game,
-                )
-                if is_created:
-                    created += 1
-                else:
-                    updated += 1
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(self.style.ERROR(f"[ERREUR] Jeu IGDB {g.get('id')} - {g.get('name')}: {e}"))
-
-            # Log de progression tous les 25 jeux, ou sur le dernier
-            if idx % 25 == 0 or idx == total_games:
-                self.stdout.write(
-                    f"    → Progression: {idx}/{total_games} jeux traités " f"({created} créés, {updated} mis à jour, {error_count} erreurs)"
-                )
-
-        self.stdout.write(self.style.SUCCESS(f"✓ Jeux importés : {created} créés, {updated} mis à jour, {error_count} erreurs."))
-
-    def _upsert_single_game(
-        self,
-        game_data,
-        involved_map,
-        publishers_map,
-        covers_map,
-        age_ratings_map,
-        mp_by_game,
-    ) -> bool:
-        """Crée ou met à jour un jeu unique, retourne True si créé."""
-        igdb_id = game_data["id"]
-        name = game_data.get("name") or f"Game {igdb_id}"
-        summary = game_data.get("summary") or ""
-
-        # date de sortie
-        first_release_ts = game_data.get("first_release_date")
-        release_date = datetime.date.fromtimestamp(first_release_ts) if first_release_ts else None
-
-        # status (enum déprécié mais encore utilisable)
-        raw_status = game_data.get("game_status")
-        status_str = self.map_status(raw_status)
-
-        cover_url = self._compute_cover_url(game_data, covers_map)
-        publisher_obj = self.find_publisher_for_game(game_data, involved_map, publishers_map)
-        min_players, max_players = self.compute_player_counts(game_data, mp_by_game)
-        min_age = self.compute_min_age(game_data, age_ratings_map)
-        popularity_score = game_data.get("total_rating") or 0.0
-        igdb_rating_count = game_data.get("total_rating_count") or 0
-
-        game_obj, is_created = Game.objects.update_or_create(
-            igdb_id=igdb_id,
-            defaults={
-                "name": name,
-                "description": summary,
-                "release_date": release_date,
-                "popularity_score": popularity_score,
-                "igdb_rating_count": igdb_rating_count,
-                "status": status_str,
-                "cover_url": cover_url,
-                "min_players": min_players,
-                "max_players": max_players,
-                "min_age": min_age,
-                "publisher": publisher_obj,
-            },
-        )
-
-        self._sync_game_relations(game_data, game_obj)
-        return is_created
-
-    def _compute_cover_url(self, game_data, covers_map):
-        """Calcule l'URL de cover à partir des données IGDB."""
-        cover_id = game_data.get("cover")
-        if not cover_id:
-            return None
-
-        cover_data = covers_map.get(cover_id)
-        if not cover_data:
-            return None
-
-        url = cover_data.get("url")
-        if not url:
-            return None
-
-        # l'API renvoie souvent une URL sans protocole, ex: //images.igdb.com/...
-        if url.startswith("//"):
-            return "https:" + url
-        return url
-
-    def _sync_game_relations(self, game_data, game_obj):
-        """Met à jour les relations M2M (plateformes, genres) pour un jeu."""
-        # lier plateformes
-        platform_ids = game_data.get("platforms") or []
-        if platform_ids:
-            platforms = Platform.objects.filter(igdb_id__in=platform_ids)
-            game_obj.platforms.set(platforms)
-        else:
-            game_obj.platforms.clear()
-
-        # lier genres
-        genre_ids = game_data.get("genres") or []
-        if genre_ids:
-            genres = Genre.objects.filter(igdb_id__in=genre_ids)
-            game_obj.genres.set(genres)
-        else:
-            game_obj.genres.clear()
-
-    # ------------------------------------------------------------------
-    # Helpers: involved_companies / companies / publishers / covers / status
-    # ------------------------------------------------------------------
-    def fetch_involved_companies(self, ids):
-        if not ids:
-            self.stdout.write("    (Aucun involved_company à récupérer)")
-            return {}
-
-        result = {}
-        unique_ids = list(set(ids))
-        chunks = [unique_ids[i : i + 500] for i in range(0, len(unique_ids), 500)]
-
-        for idx, chunk in enumerate(chunks, start=1):
-            self.stdout.write(f"    → Batch involved_companies {idx}/{len(chunks)} (taille={len(chunk)})")
-            ids_str = ",".join(str(i) for i in chunk)
-            query = f"""
-                fields id, game, company, developer, publisher;
-                where id = ({ids_str});
-                limit 500;
-            """
-            data = igdb_request("involved_companies", query)
-            for ic in data:
-                result[ic["id"]] = ic
-
-        return result
-
-    def fetch_companies(self, ids):
-        if not ids:
-            self.stdout.write("    (Aucune company à récupérer)")
-            return {}
-
-        result = {}
-        unique_ids = list(set(ids))
-        chunks = [unique_ids[i : i + 500] for i in range(0, len(unique_ids), 500)]
-
-        for idx, chunk in enumerate(chunks, start=1):
-            self.stdout.write(f"    → Batch companies {idx}/{len(chunks)} (taille={len(chunk)})")
-            ids_str = ",".join(str(i) for i in chunk)
-            query = f"""
-                fields id, name, description;
-                where id = ({ids_str});
-                limit 500;
-            """
-            data = igdb_request("companies", query)
-            for c in data:
-                result[c["id"]] = c
-
-        return result
-
-    def fetch_covers(self, ids):
-        """
-        Retourne un dict {id: cover}
-        """
-        if not ids:
-            self.stdout.write("    (Aucune cover à récupérer)")
-            return {}
-
-        result = {}
-        unique_ids = list(set(ids))
-        chunks = [unique_ids[i : i + 500] for i in range(0, len(unique_ids), 500)]
-
-        for idx, chunk in enumerate(chunks, start=1):
-            self.stdout.write(f"    → Batch covers {idx}/{len(chunks)} (taille={len(chunk)})")
-            ids_str = ",".join(str(i) for i in chunk)
-            query = f"""
-                fields id, url, image_id;
-                where id = ({ids_str});
-                limit 500;
-            """
-            data = igdb_request("covers", query)
-            for c in data:
-                result[c["id"]] = c
-
-        return result
-
-    def ensure_publishers(self, companies_map):
-        mapping = {}
-        count_created = 0
-        count_updated = 0
-
-        for comp_id, comp in companies_map.items():
-            name = comp["name"].strip()
-            description = comp.get("description") or ""
-
-            publisher_obj, created = Publisher.objects.update_or_create(
-                igdb_id=comp_id,
-                defaults={
-                    "name": name,
-                    "description": description,
-                    "website": None,
-                },
-            )
-            mapping[comp_id] = publisher_obj
-
-            if created:
-                count_created += 1
-            else:
-                count_updated += 1
-
-        self.stdout.write(f"    ✓ Publishers Django: {count_created} créés, {count_updated} mis à jour.")
-        return mapping
-
-    def find_publisher_for_game(self, game_data, involved_map, publishers_map):
-        default_publisher, _ = Publisher.objects.get_or_create(
-            name="Unknown publisher",
-            defaults={
-                "description": "Éditeur inconnu (données IGDB partielles).",
-                "website": None,
-            },
-        )
-
-        for ic_id in game_data.get("involved_companies", []) or []:
-            ic = involved_map.get(ic_id)
-            if not ic:
-                continue
-            if ic.get("publisher"):
-                comp_id = ic["company"]
-                return publishers_map.get(comp_id, default_publisher)
-
-        return default_publisher
-
-    def map_status(self, value):
-        """
-        Mappe l'entier IGDB `status` vers la string qu'on stocke dans Game.status.
-        """
-        status_map = {
-            0: "released",
-            2: "alpha",
-            3: "beta",
-            4: "early_access",
-            5: "offline",
-            6: "cancelled",
-            7: "rumored",
-            8: "delisted",
-        }
-        if value is None:
-            return "released"
-        return status_map.get(value, "released")
-
-    def fetch_age_ratings(self, ids):
-        """Délègue à igdb_demographics ; conserve les logs de progression."""
-        if not ids:
-            self.stdout.write("    (Aucun age_rating à récupérer)")
-            return {}
-        result = {}
-        unique_ids = list(set(ids))
-        chunks = [unique_ids[i : i + 500] for i in range(0, len(unique_ids), 500)]
-        for idx, chunk in enumerate(chunks, start=1):
-            self.stdout.write(f"    → Batch age_ratings {idx}/{len(chunks)} (taille={len(chunk)})")
-            result.update(fetch_age_ratings_map(igdb_request, chunk))
-        return result
-
-    def fetch_multiplayer_modes(self, ids):
-        """
-        Retourne une liste de multiplayer_modes bruts
-        """
-        if not ids:
-            self.stdout.write("    (Aucun multiplayer_mode à récupérer)")
-            return []
-
-        result = []
-        unique_ids = list(set(ids))
-        chunks = [unique_ids[i : i + 500] for i in range(0, len(unique_ids), 500)]
-
-        for idx, chunk in enumerate(chunks, start=1):
-            self.stdout.write(f"    → Batch multiplayer_modes {idx}/{len(chunks)} (taille={len(chunk)})")
-            result.extend(fetch_multiplayer_modes_raw(igdb_request, chunk))
-
-        return result
-
-    def index_multiplayer_by_game(self, mp_list):
-        return index_multiplayer_by_game(mp_list)
-
-    def compute_min_age(self, game_data, age_ratings_map):
-        return compute_min_age(game_data, age_ratings_map)
-
-    def compute_player_counts(self, game_data, mp_by_game):
-        return compute_player_counts(game_data, mp_by_game)
+        return f"first_release_date != null & first_release_date >= {from_ts} & id > {after_id}{genre_filter}"
+
+    def _write_page(self, page: _Page, state: IgdbSyncState, last_id: int) -> tuple[int, int]:
+        """Upsert de la page et avancée du point de reprise dans la même transaction. Retourne (créés, mis à jour)."""
+        igdb_ids = [g["id"] for g in page.games_data]
+        with transaction.atomic():
+            existing = Game.objects.filter(igdb_id__in=igdb_ids).count()
+            demographics = upsert_games_page(page.games_data)
+
+            state.watermark = last_id
+            state.games_synced += len(igdb_ids)
+            state.save(update_fields=["watermark", "games_synced", "updated_at"])
+        save_demographics(demographics)
+        return len(igdb_ids) - existing, existing
@@ -1,98 +1,34 @@
-import time
 import unicodedata
 
-import requests
 from django.core.management.base import BaseCommand
 
+from apps.games.backfill import add_backfill_arguments, run_backfill
+from apps.games.circuit_breaker import WIKIDATA_BACKFILL_BREAKER, CircuitOpenError
+from apps.games.igdb_wikidata import WIKIDATA_BATCH_SIZE, build_french_labels_query, fetch_wikidata_bindings, merge_french_bindings
 from apps.games.models import Game
 
-SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
-CHUNK_SIZE = 15
-WIKIDATA_USER_AGENT = "LudoKan/1.0 (contact: dev@ludokan.local)"
-
 
 def normalize(s: str) -> str:
     return unicodedata.normalize("NFD", s).encode("ascii", "ignore").decode().strip()
 
 
-def _sparql_escape_quoted(s: str) -> str:
-    return s.replace("\\", "\\\\").replace('"', '\\"')
-
-
-def _title_search_variants(title: str) -> set[str]:
-    variants = {title}
-    cleaned = title.replace("Version", "").replace("Edition", "").replace("  ", " ").strip()
-    if cleaned and cleaned != title:
-        variants.add(cleaned)
-    return variants
-
-
-def _values_lines_for_chunk(chunk: list[str]) -> list[str]:
-    lines: list[str] = []
-    for t in chunk:
-        for v in _title_search_variants(t):
-            safe_v = _sparql_escape_quoted(v)
-            safe_t = _sparql_escape_quoted(t)
-            lines.append(f'("{safe_v}" "{safe_t}")')
-    return lines
-
-
-def _sparql_french_labels_query(values_lines: list[str]) -> str:
-    joined = chr(10).join(values_lines)
-    return f"""
-PREFIX skos: <http://www.w3.org/2004/02/skos/core#>
-SELECT ?originalName ?frLabel WHERE {{
-  VALUES (?searchName ?originalName) {{
-    {joined}
-  }}
-  ?item wdt:P31 wd:Q7889.
-  {{
-    ?item rdfs:label ?enLabel FILTER(LANG(?enLabel) = "en")
-    FILTER(LCASE(STR(?enLabel)) = LCASE(STR(?searchName)))
-  }} UNION {{
-    ?item skos:altLabel ?enAlt FILTER(LANG(?enAlt) = "en")
-    FILTER(LCASE(STR(?enAlt)) = LCASE(STR(?searchName)))
-  }}
-  OPTIONAL {{ ?item rdfs:label ?frLabel FILTER(LANG(?frLabel) = "fr") }}
-}}
-""".strip()
-
-
-def _wikidata_bindings_for_query(sparql: str) -> list:
-    r = requests.get(
-        SPARQL_ENDPOINT,
-        params={"format": "json", "query": sparql},
-        headers={
-            "Accept": "application/sparql+json",
-            "User-Agent": WIKIDATA_USER_AGENT,
-        },
-        timeout=15,
-    )
-    if not r.ok:
-        return []
-    return r.json().get("results", {}).get("bindings", [])
-
-
-def _merge_french_bindings(bindings: list, out: dict[str, str | None]) -> None:
-    for b in bindings:
-        original = b.get("originalName", {}).get("value")
-        fr = b.get("frLabel", {}).get("value")
-        if original and fr and fr.strip():
-            out[original] = fr
-
-
 def fetch_french_names(names_en: list[str]) -> dict[str, str | None]:
+    """
+    Libellés français des titres, par pages VALUES de WIKIDATA_BATCH_SIZE titres (comme la résolution en ligne) ;
+    CircuitOpenError remonte pour que le lot soit compté en échec.
+    """
     result: dict[str, str | None] = dict.fromkeys(names_en)
 
-    for i in range(0, len(names_en), CHUNK_SIZE):
-        chunk = names_en[i : i + CHUNK_SIZE]
-        sparql = _sparql_french_labels_query(_values_lines_for_chunk(chunk))
+    for i in range(0, len(names_en), WIKIDATA_BATCH_SIZE):
+        chunk = names_en[i : i + WIKIDATA_BATCH_SIZE]
+        sparql = build_french_labels_query(chunk, fuzzy=True)
         try:
-            bindings = _wikidata_bindings_for_query(sparql)
-            _merge_french_bindings(bindings, result)
+            bindings = fetch_wikidata_bindings(sparql, timeout=15, breaker=WIKIDATA_BACKFILL_BREAKER)
+            merge_french_bindings(bindings, result)
+        except CircuitOpenError:
+            raise
         except Exception:
             pass
-        time.sleep(0.5)
 
     return result
 
@@ -106,31 +42,45 @@ class Command(BaseCommand):
             action="store_true",
             help="Overwrite existing name_fr values",
         )
+        # Wikidata n'a pas de limiteur partagé : peu de requêtes SPARQL simultanées.
+        add_backfill_arguments(parser, workers=2)
 
     def handle(self, *args, **options):
         overwrite = options["overwrite"]
 
         qs = Game.objects.all() if overwrite else Game.objects.filter(name_fr="")
-        games = list(qs.values("id", "name"))
+        total = qs.count()
+        if options["limit"] and options["limit"] > 0:
+            total = min(total, options["limit"])
 
-        if not games:
+        if not total:
             self.stdout.write("Aucun jeu à traiter.")
             return
 
-        self.stdout.write(f"{len(games)} jeux à traduire...")
-
-        names = [g["name"] for g in games]
-        name_to_ids: dict[str, list[int]] = {}
-        for g in games:
-            name_to_ids.setdefault(g["name"], []).append(g["id"])
-
-        fr_map = fetch_french_names(names)
-
-        updated = 0
-        for name_en, name_fr in fr_map.items():
-            if name_fr:
-                ids = name_to_ids.get(name_en, [])
-                Game.objects.filter(id__in=ids).update(name_fr=name_fr)
-                updated += len(ids)
+        self.stdout.write(f"{total} jeux à traduire...")
+
+        stats = run_backfill(
+            "name_fr:overwrite" if overwrite else "name_fr",
+            qs,
+            lambda rows: fetch_french_names(list(dict.fromkeys(row["name"] for row in rows))),
+            self._write_names,
+            fields=("id", "name"),
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            limit=options["limit"],
+            dry_run=options["dry_run"],
+            restart=options["restart"],
+            on_error=lambda rows, exc: self.stderr.write(f"Lot {rows[0]['id']}-{rows[-1]['id']} en échec : {exc}"),
+        )
 
-        self.stdout.write(self.style.SUCCESS(f"{updated} jeux mis à jour avec un nom français."))
+        self.stdout.write(self.style.SUCCESS(f"{stats.updated} jeux mis à jour avec un nom français."))
+
+    def _write_names(self, rows, fr_map, dry_run):
+        """Un seul UPDATE ... CASE pour tout le lot."""
+        games = [Game(id=row["id"], name_fr=fr_map[row["name"]]) for row in rows if fr_map.get(row["name"])]
+        if dry_run:
+            for game in games:
+                self.stdout.write(f"  [DRY-RUN] {game.id}: {game.name_fr}")
+        elif games:
+            Game.objects.bulk_update(games, ["name_fr"])
+        return (len(rows), len(games), 0)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.games.game_stats import REBUILD_BATCH_SIZE, rebuild_game_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the GameStats projection (owners, star histogram, reviews) from UserGame, Rating and Review."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--game-id",
+            type=int,
+            action="append",
+            dest="game_ids",
+            help="Only rebuild this game (repeatable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REBUILD_BATCH_SIZE,
+            help=f"Games per batch (default {REBUILD_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_game_stats(options["game_ids"], batch_size=max(options["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"Done. {rebuilt} game(s) with statistics."))
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Abs, Coalesce
+
+from apps.games.models import Game, Rating
+
+TOLERANCE = 1e-6
+BATCH_SIZE = 1000
+
+
+def _rating_aggregate(aggregate, output_field, default):
+    ratings = Rating.objects.filter(game_id=OuterRef("pk")).order_by().values("game_id")
+    return Coalesce(Subquery(ratings.annotate(v=aggregate).values("v")), Value(default), output_field=output_field)
+
+
+def drifted_games():
+    """Games whose stored rating aggregates differ from their ratings, annotated with the true values."""
+    return (
+        Game.objects.annotate(
+            true_count=_rating_aggregate(Count("id"), IntegerField(), 0),
+            true_sum=_rating_aggregate(Sum("normalized_value"), FloatField(), 0.0),
+            true_avg=_rating_aggregate(Avg("normalized_value"), FloatField(), 0.0),
+        )
+        .annotate(
+            sum_drift=Abs(F("rating_sum") - F("true_sum")),
+            avg_drift=Abs(F("average_rating") - F("true_avg")),
+            legacy_drift=Abs(F("rating_avg") - F("true_avg")),
+        )
+        .filter(~Q(rating_count=F("true_count")) | Q(sum_drift__gt=TOLERANCE) | Q(avg_drift__gt=TOLERANCE) | Q(legacy_drift__gt=TOLERANCE))
+        .only("id", "name", "rating_sum", "rating_count", "average_rating", "rating_avg")
+        .order_by("pk")
+    )
+
+
+class Command(BaseCommand):
+    help = "Repair drift between games' rating aggregates (rating_sum, rating_count, average_rating, rating_avg) and their ratings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted games without fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        queryset = drifted_games()
+
+        batch = []
+        fixed = 0
+        for game in queryset.iterator(chunk_size=BATCH_SIZE):
+            self.stdout.write(
+                f"  Game {game.pk} ({game.name}): count {game.rating_count} -> {game.true_count}, "
+                f"average {game.average_rating:.4f} -> {game.true_avg:.4f}"
+            )
+            fixed += 1
+            if dry_run:
+                continue
+            game.rating_count, game.rating_sum = game.true_count, game.true_sum
+            game.average_rating = game.rating_avg = game.true_avg
+            batch.append(game)
+            if len(batch) >= BATCH_SIZE:
+                self._flush(batch)
+        self._flush(batch)
+
+        verb = "would be repaired" if dry_run else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"Done. {fixed} game(s) {verb}."))
+
+    def _flush(self, batch):
+        if batch:
+            Game.objects.bulk_update(batch, ["rating_sum", "rating_count", "average_rating", "rating_avg"])
+            batch.clear()
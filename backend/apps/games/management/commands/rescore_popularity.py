@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.games import popularity
+
+
+class Command(BaseCommand):
+    help = "Recalcule popularity_score des jeux actifs depuis le dernier passage (ou de tout le catalogue avec --full)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recalcule tous les jeux (après un changement de pondération, ou pour prendre en compte des suppressions).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=popularity.POPULARITY_BATCH_SIZE,
+            help=f"Jeux par UPDATE (défaut {popularity.POPULARITY_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        rescored, changed = popularity.rescore_popularity(full=options["full"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ {rescored} jeux recalculés, {changed} scores modifiés."))
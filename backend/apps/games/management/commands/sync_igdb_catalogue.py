@@ -0,0 +1,49 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games import igdb_client, igdb_mirror
+from apps.games.models import IgdbSyncState
+
+
+class Command(BaseCommand):
+    help = "Synchronise le miroir local du catalogue IGDB depuis le dernier `updated_at` traité (reprend après interruption)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-pages",
+            type=int,
+            default=igdb_mirror.MIRROR_MAX_PAGES,
+            help=f"Nombre maximal de pages de {igdb_mirror.MIRROR_PAGE_SIZE} jeux à traiter.",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            default=None,
+            help="Repositionne le point de reprise à cette date (AAAA-MM-JJ) avant de synchroniser.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Repart du début du catalogue (watermark = 0).",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            igdb_mirror.reset_watermark(0)
+        elif options["since"]:
+            try:
+                since = datetime.datetime.strptime(options["since"], "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+            except ValueError as e:
+                raise CommandError("--since attend une date AAAA-MM-JJ.") from e
+            igdb_mirror.reset_watermark(int(since.timestamp()))
+
+        state = IgdbSyncState.objects.filter(name=igdb_mirror.MIRROR_STATE_NAME).first()
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Miroir IGDB depuis updated_at > {state.watermark if state else 0}"))
+
+        synced = igdb_mirror.sync_catalogue(igdb_client.igdb_request, max_pages=options["max_pages"], on_page=self._report_page)
+        self.stdout.write(self.style.SUCCESS(f"✓ {synced} jeux synchronisés."))
+
+    def _report_page(self, state, count):
+        when = datetime.datetime.fromtimestamp(state.watermark, tz=datetime.timezone.utc)
+        self.stdout.write(f"  → {count} jeux, point de reprise {when:%Y-%m-%d %H:%M:%S} (total {state.games_synced})")
@@ -3,19 +3,39 @@ Management command pour tester les performances des requêtes avec EXPLAIN.
 
 Usage:
     python manage.py test_query_performance
+    python manage.py test_query_performance --no-seqscan   # small dev databases: check each query *can* use an index
 """
 
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from apps.games.filters import GameFilter, search_similarity_threshold
 from apps.games.models import Game
 
 
 class Command(BaseCommand):
     help = "Test query performance with EXPLAIN to validate index usage"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-seqscan",
+            action="store_true",
+            help="Disable sequential scans while explaining (on a small table Postgres prefers a Seq Scan even when an index applies)",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS("\n=== Testing Query Performance with EXPLAIN ===\n"))
+        if options.get("no_seqscan"):
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+        try:
+            self._run_queries()
+        finally:
+            if options.get("no_seqscan"):
+                with connection.cursor() as cursor:
+                    cursor.execute("RESET enable_seqscan")
+
+    def _run_queries(self):
 
         # Test 1: Filter by min_age
         self.stdout.write(self.style.WARNING("\n1. Query: Filter by min_age >= 12"))
@@ -44,20 +64,21 @@ class Command(BaseCommand):
             .order_by("-popularity_score")
         )
 
-        # Test 5: Filter with M2M (genres) + numeric filter
-        self.stdout.write(self.style.WARNING("\n5. Query: Filter by genre ID 1 AND min_age >= 12"))
+        # Test 5: Filter with M2M (genres) + numeric filter - GameFilter emits an EXISTS semi-join, no DISTINCT
+        self.stdout.write(self.style.WARNING("\n5. Query: Filter by genre ID 1 AND min_age >= 12 (EXISTS semi-join)"))
         self._test_query(
-            Game.objects.filter(genres__id=1, min_age__gte=12)
-            .select_related("publisher")
-            .prefetch_related("genres", "platforms")
-            .distinct()
-            .order_by("-popularity_score")
+            GameFilter({"genre": "1", "min_age": "12"}, queryset=Game.objects.select_related("publisher").order_by("-popularity_score")).qs
         )
 
         # Test 6: Order by popularity_score only
         self.stdout.write(self.style.WARNING("\n6. Query: Order by -popularity_score (no filter)"))
         self._test_query(Game.objects.select_related("publisher").prefetch_related("genres", "platforms").order_by("-popularity_score")[:20])
 
+        # Test 7: GameFilter.search - trigram (%>) on name / name_fr + weighted tsvector, all GIN-indexed
+        self.stdout.write(self.style.WARNING("\n7. Query: Search 'zelda' (trigram name / name_fr + full-text, GIN indexes)"))
+        with search_similarity_threshold():
+            self._test_query(GameFilter().filter_search(Game.objects.all(), "search", "zelda")[:20])
+
         self.stdout.write(self.style.SUCCESS("\n\n=== Performance Testing Complete ===\n"))
         self.stdout.write("Look for 'Index Scan' or 'Index Only Scan' in the EXPLAIN output to confirm index usage.\n")
         self.stdout.write("'Seq Scan' indicates a full table scan (slower for large tables).\n")
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0019_add_rating_count_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="description_fr",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0020_game_description_fr"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IgdbGameDemographics",
+            fields=[
+                ("igdb_id", models.PositiveBigIntegerField(primary_key=True, serialize=False)),
+                ("min_age", models.IntegerField(blank=True, null=True)),
+                ("min_players", models.IntegerField(blank=True, null=True)),
+                ("max_players", models.IntegerField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                "verbose_name": "IGDB Game Demographics",
+                "verbose_name_plural": "IGDB Game Demographics",
+            },
+        ),
+    ]
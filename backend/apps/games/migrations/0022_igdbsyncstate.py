@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0021_igdbgamedemographics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IgdbSyncState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("watermark", models.BigIntegerField(default=0)),
+                ("cursor_id", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("games_synced", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "IGDB Sync State",
+                "verbose_name_plural": "IGDB Sync States",
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0022_igdbsyncstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Collection",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("igdb_id", models.PositiveBigIntegerField(unique=True)),
+                ("name", models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Franchise",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("igdb_id", models.PositiveBigIntegerField(unique=True)),
+                ("name", models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="igdb_total_rating",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="collections",
+            field=models.ManyToManyField(blank=True, related_name="games", to="games.collection"),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="franchises",
+            field=models.ManyToManyField(blank=True, related_name="games", to="games.franchise"),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:45
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Même expression pour le trigger et le remplissage initial ; configuration 'simple' (titres multilingues, pas de racinisation)
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('simple', coalesce({row}name, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce({row}name_fr, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce({row}description, '')), 'C')
+"""
+
+CREATE_TRIGGER_SQL = f"""
+CREATE FUNCTION games_game_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_SQL.format(row="NEW.")};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER games_game_search_vector
+    BEFORE INSERT OR UPDATE OF name, name_fr, description, search_vector ON games_game
+    FOR EACH ROW EXECUTE FUNCTION games_game_search_vector_update();
+
+UPDATE games_game SET search_vector = {SEARCH_VECTOR_SQL.format(row="")};
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS games_game_search_vector ON games_game;
+DROP FUNCTION IF EXISTS games_game_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0023_local_catalogue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+        migrations.AddIndex(
+            model_name="game",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["name"], name="games_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["name_fr"], name="games_name_fr_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="games_search_vector_idx"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0024_game_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="game",
+            name="games_popularity_idx",
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(fields=["-popularity_score", "-id"], name="games_popularity_idx"),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:49
+
+from django.db import migrations, models
+
+# Initialise la somme des notes à partir des notes existantes (les compteurs sont déjà à jour).
+BACKFILL_RATING_SUM_SQL = """
+UPDATE games_game AS g
+SET rating_sum = r.total
+FROM (SELECT game_id, SUM(normalized_value) AS total FROM games_rating GROUP BY game_id) AS r
+WHERE r.game_id = g.id;
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0025_game_popularity_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="rating_sum",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunSQL(sql=BACKFILL_RATING_SUM_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Initialise la projection depuis les ludothèques, notes étoiles et avis existants (jeux avec activité uniquement).
+BACKFILL_GAME_STATS_SQL = """
+INSERT INTO games_gamestats (
+    game_id, owners_count, owners_en_cours, owners_termine, owners_abandonne,
+    stars_1, stars_2, stars_3, stars_4, stars_5, reviews_count, last_review_at
+)
+SELECT
+    g.id,
+    COALESCE(o.total, 0), COALESCE(o.en_cours, 0), COALESCE(o.termine, 0), COALESCE(o.abandonne, 0),
+    COALESCE(s.s1, 0), COALESCE(s.s2, 0), COALESCE(s.s3, 0), COALESCE(s.s4, 0), COALESCE(s.s5, 0),
+    COALESCE(r.total, 0), r.last_created
+FROM games_game AS g
+LEFT JOIN (
+    SELECT game_id, COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE status = 'EN_COURS') AS en_cours,
+        COUNT(*) FILTER (WHERE status = 'TERMINE') AS termine,
+        COUNT(*) FILTER (WHERE status = 'ABANDONNE') AS abandonne
+    FROM library_usergame GROUP BY game_id
+) AS o ON o.game_id = g.id
+LEFT JOIN (
+    SELECT game_id,
+        COUNT(*) FILTER (WHERE star = 1) AS s1, COUNT(*) FILTER (WHERE star = 2) AS s2,
+        COUNT(*) FILTER (WHERE star = 3) AS s3, COUNT(*) FILTER (WHERE star = 4) AS s4,
+        COUNT(*) FILTER (WHERE star = 5) AS s5
+    FROM (
+        SELECT game_id, LEAST(GREATEST(FLOOR(value)::int, 1), 5) AS star
+        FROM games_rating WHERE rating_type = 'etoiles'
+    ) AS stars
+    GROUP BY game_id
+) AS s ON s.game_id = g.id
+LEFT JOIN (
+    SELECT game_id, COUNT(*) AS total, MAX(date_created) AS last_created FROM reviews_review GROUP BY game_id
+) AS r ON r.game_id = g.id
+WHERE o.game_id IS NOT NULL OR s.game_id IS NOT NULL OR r.game_id IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0026_game_rating_sum"),
+        ("library", "0010_merge_20260511_2222"),
+        ("reviews", "0005_add_title_to_review"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GameStats",
+            fields=[
+                (
+                    "game",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="stats", serialize=False, to="games.game"
+                    ),
+                ),
+                ("owners_count", models.IntegerField(default=0)),
+                ("owners_en_cours", models.IntegerField(default=0)),
+                ("owners_termine", models.IntegerField(default=0)),
+                ("owners_abandonne", models.IntegerField(default=0)),
+                ("stars_1", models.IntegerField(default=0)),
+                ("stars_2", models.IntegerField(default=0)),
+                ("stars_3", models.IntegerField(default=0)),
+                ("stars_4", models.IntegerField(default=0)),
+                ("stars_5", models.IntegerField(default=0)),
+                ("reviews_count", models.IntegerField(default=0)),
+                ("last_review_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Game Stats",
+                "verbose_name_plural": "Game Stats",
+            },
+        ),
+        migrations.RunSQL(sql=BACKFILL_GAME_STATS_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
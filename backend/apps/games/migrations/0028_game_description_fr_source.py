@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0027_gamestats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="description_fr_source",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
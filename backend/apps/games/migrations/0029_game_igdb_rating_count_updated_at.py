@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+# Le champ n'avance que si igdb_rating_count change (insert sans valeur explicite : date de création),
+# quel que soit l'écrivain (upsert en masse du miroir, save, QuerySet.update)
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION games_game_igdb_rating_count_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        NEW.igdb_rating_count_updated_at := coalesce(NEW.igdb_rating_count_updated_at, now());
+    ELSIF NEW.igdb_rating_count IS DISTINCT FROM OLD.igdb_rating_count THEN
+        NEW.igdb_rating_count_updated_at := now();
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER games_game_igdb_rating_count
+    BEFORE INSERT OR UPDATE OF igdb_rating_count ON games_game
+    FOR EACH ROW EXECUTE FUNCTION games_game_igdb_rating_count_update();
+
+UPDATE games_game SET igdb_rating_count_updated_at = updated_at;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS games_game_igdb_rating_count ON games_game;
+DROP FUNCTION IF EXISTS games_game_igdb_rating_count_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("games", "0028_game_description_fr_source"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="igdb_rating_count_updated_at",
+            field=models.DateTimeField(db_index=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGER_SQL, reverse_sql=DROP_TRIGGER_SQL),
+    ]
@@ -1,8 +1,11 @@
 from decimal import Decimal
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models import Avg
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
@@ -54,6 +57,24 @@ class Genre(models.Model):
         return self.name
 
 
+class Collection(models.Model):
+    # Série IGDB (collections) — alimentée par le miroir du catalogue
+    igdb_id = models.PositiveBigIntegerField(unique=True)
+    name = models.CharField(max_length=255)
+
+    def __str__(self):
+        return self.name
+
+
+class Franchise(models.Model):
+    # Franchise IGDB — alimentée par le miroir du catalogue
+    igdb_id = models.PositiveBigIntegerField(unique=True)
+    name = models.CharField(max_length=255)
+
+    def __str__(self):
+        return self.name
+
+
 class Game(models.Model):
     # IGDB ID pour la recherche sur IGDB
     igdb_id = models.PositiveBigIntegerField(unique=True, null=True, blank=True)
@@ -65,6 +86,10 @@ class Game(models.Model):
     name = models.CharField(max_length=255)
     name_fr = models.CharField(max_length=255, blank=True, default="")
     description = models.TextField(blank=True, default="")
+    # Traduction française de `description` (proxy /api/igdb/translate/)
+    description_fr = models.TextField(blank=True, default="")
+    # sha256 de la description traduite : description_fr n'est réutilisée que si la description n'a pas changé
+    description_fr_source = models.CharField(max_length=64, blank=True, default="")
     release_date = models.DateField(blank=True, null=True)
     cover_url = models.URLField(blank=True, null=True)
     status = models.CharField(
@@ -80,15 +105,25 @@ class Game(models.Model):
     rating_avg = models.FloatField(default=0.0)
     popularity_score = models.FloatField(default=0.0)
     igdb_rating_count = models.IntegerField(default=0)
+    # Dernier changement de igdb_rating_count (trigger games_game_igdb_rating_count) : date du signal IGDB de popularity.py
+    igdb_rating_count_updated_at = models.DateTimeField(null=True, editable=False, db_index=True)
+    # total_rating IGDB (null si non noté), renseigné par le miroir du catalogue
+    igdb_total_rating = models.FloatField(blank=True, null=True)
     # New fields for rating statistics
     average_rating = models.FloatField(default=0.0)
     rating_count = models.IntegerField(default=0)
+    # Somme des normalized_value : les agrégats sont ajustés par différence à chaque note (voir _apply_rating_delta)
+    rating_sum = models.FloatField(default=0.0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # tsvector pondéré (name / name_fr : A, description : C) recalculé par le trigger games_game_search_vector
+    search_vector = SearchVectorField(null=True, editable=False)
 
     publisher = models.ForeignKey(Publisher, on_delete=models.CASCADE, related_name="games")
     platforms = models.ManyToManyField(Platform, related_name="games")
     genres = models.ManyToManyField(Genre, related_name="games")
+    collections = models.ManyToManyField(Collection, related_name="games", blank=True)
+    franchises = models.ManyToManyField(Franchise, related_name="games", blank=True)
 
     class Meta:
         indexes = [
@@ -96,11 +131,15 @@ class Game(models.Model):
             models.Index(fields=["min_age"], name="games_min_age_idx"),
             models.Index(fields=["min_players"], name="games_min_players_idx"),
             models.Index(fields=["max_players"], name="games_max_players_idx"),
-            # Index pour le tri par popularité (utilisé dans ordering du ViewSet)
-            models.Index(fields=["-popularity_score"], name="games_popularity_idx"),
+            # Index pour le tri par popularité (ordering du ViewSet) ; l'id départage la pagination par curseur
+            models.Index(fields=["-popularity_score", "-id"], name="games_popularity_idx"),
             models.Index(fields=["-igdb_rating_count"], name="games_rating_count_idx"),
             # Index composite pour filtres combinés courants
             models.Index(fields=["min_age", "min_players"], name="games_age_players_idx"),
+            # Recherche (GameFilter.search) : opérateurs trigram et plein texte servis par des index GIN
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="games_name_trgm_idx"),
+            GinIndex(fields=["name_fr"], opclasses=["gin_trgm_ops"], name="games_name_fr_trgm_idx"),
+            GinIndex(fields=["search_vector"], name="games_search_vector_idx"),
         ]
 
     def __str__(self):
@@ -184,12 +223,34 @@ class Rating(models.Model):
         if not (min_value <= self.value <= max_value):
             raise ValidationError({"value": message})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # (jeu, note normalisée, étoiles) tels que chargés : base des deltas appliqués aux agrégats du jeu et à GameStats
+        if all(name in instance.__dict__ for name in ("game_id", "normalized_value", "rating_type", "value")):
+            instance._stats_snapshot = instance._stats_key()
+        return instance
+
+    def _stats_key(self):
+        return (self.game_id, self.normalized_value, star_bucket(self.rating_type, self.value))
+
+    def _stored_stats(self):
+        """(game_id, normalized_value, étoiles) actuellement en base, sans requête si l'instance vient de la base."""
+        snapshot = getattr(self, "_stats_snapshot", None)
+        if snapshot is not None:
+            return snapshot
+        if self.pk is None:
+            return None
+        row = Rating.objects.filter(pk=self.pk).values_list("game_id", "normalized_value", "rating_type", "value").first()
+        return row and (row[0], row[1], star_bucket(row[2], row[3]))
+
     def save(self, *args, **kwargs):
         """Override save to keep normalized_value in sync.
 
         Also ensures normalized_value is written even when update_fields is
         provided (e.g. via update_or_create), so averages use the latest value.
         """
+        self._stats_previous = None if self._state.adding else self._stored_stats()
         if self.rating_type and self.value is not None:
             self.normalized_value = normalize_rating(self.rating_type, self.value)
 
@@ -202,6 +263,7 @@ class Rating(models.Model):
                 kwargs["update_fields"] = update_fields_set
 
         super().save(*args, **kwargs)
+        self._stats_snapshot = self._stats_key()
 
 
 def normalize_rating(rating_type, value):
@@ -232,32 +294,49 @@ def normalize_rating(rating_type, value):
     return float(normalized)
 
 
-def _update_game_rating_stats(game):
-    """Recalculate average_rating and rating_count for a game.
+def star_bucket(rating_type, value):
+    """Colonne de l'histogramme étoiles (1-5) d'une note, None hors notes étoiles."""
+    if rating_type != Rating.RATING_TYPE_ETOILES or value is None:
+        return None
+    return min(max(int(value), 1), 5)
 
-    Also keeps legacy rating_avg in sync for backward compatibility.
-    """
-    agg = Rating.objects.filter(game=game).aggregate(avg_normalized=Avg("normalized_value"))
-    avg = agg["avg_normalized"] or 0.0
-    count = Rating.objects.filter(game=game).count()
 
-    game.average_rating = avg
-    game.rating_count = count
-    # Keep existing rating_avg field aligned with the new average
-    game.rating_avg = avg
-    game.save(update_fields=["average_rating", "rating_count", "rating_avg"])
+def _apply_rating_delta(game_id, sum_delta, count_delta):
+    """Adjust a game's rating aggregates in one atomic UPDATE (F-expressions, no aggregate over its ratings).
+
+    Postgres evaluates every SET expression against the row before the update, so the
+    new average uses the new sum and count. Also keeps legacy rating_avg in sync.
+    rating_count never goes below 0, even on a drifted row (bulk writes bypassing signals);
+    drift is repaired by the reconcile_rating_stats command.
+    """
+    has_ratings = When(rating_count__gt=-count_delta, then=(F("rating_sum") + sum_delta) / (F("rating_count") + count_delta))
+    average = Case(has_ratings, default=Value(0.0), output_field=FloatField())
+    Game.objects.filter(pk=game_id).update(
+        rating_sum=Case(When(rating_count__gt=-count_delta, then=F("rating_sum") + sum_delta), default=Value(0.0), output_field=FloatField()),
+        rating_count=Greatest(F("rating_count") + count_delta, Value(0)),
+        average_rating=average,
+        rating_avg=average,
+    )
 
 
 @receiver(post_save, sender=Rating)
-def update_game_rating_on_save(sender, instance, **kwargs):
+def update_game_rating_on_save(sender, instance, created, **kwargs):
     """Update game's average_rating and rating_count after save."""
-    _update_game_rating_stats(instance.game)
+    previous = getattr(instance, "_stats_previous", None)
+    if created or previous is None:
+        _apply_rating_delta(instance.game_id, instance.normalized_value, 1)
+    elif previous[0] != instance.game_id:
+        _apply_rating_delta(previous[0], -previous[1], -1)
+        _apply_rating_delta(instance.game_id, instance.normalized_value, 1)
+    elif previous[1] != instance.normalized_value:
+        _apply_rating_delta(instance.game_id, instance.normalized_value - previous[1], 0)
 
 
 @receiver(post_delete, sender=Rating)
 def update_game_rating_on_delete(sender, instance, **kwargs):
     """Update game's average_rating and rating_count after delete."""
-    _update_game_rating_stats(instance.game)
+    game_id, value, _ = getattr(instance, "_stats_snapshot", None) or instance._stats_key()
+    _apply_rating_delta(game_id, -value, -1)
 
 
 class GameScreenshot(models.Model):
@@ -288,3 +367,74 @@ class GameVideo(models.Model):
 
     def __str__(self):
         return f"Video {self.video_id} for {self.game.name}"
+
+
+class GameStats(models.Model):
+    """
+    Projection des statistiques d'un jeu (possession, histogramme étoiles, avis) servie par GameStatsView.
+    Tenue à jour par différence à chaque écriture de UserGame, Rating et Review (apps.games.game_stats) ;
+    la commande rebuild_game_stats la recalcule. Pas de ligne = aucune activité sur le jeu.
+    """
+
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    # Toutes les entrées de ludothèque, quel que soit le statut
+    owners_count = models.IntegerField(default=0)
+    owners_en_cours = models.IntegerField(default=0)
+    owners_termine = models.IntegerField(default=0)
+    owners_abandonne = models.IntegerField(default=0)
+    # Histogramme des notes étoiles (Rating de type etoiles)
+    stars_1 = models.IntegerField(default=0)
+    stars_2 = models.IntegerField(default=0)
+    stars_3 = models.IntegerField(default=0)
+    stars_4 = models.IntegerField(default=0)
+    stars_5 = models.IntegerField(default=0)
+    reviews_count = models.IntegerField(default=0)
+    last_review_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Game Stats"
+        verbose_name_plural = "Game Stats"
+
+    def __str__(self):
+        return f"Stats for game {self.game_id}"
+
+
+class IgdbGameDemographics(models.Model):
+    """
+    Âge minimum / nombre de joueurs dérivés d'IGDB (age_ratings, multiplayer_modes) pour tout jeu IGDB,
+    importé ou non. Sert au post-filtre démographique du proxy ; rafraîchi par la tâche refresh_igdb_demographics.
+    """
+
+    igdb_id = models.PositiveBigIntegerField(primary_key=True)
+    min_age = models.IntegerField(blank=True, null=True)
+    min_players = models.IntegerField(blank=True, null=True)
+    max_players = models.IntegerField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        verbose_name = "IGDB Game Demographics"
+        verbose_name_plural = "IGDB Game Demographics"
+
+    def __str__(self):
+        return f"Demographics for IGDB game {self.igdb_id}"
+
+
+class IgdbSyncState(models.Model):
+    """
+    Point de reprise du miroir incrémental du catalogue IGDB (apps.games.igdb_mirror).
+    watermark : `updated_at` IGDB (timestamp UNIX) jusqu'auquel tout est synchronisé.
+    cursor_id : renseigné quand on parcourt par id un lot de jeux partageant la seconde `watermark`.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.BigIntegerField(default=0)
+    cursor_id = models.PositiveBigIntegerField(blank=True, null=True)
+    games_synced = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "IGDB Sync State"
+        verbose_name_plural = "IGDB Sync States"
+
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
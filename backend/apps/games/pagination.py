@@ -0,0 +1,151 @@
+"""
+Pagination par curseur (keyset) du catalogue public, activée par ?pagination=cursor (ou ?cursor=...).
+
+Le curseur encode la position (valeur du tri, id) du dernier jeu servi : la page suivante est un
+`WHERE (tri, id) < (valeur, id)` sur l'index du tri au lieu d'un OFFSET, son coût ne dépend donc pas
+de la profondeur. Le tri est le premier champ de ?ordering (parmi GameViewSet.ordering_fields),
+départagé par l'id ; un curseur émis pour un autre tri est refusé. Le classement par pertinence de
+?search (sans ?ordering) n'est pas paginable par curseur : la combinaison est refusée (400). Le total (COUNT DISTINCT) n'est
+calculé que sur demande (?with_count=1).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+TRUTHY = {"1", "true", "yes"}
+
+
+@dataclass(frozen=True)
+class Cursor:
+    ordering: str
+    value: Any
+    pk: int
+    reverse: bool
+
+
+class GameKeysetPagination(BasePagination):
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+    default_ordering = "-popularity_score"
+    invalid_cursor_message = "Curseur invalide."
+    search_rank_message = "La pagination par curseur exige un ?ordering explicite avec ?search (tri par pertinence non paginable)."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        self.field = self.ordering.lstrip("-")
+        self.nullable = queryset.model._meta.get_field(self.field).null
+        cursor = self.decode_cursor(request, queryset.model)
+
+        with_count = request.query_params.get(self.count_query_param, "").lower() in TRUTHY
+        self.count = queryset.count() if with_count else None
+
+        reverse = cursor is not None and cursor.reverse
+        descending = self.ordering.startswith("-") != reverse
+        direction = "-" if descending else ""
+        queryset = queryset.order_by(f"{direction}{self.field}", f"{direction}id")
+        if cursor is not None:
+            queryset = queryset.filter(self._after(cursor.value, cursor.pk, descending))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        if reverse:
+            self.page.reverse()
+        self.has_next = True if reverse else has_more
+        self.has_previous = cursor is not None and (has_more if reverse else True)
+        return self.page
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_ordering(self, queryset, view) -> str:
+        """Premier champ de tri du queryset (appliqué par OrderingFilter) s'il est autorisé, sinon le tri par défaut."""
+        allowed = getattr(view, "ordering_fields", None) or []
+        ordering = next(iter(queryset.query.order_by), self.default_ordering)
+        if ordering == "-search_rank":  # GameOrderingFilter : ?search sans ?ordering
+            raise ValidationError({"ordering": self.search_rank_message})
+        if isinstance(ordering, str) and ordering.lstrip("-") in allowed:
+            return ordering
+        return self.default_ordering
+
+    def _after(self, value, pk: int, descending: bool) -> Q:
+        """Lignes situées strictement après (value, pk) ; Postgres classe les NULL en tête en DESC, en fin en ASC."""
+        field, op = self.field, "lt" if descending else "gt"
+        if value is None:
+            after_nulls = Q(**{f"{field}__isnull": True, f"id__{op}": pk})
+            return after_nulls | Q(**{f"{field}__isnull": False}) if descending else after_nulls
+        after = Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": pk})
+        if self.nullable and not descending:
+            after |= Q(**{f"{field}__isnull": True})
+        return after
+
+    # --- Curseurs ---
+
+    def encode_cursor(self, game, reverse: bool) -> str:
+        payload = {"o": self.ordering, "v": getattr(game, self.field), "id": game.pk, "r": int(reverse)}
+        raw = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request, model) -> Cursor | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+            cursor = Cursor(payload["o"], payload["v"], int(payload["id"]), bool(payload["r"]))
+            if cursor.ordering != self.ordering:
+                raise ValueError("tri différent")
+            value = None if cursor.value is None else model._meta.get_field(self.field).to_python(cursor.value)
+        except (TypeError, KeyError, ValueError) as exc:  # binascii.Error et UnicodeDecodeError sont des ValueError
+            raise NotFound(self.invalid_cursor_message) from exc
+        return Cursor(cursor.ordering, value, cursor.pk, cursor.reverse)
+
+    def _link(self, game, reverse: bool) -> str:
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(game, reverse))
+
+    def get_next_link(self) -> str | None:
+        return self._link(self.page[-1], reverse=False) if self.has_next and self.page else None
+
+    def get_previous_link(self) -> str | None:
+        return self._link(self.page[0], reverse=True) if self.has_previous and self.page else None
+
+    def get_paginated_response(self, data):
+        body = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            body["count"] = self.count
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer", "description": f"Présent seulement avec ?{self.count_query_param}=1."},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,159 @@
+"""
+Calcul de Game.popularity_score (tri par défaut des listes de jeux, index games_popularity_idx).
+
+Score « hot » à décroissance exponentielle : chaque signal vaut son poids multiplié par
+2^((t - POPULARITY_EPOCH) / demi-vie), t étant sa date :
+
+- activités locales : ajout en ludothèque (date_added), note, avis (date_created) ;
+- popularité IGDB : IGDB_WEIGHT · log1p(igdb_rating_count), datée du dernier changement de ce compteur
+  (igdb_rating_count_updated_at, avancé par trigger) — au même niveau de temps que l'activité locale.
+  Une écriture sans rapport (traduction, édition admin, resynchronisation à l'identique) ne la rajeunit pas.
+
+    popularity_score = log2(1 + Σ poids · 2^((t - époque) / demi-vie))
+
+Un signal vaut ainsi deux fois plus qu'un signal identique plus vieux d'une demi-vie, et +1 point de score
+correspond à une popularité doublée. Le classement relatif de deux jeux ne dépend pas de l'instant du calcul :
+un jeu sans nouvelle activité ni nouveau compteur IGDB garde son score. Le calcul est donc incrémental, et seuls
+les jeux ayant une activité ou un compteur IGDB modifié depuis le dernier passage sont recalculés.
+Les sommes sont évaluées relativement à l'instant du calcul (exposants ≤ 0, pas de débordement), puis
+les scores sont écrits par lot en un seul `UPDATE ... FROM (VALUES ...)`.
+
+Les suppressions (jeu retiré d'une ludothèque, note effacée) ne déclenchent pas de recalcul : le jeu est
+recalculé à sa prochaine activité, ou par `rescore_popularity --full`.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+from django.db import connection
+from django.db.models import ExpressionWrapper, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Extract, Greatest, Power
+from django.utils import timezone as dj_timezone
+
+from apps.games.models import Game, IgdbSyncState, Rating
+from apps.library.models import UserGame
+from apps.reviews.models import Review
+
+logger = logging.getLogger(__name__)
+
+POPULARITY_STATE_NAME = "popularity"
+POPULARITY_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+POPULARITY_HALF_LIFE_DAYS = 7
+POPULARITY_BATCH_SIZE = 1000
+# Recouvrement entre deux passages : rattrape les écritures validées après le début du passage précédent
+POPULARITY_OVERLAP = timedelta(minutes=5)
+
+LIBRARY_WEIGHT = 1.0
+RATING_WEIGHT = 2.0
+REVIEW_WEIGHT = 3.0
+IGDB_WEIGHT = 1.0
+
+# Activités locales : (modèle, champ date, poids)
+_ACTIVITY_SOURCES = (
+    (UserGame, "date_added", LIBRARY_WEIGHT),
+    (Rating, "date_created", RATING_WEIGHT),
+    (Review, "date_created", REVIEW_WEIGHT),
+)
+# 2^-1000 est négligeable ; borne l'exposant sous le seuil d'underflow des float8 Postgres
+_MIN_EXPONENT = -1000.0
+
+
+def _half_lives(now: datetime) -> float:
+    """Demi-vies écoulées entre l'époque et `now`."""
+    return (now - POPULARITY_EPOCH).total_seconds() / (POPULARITY_HALF_LIFE_DAYS * 86400)
+
+
+def _decayed_sums(model, date_field: str, game_ids: list[int], now: datetime) -> dict[int, float]:
+    """Σ 2^((t - now) / demi-vie) des activités de chaque jeu."""
+    # Epoch UTC : sans tzinfo, Django convertit d'abord dans TIME_ZONE (décalage de l'heure locale)
+    age = Cast(Extract(date_field, "epoch", tzinfo=timezone.utc), FloatField()) - Value(now.timestamp())
+    exponent = ExpressionWrapper(age / Value(POPULARITY_HALF_LIFE_DAYS * 86400.0), output_field=FloatField())
+    decayed = Power(Cast(Value(2.0), FloatField()), Greatest(exponent, Value(_MIN_EXPONENT)))
+    rows = model.objects.filter(game_id__in=game_ids).order_by().values("game_id").annotate(total=Sum(decayed))
+    return {row["game_id"]: row["total"] for row in rows}
+
+
+def compute_scores(game_ids: list[int], now: datetime) -> dict[int, float]:
+    """Scores des jeux `game_ids` à l'instant `now` (3 agrégats + lecture de igdb_rating_count et de sa date)."""
+    ref = _half_lives(now)
+    recent = dict.fromkeys(game_ids, 0.0)
+    for model, date_field, weight in _ACTIVITY_SOURCES:
+        for game_id, total in _decayed_sums(model, date_field, game_ids, now).items():
+            recent[game_id] += weight * total
+
+    half_life_seconds = POPULARITY_HALF_LIFE_DAYS * 86400
+    scores = {}
+    games = Game.objects.filter(pk__in=game_ids).values_list("pk", "igdb_rating_count", "igdb_rating_count_updated_at")
+    for game_id, igdb_count, counted_at in games:
+        age = min((counted_at - now).total_seconds(), 0.0) / half_life_seconds if counted_at else _MIN_EXPONENT
+        total = recent[game_id] + IGDB_WEIGHT * math.log1p(max(igdb_count, 0)) * 2.0 ** max(age, _MIN_EXPONENT)
+        # log2(1 + Σ w·2^x) = ref + log2(Σ w·2^(x - ref) + 2^-ref)
+        scores[game_id] = round(ref + math.log2(total + 2.0**-ref), 6) if total > 0 else 0.0
+    return scores
+
+
+def write_scores(scores: dict[int, float]) -> int:
+    """Écrit les scores en un seul UPDATE ... FROM (VALUES ...) ; retourne le nombre de jeux modifiés."""
+    if not scores:
+        return 0
+    values = ", ".join(["(%s, %s)"] * len(scores))
+    params = [param for item in scores.items() for param in item]
+    sql = (
+        f"UPDATE {Game._meta.db_table} AS g SET popularity_score = v.score::double precision "
+        f"FROM (VALUES {values}) AS v(id, score) "
+        "WHERE g.id = v.id::bigint AND g.popularity_score IS DISTINCT FROM v.score::double precision"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def _active_game_ids(since: datetime) -> list[int]:
+    """Jeux ayant une activité locale ou un igdb_rating_count modifié depuis `since`."""
+    active = [
+        model.objects.filter(**{f"{date_field}__gte": since}).order_by().values_list("game_id", flat=True)
+        for model, date_field, _ in _ACTIVITY_SOURCES
+    ]
+    counted = Game.objects.filter(igdb_rating_count_updated_at__gte=since).order_by().values_list("pk", flat=True)
+    return sorted(counted.union(*active))
+
+
+def _batches(game_ids: Iterable[int] | None, batch_size: int) -> Iterator[list[int]]:
+    if game_ids is not None:
+        game_ids = list(game_ids)
+        for start in range(0, len(game_ids), batch_size):
+            yield game_ids[start : start + batch_size]
+        return
+    after = 0
+    while batch := list(Game.objects.filter(pk__gt=after).order_by("pk").values_list("pk", flat=True)[:batch_size]):
+        after = batch[-1]
+        yield batch
+
+
+def rescore_popularity(*, full: bool = False, batch_size: int = POPULARITY_BATCH_SIZE, now: datetime | None = None) -> tuple[int, int]:
+    """
+    Recalcule popularity_score des jeux actifs depuis le dernier passage (tous les jeux si `full` ou au premier
+    passage), puis avance le point de reprise (IgdbSyncState `popularity`, watermark = début du passage).
+    Retourne (jeux recalculés, jeux dont le score a changé).
+    """
+    now = now or dj_timezone.now()
+    state, _ = IgdbSyncState.objects.get_or_create(name=POPULARITY_STATE_NAME)
+    game_ids = None
+    if not full and state.watermark:
+        since = datetime.fromtimestamp(state.watermark, tz=timezone.utc) - POPULARITY_OVERLAP
+        game_ids = _active_game_ids(since)
+
+    rescored = changed = 0
+    for batch in _batches(game_ids, max(batch_size, 1)):
+        changed += write_scores(compute_scores(batch, now))
+        rescored += len(batch)
+
+    state.watermark = int(now.timestamp())
+    state.games_synced = F("games_synced") + rescored
+    state.save(update_fields=["watermark", "games_synced", "updated_at"])
+    logger.info("Popularité: %d jeu(x) recalculé(s), %d modifié(s).", rescored, changed)
+    return rescored, changed
@@ -1,7 +1,8 @@
+from django.db import models
 from rest_framework import serializers
 
-from apps.games.models import Game, GameScreenshot, GameVideo, Genre, Platform, Publisher, Rating
-from apps.library.models import UserGame, UserLibrary
+from apps.games.models import Collection, Franchise, Game, GameScreenshot, GameVideo, Genre, Platform, Publisher, Rating
+from apps.games.user_overlays import game_overlay_loader
 from apps.library.serializers import GenreSerializer, PlatformSerializer, PublisherSerializer
 
 
@@ -19,6 +20,37 @@ class GameVideoSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "video_id"]
 
 
+class CollectionSerializer(serializers.ModelSerializer):
+    """Série IGDB au format du proxy (`id` = identifiant IGDB)."""
+
+    id = serializers.ReadOnlyField(source="igdb_id")
+
+    class Meta:
+        model = Collection
+        fields = ["id", "name"]
+
+
+class FranchiseSerializer(serializers.ModelSerializer):
+    """Franchise IGDB au format du proxy (`id` = identifiant IGDB)."""
+
+    id = serializers.ReadOnlyField(source="igdb_id")
+
+    class Meta:
+        model = Franchise
+        fields = ["id", "name"]
+
+
+class GameListSerializer(serializers.ListSerializer):
+    """Annonce tous les jeux de la liste au chargeur de la requête avant de les sérialiser (un seul lot)."""
+
+    def to_representation(self, data):
+        games = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        loader = self.child._get_overlay_loader()
+        if loader is not None:
+            loader.prime(game.id for game in games)
+        return super().to_representation(games)
+
+
 class GameReadSerializer(serializers.ModelSerializer):
     django_id = serializers.ReadOnlyField(source="id")
     summary = serializers.ReadOnlyField(source="description")
@@ -26,8 +58,8 @@ class GameReadSerializer(serializers.ModelSerializer):
     publisher = PublisherSerializer()
     genres = GenreSerializer(many=True)
     platforms = PlatformSerializer(many=True)
-    collections = serializers.ReadOnlyField(default=[])
-    franchises = serializers.ReadOnlyField(default=[])
+    collections = CollectionSerializer(many=True, read_only=True)
+    franchises = FranchiseSerializer(many=True, read_only=True)
     user_library = serializers.SerializerMethodField()
     user_rating = serializers.SerializerMethodField()
     screenshots = GameScreenshotSerializer(many=True, read_only=True)
@@ -64,6 +96,7 @@ class GameReadSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        list_serializer_class = GameListSerializer
 
     def get_name(self, obj: Game) -> str:
         """Retourne name_fr en priorité, sinon name."""
@@ -78,50 +111,18 @@ class GameReadSerializer(serializers.ModelSerializer):
             return None
         return user
 
-    def get_user_library(self, obj: Game):
-        user = self._get_request_user()
-        if user is None:
-            return None
-
-        # On essaie d'abord via l'attribut pré-chargé (prefetch_related)
-        user_games = getattr(obj, "prefetched_user_games", None)
-        if user_games is not None:
-            user_game = next((ug for ug in user_games if ug.user_id == user.id), None)
-        else:
-            user_game = UserGame.objects.filter(user=user, game=obj).first()
-
-        if user_game is None:
+    def _get_overlay_loader(self):
+        if self._get_request_user() is None:
             return None
+        return game_overlay_loader(self.context["request"])
 
-        collection_ids = list(
-            user_game.library_entries.exclude(library__system_key=UserLibrary.SystemKey.MA_LUDOTHEQUE).values_list("library_id", flat=True)
-        )
-        return {
-            "id": user_game.id,
-            "status": user_game.status,
-            "is_favorite": user_game.is_favorite,
-            "collection_ids": collection_ids,
-        }
+    def get_user_library(self, obj: Game):
+        loader = self._get_overlay_loader()
+        return loader.user_library(obj.id) if loader is not None else None
 
     def get_user_rating(self, obj: Game):
-        user = self._get_request_user()
-        if user is None:
-            return None
-
-        # On essaie d'abord via l'attribut pré-chargé (prefetch_related)
-        user_ratings = getattr(obj, "prefetched_user_ratings", None)
-        if user_ratings is not None:
-            rating = next((r for r in user_ratings if r.user_id == user.id), None)
-        else:
-            rating = Rating.objects.filter(user=user, game=obj).first()
-
-        if rating is None:
-            return None
-
-        return {
-            "value": float(rating.value),
-            "rating_type": rating.rating_type,
-        }
+        loader = self._get_overlay_loader()
+        return loader.user_rating(obj.id) if loader is not None else None
 
 
 class GameDetailSerializer(GameReadSerializer):
@@ -1,6 +1,8 @@
 from datetime import date
 from typing import Optional
 
+from django.db import transaction
+
 from apps.games.models import Game, GameScreenshot, GameVideo, Genre, Platform, Publisher
 
 
@@ -39,107 +41,170 @@ def _build_game_defaults(
     return defaults
 
 
-def _heal_game_metadata(
-    game: Game,
-    name: Optional[str] = None,
-    cover_url: Optional[str] = None,
-    release_date: Optional[date] = None,
-    summary: Optional[str] = None,
-) -> None:
-    """Update fields on an existing game if they are missing (Stub Healing)."""
-    update_fields = []
-
-    if not game.description and summary:
-        game.description = summary
-        update_fields.append("description")
+_HEALABLE_FIELDS = ("description", "cover_url", "release_date")
 
-    if not game.cover_url and cover_url:
-        game.cover_url = cover_url
-        update_fields.append("cover_url")
 
-    if not game.release_date and release_date:
-        game.release_date = release_date
-        update_fields.append("release_date")
+def _heal_game_fields(game: Game, data: dict) -> set[str]:
+    """Fill missing fields on an existing game (Stub Healing); returns the modified field names."""
+    changed = set()
+    for field, value in (("description", data.get("summary")), ("cover_url", data.get("cover_url")), ("release_date", data.get("release_date"))):
+        if not getattr(game, field) and value:
+            setattr(game, field, value)
+            changed.add(field)
 
+    name = data.get("name")
     if name and (not game.name or game.name.startswith("Unknown Game")):
         game.name = name
-        update_fields.append("name")
-
-    if update_fields:
-        game.save(update_fields=update_fields)
-
-
-def _heal_player_counts(
-    game: Game,
-    min_players: Optional[int],
-    max_players: Optional[int],
-) -> None:
-    update_fields = []
-    if game.min_players is None and min_players is not None:
-        game.min_players = min_players
-        update_fields.append("min_players")
-    if game.max_players is None and max_players is not None:
-        game.max_players = max_players
-        update_fields.append("max_players")
-    if update_fields:
-        game.save(update_fields=update_fields)
-
-
-def _link_igdb_platforms(game: Game, platforms: list[dict]) -> None:
-    """Create platforms if needed and link them to the game."""
-    for p_data in platforms:
-        p_id = p_data.get("id")
-        p_name = p_data.get("name")
-        if p_name:
-            p_obj, _ = Platform.objects.get_or_create(
-                igdb_id=p_id,
-                defaults={"name": p_name},
-            )
-            game.platforms.add(p_obj)
-
-
-def _link_igdb_genres(game: Game, genres: list[dict]) -> None:
-    """Create genres if needed and link them to the game."""
-    for g_data in genres:
-        g_id = g_data.get("id")
-        g_name = g_data.get("name")
-        if g_name:
-            g_obj, _ = Genre.objects.get_or_create(
-                igdb_id=g_id,
-                defaults={"name": g_name},
-            )
-            game.genres.add(g_obj)
-
-
-def _sync_igdb_screenshots(game: Game, screenshots: list[dict]) -> None:
-    """Replace all screenshots for the game with the provided list."""
-    game.screenshots.all().delete()
-    for index, s_data in enumerate(screenshots):
-        url = s_data.get("url")
-        igdb_id = s_data.get("id")
-        if url:
-            GameScreenshot.objects.create(
-                game=game,
-                url=url,
-                position=index,
-                igdb_id=igdb_id,
-            )
+        changed.add("name")
+
+    for field in ("min_players", "max_players"):
+        if getattr(game, field) is None and data.get(field) is not None:
+            setattr(game, field, data[field])
+            changed.add(field)
+    return changed
+
+
+def _resolve_igdb_terms(model, items_by_igdb_id: dict[int, str]) -> dict[int, int]:
+    """
+    Return {igdb_id: pk} for IGDB-named rows (Genre, Platform, Collection, Franchise, Publisher), creating the
+    missing ones in one statement (name conflicts are ignored). Shared with the catalogue mirror (igdb_mirror).
+    """
+    if not items_by_igdb_id:
+        return {}
+    max_length = model._meta.get_field("name").max_length
+    existing = set(model.objects.filter(igdb_id__in=items_by_igdb_id).values_list("igdb_id", flat=True))
+    missing = [model(igdb_id=igdb_id, name=name.strip()[:max_length]) for igdb_id, name in items_by_igdb_id.items() if igdb_id not in existing]
+    if missing:
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+    return dict(model.objects.filter(igdb_id__in=items_by_igdb_id).values_list("igdb_id", "pk"))
+
+
+def _link_igdb_terms(through, column: str, games: dict[int, Game], payloads: dict[int, dict], key: str, model) -> None:
+    """Link platforms / genres (missing ones are created) to the games, without removing existing links."""
+    terms = {t["id"]: t["name"] for data in payloads.values() for t in data.get(key) or [] if t.get("id") and t.get("name")}
+    pks = _resolve_igdb_terms(model, terms)
+    rows = {
+        (games[igdb_id].pk, pks[t["id"]]) for igdb_id, data in payloads.items() for t in data.get(key) or [] if t.get("id") in pks and t.get("name")
+    }
+    through.objects.bulk_create([through(game_id=game_pk, **{column: term_pk}) for game_pk, term_pk in rows], ignore_conflicts=True)
+
+
+def _sync_igdb_screenshots(games: dict[int, Game], payloads: dict[int, dict]) -> None:
+    """Align each game's screenshots with the provided list (by url): delete, create and reorder only what changed."""
+    wanted = {games[igdb_id].pk: data["screenshots"] for igdb_id, data in payloads.items() if data.get("screenshots") is not None}
+    if not wanted:
+        return
+    existing: dict[tuple[int, str], GameScreenshot] = {}
+    stale = []
+    for shot in GameScreenshot.objects.filter(game_id__in=wanted):
+        if (shot.game_id, shot.url) in existing:
+            stale.append(shot.pk)
+        else:
+            existing[(shot.game_id, shot.url)] = shot
+
+    to_create, to_update, kept = [], [], set()
+    for game_pk, screenshots in wanted.items():
+        urls = list(dict.fromkeys(s_data.get("url") for s_data in screenshots if s_data.get("url")))
+        igdb_ids = {s_data.get("url"): s_data.get("id") for s_data in screenshots if s_data.get("url")}
+        for position, url in enumerate(urls):
+            shot = existing.get((game_pk, url))
+            if shot is None:
+                to_create.append(GameScreenshot(game_id=game_pk, url=url, position=position, igdb_id=igdb_ids[url]))
+                continue
+            kept.add(shot.pk)
+            if (shot.position, shot.igdb_id) != (position, igdb_ids[url]):
+                shot.position, shot.igdb_id = position, igdb_ids[url]
+                to_update.append(shot)
+    stale.extend(shot.pk for shot in existing.values() if shot.pk not in kept)
+
+    if stale:
+        GameScreenshot.objects.filter(pk__in=stale).delete()
+    GameScreenshot.objects.bulk_create(to_create)
+    if to_update:
+        GameScreenshot.objects.bulk_update(to_update, ["position", "igdb_id"])
+
+
+def _sync_igdb_videos(games: dict[int, Game], payloads: dict[int, dict]) -> None:
+    """Align each game's videos with the provided list (by IGDB video id): delete, create and update only what changed."""
+    wanted = {games[igdb_id].pk: data["videos"] for igdb_id, data in payloads.items() if data.get("videos") is not None}
+    if not wanted:
+        return
+    existing = {(v.game_id, v.igdb_id): v for v in GameVideo.objects.filter(game_id__in=wanted)}
+
+    to_create, to_update, kept = [], [], set()
+    for game_pk, videos in wanted.items():
+        for v_data in videos:
+            v_id, youtube_id, name = v_data.get("id"), v_data.get("video_id"), v_data.get("name") or ""
+            if not v_id or not youtube_id or (game_pk, v_id) in kept:
+                continue
+            kept.add((game_pk, v_id))
+            video = existing.get((game_pk, v_id))
+            if video is None:
+                to_create.append(GameVideo(game_id=game_pk, igdb_id=v_id, name=name, video_id=youtube_id))
+            elif (video.name, video.video_id) != (name, youtube_id):
+                video.name, video.video_id = name, youtube_id
+                to_update.append(video)
+
+    stale = [v.pk for key, v in existing.items() if key not in kept]
+    if stale:
+        GameVideo.objects.filter(pk__in=stale).delete()
+    GameVideo.objects.bulk_create(to_create)
+    if to_update:
+        GameVideo.objects.bulk_update(to_update, ["name", "video_id"])
+
+
+def upsert_games_from_igdb(igdb_games: list[dict]) -> tuple[dict[int, Game], set[int]]:
+    """
+    Bulk variant of get_or_create_game_from_igdb, for a list of normalized IGDB games
+    (keys igdb_id, name, cover_url, release_date, summary, platforms, genres, screenshots, videos,
+    min_players, max_players; a missing key leaves the field untouched).
 
+    Same rules as the single-game version (missing fields are healed, platforms / genres are only added,
+    screenshots / videos are aligned when provided) in a constant number of statements whatever the list size.
+    Returns ({igdb_id: Game}, igdb_ids created).
+    """
+    payloads: dict[int, dict] = {}
+    for data in igdb_games:
+        if data.get("igdb_id"):
+            payloads.setdefault(int(data["igdb_id"]), data)
+    if not payloads:
+        return {}, set()
+    with transaction.atomic():
+        return _upsert_games(payloads)
 
-def _sync_igdb_videos(game: Game, videos: list[dict]) -> None:
-    """Replace all videos for the game with the provided list."""
-    game.game_videos.all().delete()
-    for v_data in videos:
-        v_id = v_data.get("id")
-        v_name = v_data.get("name")
-        v_youtube_id = v_data.get("video_id")
-        if v_youtube_id:
-            GameVideo.objects.create(
-                game=game,
-                igdb_id=v_id,
-                name=v_name or "",
-                video_id=v_youtube_id,
+
+def _upsert_games(payloads: dict[int, dict]) -> tuple[dict[int, Game], set[int]]:
+    publisher = _get_igdb_publisher()
+    games = {game.igdb_id: game for game in Game.objects.filter(igdb_id__in=payloads)}
+    new_ids = [igdb_id for igdb_id in payloads if igdb_id not in games]
+
+    healed, fields = [], set()
+    for igdb_id, game in games.items():
+        changed = _heal_game_fields(game, payloads[igdb_id])
+        if changed:
+            healed.append(game)
+            fields |= changed
+    if healed:
+        Game.objects.bulk_update(healed, sorted(fields))
+
+    if new_ids:
+        new_games = []
+        for igdb_id in new_ids:
+            data = payloads[igdb_id]
+            defaults = _build_game_defaults(
+                publisher, igdb_id, data.get("name"), data.get("cover_url"), data.get("release_date"), data.get("summary")
             )
+            new_games.append(Game(igdb_id=igdb_id, min_players=data.get("min_players"), max_players=data.get("max_players"), **defaults))
+        # ignore_conflicts: a concurrent import of the same game must not fail the whole batch
+        Game.objects.bulk_create(new_games, ignore_conflicts=True)
+        games.update({game.igdb_id: game for game in Game.objects.filter(igdb_id__in=new_ids)})
+
+    _link_igdb_terms(Game.platforms.through, "platform_id", games, payloads, "platforms", Platform)
+    _link_igdb_terms(Game.genres.through, "genre_id", games, payloads, "genres", Genre)
+    _sync_igdb_screenshots(games, payloads)
+    _sync_igdb_videos(games, payloads)
+
+    return games, set(new_ids)
 
 
 def get_or_create_game_from_igdb(
@@ -159,48 +224,23 @@ def get_or_create_game_from_igdb(
     """
     Centralized logic to dynamically resolve or create an IGDB game in the local database.
     This aims to be the single source of truth for converting IGDB games to Django Games.
+    Single-game entry point of upsert_games_from_igdb.
     """
-    publisher = _get_igdb_publisher()
-
-    defaults = _build_game_defaults(
-        publisher=publisher,
-        igdb_id=igdb_id,
-        name=name,
-        cover_url=cover_url,
-        release_date=release_date,
-        summary=summary,
+    games, created = upsert_games_from_igdb(
+        [
+            {
+                "igdb_id": igdb_id,
+                "name": name,
+                "cover_url": cover_url,
+                "release_date": release_date,
+                "summary": summary,
+                "platforms": platforms,
+                "genres": genres,
+                "screenshots": screenshots,
+                "videos": videos,
+                "min_players": min_players,
+                "max_players": max_players,
+            }
+        ]
     )
-
-    if min_players is not None:
-        defaults["min_players"] = min_players
-    if max_players is not None:
-        defaults["max_players"] = max_players
-
-    game, created = Game.objects.get_or_create(
-        igdb_id=igdb_id,
-        defaults=defaults,
-    )
-
-    if not created:
-        _heal_game_metadata(
-            game=game,
-            name=name,
-            cover_url=cover_url,
-            release_date=release_date,
-            summary=summary,
-        )
-        _heal_player_counts(game, min_players, max_players)
-
-    if platforms:
-        _link_igdb_platforms(game, platforms)
-
-    if genres:
-        _link_igdb_genres(game, genres)
-
-    if screenshots is not None:
-        _sync_igdb_screenshots(game, screenshots)
-
-    if videos is not None:
-        _sync_igdb_videos(game, videos)
-
-    return game, created
+    return games[igdb_id], igdb_id in created
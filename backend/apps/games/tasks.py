@@ -0,0 +1,105 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from apps.games import healing, igdb_cache, igdb_client, igdb_mirror, igdb_trending, popularity
+from apps.games.igdb_demographics import refresh_stored_demographics
+from apps.games.igdb_wikidata import enrich_with_wikidata_display_name
+from apps.games.models import Game, IgdbGameDemographics
+
+logger = logging.getLogger(__name__)
+
+DEMOGRAPHICS_REFRESH_AFTER = timedelta(days=7)
+DEMOGRAPHICS_REFRESH_BATCH = 2000  # jeux recalculés par exécution (≈ 4 x 3 requêtes IGDB de 500 ids)
+MIRROR_LOCK_KEY = "igdb:mirror:lock"
+MIRROR_LOCK_SECONDS = 30 * 60
+TRENDING_WARMUP_LOCK_KEY = "igdb:trending:warmup:lock"
+POPULARITY_LOCK_KEY = "games:popularity:lock"
+POPULARITY_LOCK_SECONDS = 30 * 60
+
+
+@shared_task(ignore_result=True)
+def persist_games_name_fr(names_fr: list[list]):
+    """
+    Écrit en base les noms français résolus par Wikidata pendant l'enrichissement du proxy IGDB.
+    names_fr : [[igdb_id, name_fr], ...]. Un name_fr déjà renseigné (saisie manuelle, populate_name_fr) n'est pas écrasé.
+    """
+    by_igdb_id = {int(igdb_id): (name_fr or "").strip()[:255] for igdb_id, name_fr in names_fr if (name_fr or "").strip()}
+    games = list(Game.objects.filter(igdb_id__in=by_igdb_id, name_fr=""))
+    for game in games:
+        game.name_fr = by_igdb_id[game.igdb_id]
+    if games:
+        Game.objects.bulk_update(games, ["name_fr"])
+        logger.info("name_fr enregistré pour %d jeu(x).", len(games))
+    return len(games)
+
+
+@shared_task(ignore_result=True)
+def refresh_igdb_demographics(batch_size: int = DEMOGRAPHICS_REFRESH_BATCH):
+    """
+    Tient à jour IgdbGameDemographics : d'abord les jeux importés sans ligne, puis les lignes
+    les plus anciennes (plus de DEMOGRAPHICS_REFRESH_AFTER). Retourne le nombre de jeux traités.
+    """
+    known = IgdbGameDemographics.objects.values("igdb_id")
+    ids = list(Game.objects.filter(igdb_id__isnull=False).exclude(igdb_id__in=known).values_list("igdb_id", flat=True)[:batch_size])
+    if len(ids) < batch_size:
+        stale = IgdbGameDemographics.objects.filter(updated_at__lt=timezone.now() - DEMOGRAPHICS_REFRESH_AFTER).order_by("updated_at")
+        ids.extend(stale.values_list("igdb_id", flat=True)[: batch_size - len(ids)])
+    if not ids:
+        return 0
+
+    updated, deleted = refresh_stored_demographics(igdb_client.igdb_request, ids)
+    logger.info("IgdbGameDemographics: %d jeu(x) rafraîchi(s), %d supprimé(s).", updated, deleted)
+    return len(ids)
+
+
+@shared_task(ignore_result=True)
+def sync_igdb_catalogue(max_pages: int = igdb_mirror.MIRROR_MAX_PAGES):
+    """Avance le miroir incrémental du catalogue IGDB ; une seule exécution à la fois (verrou Redis)."""
+    if not igdb_cache.try_lock(MIRROR_LOCK_KEY, timeout=MIRROR_LOCK_SECONDS):
+        logger.info("Miroir IGDB déjà en cours, exécution ignorée.")
+        return 0
+    try:
+        synced = igdb_mirror.sync_catalogue(igdb_client.igdb_request, max_pages=max_pages)
+    finally:
+        igdb_cache.release_lock(MIRROR_LOCK_KEY)
+    logger.info("Miroir IGDB: %d jeu(x) synchronisé(s).", synced)
+    return synced
+
+
+@shared_task(ignore_result=True)
+def rescore_popularity():
+    """Recalcule popularity_score des jeux actifs depuis le dernier passage ; une seule exécution à la fois (verrou Redis)."""
+    if not igdb_cache.try_lock(POPULARITY_LOCK_KEY, timeout=POPULARITY_LOCK_SECONDS):
+        logger.info("Calcul de popularité déjà en cours, exécution ignorée.")
+        return 0
+    try:
+        rescored, _ = popularity.rescore_popularity()
+    finally:
+        igdb_cache.release_lock(POPULARITY_LOCK_KEY)
+    return rescored
+
+
+@shared_task(ignore_result=True)
+def warm_igdb_trending_cache(top_n: int | None = None):
+    """Re-rend les réponses trending les plus demandées avant leur expiration (voir igdb_trending)."""
+    if not settings.IGDB_TRENDING_WARMUP_ENABLED:
+        return {}
+    if not igdb_cache.try_lock(TRENDING_WARMUP_LOCK_KEY, timeout=igdb_trending.TRENDING_WARMUP_INTERVAL_SECONDS):
+        logger.info("Préchauffage trending déjà en cours, exécution ignorée.")
+        return {}
+    try:
+        return igdb_trending.warm_trending_cache(enrich_with_wikidata_display_name, top_n)
+    finally:
+        igdb_cache.release_lock(TRENDING_WARMUP_LOCK_KEY)
+
+
+@shared_task(ignore_result=True)
+def heal_stub_game(igdb_id: int):
+    """Complète depuis IGDB un jeu stub signalé par une vue de détail (une seule tâche en attente par igdb_id)."""
+    healed = healing.heal_stub_game(igdb_id)
+    logger.info("Complétion du jeu IGDB %s: %s.", igdb_id, "effectuée" if healed else "introuvable sur IGDB")
+    return healed
@@ -5,9 +5,11 @@ avec le modèle CustomUser et les modèles Game/Publisher/Genre/Platform.
 """
 
 import os
+import re
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from apps.games.models import Game, Genre, Platform, Publisher
@@ -27,6 +29,76 @@ def patch_igdb_env_config(monkeypatch):
     monkeypatch.setattr(check_igdb_mod, "env_config", _os_env)
 
 
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """
+    Cache propre au process et vidé à chaque test : les couches de cache (réponses IGDB, traductions, Wikidata,
+    disjoncteurs, préchauffage) restent actives sans rien partager via le Redis de test commun aux workers xdist.
+    """
+    import apps.games.igdb_wikidata as igdb_wikidata_mod
+
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "games-tests"}}
+    cache.clear()
+    igdb_wikidata_mod._wikidata_cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def queued_names_fr(monkeypatch):
+    """Pas de broker Celery en test : les écritures name_fr mises en file sont capturées ici."""
+    from apps.games import tasks
+
+    queued: list[list] = []
+    monkeypatch.setattr(tasks.persist_games_name_fr, "delay", lambda names_fr: queued.extend(names_fr))
+    return queued
+
+
+@pytest.fixture(autouse=True)
+def queued_heals(monkeypatch):
+    """Pas de broker Celery en test : les complétions de jeux stub mises en file sont capturées ici (igdb_id)."""
+    from apps.games import tasks
+
+    queued: list[int] = []
+    monkeypatch.setattr(tasks.heal_stub_game, "delay", queued.append)
+    return queued
+
+
+_MULTIQUERY_BLOCK_RE = re.compile(r'query (\S+) "([^"]+)" \{ (.*?) \};(?:\n|$)', re.DOTALL)
+
+
+def igdb_multiquery_aware(fake_igdb_request):
+    """
+    Enveloppe un faux igdb_request « une requête à la fois » pour qu'il réponde aussi à /multiquery :
+    chaque sous-requête est rejouée sur le faux et la réponse reprend le format IGDB (result / count).
+    """
+
+    def _request(endpoint, query):
+        if endpoint != "multiquery":
+            return fake_igdb_request(endpoint, query)
+        out = []
+        for sub_endpoint, name, body in _MULTIQUERY_BLOCK_RE.findall(query):
+            data = fake_igdb_request(sub_endpoint, body)
+            if sub_endpoint.endswith("/count"):
+                out.append({"name": name, "count": data.get("count", 0) if isinstance(data, dict) else 0})
+            else:
+                out.append({"name": name, "result": data if isinstance(data, list) else []})
+        return out
+
+    return _request
+
+
+def patch_igdb_request(monkeypatch, fake_igdb_request):
+    """Remplace igdb_request et aigdb_request (vues asynchrones) par un même faux compatible /multiquery."""
+    sync_fake = igdb_multiquery_aware(fake_igdb_request)
+
+    async def async_fake(endpoint, query):
+        return sync_fake(endpoint, query)
+
+    monkeypatch.setattr("apps.games.igdb_client.igdb_request", sync_fake)
+    monkeypatch.setattr("apps.games.igdb_client.aigdb_request", async_fake)
+
+
 @pytest.fixture
 def api_client():
     """Client DRF simple sans authentification"""
@@ -16,7 +16,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
-from apps.games.models import Game, Rating
+from apps.games.models import Collection, Franchise, Game, Rating
 from apps.library.models import UserGame
 
 # ---------------------------------------------------------------------------
@@ -79,6 +79,16 @@ class TestGameByIgdbIdView:
         assert data["user_library"] is None
         assert data["user_rating"] is None
 
+    def test_game_in_db_exposes_mirrored_collections_and_franchises(self, api_client, game):
+        """Séries / franchises stockées par le miroir, au format du proxy (id IGDB)."""
+        game.collections.add(Collection.objects.create(igdb_id=55, name="Série"))
+        game.franchises.add(Franchise.objects.create(igdb_id=66, name="Franchise"))
+
+        response = api_client.get(self._url(game.igdb_id))
+
+        assert response.data["collections"] == [{"id": 55, "name": "Série"}]
+        assert response.data["franchises"] == [{"id": 66, "name": "Franchise"}]
+
     # -----------------------------------------------------------------------
     # Case 2: Game exists in DB + authenticated user with library/rating data
     # -----------------------------------------------------------------------
@@ -460,3 +460,17 @@ class TestGameFilterSearch:
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 4
+
+    def test_filter_search_orders_by_relevance_by_default(self, api_client, publisher_test):
+        """Sans ?ordering, ?search classe par pertinence et non par popularité ; ?ordering explicite reste prioritaire."""
+        Game.objects.create(igdb_id=8101, name="Robots Arena", description="", publisher=publisher_test, popularity_score=1.0)
+        Game.objects.create(igdb_id=8102, name="Cave Story", description="A platformer about robots", publisher=publisher_test, popularity_score=50.0)
+
+        response = api_client.get("/api/games/", {"search": "robots"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [g["igdb_id"] for g in response.data["results"]] == [8101, 8102]
+
+        response = api_client.get("/api/games/", {"search": "robots", "ordering": "-popularity_score"})
+
+        assert [g["igdb_id"] for g in response.data["results"]] == [8102, 8101]
@@ -0,0 +1,88 @@
+"""
+Régression des plans de requête des filtres genre / plateforme de GameFilter.
+
+Sur un catalogue seedé de plusieurs milliers de jeux, la forme EXISTS (semi-jointure) ne doit ni
+dédoublonner (Unique / HashAggregate) ni trier l'ensemble joint, contrairement à l'ancienne forme
+JOIN + DISTINCT, et doit renvoyer exactement les mêmes jeux.
+"""
+
+import pytest
+from django.db import connection
+
+from apps.games.filters import GameFilter
+from apps.games.models import Game, Genre, Platform
+from apps.games.views import GameViewSet
+
+N_GAMES = 4000
+
+
+@pytest.fixture
+def large_catalogue(publisher):
+    genres = Genre.objects.bulk_create([Genre(igdb_id=91000 + i, name=f"Seed genre {i}") for i in range(12)])
+    platforms = Platform.objects.bulk_create([Platform(igdb_id=92000 + i, name=f"Seed platform {i}") for i in range(6)])
+    games = Game.objects.bulk_create(
+        [Game(igdb_id=900000 + i, name=f"Seed {i}", publisher=publisher, popularity_score=float(i)) for i in range(N_GAMES)]
+    )
+    Game.genres.through.objects.bulk_create(
+        [Game.genres.through(game_id=g.id, genre_id=genres[(i + k) % 12].id) for i, g in enumerate(games) for k in range(3)]
+    )
+    Game.platforms.through.objects.bulk_create(
+        [Game.platforms.through(game_id=g.id, platform_id=platforms[(i + k) % 6].id) for i, g in enumerate(games) for k in range(2)]
+    )
+    with connection.cursor() as cursor:
+        for table in ("games_game", Game.genres.through._meta.db_table, Game.platforms.through._meta.db_table):
+            cursor.execute(f"ANALYZE {table}")
+    return genres, platforms
+
+
+def _plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        return cursor.fetchone()[0][0]["Plan"]
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _deduplicates(plan):
+    return any(node["Node Type"] in ("Unique", "Aggregate") for node in _nodes(plan))
+
+
+@pytest.mark.django_db
+def test_exists_filters_avoid_distinct_and_match_join_results(large_catalogue):
+    genres, platforms = large_catalogue
+    genre_ids, platform_ids = [genres[0].id, genres[1].id], [platforms[0].id]
+    ordered = Game.objects.order_by("-popularity_score")
+
+    join_distinct = ordered.filter(genres__id__in=genre_ids, platforms__id__in=platform_ids).distinct()[:20]
+    exists = GameFilter({"genre": ",".join(map(str, genre_ids)), "platform": str(platform_ids[0])}, queryset=ordered).qs[:20]
+
+    join_plan, exists_plan = _plan(join_distinct), _plan(exists)
+    assert _deduplicates(join_plan)
+    assert not _deduplicates(exists_plan)
+    assert exists_plan["Total Cost"] < join_plan["Total Cost"]
+    assert "DISTINCT" not in str(exists.query) and "EXISTS" in str(exists.query)
+    assert list(exists.values_list("id", flat=True)) == list(join_distinct.values_list("id", flat=True))
+
+
+@pytest.mark.django_db
+def test_unfiltered_catalogue_list_is_not_distinct(large_catalogue):
+    queryset = GameFilter({}, queryset=GameViewSet.queryset.all()).qs[:20]
+
+    assert "DISTINCT" not in str(queryset.query)
+    assert not _deduplicates(_plan(queryset))
+
+
+@pytest.mark.django_db
+def test_api_filter_returns_each_game_once(api_client, large_catalogue):
+    genres, _platforms = large_catalogue
+
+    response = api_client.get("/api/games/", {"genre": f"{genres[0].id},{genres[1].id},{genres[2].id}", "with_count": "1", "pagination": "cursor"})
+
+    ids = [game["id"] for game in response.data["results"]]
+    assert len(ids) == len(set(ids)) == 10
+    assert response.data["count"] == Game.objects.filter(genres__in=genres[:3]).distinct().count()
@@ -0,0 +1,122 @@
+"""
+Tests de la pagination par curseur (keyset) de /api/games/ (?pagination=cursor).
+"""
+
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.games.models import Game
+
+URL = "/api/games/"
+
+
+@pytest.fixture
+def catalogue(publisher):
+    """25 jeux, scores de popularité avec ex æquo, une date de sortie sur trois manquante."""
+    games = []
+    for i in range(25):
+        games.append(
+            Game.objects.create(
+                igdb_id=70000 + i,
+                name=f"Keyset {i:02d}",
+                publisher=publisher,
+                popularity_score=float(i // 3),
+                release_date=None if i % 3 == 0 else datetime.date(2000 + i % 7, 1, 1),
+            )
+        )
+    return games
+
+
+def _expected_ids(ordering):
+    field = ordering.lstrip("-")
+    direction = "-" if ordering.startswith("-") else ""
+    return list(Game.objects.order_by(f"{direction}{field}", f"{direction}id").values_list("id", flat=True))
+
+
+def _walk_forward(api_client, params):
+    ids, pages, url = [], [], URL
+    response = api_client.get(url, params)
+    while True:
+        assert response.status_code == 200
+        pages.append(response.data)
+        ids.extend(game["id"] for game in response.data["results"])
+        if not response.data["next"]:
+            return ids, pages
+        response = api_client.get(response.data["next"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["-popularity_score", "popularity_score", "-release_date", "release_date", "rating_count"])
+def test_forward_walk_is_complete_and_stable(api_client, catalogue, ordering):
+    ids, pages = _walk_forward(api_client, {"pagination": "cursor", "page_size": 7, "ordering": ordering})
+
+    assert ids == _expected_ids(ordering)
+    assert len(pages) == 4
+    assert pages[0]["previous"] is None
+    assert "count" not in pages[0]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["-popularity_score", "release_date"])
+def test_backward_walk_returns_previous_pages(api_client, catalogue, ordering):
+    _ids, pages = _walk_forward(api_client, {"pagination": "cursor", "page_size": 7, "ordering": ordering})
+
+    response = api_client.get(pages[-1]["previous"])
+    assert response.data["results"] == pages[-2]["results"]
+    response = api_client.get(response.data["previous"])
+    response = api_client.get(response.data["previous"])
+
+    assert response.data["results"] == pages[0]["results"]
+    assert response.data["previous"] is None
+    assert api_client.get(response.data["next"]).data["results"] == pages[1]["results"]
+
+
+@pytest.mark.django_db
+def test_insertions_do_not_shift_the_next_page(api_client, catalogue):
+    first = api_client.get(URL, {"pagination": "cursor", "page_size": 5}).data
+    Game.objects.create(igdb_id=79999, name="Nouveau en tête", publisher=catalogue[0].publisher, popularity_score=100.0)
+
+    second = api_client.get(first["next"]).data
+
+    assert second["results"][0]["id"] == _expected_ids("-popularity_score")[6]
+
+
+@pytest.mark.django_db
+def test_count_only_on_request_and_no_offset(api_client, catalogue):
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(URL, {"pagination": "cursor", "page_size": 5})
+    assert not any("COUNT(" in q["sql"] for q in ctx.captured_queries)
+    assert not any("OFFSET" in q["sql"] for q in ctx.captured_queries)
+
+    response = api_client.get(URL, {"pagination": "cursor", "with_count": "1"})
+    assert response.data["count"] == 25
+
+
+@pytest.mark.django_db
+def test_cursor_for_another_ordering_or_garbage_is_rejected(api_client, catalogue):
+    first = api_client.get(URL, {"pagination": "cursor", "page_size": 5}).data
+    cursor = first["next"].split("cursor=")[1].split("&")[0]
+
+    assert api_client.get(URL, {"cursor": cursor, "ordering": "release_date"}).status_code == 404
+    assert api_client.get(URL, {"cursor": "pas-un-curseur"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_search_needs_an_explicit_ordering(api_client, catalogue):
+    rejected = api_client.get(URL, {"pagination": "cursor", "search": "Keyset"})
+    ordered = api_client.get(URL, {"pagination": "cursor", "search": "Keyset", "ordering": "-popularity_score", "page_size": 5})
+
+    assert rejected.status_code == 400 and "ordering" in rejected.data["errors"]
+    assert ordered.status_code == 200
+    assert [game["id"] for game in ordered.data["results"]] == _expected_ids("-popularity_score")[:5]
+
+
+@pytest.mark.django_db
+def test_default_list_keeps_page_number_pagination(api_client, catalogue):
+    response = api_client.get(URL)
+
+    assert response.data["count"] == 25
+    assert len(response.data["results"]) == 10
@@ -2,20 +2,23 @@ import pytest
 from django.test import override_settings
 from rest_framework import status
 
+from apps.library.models import UserGame
+
 
 @pytest.mark.django_db
 @override_settings(DEBUG=False)
-def test_game_stats_uses_cache(api_client, game):
+def test_game_stats_is_fresh_without_cache(api_client, game, user):
     """
-    Couvre la branche de GameStatsView qui renvoie directement les données en cache.
+    GameStatsView lit la projection GameStats : une écriture est visible dès l'appel suivant, sans cache à invalider.
     """
     url = f"/api/games/{game.id}/stats/"
 
-    # Premier appel : pas de cache, la vue calcule et stocke les données
     response1 = api_client.get(url)
     assert response1.status_code == status.HTTP_200_OK
+    assert response1.data["owners_count"] == 0
+
+    UserGame.objects.create(user=user, game=game)
 
-    # Second appel : doit retourner les données directement depuis le cache
     response2 = api_client.get(url)
     assert response2.status_code == status.HTTP_200_OK
-    assert response2.data == response1.data
+    assert response2.data["owners_count"] == 1
@@ -5,6 +5,7 @@ from django.core.exceptions import ImproperlyConfigured
 from django.urls import reverse
 from rest_framework import status
 
+from apps.games.healing import heal_stub_game
 from apps.games.models import Game, Publisher
 from apps.games.services import get_or_create_game_from_igdb
 
@@ -32,8 +33,8 @@ class TestHealingAndErrorBoundaries:
         assert str(game.release_date) == "2022-02-22"
         assert game.description == "Now it has a summary too."
 
-    # --- 2. View-level healing via PK (GameViewSet.retrieve) ---
-    def test_retrieve_by_pk_triggers_healing(self, api_client):
+    # --- 2. View-level healing via PK (GameViewSet.retrieve) : mise en file, sans appel IGDB ---
+    def test_retrieve_by_pk_queues_healing(self, api_client, queued_heals):
         igdb_id = 22222
         game = Game.objects.create(igdb_id=igdb_id, name=f"Unknown Game ({igdb_id})", publisher=self.publisher)
 
@@ -50,10 +51,17 @@ class TestHealingAndErrorBoundaries:
         ]
 
         url = reverse("games:game-detail", kwargs={"pk": game.id})
-        with patch("apps.games.views.igdb_client.igdb_request", return_value=mock_igdb):
+        with patch("apps.games.views.igdb_client.igdb_request", side_effect=AssertionError("IGDB appelé dans la vue")):
             response = api_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
+        assert response.data["name"] == f"Unknown Game ({igdb_id})"
+        assert response.data["healing"] is True
+        assert queued_heals == [igdb_id]
+
+        # La tâche Celery complète ensuite la fiche
+        with patch("apps.games.views.igdb_client.igdb_request", return_value=mock_igdb):
+            assert heal_stub_game(igdb_id) is True
         game.refresh_from_db()
         assert game.name == "Healed via PK"
         assert game.description == "PK Healing summary."
@@ -101,7 +109,7 @@ class TestHealingAndErrorBoundaries:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["name"] == "Resilient Stub"
 
-    def test_game_by_igdb_id_healing_success(self, api_client):
+    def test_game_by_igdb_id_healing_success(self, api_client, queued_heals):
         igdb_id = 44445
         game = Game.objects.create(igdb_id=igdb_id, name=f"Unknown Game ({igdb_id})", publisher=self.publisher)
         mock_igdb = [
@@ -116,9 +124,14 @@ class TestHealingAndErrorBoundaries:
             }
         ]
         url = reverse("games:game-by-igdb", kwargs={"igdb_id": igdb_id})
-        with patch("apps.games.views.igdb_client.igdb_request", return_value=mock_igdb):
+        with patch("apps.games.views.igdb_client.igdb_request", side_effect=AssertionError("IGDB appelé dans la vue")):
             response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
+        assert response.data["healing"] is True
+        assert queued_heals == [igdb_id]
+
+        with patch("apps.games.views.igdb_client.igdb_request", return_value=mock_igdb):
+            heal_stub_game(igdb_id)
         game.refresh_from_db()
         assert game.description == "Healing summary."
 
@@ -13,6 +13,8 @@ from rest_framework import status
 
 from apps.games.igdb_normalizer import normalize_igdb_game
 from apps.games.igdb_proxy_constants import MAX_TRANSLATE_TEXT_LEN
+from apps.games.models import Game
+from apps.games.tests.conftest import patch_igdb_request
 from apps.games.views_igdb import IgdbCollectionGamesView, IgdbFranchiseGamesView, IgdbGameDetailView
 
 
@@ -58,10 +60,7 @@ class TestIgdbProxySearch:
         def mock_enrich(games):
             return [normalize_igdb_game({**g, "display_name": g.get("name"), "name_fr": None, "name_en": g.get("name")}) for g in games]
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb_request,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb_request)
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             mock_enrich,
@@ -82,10 +81,7 @@ class TestIgdbProxySearch:
                 return [{"id": 2, "name": "B", "total_rating_count": 10}]
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -97,10 +93,7 @@ class TestIgdbProxySearch:
         assert ids == {1, 2}
 
     def test_search_non_suggest_simple(self, api_client, mock_enrich, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 3, "name": "X", "total_rating_count": 1}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 3, "name": "X", "total_rating_count": 1}])
         response = api_client.get("/api/igdb/search/", {"q": "x"})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
@@ -115,10 +108,7 @@ class TestIgdbProxySearch:
                 return []
             return [{"id": 7, "name": "Café", "total_rating_count": 3}]
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/search/", {"q": "café"})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
@@ -126,10 +116,7 @@ class TestIgdbProxySearch:
         assert len(calls) == 2
 
     def test_search_igdb_unavailable_returns_empty(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("no token")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("no token")))
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -139,10 +126,7 @@ class TestIgdbProxySearch:
         assert response.data == []
 
     def test_search_other_error_500(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(RuntimeError("network")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("network")))
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -154,37 +138,25 @@ class TestIgdbProxySearch:
 @pytest.mark.django_db
 class TestIgdbProxyGamesList:
     def test_games_list_ok(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 1, "name": "G"}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 1, "name": "G"}])
         response = api_client.get("/api/igdb/games/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data[0]["igdb_id"] == 1
 
     def test_games_list_non_list_response(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: {},
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: {})
         response = api_client.get("/api/igdb/games/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data == []
 
     def test_games_list_improperly_configured_empty(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")))
         response = api_client.get("/api/igdb/games/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data == []
 
     def test_games_list_other_error_500(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(RuntimeError("boom")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("boom")))
         response = api_client.get("/api/igdb/games/")
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -204,20 +176,14 @@ class TestIgdbProxyTrending:
             calls.append(q)
             return [{"id": 1, "name": "T", "total_rating_count": 10}]
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         api_client.get("/api/igdb/trending/")
         assert len(calls) == 2
         api_client.get("/api/igdb/trending/")
         assert len(calls) == 2
 
     def test_trending_enrich_zero(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 1, "name": "N", "total_rating_count": 5}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 1, "name": "N", "total_rating_count": 5}])
         response = api_client.get("/api/igdb/trending/", {"enrich": "0"})
         assert response.status_code == status.HTTP_200_OK
         assert response.data["results"][0]["name"] == "N"
@@ -232,27 +198,18 @@ class TestIgdbProxyTrending:
                 ]
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/trending/", {"genre": "1", "limit": "10"})
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) >= 1
 
     def test_trending_invalid_genre_id_ignored(self, api_client, mock_enrich, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 1, "name": "X", "total_rating_count": 5}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 1, "name": "X", "total_rating_count": 5}])
         response = api_client.get("/api/igdb/trending/", {"genre": "not-int"})
         assert response.status_code == status.HTTP_200_OK
 
     def test_trending_igdb_unavailable_empty(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")))
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -262,10 +219,7 @@ class TestIgdbProxyTrending:
         assert response.data == {"results": [], "total_count": 0}
 
     def test_trending_other_error_500(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(RuntimeError("e")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("e")))
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -277,10 +231,7 @@ class TestIgdbProxyTrending:
 @pytest.mark.django_db
 class TestIgdbProxyGameDetail:
     def test_detail_ok(self, api_client, mock_enrich, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 99, "name": "Detail"}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 99, "name": "Detail"}])
         response = api_client.get("/api/igdb/games/99/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data["igdb_id"] == 99
@@ -291,26 +242,17 @@ class TestIgdbProxyGameDetail:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_detail_not_found(self, api_client, mock_enrich, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [])
         response = api_client.get("/api/igdb/games/999999999/")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_detail_improperly_configured_404(self, api_client, mock_enrich, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")))
         response = api_client.get("/api/igdb/games/1/")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_detail_other_error_500(self, api_client, mock_enrich, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(RuntimeError("x")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("x")))
         response = api_client.get("/api/igdb/games/1/")
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
@@ -318,10 +260,7 @@ class TestIgdbProxyGameDetail:
 @pytest.mark.django_db
 class TestIgdbProxyCollectionFranchise:
     def test_collection_games_ok(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 1}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 1}])
         response = api_client.get("/api/igdb/collections/5/games/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data[0]["igdb_id"] == 1
@@ -331,27 +270,18 @@ class TestIgdbProxyCollectionFranchise:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     def test_collection_improperly_configured(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")))
         response = api_client.get("/api/igdb/collections/1/games/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data == []
 
     def test_collection_error_500(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(RuntimeError("x")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("x")))
         response = api_client.get("/api/igdb/collections/1/games/")
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
     def test_franchise_games_ok(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 2}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 2}])
         response = api_client.get("/api/igdb/franchises/3/games/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data[0]["igdb_id"] == 2
@@ -375,10 +305,7 @@ class TestIgdbProxyFranchisesSearch:
                 return [{"id": 2, "name": "C"}]
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/franchises/", {"q": "mario"})
         assert response.status_code == status.HTTP_200_OK
         types = {item["type"] for item in response.data}
@@ -393,10 +320,7 @@ class TestIgdbProxySearchPage:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_name_match_ok(self, api_client, mock_enrich, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: [{"id": 1, "name": "Z", "total_rating_count": 5}],
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 1, "name": "Z", "total_rating_count": 5}])
         response = api_client.get("/api/igdb/search-page/", {"q": "zelda"})
         assert response.status_code == status.HTTP_200_OK
 
@@ -411,19 +335,13 @@ class TestIgdbProxySearchPage:
                 return [{"id": 9, "name": "S", "total_rating_count": 100}]
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/search-page/", {"q": "foo", "offset": "0"})
         assert response.status_code == status.HTTP_200_OK
         assert any("search" in c for c in calls)
 
     def test_search_page_unavailable_empty(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("x")))
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -468,6 +386,21 @@ class TestIgdbProxyTranslate:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["translated"] == "Only chunk"
 
+    @pytest.mark.django_db
+    def test_translate_with_igdb_id_stores_game_summary(self, api_client, monkeypatch, publisher):
+        game = Game.objects.create(igdb_id=501, name="Zelda", description="Hello. World", publisher=publisher)
+
+        def fake_get(url, headers, timeout):
+            return SimpleNamespace(ok=True, json=lambda: {"responseData": {"translatedText": "Bonjour le monde"}})
+
+        monkeypatch.setattr("apps.games.views_igdb_helpers.requests.get", fake_get)
+        response = api_client.post("/api/igdb/translate/", {"text": "Hello. World", "igdb_id": 501}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["translated"] == "Bonjour le monde"
+        game.refresh_from_db()
+        assert game.description_fr == "Bonjour le monde"
+
 
 @pytest.mark.django_db
 class TestIgdbProxyWikidataTest:
@@ -544,10 +477,7 @@ class TestIgdbProxySearchSuggestBranches:
                 return [{"id": 1, "name": "A", "total_rating_count": 10}]
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -564,10 +494,7 @@ class TestIgdbProxySearchSuggestBranches:
                 raise RuntimeError("search igdb down")
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -585,10 +512,7 @@ class TestIgdbProxySearchSuggestBranches:
                 return []
             return [{"id": 7, "name": "G", "total_rating_count": 15}]
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -599,7 +523,7 @@ class TestIgdbProxySearchSuggestBranches:
         assert len(calls) == 3
 
     def test_suggest_fallback_accented_exception_swallowed(self, api_client, monkeypatch):
-        """3ᵉ appel (fallback search normalisé) lève → except pass (l. 254-255)."""
+        """Le search normalisé lève → la multiquery échoue, chaque sous-requête est rejouée seule et l'erreur avalée."""
         calls = []
 
         def mock_igdb(ep, q):
@@ -608,10 +532,7 @@ class TestIgdbProxySearchSuggestBranches:
                 return []
             raise RuntimeError("fallback fail")
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -619,7 +540,7 @@ class TestIgdbProxySearchSuggestBranches:
         response = api_client.get("/api/igdb/search/", {"q": "café", "suggest": "1", "limit": "2"})
         assert response.status_code == status.HTTP_200_OK
         assert response.data == []
-        assert len(calls) == 3
+        assert len(calls) == 6
 
 
 @pytest.mark.django_db
@@ -632,10 +553,7 @@ class TestIgdbProxyFranchisesSearchExceptions:
                 return [{"id": 10, "name": "Col"}]
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/franchises/", {"q": "mario"})
         assert response.status_code == status.HTTP_200_OK
         assert any(x.get("type") == "collection" for x in response.data)
@@ -648,10 +566,7 @@ class TestIgdbProxyFranchisesSearchExceptions:
                 raise RuntimeError("col down")
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/franchises/", {"q": "x"})
         assert response.status_code == status.HTTP_200_OK
         assert any(x.get("type") == "franchise" for x in response.data)
@@ -660,19 +575,13 @@ class TestIgdbProxyFranchisesSearchExceptions:
 @pytest.mark.django_db
 class TestIgdbProxyFranchise500:
     def test_franchise_games_500(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(RuntimeError("igdb")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("igdb")))
         response = api_client.get("/api/igdb/franchises/1/games/")
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
     def test_franchise_games_improperly_configured_returns_empty(self, api_client, monkeypatch):
         """Branche _is_igdb_unavailable → Response([]) (l. 372-373)."""
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("no creds")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(ImproperlyConfigured("no creds")))
         response = api_client.get("/api/igdb/franchises/1/games/")
         assert response.status_code == status.HTTP_200_OK
         assert response.data == []
@@ -691,10 +600,7 @@ class TestIgdbProxySearchPageExtra:
                 return [{"id": 3, "name": "Café", "total_rating_count": 8}]
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/search-page/", {"q": "café"})
         assert response.status_code == status.HTTP_200_OK
         assert response.data["results"][0]["igdb_id"] == 3
@@ -707,19 +613,13 @@ class TestIgdbProxySearchPageExtra:
                 raise RuntimeError("search inner")
             return []
 
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            mock_igdb,
-        )
+        patch_igdb_request(monkeypatch, mock_igdb)
         response = api_client.get("/api/igdb/search-page/", {"q": "foo", "offset": "0"})
         assert response.status_code == status.HTTP_200_OK
         assert response.data == {"results": [], "total_count": 0}
 
     def test_outer_exception_500(self, api_client, monkeypatch):
-        monkeypatch.setattr(
-            "apps.games.views_igdb.igdb_client.igdb_request",
-            lambda ep, q: (_ for _ in ()).throw(RuntimeError("outer")),
-        )
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("outer")))
         monkeypatch.setattr(
             "apps.games.views_igdb.enrich_with_wikidata_display_name",
             _enrich_stub,
@@ -824,7 +724,7 @@ class TestIgdbProxyCoverageHelpers:
             calls.append(q)
             return [{"id": 1, "name": "Filtered Game", "total_rating_count": 10}]
 
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", mock_igdb)
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
 
         params = {
@@ -840,11 +740,11 @@ class TestIgdbProxyCoverageHelpers:
         response = api_client.get("/api/igdb/search-page/", params)
         assert response.status_code == status.HTTP_200_OK
 
-        last_query = calls[-1]
-        assert "themes = (1) | themes = (2)" in last_query
-        assert "game_modes = (3)" in last_query
-        assert "player_perspectives = (4)" in last_query
-        assert "total_rating >= 80.5" in last_query
+        name_query = next(c for c in calls if "name ~" in c)
+        assert "themes = (1) | themes = (2)" in name_query
+        assert "game_modes = (3)" in name_query
+        assert "player_perspectives = (4)" in name_query
+        assert "total_rating >= 80.5" in name_query
 
     def test_search_suggest_with_manual_filters_coverage(self, api_client, monkeypatch):
         """Couvre _apply_raw_list_filters (filtrage manuel post-search)"""
@@ -852,7 +752,7 @@ class TestIgdbProxyCoverageHelpers:
         def mock_igdb(ep, q):
             return [{"id": 1, "name": "G", "themes": [10], "total_rating": 50, "first_release_date": 1000, "total_rating_count": 100}]
 
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", mock_igdb)
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
         params = {"q": "t", "suggest": "1", "theme": "1", "min_rating": "80"}
         response = api_client.get("/api/igdb/search/", params)
@@ -887,7 +787,7 @@ class TestIgdbProxyCoverageHelpers:
                 },
             ]
 
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", mock_igdb)
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
         params = {
             "q": "t",
@@ -912,7 +812,7 @@ class TestIgdbProxyCoverageHelpers:
 
         monkeypatch.setitem(TRENDING_SORTS, "complex", "where x=1; sort rating desc;")
         calls = []
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", lambda ep, q: calls.append(q) or [])
+        patch_igdb_request(monkeypatch, lambda ep, q: calls.append(q) or [])
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
         api_client.get("/api/igdb/search-page/", {"q": "test", "sort": "complex"})
         assert any("sort rating desc;" in c for c in calls)
@@ -951,7 +851,7 @@ class TestIgdbProxyCoverageHelpers:
                 return [{"id": 1, "category": 1, "rating": 12}]
             return [{"id": 1, "name": "D", "age_ratings": [1]}]
 
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", mock_igdb)
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
         api_client.get("/api/igdb/trending/", {"min_age": "12", "genre": "4"})
 
@@ -961,7 +861,7 @@ class TestIgdbProxyCoverageHelpers:
                 return [{"id": 1, "category": 1, "rating": 12}]
             return [{"id": 1, "name": "Z", "age_ratings": [1]}]
 
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", mock_igdb)
+        patch_igdb_request(monkeypatch, mock_igdb)
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
         api_client.get("/api/igdb/search-page/", {"q": "z", "min_age": "12", "offset": "0", "limit": "1"})
 
@@ -972,7 +872,7 @@ class TestIgdbProxyCoverageHelpers:
 
     def test_genre_platform_where_platforms_coverage(self, api_client, monkeypatch):
         calls = []
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", lambda ep, q: calls.append(q) or [{"id": 1}])
+        patch_igdb_request(monkeypatch, lambda ep, q: calls.append(q) or [{"id": 1}])
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
         api_client.get("/api/igdb/search-page/", {"q": "t", "platform": "48,49"})
         assert any("platforms = (48) | platforms = (49)" in c for c in calls)
@@ -990,16 +890,65 @@ class TestIgdbProxyCoverageHelpers:
 
         assert "genres" in _fields_with_optional_genres_and_demographics("f1;", True, False)
 
-    def test_trending_fetch_total_count_exception_coverage(self, monkeypatch):
-        from apps.games.views_igdb_helpers import IgdbFilters, trending_fetch_total_count
-
-        assert trending_fetch_total_count(lambda *a, **k: 1 / 0, IgdbFilters()) == 0
-
     def test_igdb_setup_fields_rating_force_coverage(self, api_client, monkeypatch):
         calls = []
-        monkeypatch.setattr("apps.games.views_igdb.igdb_client.igdb_request", lambda ep, q: calls.append(q) or [])
+        patch_igdb_request(monkeypatch, lambda ep, q: calls.append(q) or [])
         monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
         api_client.get("/api/igdb/search/", {"q": "x", "min_rating": "80"})
         # On ne vérifie plus total_rating car il est dans les constantes, mais on vérifie que ça passe
         api_client.get("/api/igdb/search/", {"q": "x", "theme": "1"})
         assert "themes.id" in calls[-1]
+
+
+@pytest.mark.django_db
+class TestIgdbProxyLocalCatalogue:
+    """Trending / séries servis depuis le miroir local quand il est à jour, ou quand IGDB est injoignable."""
+
+    @pytest.fixture(autouse=True)
+    def _local_catalogue(self, monkeypatch, publisher):
+        import time
+
+        from apps.games.igdb_mirror import MIRROR_STATE_NAME
+        from apps.games.models import Collection, IgdbSyncState
+
+        cache.clear()
+        monkeypatch.setattr("apps.games.views_igdb.enrich_with_wikidata_display_name", _enrich_stub)
+        self.state = IgdbSyncState.objects.create(name=MIRROR_STATE_NAME, watermark=int(time.time()))
+        collection = Collection.objects.create(igdb_id=5, name="Série")
+        for igdb_id, count in ((1, 10), (2, 30)):
+            Game.objects.create(igdb_id=igdb_id, name=f"Local {igdb_id}", igdb_rating_count=count, publisher=publisher).collections.add(collection)
+        yield
+        cache.clear()
+
+    def test_trending_served_locally_without_igdb(self, api_client, monkeypatch):
+        patch_igdb_request(monkeypatch, lambda ep, q: pytest.fail("catalogue local à jour : pas d'appel IGDB"))
+        response = api_client.get("/api/igdb/trending/", {"limit": "1"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_count"] == 2
+        assert [g["name"] for g in response.data["results"]] == ["Local 2"]
+        assert response.data["results"][0]["django_id"] is not None
+
+    def test_trending_stale_mirror_asks_igdb(self, api_client, monkeypatch):
+        self.state.watermark = 0
+        self.state.save()
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 9, "name": "IGDB", "total_rating_count": 5}])
+        response = api_client.get("/api/igdb/trending/")
+        assert [g["igdb_id"] for g in response.data["results"]] == [9]
+
+    def test_trending_stale_mirror_covers_igdb_outage(self, api_client, monkeypatch):
+        self.state.watermark = 0
+        self.state.save()
+        patch_igdb_request(monkeypatch, lambda ep, q: (_ for _ in ()).throw(RuntimeError("IGDB down")))
+        response = api_client.get("/api/igdb/trending/", {"limit": "10"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [g["igdb_id"] for g in response.data["results"]] == [2, 1]
+
+    def test_collection_served_locally(self, api_client, monkeypatch):
+        patch_igdb_request(monkeypatch, lambda ep, q: pytest.fail("série connue localement"))
+        response = api_client.get("/api/igdb/collections/5/games/", {"limit": "10"})
+        assert [g["igdb_id"] for g in response.data] == [2, 1]
+
+    def test_unknown_franchise_asks_igdb(self, api_client, monkeypatch):
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": 7}] if "where franchises = (3)" in q else [])
+        response = api_client.get("/api/igdb/franchises/3/games/")
+        assert [g["igdb_id"] for g in response.data] == [7]
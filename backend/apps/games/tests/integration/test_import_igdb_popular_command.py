@@ -18,25 +18,38 @@ def test_import_igdb_popular_creates_games_and_relations(monkeypatch):
         "genres_called": False,
         "platforms_called": False,
         "games_called": False,
-        "involved_called": False,
-        "companies_called": False,
-        "covers_called": False,
-        "age_ratings_called": False,
-        "multiplayer_called": False,
     }
 
+    # Requête développée du miroir : entités liées incluses dans le payload du jeu
     fake_game = {
         "id": 1,
         "name": "Fake IGDB Game",
         "summary": "Description du jeu IGDB.",
         "first_release_date": 1_700_000_000,  # timestamp arbitraire
         "game_status": 0,  # → "released"
-        "genres": [10],
-        "platforms": [20],
-        "involved_companies": [100],
-        "age_ratings": [200],
-        "multiplayer_modes": [300],
-        "cover": 400,
+        "total_rating": 84.0,
+        "total_rating_count": 120,
+        "genres": [{"id": 10, "name": "Action"}],
+        "platforms": [{"id": 20, "name": "PC"}],
+        "collections": [{"id": 30, "name": "Fake Series"}],
+        "franchises": [{"id": 31, "name": "Fake Franchise"}],
+        "involved_companies": [{"id": 100, "publisher": True, "company": {"id": 500, "name": "Fake Publisher"}}],
+        "age_ratings": [{"id": 200, "category": 2, "rating": 4}],  # PEGI 16
+        "multiplayer_modes": [
+            {
+                "id": 300,
+                "offlinemax": 4,
+                "onlinemax": 8,
+                "offlinecoopmax": 2,
+                "onlinecoopmax": 4,
+                "offlinecoop": True,
+                "onlinecoop": False,
+                "campaigncoop": False,
+            }
+        ],
+        "cover": {"id": 400, "url": "//images.igdb.com/igdb/image/upload/t_thumb/fake_cover.jpg"},
+        "screenshots": [{"id": 600, "url": "//images.igdb.com/igdb/image/upload/t_thumb/shot.jpg"}],
+        "videos": [{"id": 700, "name": "Trailer", "video_id": "yt123"}],
     }
 
     def fake_igdb_request(endpoint: str, query: str):
@@ -58,76 +71,14 @@ def test_import_igdb_popular_creates_games_and_relations(monkeypatch):
                 {"id": 20, "name": "PC"},
             ]
 
-        # Jeux : un batch avec un seul jeu
+        # Jeux : un batch avec un seul jeu, entités liées développées
         if endpoint == "games":
+            assert "involved_companies.company.name" in query and "sort id asc" in query
             if state["games_called"]:
                 return []
             state["games_called"] = True
             return [fake_game]
 
-        # Involved companies
-        if endpoint == "involved_companies":
-            state["involved_called"] = True
-            return [
-                {
-                    "id": 100,
-                    "game": 1,
-                    "company": 500,
-                    "developer": False,
-                    "publisher": True,
-                },
-            ]
-
-        # Companies (publishers)
-        if endpoint == "companies":
-            state["companies_called"] = True
-            return [
-                {
-                    "id": 500,
-                    "name": "Fake Publisher",
-                    "description": "Un éditeur de test.",
-                },
-            ]
-
-        # Covers
-        if endpoint == "covers":
-            state["covers_called"] = True
-            return [
-                {
-                    "id": 400,
-                    "url": "//images.igdb.com/igdb/image/upload/t_cover_big/fake_cover.jpg",
-                    "image_id": "fake_cover",
-                },
-            ]
-
-        # Age ratings (PEGI 16 par ex.)
-        if endpoint == "age_ratings":
-            state["age_ratings_called"] = True
-            return [
-                {
-                    "id": 200,
-                    "category": 2,  # PEGI
-                    "rating": 4,  # mappé à 16 ans dans compute_min_age
-                },
-            ]
-
-        # Multiplayer modes
-        if endpoint == "multiplayer_modes":
-            state["multiplayer_called"] = True
-            return [
-                {
-                    "id": 300,
-                    "game": 1,
-                    "offlinemax": 4,
-                    "onlinemax": 8,
-                    "offlinecoopmax": 2,
-                    "onlinecoopmax": 4,
-                    "offlinecoop": True,
-                    "onlinecoop": False,
-                    "campaigncoop": False,
-                },
-            ]
-
         pytest.fail(f"Endpoint IGDB inattendu dans le fake_igdb_request: {endpoint}")
 
     # On monkeypatch l'appel réseau pour ne jamais toucher l'API réelle
@@ -146,11 +97,6 @@ def test_import_igdb_popular_creates_games_and_relations(monkeypatch):
     assert state["genres_called"]
     assert state["platforms_called"]
     assert state["games_called"]
-    assert state["involved_called"]
-    assert state["companies_called"]
-    assert state["covers_called"]
-    assert state["age_ratings_called"]
-    assert state["multiplayer_called"]
 
     # Vérifier la création / mise à jour des entités de base
     genre = Genre.objects.get(igdb_id=10)
@@ -166,12 +112,17 @@ def test_import_igdb_popular_creates_games_and_relations(monkeypatch):
     assert game.name == "Fake IGDB Game"
     assert game.publisher == publisher
 
-    # Relations M2M
+    # Relations M2M et médias (mêmes que le miroir)
     assert list(game.genres.values_list("igdb_id", flat=True)) == [10]
     assert list(game.platforms.values_list("igdb_id", flat=True)) == [20]
+    assert list(game.collections.values_list("igdb_id", flat=True)) == [30]
+    assert list(game.franchises.values_list("igdb_id", flat=True)) == [31]
+    assert list(game.screenshots.values_list("igdb_id", flat=True)) == [600]
+    assert list(game.game_videos.values_list("video_id", flat=True)) == ["yt123"]
 
     # Champs calculés / dérivés
-    assert game.status == "released"  # map_status(0)
+    assert game.status == "released"
+    assert (game.igdb_total_rating, game.igdb_rating_count) == (84.0, 120)
     assert game.cover_url.startswith("https://images.igdb.com/")
     assert game.min_age == 16  # mappé depuis PEGI (rating=4)
     assert game.min_players == 2  # coop détecté
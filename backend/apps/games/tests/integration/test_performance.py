@@ -92,13 +92,14 @@ def test_game_detail_with_many_ratings_is_efficient(django_assert_max_num_querie
 @pytest.mark.django_db
 @pytest.mark.performance
 def test_game_stats_query_count_is_bounded(
-    django_assert_max_num_queries,
+    django_assert_num_queries,
     api_client,
     game,
     user,
 ):
     UserGame.objects.create(user=user, game=game)
 
-    with django_assert_max_num_queries(3):
+    # Une seule lecture par clé primaire (GameStats + Game)
+    with django_assert_num_queries(1):
         response = api_client.get(f"/api/games/{game.id}/stats/")
         assert response.status_code == 200
@@ -0,0 +1,96 @@
+"""
+Coût constant des données utilisateur (user_library, user_rating, collection_ids) sur les listes de jeux :
+le nombre de requêtes ne dépend pas du nombre de jeux, sur /api/games/ comme sur le proxy IGDB.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.games.models import Game, Rating
+from apps.games.tests.conftest import patch_igdb_request
+from apps.games.user_overlays import GameOverlayLoader
+from apps.library.models import UserGame, UserLibrary, UserLibraryEntry
+
+
+@pytest.fixture
+def make_games(user, publisher):
+    favourites = UserLibrary.objects.create(user=user, name="Favoris")
+    system, _ = UserLibrary.objects.get_or_create(user=user, system_key=UserLibrary.SystemKey.MA_LUDOTHEQUE, defaults={"name": "Ma ludothèque"})
+
+    def _make(n, offset=0):
+        games = []
+        for i in range(offset, offset + n):
+            game = Game.objects.create(igdb_id=81000 + i, name=f"Overlay {i}", publisher=publisher, popularity_score=float(i))
+            user_game = UserGame.objects.create(user=user, game=game, is_favorite=True)
+            UserLibraryEntry.objects.get_or_create(library=favourites, user_game=user_game)
+            UserLibraryEntry.objects.get_or_create(library=system, user_game=user_game)
+            Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=7)
+            games.append(game)
+        return games
+
+    _make.favourites = favourites
+    return _make
+
+
+def _count_queries(fn):
+    with CaptureQueriesContext(connection) as ctx:
+        response = fn()
+    assert response.status_code == 200
+    return len(ctx.captured_queries), response
+
+
+@pytest.mark.django_db
+def test_game_list_overlays_cost_constant_queries(authenticated_api_client, make_games):
+    make_games(2)
+    few, _ = _count_queries(lambda: authenticated_api_client.get("/api/games/"))
+    make_games(8, offset=2)
+    many, response = _count_queries(lambda: authenticated_api_client.get("/api/games/"))
+
+    assert many == few
+    assert len(response.data["results"]) == 10
+    first = response.data["results"][0]
+    assert first["user_library"]["collection_ids"] == [make_games.favourites.id]
+    assert first["user_rating"] == {"value": 7.0, "rating_type": Rating.RATING_TYPE_SUR_10}
+
+
+@pytest.mark.django_db
+def test_igdb_proxy_overlays_cost_constant_queries(authenticated_api_client, make_games, monkeypatch):
+    games = make_games(10)
+
+    def _listing(n):
+        patch_igdb_request(monkeypatch, lambda ep, q: [{"id": g.igdb_id, "name": g.name} for g in games[:n]])
+        return _count_queries(lambda: authenticated_api_client.get("/api/igdb/games/"))
+
+    few, _ = _listing(2)
+    many, response = _listing(10)
+
+    assert many == few
+    assert all(g["user_library"]["collection_ids"] == [make_games.favourites.id] for g in response.data)
+    assert all(g["user_rating"]["value"] == 7.0 for g in response.data)
+
+
+@pytest.mark.django_db
+def test_loader_batches_primed_games_and_caches_results(user, make_games, django_assert_num_queries):
+    games = make_games(5)
+    loader = GameOverlayLoader(user)
+    loader.prime(g.id for g in games)
+
+    with django_assert_num_queries(3):
+        libraries = [loader.user_library(g.id) for g in games]
+        ratings = [loader.user_rating(g.id) for g in games]
+
+    assert all(lib["is_favorite"] for lib in libraries)
+    assert all(r["value"] == 7.0 for r in ratings)
+
+
+@pytest.mark.django_db
+def test_anonymous_loader_makes_no_query(make_games, django_assert_num_queries):
+    from django.contrib.auth.models import AnonymousUser
+
+    game = make_games(1)[0]
+    loader = GameOverlayLoader(AnonymousUser())
+
+    with django_assert_num_queries(0):
+        assert loader.user_library(game.id) is None
+        assert loader.user_rating(game.id) is None
@@ -140,7 +140,7 @@ def test_backfill_db_sync_error(mock_igdb_request, game_with_igdb):
     """Test l'erreur lors de la persistance en base locale."""
     mock_igdb_request.return_value = [{"id": 123, "screenshots": [{"id": 1, "url": "url", "image_id": "test_id"}]}]
 
-    with patch("apps.games.management.commands.backfill_game_media.get_or_create_game_from_igdb", side_effect=Exception("DB Error")):
+    with patch("apps.games.management.commands.backfill_game_media.upsert_games_from_igdb", side_effect=Exception("DB Error")):
         out = StringIO()
         call_command("backfill_game_media", stdout=out)
 
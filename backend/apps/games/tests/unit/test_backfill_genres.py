@@ -105,7 +105,7 @@ class TestBackfillGenresCommand:
         """Test la gestion des erreurs lors de la mise à jour en base locale."""
         mock_igdb_request.return_value = [{"id": 123, "genres": [{"id": 1, "name": "Action"}]}]
 
-        with patch("apps.games.management.commands.backfill_genres.get_or_create_game_from_igdb", side_effect=Exception("DB Error")):
+        with patch("apps.games.management.commands.backfill_genres.upsert_games_from_igdb", side_effect=Exception("DB Error")):
             out = StringIO()
             call_command("backfill_genres", stdout=out)
             assert "IGDB 123: error — DB Error" in out.getvalue()
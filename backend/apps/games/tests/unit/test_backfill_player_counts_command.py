@@ -15,53 +15,41 @@ def publisher():
 
 
 @pytest.mark.django_db
-@patch("apps.games.management.commands.backfill_player_counts.time.sleep", return_value=None)
-@patch("apps.games.management.commands.backfill_player_counts.get_or_create_game_from_igdb")
-@patch("apps.games.management.commands.backfill_player_counts.enrich_with_wikidata_display_name")
+@patch("apps.games.management.commands.backfill_player_counts.upsert_games_from_igdb")
 @patch("apps.games.management.commands.backfill_player_counts.igdb_client.igdb_request")
 def test_backfill_player_counts_success_and_skip(
     mock_igdb_request,
-    mock_enrich,
-    mock_get_or_create,
-    _mock_sleep,
+    mock_upsert,
     publisher,
 ):
     """Met a jour les jeux avec data IGDB et skip ceux sans min/max."""
     Game.objects.create(name="Needs Backfill", igdb_id=111, publisher=publisher, max_players=None)
     Game.objects.create(name="Also Needs Backfill", igdb_id=222, publisher=publisher, max_players=None)
 
-    mock_igdb_request.return_value = [{"id": 111}, {"id": 222}]
-    mock_enrich.return_value = [
-        {"igdb_id": 111, "min_players": 1, "max_players": 4},
-        {"igdb_id": 222, "min_players": None, "max_players": None},
-    ]
+    mock_igdb_request.return_value = [{"id": 111, "multiplayer_modes": [{"onlinemax": 4}]}, {"id": 222}]
 
     out = StringIO()
     err = StringIO()
-    call_command("backfill_player_counts", "--batch=50", "--delay=0", stdout=out, stderr=err)
+    call_command("backfill_player_counts", "--batch-size=900", stdout=out, stderr=err)
 
     output = out.getvalue()
     assert "Found 2 games without player count data." in output
     assert "2/2..." in output
     assert "Done. Updated: 1, no IGDB data: 1." in output
 
-    # batch est cappé à 10 dans la commande
+    # la taille de lot est plafonnée à 500 (maximum IGDB)
     sent_query = mock_igdb_request.call_args[0][1]
-    assert "limit 10;" in sent_query
+    assert "limit 2;" in sent_query
     assert "where id = (111,222);" in sent_query
-    mock_get_or_create.assert_called_once_with(igdb_id=111, min_players=1, max_players=4)
+    mock_upsert.assert_called_once_with([{"igdb_id": 111, "min_players": 1, "max_players": 4}])
 
 
 @pytest.mark.django_db
-@patch("apps.games.management.commands.backfill_player_counts.time.sleep", return_value=None)
-@patch("apps.games.management.commands.backfill_player_counts.get_or_create_game_from_igdb")
-@patch("apps.games.management.commands.backfill_player_counts.enrich_with_wikidata_display_name")
+@patch("apps.games.management.commands.backfill_player_counts.upsert_games_from_igdb")
 @patch("apps.games.management.commands.backfill_player_counts.igdb_client.igdb_request")
 def test_backfill_player_counts_handles_batch_errors(
     mock_igdb_request,
-    _mock_enrich,
-    mock_get_or_create,
-    _mock_sleep,
+    mock_upsert,
     publisher,
 ):
     """Une erreur IGDB sur un lot est loggée et la commande continue."""
@@ -71,32 +59,39 @@ def test_backfill_player_counts_handles_batch_errors(
 
     out = StringIO()
     err = StringIO()
-    call_command("backfill_player_counts", "--delay=0", stdout=out, stderr=err)
+    call_command("backfill_player_counts", stdout=out, stderr=err)
 
     assert "Error on batch [333]: IGDB down" in err.getvalue()
     assert "Done. Updated: 0, no IGDB data: 0." in out.getvalue()
-    mock_get_or_create.assert_not_called()
+    mock_upsert.assert_not_called()
 
 
 @pytest.mark.django_db
-@patch("apps.games.management.commands.backfill_player_counts.time.sleep", return_value=None)
-@patch("apps.games.management.commands.backfill_player_counts.get_or_create_game_from_igdb")
-@patch("apps.games.management.commands.backfill_player_counts.enrich_with_wikidata_display_name")
 @patch("apps.games.management.commands.backfill_player_counts.igdb_client.igdb_request")
-def test_backfill_player_counts_respects_limit(
-    mock_igdb_request,
-    mock_enrich,
-    _mock_get_or_create,
-    _mock_sleep,
-    publisher,
-):
+def test_backfill_player_counts_respects_limit(mock_igdb_request, publisher):
     """Le paramètre --limit borne le nombre de jeux traités."""
     Game.objects.create(name="A", igdb_id=901, publisher=publisher, max_players=None)
     Game.objects.create(name="B", igdb_id=902, publisher=publisher, max_players=None)
 
     mock_igdb_request.return_value = [{"id": 901}]
-    mock_enrich.return_value = [{"igdb_id": 901, "min_players": None, "max_players": None}]
 
     out = StringIO()
-    call_command("backfill_player_counts", "--limit=1", "--delay=0", stdout=out)
+    call_command("backfill_player_counts", "--limit=1", stdout=out)
     assert "Found 1 games without player count data." in out.getvalue()
+    assert "where id = (901);" in mock_igdb_request.call_args[0][1]
+
+
+@pytest.mark.django_db
+@patch("apps.games.management.commands.backfill_player_counts.igdb_client.igdb_request")
+def test_backfill_player_counts_writes_in_bulk(mock_igdb_request, publisher):
+    Game.objects.create(name="A", igdb_id=901, publisher=publisher, max_players=None)
+    Game.objects.create(name="B", igdb_id=902, publisher=publisher, max_players=None)
+
+    mock_igdb_request.return_value = [
+        {"id": 901, "multiplayer_modes": [{"offlinemax": 2}]},
+        {"id": 902, "game_modes": [{"name": "Single player"}]},
+    ]
+
+    call_command("backfill_player_counts", stdout=StringIO())
+
+    assert dict(Game.objects.values_list("igdb_id", "max_players")) == {901: 2, 902: 1}
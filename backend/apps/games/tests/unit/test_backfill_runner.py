@@ -0,0 +1,108 @@
+"""Tests du cadre commun des backfills (apps.games.backfill)."""
+
+import threading
+import time
+
+import pytest
+
+from apps.games.backfill import checkpoint_name, run_backfill
+from apps.games.models import Game, IgdbSyncState
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def games(publisher):
+    return Game.objects.bulk_create([Game(igdb_id=64000 + i, name=f"Backfill {i}", publisher=publisher) for i in range(7)])
+
+
+def _fetch(rows):
+    return [row["igdb_id"] for row in rows]
+
+
+def _run(fetch=_fetch, write=None, **kwargs):
+    written = []
+
+    def _write(rows, fetched, dry_run):
+        written.append(fetched)
+        if write is not None:
+            write(rows, fetched)
+        return (len(rows), len(rows), 0)
+
+    stats = run_backfill("test", Game.objects.filter(igdb_id__gte=64000), fetch, _write, **kwargs)
+    return stats, written
+
+
+def test_walks_games_in_keyset_batches_and_writes_in_order(games):
+    stats, written = _run(batch_size=3, workers=3)
+
+    assert written == [[64000, 64001, 64002], [64003, 64004, 64005], [64006]]
+    assert (stats.processed, stats.updated, stats.errors) == (7, 7, 0)
+    assert not IgdbSyncState.objects.filter(name=checkpoint_name("test")).exists()
+
+
+def test_limit_stops_early_and_keeps_checkpoint(games):
+    _stats, written = _run(batch_size=2, limit=3)
+
+    assert written == [[64000, 64001], [64002]]
+    assert IgdbSyncState.objects.get(name=checkpoint_name("test")).watermark == games[2].pk
+
+
+def test_crash_resumes_after_last_written_batch(games):
+    def failing_write(rows, fetched):
+        if 64004 in fetched:
+            raise RuntimeError("DB down")
+
+    with pytest.raises(RuntimeError):
+        _run(write=failing_write, batch_size=2, workers=1)
+    assert IgdbSyncState.objects.get(name=checkpoint_name("test")).watermark == games[3].pk
+
+    _stats, written = _run(batch_size=2)
+    assert written == [[64004, 64005], [64006]]
+
+    _stats, written = _run(batch_size=2)
+    assert written[0][0] == 64000
+
+
+def test_failed_fetch_is_reported_and_skipped(games):
+    errors = []
+
+    def flaky_fetch(rows):
+        if rows[0]["igdb_id"] == 64002:
+            raise ConnectionError("IGDB down")
+        return _fetch(rows)
+
+    stats, written = _run(fetch=flaky_fetch, batch_size=2, on_error=lambda rows, exc: errors.append(str(exc)))
+
+    assert errors == ["IGDB down"]
+    assert stats.failed_batches == 1
+    assert [batch[0] for batch in written] == [64000, 64004, 64006]
+
+
+def test_dry_run_leaves_no_checkpoint(games):
+    IgdbSyncState.objects.create(name=checkpoint_name("test"), watermark=games[4].pk)
+
+    _stats, written = _run(batch_size=10, dry_run=True)
+
+    assert written == [[64005, 64006]]
+    assert IgdbSyncState.objects.get(name=checkpoint_name("test")).watermark == games[4].pk
+
+
+def test_upstream_requests_are_bounded_by_workers(games):
+    lock = threading.Lock()
+    current = peak = 0
+
+    def slow_fetch(rows):
+        nonlocal current, peak
+        with lock:
+            current += 1
+            peak = max(peak, current)
+        time.sleep(0.05)
+        with lock:
+            current -= 1
+        return _fetch(rows)
+
+    _stats, written = _run(fetch=slow_fetch, batch_size=1, workers=2)
+
+    assert len(written) == 7
+    assert peak == 2
@@ -0,0 +1,93 @@
+"""
+upsert_games_from_igdb : import par lot des jeux IGDB avec un nombre de requêtes constant,
+indépendant du nombre de jeux, et mêmes règles que get_or_create_game_from_igdb.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.games.models import Game, GameScreenshot, GameVideo, Genre
+from apps.games.services import upsert_games_from_igdb
+
+pytestmark = pytest.mark.django_db
+
+
+def _payloads(n, offset=0, suffix=""):
+    return [
+        {
+            "igdb_id": 70000 + i,
+            "name": f"Bulk {i}",
+            "summary": f"Desc {i}",
+            "genres": [{"id": 7100 + i % 3, "name": f"Bulk genre {i % 3}"}],
+            "platforms": [{"id": 7200 + i % 2, "name": f"Bulk platform {i % 2}"}],
+            "screenshots": [{"url": f"https://img/{i}/a{suffix}.jpg", "id": 1}, {"url": f"https://img/{i}/b.jpg", "id": 2}],
+            "videos": [{"id": 7300 + i, "name": "Trailer", "video_id": f"yt{i}{suffix}"}],
+            "min_players": 1,
+            "max_players": 4,
+        }
+        for i in range(offset, offset + n)
+    ]
+
+
+def _count(payloads):
+    with CaptureQueriesContext(connection) as ctx:
+        upsert_games_from_igdb(payloads)
+    return len(ctx.captured_queries)
+
+
+def test_create_costs_constant_queries():
+    # Éditeur IGDB, genres et plateformes créés hors mesure : les deux mesures voient les mêmes termes existants
+    terms = _payloads(3)
+    upsert_games_from_igdb(
+        [{"igdb_id": 69999, "genres": [g for p in terms for g in p["genres"]], "platforms": [t for p in terms for t in p["platforms"]]}]
+    )
+    few = _count(_payloads(2))
+    many = _count(_payloads(20, offset=2))
+
+    assert many == few
+    assert Game.objects.filter(igdb_id__gte=70000).count() == 22
+    assert GameScreenshot.objects.filter(game__igdb_id__gte=70000).count() == 44
+    assert Genre.objects.filter(igdb_id__in=[7100, 7101, 7102]).count() == 3
+
+
+def test_update_costs_constant_queries_and_diffs_media():
+    upsert_games_from_igdb(_payloads(22))
+    kept = GameScreenshot.objects.get(url="https://img/5/b.jpg")
+
+    few = _count(_payloads(2, suffix="-v2"))
+    many = _count(_payloads(20, offset=2, suffix="-v2"))
+
+    assert many == few
+    game = Game.objects.get(igdb_id=70005)
+    assert sorted(game.screenshots.values_list("url", flat=True)) == ["https://img/5/a-v2.jpg", "https://img/5/b.jpg"]
+    assert GameScreenshot.objects.filter(pk=kept.pk).exists()
+    assert list(GameVideo.objects.filter(game=game).values_list("video_id", flat=True)) == ["yt5-v2"]
+
+
+def test_existing_games_are_healed_not_overwritten(publisher):
+    Game.objects.create(igdb_id=70000, name="Unknown Game (70000)", description="", publisher=publisher)
+    Game.objects.create(igdb_id=70001, name="Curated", description="Locale", publisher=publisher, max_players=2)
+
+    games, created = upsert_games_from_igdb(_payloads(3))
+
+    assert created == {70002}
+    games[70000].refresh_from_db()
+    games[70001].refresh_from_db()
+    assert (games[70000].name, games[70000].description) == ("Bulk 0", "Desc 0")
+    assert (games[70001].name, games[70001].description, games[70001].max_players) == ("Curated", "Locale", 2)
+    assert games[70001].genres.filter(igdb_id=7101).exists()
+
+
+def test_media_left_untouched_when_not_provided():
+    upsert_games_from_igdb(_payloads(1))
+
+    upsert_games_from_igdb([{"igdb_id": 70000, "min_players": 2}])
+
+    assert GameScreenshot.objects.filter(game__igdb_id=70000).count() == 2
+    assert GameVideo.objects.filter(game__igdb_id=70000).count() == 1
+
+
+def test_empty_batch_makes_no_query(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert upsert_games_from_igdb([{"name": "no id"}]) == ({}, set())
@@ -218,3 +218,56 @@ def test_read_twitch_env_strips_values(monkeypatch):
     assert tid == "cid"
     assert ts == "sec"
     assert mt == "tok"
+
+
+def test_check_igdb_metrics_prints_transport_counters():
+    """--metrics : affiche les compteurs par endpoint sans appeler IGDB."""
+    metrics = {
+        "games": {
+            "calls": 3,
+            "errors": 1,
+            "retries": 2,
+            "latency_ms_total": 600,
+            "latency_ms_avg": 200.0,
+            "throttled": 1,
+            "throttle_wait_ms_total": 250,
+            "cache_hits": 6,
+            "cache_stale": 1,
+            "cache_misses": 3,
+            "cache_coalesced": 1,
+            "cache_hit_ratio": 0.8,
+        }
+    }
+    with (
+        patch("apps.games.management.commands.check_igdb.igdb_transport.get_transport_metrics", return_value=metrics),
+        patch("apps.games.management.commands.check_igdb.igdb_client.igdb_request") as igdb_request,
+    ):
+        out = StringIO()
+        call_command("check_igdb", "--metrics", stdout=out)
+
+    body = out.getvalue()
+    assert "games: 3 appel(s), 1 erreur(s), 2 retry" in body
+    assert "latence moy. 200.0 ms" in body
+    assert "throttling 1x / 250 ms" in body
+    assert "cache: 6 hit, 1 périmé(s), 3 miss (1 mutualisé(s)), ratio 80%" in body
+    igdb_request.assert_not_called()
+
+
+def test_check_igdb_metrics_prints_wikidata_cache_counters():
+    wikidata = {"local_hits": 5, "shared_hits": 1, "negative_hits": 2, "misses": 4, "hit_ratio": 0.6}
+    with (
+        patch("apps.games.management.commands.check_igdb.igdb_transport.get_transport_metrics", return_value={}),
+        patch("apps.games.management.commands.check_igdb.igdb_wikidata.get_wikidata_cache_metrics", return_value=wikidata),
+    ):
+        out = StringIO()
+        call_command("check_igdb", "--metrics", stdout=out)
+
+    assert "5 hit local, 1 hit Redis (2 sans libellé), 4 miss, ratio 60%" in out.getvalue()
+
+
+def test_check_igdb_metrics_empty():
+    with patch("apps.games.management.commands.check_igdb.igdb_transport.get_transport_metrics", return_value={}):
+        out = StringIO()
+        call_command("check_igdb", "--metrics", stdout=out)
+
+    assert "Aucun appel IGDB enregistré." in out.getvalue()
@@ -0,0 +1,200 @@
+"""Tests des disjoncteurs partagés IGDB / Wikidata / MyMemory (apps.games.circuit_breaker)."""
+
+import asyncio
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+import requests
+from django.core.management import call_command
+
+from apps.games import circuit_breaker, igdb_transport, igdb_wikidata
+from apps.games.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker, CircuitOpenError
+from apps.games.management.commands import populate_name_fr
+from apps.games.views_igdb_helpers import _mymemory_translate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(locmem_cache, monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("test", failure_threshold=3, failure_rate=0.5, window_seconds=30, open_seconds=20, slow_call_seconds=1.0)
+
+
+def _fail(breaker, n=1):
+    for _ in range(n):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold_and_fails_fast(clock, breaker):
+    _fail(breaker, 2)
+    breaker.before_call()
+    _fail(breaker)
+
+    assert breaker.state() == STATE_OPEN
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.before_call()
+    assert exc.value.upstream == "test" and exc.value.retry_in == 20
+    assert breaker.snapshot()["rejected"] == 1
+    assert breaker.snapshot()["opened"] == 1
+
+
+def test_stays_closed_while_error_rate_is_low(clock, breaker):
+    for _ in range(10):
+        breaker.record_success(0.1)
+    _fail(breaker, 4)
+
+    assert breaker.state() == STATE_CLOSED
+    breaker.before_call()
+
+
+def test_slow_calls_count_as_failures(clock, breaker):
+    for _ in range(3):
+        breaker.record_success(2.5)
+
+    assert breaker.state() == STATE_OPEN
+    assert breaker.snapshot()["slow_calls"] == 3
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success(clock, breaker):
+    _fail(breaker, 3)
+    clock.now += 21
+
+    assert breaker.state() == STATE_HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(0.1)
+
+    assert breaker.state() == STATE_CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens(clock, breaker):
+    _fail(breaker, 3)
+    clock.now += 21
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state() == STATE_OPEN
+    assert breaker.snapshot()["opened"] == 2
+
+
+def test_call_records_exceptions_and_error_responses(clock, breaker):
+    def boom():
+        raise requests.Timeout("lent")
+
+    for _ in range(2):
+        with pytest.raises(requests.Timeout):
+            breaker.call(boom)
+    assert breaker.call(lambda: SimpleNamespace(status_code=503), is_failure=circuit_breaker.is_upstream_error_response).status_code == 503
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(pytest.fail)
+
+
+def test_acall_shares_state_with_sync_calls(clock, breaker):
+    async def ok():
+        return "ok"
+
+    _fail(breaker, 3)
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.acall(ok))
+    clock.now += 21
+    assert asyncio.run(breaker.acall(ok)) == "ok"
+    assert breaker.state() == STATE_CLOSED
+
+
+def test_disabled_breaker_never_opens(settings, breaker):
+    settings.CIRCUIT_BREAKERS_ENABLED = False
+    _fail(breaker, 10)
+    breaker.before_call()
+    assert breaker.state() == STATE_CLOSED
+
+
+def test_igdb_transport_fails_fast_once_open(clock, monkeypatch):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(igdb_transport.time, "sleep", lambda _s: None)
+    calls = []
+
+    def timeout_post(url, data, headers, timeout):
+        calls.append(url)
+        raise requests.ConnectionError("injoignable")
+
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=timeout_post))
+    for _ in range(circuit_breaker.IGDB_BREAKER.failure_threshold):
+        with pytest.raises(requests.ConnectionError):
+            igdb_transport.post("games", "https://x/games", b"q", {}, 10)
+    sent = len(calls)
+
+    with pytest.raises(CircuitOpenError):
+        igdb_transport.post("games", "https://x/games", b"q", {}, 10)
+    assert len(calls) == sent
+
+
+def test_wikidata_open_breaker_skips_sparql(clock, monkeypatch):
+    _fail(circuit_breaker.WIKIDATA_BREAKER, circuit_breaker.WIKIDATA_BREAKER.failure_threshold)
+    monkeypatch.setattr(igdb_wikidata.requests, "get", lambda *_a, **_k: pytest.fail("Wikidata appelé"))
+
+    assert igdb_wikidata.fetch_french_labels(["Halo"]) == {"Halo": None}
+
+
+def test_wikidata_backfill_failures_leave_online_breaker_closed(clock, monkeypatch):
+    def timeout(*_a, **_k):
+        raise requests.Timeout("15s")
+
+    monkeypatch.setattr(igdb_wikidata.requests, "get", timeout)
+    for _ in range(circuit_breaker.WIKIDATA_BACKFILL_BREAKER.failure_threshold):
+        assert populate_name_fr.fetch_french_names(["Halo"]) == {"Halo": None}
+
+    assert circuit_breaker.WIKIDATA_BACKFILL_BREAKER.state() == STATE_OPEN
+    assert circuit_breaker.WIKIDATA_BREAKER.state() == STATE_CLOSED
+    with pytest.raises(CircuitOpenError):
+        populate_name_fr.fetch_french_names(["Halo"])
+
+
+def test_mymemory_open_breaker_returns_none_without_call(clock, monkeypatch):
+    _fail(circuit_breaker.MYMEMORY_BREAKER, circuit_breaker.MYMEMORY_BREAKER.failure_threshold)
+    monkeypatch.setattr("apps.games.views_igdb_helpers.requests.get", lambda *_a, **_k: pytest.fail("MyMemory appelé"))
+
+    assert _mymemory_translate("Hello") is None
+
+
+@pytest.mark.django_db
+def test_trending_view_returns_empty_page_when_igdb_breaker_is_open(api_client, monkeypatch):
+    def open_breaker(*_a, **_k):
+        raise CircuitOpenError("igdb", 12)
+
+    monkeypatch.setattr("apps.games.igdb_trending.trending_fetch_page", open_breaker)
+
+    response = api_client.get("/api/igdb/trending/", {"limit": "7", "offset": "3"})
+
+    assert response.status_code == 200
+    assert response.data == {"results": [], "total_count": 0}
+
+
+def test_check_igdb_metrics_prints_breaker_states(clock):
+    _fail(circuit_breaker.IGDB_BREAKER, circuit_breaker.IGDB_BREAKER.failure_threshold)
+    out = StringIO()
+
+    call_command("check_igdb", "--metrics", stdout=out)
+
+    assert "=== Disjoncteurs ===" in out.getvalue()
+    assert "igdb: open, 1 ouverture(s)" in out.getvalue()
+    assert "wikidata: closed" in out.getvalue()
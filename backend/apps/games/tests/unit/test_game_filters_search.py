@@ -3,8 +3,9 @@
 import uuid
 
 import pytest
+from django.db import connection
 
-from apps.games.filters import GameFilter
+from apps.games.filters import GameFilter, search_similarity_threshold
 from apps.games.models import Game, Publisher
 
 
@@ -39,3 +40,40 @@ class TestGameFilterSearchMethod:
         flt = GameFilter()
         out = flt.filter_search(qs, "search", "  \t  ")
         assert list(out) == list(qs)
+
+
+@pytest.mark.django_db
+class TestGameFilterSearchIndexes:
+    """Préfiltre indexable (trigram %> / tsvector) puis classement."""
+
+    def test_trigger_maintains_weighted_search_vector(self):
+        game = Game.objects.create(igdb_id=9010, name="Hollow Knight", description="Metroidvania", publisher=_publisher())
+        Game.objects.filter(pk=game.pk).update(name_fr="Chevalier creux")
+
+        vector = Game.objects.values_list("search_vector", flat=True).get(pk=game.pk)
+
+        assert "'hollow':1A" in vector
+        assert "'chevalier'" in vector and "'metroidvania':" in vector and "C" in vector.split("'metroidvania':")[1]
+
+    def test_search_keeps_fuzzy_word_similarity_threshold(self):
+        Game.objects.create(igdb_id=9011, name="The Legend of Zelda", publisher=_publisher())
+        Game.objects.create(igdb_id=9012, name="Tetris", publisher=_publisher())
+
+        with search_similarity_threshold():
+            out = list(GameFilter().filter_search(Game.objects.all(), "search", "Zeldaa").values_list("igdb_id", flat=True))
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW pg_trgm.word_similarity_threshold")
+                threshold = cursor.fetchone()[0]
+
+        assert out == [9011]
+        assert threshold == "0.3"
+
+    def test_search_matches_description_and_ranks_title_matches_first(self):
+        pub = _publisher()
+        Game.objects.create(igdb_id=9013, name="Cave Story", description="A platformer about robots", publisher=pub)
+        Game.objects.create(igdb_id=9014, name="Robots Arena", description="", publisher=pub)
+
+        with search_similarity_threshold():
+            out = list(GameFilter().filter_search(Game.objects.all(), "search", "robots").values_list("igdb_id", flat=True))
+
+        assert out == [9014, 9013]
@@ -21,7 +21,7 @@ class TestGameDatabaseIndexes:
         """Le modèle Game doit avoir des index définis dans Meta.indexes"""
         assert hasattr(Game._meta, "indexes")
         indexes = Game._meta.indexes
-        assert len(indexes) == 6, "Game should have exactly 6 custom indexes"
+        assert len(indexes) == 9, "Game should have exactly 9 custom indexes"
 
         # Vérifier les noms des index
         index_names = {idx.name for idx in indexes}
@@ -32,6 +32,9 @@ class TestGameDatabaseIndexes:
             "games_popularity_idx",
             "games_rating_count_idx",
             "games_age_players_idx",
+            "games_name_trgm_idx",
+            "games_name_fr_trgm_idx",
+            "games_search_vector_idx",
         }
         assert index_names == expected_names, f"Expected {expected_names}, got {index_names}"
 
@@ -126,7 +129,7 @@ class TestGameDatabaseIndexes:
         assert "min_players" in indexdef.lower(), "Composite index should include min_players"
 
     def test_all_custom_indexes_are_btree(self):
-        """Tous les index custom doivent être de type B-tree (par défaut)"""
+        """Les index custom des filtres / tris doivent être de type B-tree (par défaut) ; ceux de la recherche sont GIN"""
         with connection.cursor() as cursor:
             cursor.execute("""
                 SELECT indexname, indexdef
@@ -134,13 +137,29 @@ class TestGameDatabaseIndexes:
                 WHERE tablename = 'games_game'
                   AND indexname LIKE 'games_%_idx';
                 """)
-            results = cursor.fetchall()
+            results = dict(cursor.fetchall())
 
-        assert len(results) == 6, f"Expected 6 custom indexes, found {len(results)}"
+        search_indexes = {"games_name_trgm_idx", "games_name_fr_trgm_idx", "games_search_vector_idx"}
+        assert len(results) == 9, f"Expected 9 custom indexes, found {len(results)}"
 
-        for indexname, indexdef in results:
+        for indexname, indexdef in results.items():
             # B-tree est le type par défaut (USING btree)
-            assert "btree" in indexdef.lower(), f"Index {indexname} should be B-tree type"
+            expected = "gin" if indexname in search_indexes else "btree"
+            assert f"using {expected}" in indexdef.lower(), f"Index {indexname} should be {expected} type"
+
+    def test_search_trigram_indexes_use_gin_trgm_ops(self):
+        """Les index trigram de la recherche doivent utiliser la classe d'opérateurs gin_trgm_ops"""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT indexname, indexdef
+                FROM pg_indexes
+                WHERE tablename = 'games_game'
+                  AND indexname IN ('games_name_trgm_idx', 'games_name_fr_trgm_idx');
+                """)
+            results = dict(cursor.fetchall())
+
+        assert "(name gin_trgm_ops)" in results["games_name_trgm_idx"]
+        assert "(name_fr gin_trgm_ops)" in results["games_name_fr_trgm_idx"]
 
     def test_foreign_key_index_exists(self):
         """Django doit créer automatiquement un index sur la FK publisher_id"""
@@ -224,7 +243,7 @@ class TestGameIndexConfiguration:
         popularity_idx = next((idx for idx in indexes if idx.name == "games_popularity_idx"), None)
 
         assert popularity_idx is not None, "games_popularity_idx not found in model"
-        assert popularity_idx.fields == ["-popularity_score"], "Index should be on -popularity_score (DESC)"
+        assert popularity_idx.fields == ["-popularity_score", "-id"], "Index should be on (-popularity_score, -id) for keyset pagination"
 
     def test_rating_count_index_configuration(self):
         """L'index igdb_rating_count doit être configuré en DESC"""
@@ -0,0 +1,134 @@
+"""Tests unitaires de la projection GameStats (maintenance par signaux et reconstruction)."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.games.models import Game, GameStats, Rating
+from apps.library.models import UserGame
+from apps.reviews.models import Review
+
+pytestmark = pytest.mark.django_db
+
+
+def _stats(game):
+    return GameStats.objects.get(pk=game.pk)
+
+
+@pytest.fixture
+def other_game(publisher):
+    return Game.objects.create(name="Other", igdb_id=64001, publisher=publisher)
+
+
+class TestUserGameMaintenance:
+    def test_create_counts_owner_and_status(self, user, another_user, game):
+        UserGame.objects.create(user=user, game=game)
+        UserGame.objects.create(user=another_user, game=game, status=UserGame.GameStatus.ENVIE_DE_JOUER)
+
+        stats = _stats(game)
+        assert (stats.owners_count, stats.owners_en_cours, stats.owners_termine) == (2, 1, 0)
+
+    def test_status_change_moves_count(self, user, game):
+        UserGame.objects.create(user=user, game=game)
+        user_game = UserGame.objects.get(user=user, game=game)
+
+        user_game.status = UserGame.GameStatus.TERMINE
+        user_game.save()
+
+        stats = _stats(game)
+        assert (stats.owners_count, stats.owners_en_cours, stats.owners_termine) == (1, 0, 1)
+
+    def test_unchanged_status_does_not_touch_stats(self, user, game):
+        UserGame.objects.create(user=user, game=game)
+        user_game = UserGame.objects.get(user=user, game=game)
+
+        user_game.is_favorite = True
+        with CaptureQueriesContext(connection) as ctx:
+            user_game.save()
+
+        assert not any("games_gamestats" in q["sql"] or 'FROM "library_usergame"' in q["sql"] for q in ctx.captured_queries)
+
+    def test_delete_decrements(self, user, game):
+        user_game = UserGame.objects.create(user=user, game=game, status=UserGame.GameStatus.ABANDONNE)
+
+        user_game.delete()
+
+        stats = _stats(game)
+        assert (stats.owners_count, stats.owners_abandonne) == (0, 0)
+
+
+class TestRatingMaintenance:
+    def test_star_histogram_follows_value_and_type(self, user, another_user, game):
+        rating = Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_ETOILES, value=4)
+        Rating.objects.create(user=another_user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=9)
+        assert (_stats(game).stars_4, _stats(game).stars_5) == (1, 0)
+
+        rating.value = 5
+        rating.save()
+        assert (_stats(game).stars_4, _stats(game).stars_5) == (0, 1)
+
+        Rating.objects.update_or_create(user=user, game=game, defaults={"rating_type": Rating.RATING_TYPE_SUR_100, "value": 80})
+        assert _stats(game).stars_5 == 0
+
+    def test_delete_decrements_star(self, user, game):
+        rating = Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_ETOILES, value=2)
+
+        rating.delete()
+
+        assert _stats(game).stars_2 == 0
+
+
+class TestReviewMaintenance:
+    def test_create_and_delete_track_count_and_last_date(self, user, another_user, game):
+        first = Review.objects.create(user=user, game=game, content="Premier")
+        last = Review.objects.create(user=another_user, game=game, content="Second")
+        stats = _stats(game)
+        assert (stats.reviews_count, stats.last_review_at) == (2, last.date_created)
+
+        last.delete()
+
+        stats = _stats(game)
+        assert (stats.reviews_count, stats.last_review_at) == (1, first.date_created)
+
+
+def test_deleting_game_with_activity_cascades(user, game):
+    UserGame.objects.create(user=user, game=game)
+    Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_ETOILES, value=3)
+    Review.objects.create(user=user, game=game, content="Avis")
+
+    game.delete()
+
+    assert not GameStats.objects.exists()
+
+
+def test_rebuild_command_repairs_drift(user, another_user, game, other_game):
+    UserGame.objects.create(user=user, game=game)
+    Rating.objects.create(user=another_user, game=game, rating_type=Rating.RATING_TYPE_ETOILES, value=3)
+    review = Review.objects.create(user=user, game=game, content="Avis")
+    # Écritures en masse : contournent les signaux
+    UserGame.objects.filter(game=game).update(status=UserGame.GameStatus.TERMINE)
+    GameStats.objects.filter(pk=game.pk).update(stars_3=7, reviews_count=0)
+    GameStats.objects.create(game=other_game, owners_count=4)
+
+    out = StringIO()
+    call_command("rebuild_game_stats", "--batch-size", "1", stdout=out)
+
+    stats = _stats(game)
+    assert (stats.owners_count, stats.owners_en_cours, stats.owners_termine) == (1, 0, 1)
+    assert (stats.stars_3, stats.reviews_count, stats.last_review_at) == (1, 1, review.date_created)
+    assert not GameStats.objects.filter(pk=other_game.pk).exists()
+    assert "Done. 1 game(s) with statistics." in out.getvalue()
+
+
+def test_rebuild_command_limited_to_games(user, game, other_game):
+    UserGame.objects.create(user=user, game=game)
+    UserGame.objects.create(user=user, game=other_game)
+    GameStats.objects.update(owners_count=9)
+
+    call_command("rebuild_game_stats", "--game-id", str(game.pk), stdout=StringIO())
+
+    assert _stats(game).owners_count == 1
+    assert _stats(other_game).owners_count == 9
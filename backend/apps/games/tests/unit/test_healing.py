@@ -0,0 +1,95 @@
+"""Tests de la complétion asynchrone des jeux stub (apps.games.healing)."""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from apps.games import healing
+from apps.games.healing import heal_stub_game, is_stub_game, request_stub_healing
+from apps.games.models import Game
+
+
+@pytest.fixture
+def stub(publisher):
+    return Game.objects.create(igdb_id=61000, name="Stub", publisher=publisher)
+
+
+@pytest.fixture
+def complete(publisher, genre):
+    game = Game.objects.create(igdb_id=61001, name="Complet", description="Fiche complète", publisher=publisher)
+    game.genres.add(genre)
+    return game
+
+
+@pytest.mark.django_db
+def test_is_stub_without_description_needs_no_query(stub, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert is_stub_game(stub)
+
+
+@pytest.mark.django_db
+def test_is_stub_uses_prefetched_relations_or_one_query(complete, publisher, django_assert_num_queries):
+    bare = Game.objects.create(igdb_id=61002, name="Sans genre", description="Décrit", publisher=publisher)
+
+    with django_assert_num_queries(1):
+        assert not is_stub_game(complete)
+    with django_assert_num_queries(1):
+        assert is_stub_game(bare)
+
+    prefetched = Game.objects.prefetch_related("genres", "platforms").get(pk=complete.pk)
+    with django_assert_num_queries(0):
+        assert not is_stub_game(prefetched)
+
+
+@pytest.mark.django_db
+def test_request_is_deduplicated_until_the_heal_finishes(locmem_cache, stub, queued_heals):
+    assert request_stub_healing(stub) is True
+    assert request_stub_healing(stub) is True
+    assert queued_heals == [stub.igdb_id]
+
+    with patch("apps.games.healing.igdb_client.igdb_request", return_value=[]):
+        assert heal_stub_game(stub.igdb_id) is False
+
+    assert request_stub_healing(stub) is True
+    assert queued_heals == [stub.igdb_id, stub.igdb_id]
+
+
+@pytest.mark.django_db
+def test_request_disabled_or_without_igdb_id(stub, publisher, queued_heals, settings):
+    local_only = Game.objects.create(name="Local", publisher=publisher)
+    assert request_stub_healing(local_only) is False
+
+    settings.GAMES_STUB_HEALING_ENABLED = False
+    assert request_stub_healing(stub) is False
+    assert queued_heals == []
+
+
+@pytest.mark.django_db
+def test_broker_failure_releases_pending_key(locmem_cache, stub, monkeypatch):
+    from apps.games import tasks
+
+    monkeypatch.setattr(tasks.heal_stub_game, "delay", lambda _id: (_ for _ in ()).throw(ConnectionError("broker")))
+
+    assert request_stub_healing(stub) is False
+    assert cache.get(healing._pending_key(stub.igdb_id)) is None
+
+
+@pytest.mark.django_db
+def test_heal_releases_pending_key_when_igdb_fails(locmem_cache, stub, queued_heals):
+    request_stub_healing(stub)
+
+    with patch("apps.games.healing.igdb_client.igdb_request", side_effect=RuntimeError("IGDB")):
+        with pytest.raises(RuntimeError):
+            heal_stub_game(stub.igdb_id)
+
+    assert cache.get(healing._pending_key(stub.igdb_id)) is None
+
+
+@pytest.mark.django_db
+def test_complete_game_detail_has_no_healing_hint(api_client, complete, queued_heals):
+    response = api_client.get(f"/api/games/{complete.id}/")
+
+    assert response.status_code == 200
+    assert "healing" not in response.data
+    assert queued_heals == []
@@ -0,0 +1,118 @@
+import uuid
+
+import pytest
+from django.core.cache import cache
+
+from apps.games import igdb_cache, igdb_transport
+
+
+@pytest.fixture(autouse=True)
+def _no_lock_wait(monkeypatch):
+    monkeypatch.setattr(igdb_cache.time, "sleep", lambda s: None)
+
+
+@pytest.fixture
+def endpoint():
+    """Endpoint unique par test : le Redis de test (clés et métriques) est partagé entre workers xdist."""
+    return f"test_{uuid.uuid4().hex}"
+
+
+def _query():
+    return 'fields id,name; where slug = "zelda";'
+
+
+def _counting_fetch(result):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return result
+
+    return fetch, calls
+
+
+def test_canonicalize_query_ignores_whitespace_clause_and_field_order():
+    a = igdb_cache.canonicalize_query("games", 'fields name, id;  where name ~ *"a  b"*;\nlimit 5;')
+    b = igdb_cache.canonicalize_query("games", b'limit 5; where name ~ *"a  b"*; fields id,name;')
+
+    assert a == b
+    assert '"a  b"' in a
+
+
+def test_canonicalize_multiquery_keeps_block_order():
+    body = 'query games "b" { fields id; };\nquery games "a" { fields id; };'
+
+    assert igdb_cache.canonicalize_query("multiquery", body).index('"b"') < igdb_cache.canonicalize_query("multiquery", body).index('"a"')
+
+
+def test_cached_call_hits_after_first_miss(endpoint):
+    q = _query()
+    fetch, calls = _counting_fetch([{"id": 1}])
+
+    assert igdb_cache.cached_call(endpoint, q, fetch) == [{"id": 1}]
+    assert igdb_cache.cached_call(endpoint, q.replace(";", " ;"), fetch) == [{"id": 1}]
+
+    assert len(calls) == 1
+    metrics = igdb_transport.get_transport_metrics()[endpoint]
+    assert metrics["cache_misses"] == 1
+    assert metrics["cache_hits"] == 1
+    assert metrics["cache_hit_ratio"] == 0.5
+
+
+def test_errors_are_not_cached(endpoint):
+    q = _query()
+
+    def boom():
+        raise RuntimeError("IGDB error 500")
+
+    with pytest.raises(RuntimeError):
+        igdb_cache.cached_call(endpoint, q, boom)
+
+    fetch, calls = _counting_fetch([])
+    igdb_cache.cached_call(endpoint, q, fetch)
+    assert len(calls) == 1
+
+
+def test_stale_entry_is_served_and_refreshed_once(monkeypatch, endpoint):
+    q = _query()
+    key = igdb_cache.cache_key(endpoint, q)
+    cache.set(key, {"data": ["old"], "fresh_until": 0}, timeout=60)
+    refreshes = []
+    monkeypatch.setattr(igdb_cache, "_spawn_refresh", lambda *args: refreshes.append(args))
+    fetch, calls = _counting_fetch(["new"])
+
+    assert igdb_cache.cached_call(endpoint, q, fetch) == ["old"]
+    assert igdb_cache.cached_call(endpoint, q, fetch) == ["old"]
+
+    # Un seul worker obtient le verrou de rafraîchissement
+    assert len(refreshes) == 1
+    igdb_cache._refresh(*refreshes[0])
+    assert calls == [1]
+    assert igdb_cache.cached_call(endpoint, q, fetch) == ["new"]
+    assert igdb_transport.get_transport_metrics()[endpoint]["cache_stale"] == 2
+
+
+def test_concurrent_miss_waits_for_the_lock_holder(monkeypatch, endpoint):
+    q = _query()
+    key = igdb_cache.cache_key(endpoint, q)
+    cache.add(f"{key}:lock", 1, timeout=30)
+
+    # Pendant l'attente, le worker qui détient le verrou publie sa réponse
+    monkeypatch.setattr(igdb_cache.time, "sleep", lambda s: cache.set(key, {"data": ["shared"], "fresh_until": 9e18}, timeout=60))
+    fetch, calls = _counting_fetch(["mine"])
+
+    assert igdb_cache.cached_call(endpoint, q, fetch) == ["shared"]
+    assert calls == []
+    assert igdb_transport.get_transport_metrics()[endpoint]["cache_coalesced"] == 1
+    cache.delete(f"{key}:lock")
+
+
+def test_zero_ttl_bypasses_cache(monkeypatch, endpoint):
+    monkeypatch.setitem(igdb_cache.IGDB_CACHE_TTLS, endpoint, 0)
+    q = _query()
+    fetch, calls = _counting_fetch([])
+
+    igdb_cache.cached_call(endpoint, q, fetch)
+    igdb_cache.cached_call(endpoint, q, fetch)
+
+    assert len(calls) == 2
@@ -1,9 +1,29 @@
+import asyncio
+import time
+import uuid
 from types import SimpleNamespace
 
 import pytest
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 
-from apps.games import igdb_client
+from apps.games import igdb_cache, igdb_client, igdb_transport
+
+
+@pytest.fixture(autouse=True)
+def _no_transport_wait(monkeypatch):
+    """Pas de limiteur ni d'attente réelle entre retries dans les tests unitaires."""
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(igdb_transport.time, "sleep", lambda s: None)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_twitch_token(monkeypatch):
+    """Clé de token partagé propre à chaque test (workers xdist sur le même Redis)."""
+    monkeypatch.setattr(igdb_client, "TWITCH_TOKEN_CACHE_PREFIX", f"test:twitch_token:{uuid.uuid4().hex}")
+    igdb_client._clear_twitch_token_cache()
+    yield
+    igdb_client._clear_twitch_token_cache()
 
 
 def _reset_twitch_token_cache():
@@ -11,6 +31,27 @@ def _reset_twitch_token_cache():
     igdb_client._twitch_token_cache["expires_at"] = 0
 
 
+def _twitch_env(monkeypatch):
+    monkeypatch.setenv("TWITCH_CLIENT_ID", "twitch-cid")
+    monkeypatch.setenv("TWITCH_CLIENT_SECRET", "twitch-secret")
+    monkeypatch.delenv("IGDB_ACCESS_TOKEN", raising=False)
+
+
+def _counting_oauth(monkeypatch, token="oauth-token", expires_in=3600):
+    calls = []
+
+    def fake_post(url, data, headers, timeout):
+        calls.append(url)
+        return SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"access_token": f"{token}-{len(calls)}", "expires_in": expires_in})
+
+    monkeypatch.setattr(igdb_client.requests, "post", fake_post)
+    return calls
+
+
+def _shared_key():
+    return igdb_client._twitch_token_key("twitch-cid")
+
+
 def test_get_igdb_headers_ok(monkeypatch):
     """Avec IGDB_ACCESS_TOKEN défini, on l'utilise (comportement legacy)."""
     monkeypatch.delenv("TWITCH_CLIENT_ID", raising=False)
@@ -127,6 +168,77 @@ def test_clear_twitch_token_cache_resets_state():
     assert igdb_client._twitch_token_cache["expires_at"] == 0
 
 
+def test_twitch_token_is_shared_across_processes(monkeypatch):
+    """Un autre process (cache local vide) réutilise le token publié au lieu de rappeler Twitch."""
+    _twitch_env(monkeypatch)
+    calls = _counting_oauth(monkeypatch)
+
+    assert igdb_client.get_twitch_access_token() == "oauth-token-1"
+    _reset_twitch_token_cache()  # nouveau worker
+    assert igdb_client.get_twitch_access_token() == "oauth-token-1"
+
+    assert len(calls) == 1
+    assert cache.get(_shared_key())["access_token"] == "oauth-token-1"
+
+
+def test_twitch_token_refreshed_in_background_before_expiry(monkeypatch):
+    """Dans la fenêtre d'anticipation : le token courant est servi et un seul renouvellement est lancé."""
+    _twitch_env(monkeypatch)
+    calls = _counting_oauth(monkeypatch)
+    started = []
+
+    class InlineThread:
+        def __init__(self, target, args, **kwargs):
+            self.target, self.args = target, args
+
+        def start(self):
+            started.append(self)
+
+    monkeypatch.setattr(igdb_client.threading, "Thread", InlineThread)
+    expiring = {"access_token": "old-token", "expires_at": time.time() * 1000 + 5 * 60_000}
+    cache.set(_shared_key(), expiring, timeout=300)
+
+    assert igdb_client.get_twitch_access_token() == "old-token"
+    _reset_twitch_token_cache()
+    assert igdb_client.get_twitch_access_token() == "old-token"  # verrou déjà pris : pas de second renouvellement
+    assert len(started) == 1
+
+    started[0].target(*started[0].args)
+
+    assert len(calls) == 1
+    assert cache.get(_shared_key())["access_token"] == "oauth-token-1"
+    assert igdb_client.get_twitch_access_token() == "oauth-token-1"
+
+
+def test_twitch_token_waits_for_process_holding_the_lock(monkeypatch):
+    """Sans token valide et verrou pris ailleurs : on attend le token publié par l'autre process."""
+    _twitch_env(monkeypatch)
+    calls = _counting_oauth(monkeypatch)
+    cache.add(f"{_shared_key()}:lock", 1, timeout=30)
+
+    def other_process_publishes(_delay):
+        cache.set(_shared_key(), {"access_token": "from-other", "expires_at": time.time() * 1000 + 3_600_000}, timeout=3600)
+
+    monkeypatch.setattr(igdb_client.time, "sleep", other_process_publishes)
+
+    assert igdb_client.get_twitch_access_token() == "from-other"
+    assert calls == []
+
+
+def test_invalidate_twitch_token_keeps_token_renewed_by_another_worker(monkeypatch):
+    """Un 401 tardif sur l'ancien token ne supprime pas le token déjà renouvelé."""
+    _twitch_env(monkeypatch)
+    entry = {"access_token": "new-token", "expires_at": time.time() * 1000 + 3_600_000}
+    cache.set(_shared_key(), entry, timeout=3600)
+
+    igdb_client.invalidate_twitch_token("old-token")
+    assert cache.get(_shared_key())["access_token"] == "new-token"
+
+    igdb_client.invalidate_twitch_token("new-token")
+    assert cache.get(_shared_key()) is None
+    assert igdb_client._twitch_token_cache["access_token"] is None
+
+
 def test_igdb_request_401_retries_with_fresh_headers(monkeypatch):
     """401 : vide le cache token Twitch, refait les headers et retente."""
     _reset_twitch_token_cache()
@@ -148,7 +260,7 @@ def test_igdb_request_401_retries_with_fresh_headers(monkeypatch):
         return SimpleNamespace(ok=True, json=lambda: [{"id": 42, "name": "Retry"}])
 
     monkeypatch.setattr(igdb_client, "get_igdb_headers", fake_get_igdb_headers)
-    monkeypatch.setattr(igdb_client.requests, "post", fake_post)
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=fake_post))
 
     result = igdb_client.igdb_request("games", "fields id;")
 
@@ -173,7 +285,7 @@ def test_igdb_request_success(monkeypatch):
         return SimpleNamespace(ok=True, json=lambda: [{"id": 1, "name": "Game"}])
 
     monkeypatch.setattr(igdb_client, "get_igdb_headers", fake_get_igdb_headers)
-    monkeypatch.setattr(igdb_client.requests, "post", fake_post)
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=fake_post))
 
     result = igdb_client.igdb_request("games", "fields *;")
 
@@ -197,7 +309,7 @@ def test_igdb_request_failure_with_json_body(monkeypatch):
         )
 
     monkeypatch.setattr(igdb_client, "get_igdb_headers", fake_get_igdb_headers)
-    monkeypatch.setattr(igdb_client.requests, "post", fake_post)
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=fake_post))
 
     with pytest.raises(RuntimeError) as exc:
         igdb_client.igdb_request("games", "fields *;")
@@ -222,7 +334,7 @@ def test_igdb_request_failure_with_non_json_body(monkeypatch):
         return FakeResponse()
 
     monkeypatch.setattr(igdb_client, "get_igdb_headers", fake_get_igdb_headers)
-    monkeypatch.setattr(igdb_client.requests, "post", fake_post)
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=fake_post))
 
     with pytest.raises(RuntimeError) as exc:
         igdb_client.igdb_request("covers", "fields *;")
@@ -243,7 +355,7 @@ def test_igdb_request_normalizes_endpoint_with_leading_slash(monkeypatch):
         return SimpleNamespace(ok=True, json=lambda: [])
 
     monkeypatch.setattr(igdb_client, "get_igdb_headers", fake_get_igdb_headers)
-    monkeypatch.setattr(igdb_client.requests, "post", fake_post)
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=fake_post))
 
     igdb_client.igdb_request("/games", "fields *;")
 
@@ -262,8 +374,102 @@ def test_igdb_request_accepts_bytes_query(monkeypatch):
         return SimpleNamespace(ok=True, json=lambda: [])
 
     monkeypatch.setattr(igdb_client, "get_igdb_headers", fake_get_igdb_headers)
-    monkeypatch.setattr(igdb_client.requests, "post", fake_post)
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=fake_post))
 
     igdb_client.igdb_request("games", b"fields id;")
 
     assert called["data"] == b"fields id;"
+
+
+def test_build_multiquery_body_formats_named_blocks():
+    body = igdb_client.build_multiquery_body(
+        {
+            "results": ("games", "fields id; limit 2;"),
+            "count": ("games/count", "where total_rating_count > 0;"),
+        }
+    )
+
+    assert body == 'query games "results" { fields id; limit 2; };\nquery games/count "count" { where total_rating_count > 0; };'
+
+
+def test_igdb_multiquery_single_round_trip_and_maps_results():
+    calls = []
+
+    def fake_request(endpoint, body):
+        calls.append((endpoint, body))
+        return [
+            {"name": "results", "result": [{"id": 1}]},
+            {"name": "count", "count": 42},
+        ]
+
+    out = igdb_client.igdb_multiquery(
+        {"results": ("games", "fields id;"), "count": ("games/count", ""), "missing": ("games", "fields id;")},
+        fake_request,
+    )
+
+    assert len(calls) == 1
+    assert calls[0][0] == "multiquery"
+    assert out == {"results": [{"id": 1}], "count": 42, "missing": []}
+
+
+def test_igdb_multiquery_rejects_more_than_ten_subqueries():
+    queries = {f"q{i}": ("games", "fields id;") for i in range(igdb_client.IGDB_MULTIQUERY_MAX + 1)}
+
+    with pytest.raises(ValueError):
+        igdb_client.igdb_multiquery(queries, lambda *a: [])
+
+
+def test_igdb_request_served_from_response_cache(monkeypatch):
+    """Cache activé : deux requêtes équivalentes (espaces, ordre des champs) → un seul POST IGDB."""
+    posts = []
+
+    def fake_post(url, data, headers, timeout):
+        posts.append(data)
+        return SimpleNamespace(ok=True, json=lambda: [{"id": 7}])
+
+    monkeypatch.setattr(igdb_client, "get_igdb_headers", lambda: {})
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: SimpleNamespace(post=fake_post))
+
+    query = 'fields id, name; where slug = "cache-test-igdb-request";'
+    cache_key = igdb_cache.cache_key("games", query)
+    igdb_cache.cache.delete(cache_key)
+
+    assert igdb_client.igdb_request("games", query) == [{"id": 7}]
+    assert igdb_client.igdb_request("/games", 'where slug = "cache-test-igdb-request";  fields name,id;') == [{"id": 7}]
+    assert len(posts) == 1
+    igdb_cache.cache.delete(cache_key)
+
+
+def test_aigdb_request_success_via_async_transport(monkeypatch):
+    sent = {}
+
+    async def fake_apost(endpoint, url, body, headers, timeout):
+        sent.update(endpoint=endpoint, url=url, body=body)
+        return SimpleNamespace(is_success=True, status_code=200, json=lambda: [{"id": 3}])
+
+    monkeypatch.setattr(igdb_client, "get_igdb_headers", lambda: {"Client-ID": "cid"})
+    monkeypatch.setattr(igdb_transport, "apost", fake_apost)
+
+    assert asyncio.run(igdb_client.aigdb_request("/games", "fields id;")) == [{"id": 3}]
+    assert sent == {"endpoint": "games", "url": "https://api.igdb.com/v4/games", "body": b"fields id;"}
+
+
+def test_aigdb_request_failure_raises_runtime_error(monkeypatch):
+    async def fake_apost(endpoint, url, body, headers, timeout):
+        return SimpleNamespace(is_success=False, status_code=500, json=lambda: {"error": "boom"}, text="")
+
+    monkeypatch.setattr(igdb_client, "get_igdb_headers", lambda: {})
+    monkeypatch.setattr(igdb_transport, "apost", fake_apost)
+
+    with pytest.raises(RuntimeError, match="IGDB error 500 on games"):
+        asyncio.run(igdb_client.aigdb_request("games", "fields id;"))
+
+
+def test_aigdb_multiquery_maps_results():
+    async def fake_request(endpoint, body):
+        assert endpoint == "multiquery"
+        return [{"name": "results", "result": [{"id": 1}]}, {"name": "count", "count": 4}]
+
+    out = asyncio.run(igdb_client.aigdb_multiquery({"results": ("games", "fields id;"), "count": ("games/count", "")}, fake_request))
+
+    assert out == {"results": [{"id": 1}], "count": 4}
@@ -1,15 +1,22 @@
 """Tests unitaires pour apps.games.igdb_demographics (sans DB, mocks igdb_request)."""
 
+import asyncio
+
 import pytest
 
+import apps.games.igdb_demographics as demographics_mod
 from apps.games.igdb_demographics import (
+    afilter_games_raw_by_demographics,
     compute_min_age,
     compute_player_counts,
     fetch_age_ratings_map,
     fetch_multiplayer_modes_raw,
     filter_games_raw_by_demographics,
     index_multiplayer_by_game,
+    load_demographics,
+    refresh_stored_demographics,
 )
+from apps.games.models import IgdbGameDemographics
 
 
 def test_index_multiplayer_by_game_skips_entry_without_game():
@@ -201,3 +208,89 @@ def test_fetch_multiplayer_modes_raw_batches_over_500_ids():
 
     fetch_multiplayer_modes_raw(mock_igdb, ids)
     assert len(calls) == 2
+
+
+def test_afilter_games_raw_by_demographics_fetches_ratings_and_modes_concurrently():
+    started = []
+
+    async def mock_igdb(ep, q):
+        started.append(ep)
+        await asyncio.sleep(0)
+        # Les deux requêtes sont parties avant que l'une ne se termine
+        assert set(started) == {"age_ratings", "multiplayer_modes"}
+        if ep == "age_ratings":
+            return [{"id": 10, "category": 2, "rating": 4}]
+        return [{"id": 20, "game": 1, "offlinemax": 4}]
+
+    games = [{"id": 1, "age_ratings": [10], "multiplayer_modes": [20]}]
+    out = asyncio.run(afilter_games_raw_by_demographics(mock_igdb, games, 12, None, 4))
+
+    assert [g["id"] for g in out] == [1]
+    assert out[0]["_ludokan_min_age"] == 16
+    assert out[0]["_ludokan_max_players"] == 4
+
+
+@pytest.mark.django_db
+def test_filter_games_raw_uses_stored_demographics_without_igdb():
+    IgdbGameDemographics.objects.create(igdb_id=100, min_age=12, min_players=1, max_players=4)
+    IgdbGameDemographics.objects.create(igdb_id=101, min_age=18, min_players=1, max_players=1)
+
+    def _no_call(_ep, _q):
+        raise AssertionError("valeurs connues localement : pas d'appel IGDB")
+
+    games = [{"id": 100, "age_ratings": [10]}, {"id": 101, "age_ratings": [11]}]
+    out = filter_games_raw_by_demographics(_no_call, games, min_age=None, min_players=None, max_players=4)
+
+    assert [g["id"] for g in out] == [100]
+    assert out[0]["_ludokan_min_age"] == 12
+
+
+@pytest.mark.django_db
+def test_filter_games_raw_fetches_only_missing_games_and_stores_them(igdb_request_demographics_stub):
+    IgdbGameDemographics.objects.create(igdb_id=1, min_age=16, min_players=1, max_players=2)
+    queries = []
+
+    def _req(endpoint, query):
+        queries.append((endpoint, query))
+        return igdb_request_demographics_stub(endpoint, query)
+
+    games = [{"id": 1, "age_ratings": [99], "multiplayer_modes": [98]}, {"id": 100, "age_ratings": [10], "multiplayer_modes": [200]}]
+    out = filter_games_raw_by_demographics(_req, games, min_age=12, min_players=None, max_players=None)
+
+    assert [g["id"] for g in out] == [1, 100]
+    assert len(queries) == 2
+    assert all("99" not in q and "98" not in q for _ep, q in queries)
+    assert load_demographics([100]) == {100: (12, 1, 4)}
+
+
+def test_afilter_games_raw_by_demographics_fetches_only_missing_games(monkeypatch):
+    saved = {}
+    monkeypatch.setattr(demographics_mod, "load_demographics", lambda ids: {2: (18, 1, 1)})
+    monkeypatch.setattr(demographics_mod, "save_demographics", saved.update)
+    requested = []
+
+    async def mock_igdb(ep, q):
+        requested.append(ep)
+        return [{"id": 10, "category": 2, "rating": 2}] if ep == "age_ratings" else []
+
+    games = [{"id": 1, "age_ratings": [10], "multiplayer_modes": []}, {"id": 2, "age_ratings": [11], "multiplayer_modes": []}]
+    out = asyncio.run(afilter_games_raw_by_demographics(mock_igdb, games, 7, None, None))
+
+    assert [g["id"] for g in out] == [1, 2]
+    assert requested == ["age_ratings"]
+    assert saved == {1: (7, None, None)}
+
+
+@pytest.mark.django_db
+def test_refresh_stored_demographics_updates_and_deletes_gone_games(igdb_request_demographics_stub):
+    IgdbGameDemographics.objects.create(igdb_id=100, min_age=3, min_players=None, max_players=None)
+    IgdbGameDemographics.objects.create(igdb_id=555, min_age=18, min_players=1, max_players=1)
+
+    def _req(endpoint, query):
+        if endpoint == "games":
+            assert "fields id, age_ratings, multiplayer_modes;" in query
+            return [{"id": 100, "age_ratings": [10], "multiplayer_modes": [200]}]
+        return igdb_request_demographics_stub(endpoint, query)
+
+    assert refresh_stored_demographics(_req, [100, 555]) == (1, 1)
+    assert load_demographics([100, 555]) == {100: (12, 1, 4)}
@@ -0,0 +1,125 @@
+"""Tests du service local-first (apps.games.igdb_local_catalogue) : filtres ORM, tris et contrat NormalizedGame."""
+
+import datetime
+import time
+
+import pytest
+
+import apps.games.igdb_local_catalogue as local_mod
+from apps.games.igdb_local_catalogue import game_as_igdb_payload, local_catalogue_is_fresh, local_related_games, local_trending_page
+from apps.games.igdb_mirror import MIRROR_STATE_NAME
+from apps.games.igdb_normalizer import normalize_igdb_game
+from apps.games.models import Collection, Game, IgdbSyncState
+from apps.games.views_igdb_helpers import IgdbFilters
+
+
+@pytest.fixture
+def fresh_catalogue(db):
+    IgdbSyncState.objects.create(name=MIRROR_STATE_NAME, watermark=int(time.time()) - 60)
+
+
+def _game(publisher, igdb_id, count, **fields):
+    return Game.objects.create(igdb_id=igdb_id, name=f"Jeu {igdb_id}", igdb_rating_count=count, publisher=publisher, **fields)
+
+
+@pytest.mark.django_db
+def test_local_catalogue_is_fresh_follows_mirror_watermark():
+    assert local_catalogue_is_fresh() is False
+
+    state = IgdbSyncState.objects.create(name=MIRROR_STATE_NAME, watermark=int(time.time()) - 2 * local_mod.LOCAL_CATALOGUE_MAX_LAG_SECONDS)
+    assert local_catalogue_is_fresh() is False
+
+    state.watermark = int(time.time()) - 60
+    state.save()
+    assert local_catalogue_is_fresh() is True
+
+
+def test_local_trending_page_disabled_returns_none():
+    assert local_trending_page(10, 0, IgdbFilters()) is None
+
+
+def test_local_trending_page_filters_not_stored_locally(fresh_catalogue):
+    assert local_trending_page(10, 0, IgdbFilters(theme_ids=[1])) is None
+
+
+def test_local_trending_page_sorts_and_paginates(fresh_catalogue, publisher):
+    for igdb_id, count in ((1, 10), (2, 300), (3, 0), (4, 50)):
+        _game(publisher, igdb_id, count)
+
+    page, total = local_trending_page(2, 1, IgdbFilters())
+
+    assert total == 3
+    assert [g["id"] for g in page] == [4, 1]
+
+
+def test_local_trending_page_translates_filters(fresh_catalogue, publisher, genre, platform):
+    match = _game(publisher, 1, 80, min_age=16, min_players=1, max_players=4, igdb_total_rating=85.0, release_date=datetime.date(2021, 5, 1))
+    match.genres.add(genre)
+    match.platforms.add(platform)
+    other_genre = _game(publisher, 2, 90, min_age=16, min_players=1, max_players=4, igdb_total_rating=85.0, release_date=datetime.date(2021, 5, 1))
+    other_genre.platforms.add(platform)
+    too_young = _game(publisher, 3, 70, min_age=7, min_players=1, max_players=4, igdb_total_rating=85.0, release_date=datetime.date(2021, 5, 1))
+    too_young.genres.add(genre)
+    unknown_age = _game(publisher, 4, 60, min_players=1, max_players=4, igdb_total_rating=85.0, release_date=datetime.date(2021, 5, 1))
+    unknown_age.genres.add(genre)
+    filters = IgdbFilters(
+        genre_ids=[genre.igdb_id, 999],
+        platform_ids=[platform.igdb_id],
+        min_age=12,
+        min_players=1,
+        max_players=4,
+        min_rating=80,
+        release_year_min=2020,
+        release_year_max=2021,
+    )
+
+    page, total = local_trending_page(10, 0, filters)
+
+    assert (total, [g["id"] for g in page]) == (1, [1])
+    assert page[0]["platforms"] == [{"id": platform.igdb_id, "name": platform.name}]
+    assert (page[0]["_ludokan_min_age"], page[0]["_ludokan_min_players"], page[0]["_ludokan_max_players"]) == (16, 1, 4)
+
+
+def test_local_trending_page_no_local_match_defers_to_igdb(fresh_catalogue, publisher):
+    _game(publisher, 1, 10)
+    assert local_trending_page(10, 0, IgdbFilters(sort="most_rated")) is None
+
+
+@pytest.mark.django_db
+def test_game_as_igdb_payload_keeps_normalized_contract(publisher, platform):
+    game = _game(
+        publisher,
+        42,
+        120,
+        description="Résumé",
+        cover_url="https://images.igdb.com/t_cover_big/x.jpg",
+        release_date=datetime.date(2020, 3, 20),
+        igdb_total_rating=91.5,
+    )
+    game.platforms.add(platform)
+    igdb_equivalent = {
+        "id": 42,
+        "name": "Jeu 42",
+        "summary": "Résumé",
+        "cover": {"id": 7, "url": "//images.igdb.com/t_thumb/x.jpg"},
+        "first_release_date": 1584662400,
+        "platforms": [{"id": platform.igdb_id, "name": platform.name}],
+        "total_rating": 91.5,
+        "total_rating_count": 120,
+    }
+
+    assert normalize_igdb_game(game_as_igdb_payload(game)) == normalize_igdb_game(igdb_equivalent)
+
+
+def test_local_related_games_unknown_collection_defers_to_igdb(fresh_catalogue):
+    assert local_related_games("collections", 5, 10, 0) is None
+
+
+def test_local_related_games_orders_by_rating_count(fresh_catalogue, publisher):
+    collection = Collection.objects.create(igdb_id=5, name="Zelda")
+    for igdb_id, count in ((1, 10), (2, 300), (3, 50)):
+        _game(publisher, igdb_id, count).collections.add(collection)
+    _game(publisher, 4, 1000)
+
+    assert [g["id"] for g in local_related_games("collections", 5, 2, 0)] == [2, 3]
+    assert [g["id"] for g in local_related_games("collections", 5, 2, 2)] == [1]
@@ -0,0 +1,162 @@
+"""Tests du miroir incrémental IGDB (apps.games.igdb_mirror) et de la commande sync_igdb_catalogue."""
+
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.games import igdb_mirror
+from apps.games.igdb_mirror import fetch_next_page, sync_catalogue
+from apps.games.models import Game, GameScreenshot, GameVideo, Genre, IgdbGameDemographics, IgdbSyncState, Platform
+
+_WHERE_RE = re.compile(r"where version_parent = null & (.*?); sort (\w+) asc")
+
+
+def _raw_game(igdb_id, updated_at, **extra):
+    data = {"id": igdb_id, "name": f"Jeu {igdb_id}", "updated_at": updated_at}
+    data.update(extra)
+    return data
+
+
+class FakeCatalogue:
+    """Répond aux requêtes `games` du miroir comme IGDB (filtres updated_at / id, tri, limit)."""
+
+    def __init__(self, games, fail_after=None):
+        self.games = games
+        self.queries = []
+        self.fail_after = fail_after
+
+    def __call__(self, endpoint, query):
+        assert endpoint == "games"
+        if self.fail_after is not None and len(self.queries) >= self.fail_after:
+            raise RuntimeError("IGDB indisponible")
+        self.queries.append(query)
+        where, sort = _WHERE_RE.search(query).groups()
+        tie = re.fullmatch(r"updated_at = (\d+) & id > (\d+)", where)
+        if tie:
+            ts, after = int(tie.group(1)), int(tie.group(2))
+            rows = [g for g in self.games if g["updated_at"] == ts and g["id"] > after]
+        else:
+            since = int(re.fullmatch(r"updated_at > (\d+)", where).group(1))
+            rows = [g for g in self.games if g["updated_at"] > since]
+        rows.sort(key=lambda g: g[sort])
+        return rows[: igdb_mirror.MIRROR_PAGE_SIZE]
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    monkeypatch.setattr(igdb_mirror, "MIRROR_PAGE_SIZE", 2)
+
+
+def test_fetch_next_page_drops_truncated_last_second(small_pages):
+    fake = FakeCatalogue([_raw_game(1, 10), _raw_game(2, 20), _raw_game(3, 20)])
+
+    games, watermark, cursor_id, done = fetch_next_page(fake, 0, None)
+
+    assert [g["id"] for g in games] == [1]
+    assert (watermark, cursor_id, done) == (10, None, False)
+
+
+def test_fetch_next_page_walks_a_crowded_second_by_id(small_pages):
+    fake = FakeCatalogue([_raw_game(i, 50) for i in (4, 2, 3)])
+
+    assert fetch_next_page(fake, 0, None) == ([], 50, 0, False)
+    games, watermark, cursor_id, _ = fetch_next_page(fake, 50, 0)
+    assert ([g["id"] for g in games], watermark, cursor_id) == ([2, 3], 50, 3)
+    games, watermark, cursor_id, _ = fetch_next_page(fake, 50, 3)
+    assert ([g["id"] for g in games], watermark, cursor_id) == ([4], 50, None)
+
+
+@pytest.mark.django_db
+def test_sync_catalogue_upserts_games_relations_and_media(monkeypatch):
+    monkeypatch.setattr(igdb_mirror, "save_demographics", lambda values: None)
+    Game.objects.create(igdb_id=7, name="Ancien nom", name_fr="Nom FR", publisher=igdb_mirror._get_igdb_publisher())
+    raw = _raw_game(
+        7,
+        100,
+        summary="Résumé",
+        first_release_date=1577836800,
+        total_rating=88.5,
+        cover={"id": 1, "url": "//images.igdb.com/t_thumb/c.jpg"},
+        genres=[{"id": 12, "name": "RPG"}],
+        platforms=[{"id": 6, "name": "PC"}],
+        collections=[{"id": 55, "name": "Série"}],
+        franchises=[{"id": 66, "name": "Franchise"}],
+        screenshots=[{"id": 30, "url": "//images.igdb.com/t_thumb/s1.jpg"}, {"id": 31, "url": "//images.igdb.com/t_thumb/s2.jpg"}],
+        videos=[{"id": 40, "name": "Trailer", "video_id": "abc123"}],
+        involved_companies=[{"id": 5, "publisher": True, "company": {"id": 900, "name": "Éditeur"}}],
+        age_ratings=[{"id": 10, "category": 2, "rating": 3}],
+        multiplayer_modes=[{"id": 20, "offlinemax": 4, "offlinecoop": True}],
+    )
+
+    assert sync_catalogue(FakeCatalogue([raw, _raw_game(8, 100)])) == 2
+
+    game = Game.objects.get(igdb_id=7)
+    assert (game.name, game.name_fr, game.description) == ("Jeu 7", "Nom FR", "Résumé")
+    assert str(game.release_date) == "2020-01-01"
+    assert game.cover_url == "https://images.igdb.com/t_cover_big/c.jpg"
+    assert (game.min_age, game.min_players, game.max_players) == (12, 2, 4)
+    assert game.publisher.igdb_id == 900
+    assert list(game.genres.values_list("igdb_id", flat=True)) == [12]
+    assert list(game.platforms.values_list("igdb_id", flat=True)) == [6]
+    assert list(game.collections.values_list("igdb_id", "name")) == [(55, "Série")]
+    assert list(game.franchises.values_list("igdb_id", flat=True)) == [66]
+    assert game.igdb_total_rating == 88.5
+    assert list(GameScreenshot.objects.filter(game=game).values_list("position", "igdb_id")) == [(0, 30), (1, 31)]
+    assert list(GameVideo.objects.filter(game=game).values_list("video_id", flat=True)) == ["abc123"]
+    assert Game.objects.get(igdb_id=8).publisher.name == "IGDB"
+    state = IgdbSyncState.objects.get(name=igdb_mirror.MIRROR_STATE_NAME)
+    assert (state.watermark, state.cursor_id, state.games_synced) == (100, None, 2)
+
+
+@pytest.mark.django_db
+def test_sync_catalogue_replaces_links_and_media_on_update(monkeypatch):
+    monkeypatch.setattr(igdb_mirror, "save_demographics", lambda values: None)
+    first = _raw_game(1, 10, genres=[{"id": 1, "name": "A"}], screenshots=[{"id": 2, "url": "//x/t_thumb/a.jpg"}])
+    sync_catalogue(FakeCatalogue([first]))
+
+    second = _raw_game(1, 20, genres=[{"id": 3, "name": "B"}], platforms=[{"id": 4, "name": "P"}])
+    sync_catalogue(FakeCatalogue([second]))
+
+    game = Game.objects.get(igdb_id=1)
+    assert list(game.genres.values_list("igdb_id", flat=True)) == [3]
+    assert not game.screenshots.exists()
+    assert Genre.objects.filter(igdb_id=1).exists() and Platform.objects.filter(igdb_id=4).exists()
+
+
+@pytest.mark.django_db
+def test_sync_catalogue_resumes_from_last_committed_page(small_pages, monkeypatch):
+    monkeypatch.setattr(igdb_mirror, "save_demographics", lambda values: None)
+    games = [_raw_game(1, 10), _raw_game(2, 20), _raw_game(3, 30), _raw_game(4, 40)]
+
+    with pytest.raises(RuntimeError):
+        sync_catalogue(FakeCatalogue(games, fail_after=1))
+    assert IgdbSyncState.objects.get().watermark == 10
+    assert list(Game.objects.values_list("igdb_id", flat=True)) == [1]
+
+    resumed = FakeCatalogue(games)
+    assert sync_catalogue(resumed) == 3
+    assert "updated_at > 10" in resumed.queries[0]
+    assert sorted(Game.objects.values_list("igdb_id", flat=True)) == [1, 2, 3, 4]
+
+
+@pytest.mark.django_db
+def test_sync_catalogue_stores_demographics():
+    sync_catalogue(FakeCatalogue([_raw_game(5, 10, age_ratings=[{"id": 1, "category": 1, "rating": 4}])]))
+
+    assert IgdbGameDemographics.objects.values_list("igdb_id", "min_age").get() == (5, 13)
+
+
+@pytest.mark.django_db
+def test_sync_igdb_catalogue_command_since_and_progress(monkeypatch):
+    monkeypatch.setattr(igdb_mirror, "save_demographics", lambda values: None)
+    fake = FakeCatalogue([_raw_game(1, 1577836799), _raw_game(2, 1577836900)])
+    monkeypatch.setattr("apps.games.igdb_client.igdb_request", fake)
+
+    out = StringIO()
+    call_command("sync_igdb_catalogue", "--since=2020-01-01", stdout=out)
+
+    assert "updated_at > 1577836800" in fake.queries[0]
+    assert list(Game.objects.values_list("igdb_id", flat=True)) == [2]
+    assert "✓ 1 jeux synchronisés." in out.getvalue()
@@ -0,0 +1,231 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import requests
+from django.core.cache import cache
+
+from apps.games import igdb_transport
+
+
+@pytest.fixture(autouse=True)
+def _clean_transport(monkeypatch, locmem_cache):
+    sleeps = []
+    monkeypatch.setattr(igdb_transport.time, "sleep", sleeps.append)
+    igdb_transport.reset_transport_metrics()
+    yield sleeps
+    igdb_transport.reset_transport_metrics()
+
+
+def _fake_session(responses):
+    calls = []
+
+    def fake_post(url, data, headers, timeout):
+        calls.append(url)
+        r = responses[len(calls) - 1]
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    return SimpleNamespace(post=fake_post), calls
+
+
+async def _no_async_sleep(_delay):
+    return None
+
+
+def _resp(status_code, headers=None):
+    return SimpleNamespace(ok=200 <= status_code < 300, status_code=status_code, headers=headers or {})
+
+
+def test_get_session_is_reused_within_process():
+    igdb_transport._reset_session()
+    s1 = igdb_transport.get_session()
+    s2 = igdb_transport.get_session()
+    assert s1 is s2
+    assert isinstance(s1, requests.Session)
+
+
+def test_get_session_recreated_after_fork(monkeypatch):
+    igdb_transport._reset_session()
+    s1 = igdb_transport.get_session()
+    monkeypatch.setattr(igdb_transport.os, "getpid", lambda: -1)
+    s2 = igdb_transport.get_session()
+    assert s1 is not s2
+    igdb_transport._reset_session()
+
+
+def test_post_retries_on_429_then_succeeds(monkeypatch):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    session, calls = _fake_session([_resp(429, {"Retry-After": "1"}), _resp(200)])
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: session)
+
+    resp = igdb_transport.post("games", "https://x/games", b"q", {}, 10)
+
+    assert resp.status_code == 200
+    assert len(calls) == 2
+
+
+def test_post_returns_last_response_after_max_retries(monkeypatch, _clean_transport):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    session, calls = _fake_session([_resp(503)] * (igdb_transport.IGDB_MAX_RETRIES + 1))
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: session)
+
+    resp = igdb_transport.post("games", "https://x/games", b"q", {}, 10)
+
+    assert resp.status_code == 503
+    assert len(calls) == igdb_transport.IGDB_MAX_RETRIES + 1
+    assert len(_clean_transport) == igdb_transport.IGDB_MAX_RETRIES
+
+
+def test_post_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    session, calls = _fake_session([_resp(400)])
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: session)
+
+    assert igdb_transport.post("games", "https://x/games", b"q", {}, 10).status_code == 400
+    assert len(calls) == 1
+
+
+def test_post_retries_network_errors_then_raises(monkeypatch):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    errors = [requests.ConnectionError("reset")] * (igdb_transport.IGDB_MAX_RETRIES + 1)
+    session, calls = _fake_session(errors)
+    monkeypatch.setattr(igdb_transport, "get_session", lambda: session)
+
+    with pytest.raises(requests.ConnectionError):
+        igdb_transport.post("games", "https://x/games", b"q", {}, 10)
+    assert len(calls) == igdb_transport.IGDB_MAX_RETRIES + 1
+    assert igdb_transport.get_transport_metrics()["games"]["errors"] == 1
+
+
+def test_rate_limiter_waits_when_bucket_is_empty(monkeypatch, _clean_transport):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 2)
+    tokens = iter([False, False, True])
+    monkeypatch.setattr(igdb_transport, "_try_take_token", lambda now: next(tokens))
+
+    igdb_transport.acquire_rate_limit_slot()
+
+    assert len(_clean_transport) == 2
+    assert all(0 < s <= 1.05 for s in _clean_transport)
+
+
+def test_try_take_token_shares_bucket_through_cache(monkeypatch):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 2)
+    now = 1_000_000_123.5
+    cache.delete(f"igdb:ratelimit:{int(now)}")
+
+    assert [igdb_transport._try_take_token(now) for _ in range(3)] == [True, True, False]
+
+
+def test_metrics_are_aggregated_per_endpoint(monkeypatch):
+    igdb_transport.record_call_metrics("games", 0.2, 0.0, 0, False)
+    igdb_transport.record_call_metrics("games", 0.4, 0.5, 1, True)
+    igdb_transport.record_call_metrics("games/count", 0.1, 0.0, 0, False)
+
+    metrics = igdb_transport.get_transport_metrics()
+
+    assert set(metrics) == {"games", "games/count"}
+    assert metrics["games"]["calls"] == 2
+    assert metrics["games"]["errors"] == 1
+    assert metrics["games"]["retries"] == 1
+    assert metrics["games"]["latency_ms_avg"] == 300.0
+    assert metrics["games"]["throttled"] == 1
+    assert metrics["games"]["throttle_wait_ms_total"] == 500
+
+
+class _FakeAsyncClient:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    async def post(self, url, content, headers, timeout):
+        self.calls.append(url)
+        r = self.responses[len(self.calls) - 1]
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+
+def test_apost_retries_on_503_then_succeeds(monkeypatch):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(igdb_transport.asyncio, "sleep", _no_async_sleep)
+    client = _FakeAsyncClient([SimpleNamespace(is_success=False, status_code=503, headers={}), SimpleNamespace(is_success=True, status_code=200)])
+    monkeypatch.setattr(igdb_transport, "aget_async_client", _returning(client))
+
+    resp = asyncio.run(igdb_transport.apost("games", "https://x/games", b"q", {}, 10))
+
+    assert resp.status_code == 200
+    assert len(client.calls) == 2
+
+
+def test_apost_retries_transport_errors_then_raises(monkeypatch):
+    monkeypatch.setattr(igdb_transport, "IGDB_RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(igdb_transport.asyncio, "sleep", _no_async_sleep)
+    client = _FakeAsyncClient([httpx.ConnectError("reset")] * (igdb_transport.IGDB_MAX_RETRIES + 1))
+    monkeypatch.setattr(igdb_transport, "aget_async_client", _returning(client))
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(igdb_transport.apost("games", "https://x/games", b"q", {}, 10))
+    assert len(client.calls) == igdb_transport.IGDB_MAX_RETRIES + 1
+
+
+def _returning(value):
+    async def _get():
+        return value
+
+    return _get
+
+
+def test_async_client_is_per_event_loop_and_closed_with_it():
+    async def two_clients():
+        return await igdb_transport.aget_async_client(), await igdb_transport.aget_async_client()
+
+    a1, a2 = asyncio.run(two_clients())
+    b1, _ = asyncio.run(two_clients())
+
+    assert a1 is a2
+    assert a1 is not b1
+    assert a1.is_closed and b1.is_closed
+
+
+def test_apost_in_async_view_served_by_wsgi_uses_shared_session(monkeypatch):
+    from asgiref.sync import async_to_sync
+    from rest_framework.permissions import AllowAny
+    from rest_framework.response import Response
+    from rest_framework.test import APIRequestFactory
+
+    from apps.core.async_views import AsyncAPIView
+
+    class View(AsyncAPIView):
+        authentication_classes = []
+        permission_classes = [AllowAny]
+
+        async def get(self, request):
+            resp = await igdb_transport.apost("games", "https://x/games", b"q", {}, 10)
+            return Response({"status": resp.status_code})
+
+    calls = []
+    monkeypatch.setattr(igdb_transport, "post", lambda *args: calls.append(args) or SimpleNamespace(ok=True, status_code=200))
+    monkeypatch.setattr(igdb_transport, "aget_async_client", lambda: pytest.fail("client httpx créé pour une boucle éphémère"))
+
+    # Handler WSGI : la vue async tourne sur une boucle async_to_sync créée pour la requête
+    response = async_to_sync(View.as_view())(APIRequestFactory().get("/"))
+
+    assert response.data == {"status": 200}
+    assert calls == [("games", "https://x/games", b"q", {}, 10)]
+
+
+def test_long_lived_loop_is_not_ephemeral():
+    async def check():
+        return igdb_transport.is_ephemeral_loop(asyncio.get_running_loop())
+
+    assert asyncio.run(check()) is False
+
+
+def test_response_ok_handles_requests_and_httpx_responses():
+    assert igdb_transport.response_ok(SimpleNamespace(ok=True))
+    assert igdb_transport.response_ok(SimpleNamespace(is_success=True))
+    assert not igdb_transport.response_ok(SimpleNamespace(is_success=False))
+    assert not igdb_transport.response_ok(None)
@@ -0,0 +1,106 @@
+"""Tests du cache trending et de son préchauffage (apps.games.igdb_trending)."""
+
+import time
+
+import pytest
+from django.core.cache import cache
+
+from apps.games import igdb_trending
+from apps.games.igdb_trending import get_trending_warmup_metrics, record_trending_request, trending_cache_key, warm_trending_cache
+from apps.games.views_igdb_helpers import IgdbFilters
+
+POPULAR = IgdbFilters(genre_ids=[12])
+RARE = IgdbFilters(sort="name")
+
+
+@pytest.fixture
+def warmup_cache(locmem_cache):
+    return locmem_cache
+
+
+@pytest.fixture
+def fake_igdb(monkeypatch):
+    calls = []
+
+    def _fetch(_request, limit, offset, filters):
+        calls.append((filters, limit, offset))
+        return [{"id": 1, "name": "Jeu", "total_rating_count": 10}], 1
+
+    monkeypatch.setattr(igdb_trending, "trending_fetch_page", _fetch)
+    return calls
+
+
+def _digest(filters):
+    return igdb_trending._digest(trending_cache_key(filters, 20, 0, False))
+
+
+def _requests(filters, n, hit=False):
+    for _ in range(n):
+        record_trending_request(filters, 20, 0, False, hit=hit)
+
+
+def test_record_is_noop_when_disabled(warmup_cache, settings):
+    settings.IGDB_TRENDING_WARMUP_ENABLED = False
+    _requests(POPULAR, 2)
+    assert warm_trending_cache(lambda games: games)["candidates"] == 0
+
+
+@pytest.mark.django_db
+def test_warmup_renders_top_keys_and_reports_coverage(warmup_cache, fake_igdb):
+    _requests(POPULAR, 3)
+    _requests(RARE, 1)
+
+    report = warm_trending_cache(lambda games: games, top_n=1)
+
+    assert fake_igdb == [(POPULAR, 20, 0)]
+    assert cache.get(trending_cache_key(POPULAR, 20, 0, False))["total_count"] == 1
+    assert cache.get(trending_cache_key(RARE, 20, 0, False)) is None
+    assert (report["candidates"], report["warmed_keys"], report["refreshed"], report["failed"]) == (2, 1, 1, 0)
+    assert (report["requests_covered"], report["requests_total"], report["coverage"]) == (3, 4, 0.75)
+    assert report["duration_ms"] >= 0
+    assert get_trending_warmup_metrics()["last_warmup"] == report
+
+
+@pytest.mark.django_db
+def test_warmup_skips_fresh_entries_and_refreshes_those_about_to_expire(warmup_cache, fake_igdb):
+    _requests(POPULAR, 1)
+    warm_trending_cache(lambda games: games)
+
+    assert warm_trending_cache(lambda games: games)["skipped_fresh"] == 1
+    assert len(fake_igdb) == 1
+
+    rendered = time.time() - (igdb_trending.TRENDING_CACHE_TTL - igdb_trending.TRENDING_WARMUP_REFRESH_AHEAD_SECONDS) - 1
+    cache.set(f"{igdb_trending._RENDERED_PREFIX}:{_digest(POPULAR)}", rendered)
+    assert warm_trending_cache(lambda games: games)["refreshed"] == 1
+    assert len(fake_igdb) == 2
+
+
+def test_warmup_counts_failures(warmup_cache, monkeypatch):
+    monkeypatch.setattr(igdb_trending, "trending_fetch_page", lambda *_a: (_ for _ in ()).throw(RuntimeError("IGDB")))
+    _requests(POPULAR, 1)
+
+    report = warm_trending_cache(lambda games: games)
+
+    assert (report["refreshed"], report["failed"]) == (0, 1)
+
+
+def test_registry_drops_keys_without_requests_in_window(warmup_cache):
+    _requests(POPULAR, 2)
+    _requests(RARE, 1)
+    cache.delete(f"{igdb_trending._REQUESTS_PREFIX}:{_digest(RARE)}")
+
+    ranked, total = igdb_trending._ranked_candidates()
+
+    assert [(digest, params["filters"]["genre_ids"], count) for digest, params, count in ranked] == [(_digest(POPULAR), [12], 2)]
+    assert total == 2
+    assert list(cache.get(igdb_trending._REGISTRY_KEY)) == [_digest(POPULAR)]
+
+
+@pytest.mark.django_db
+def test_trending_view_records_hits_and_misses(warmup_cache, fake_igdb, api_client):
+    api_client.get("/api/igdb/trending/", {"enrich": "0"})
+    api_client.get("/api/igdb/trending/", {"enrich": "0"})
+
+    metrics = get_trending_warmup_metrics()
+    assert (metrics["cache_hits"], metrics["cache_misses"], metrics["cache_hit_ratio"]) == (1, 1, 0.5)
+    assert len(fake_igdb) == 1
@@ -1,15 +1,20 @@
 """Tests unitaires pour apps.games.igdb_wikidata (API Wikidata mockée)."""
 
+import uuid
 from types import SimpleNamespace
 
 import pytest
 
 from apps.games import igdb_wikidata as wd
+from apps.games.models import Game
 
 
 @pytest.fixture(autouse=True)
-def clear_wikidata_cache():
-    """Chaque test repart d'un cache vide."""
+def clear_wikidata_cache(monkeypatch):
+    """Chaque test repart d'un cache vide, avec un niveau Redis et des compteurs qui lui sont propres."""
+    namespace = uuid.uuid4().hex
+    monkeypatch.setattr(wd, "WIKIDATA_SHARED_KEY_PREFIX", f"test:wikidata:{namespace}")
+    monkeypatch.setattr(wd, "_METRICS_KEY_PREFIX", f"test:wikidata:metrics:{namespace}")
     wd._wikidata_cache.clear()
     yield
     wd._wikidata_cache.clear()
@@ -30,6 +35,22 @@ def test_cache_set_get_and_expiry(monkeypatch):
     assert "game" not in wd._wikidata_cache
 
 
+def test_local_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(wd, "WIKIDATA_LOCAL_CACHE_MAX_ENTRIES", 2)
+    wd._local_set("a", "A")
+    wd._local_set("b", "B")
+    assert wd._cache_get("a") == "A"  # "a" redevient le plus récent
+    wd._local_set("c", "C")
+    assert list(wd._wikidata_cache) == ["a", "c"]
+
+
+def test_negative_entry_has_shorter_ttl():
+    wd._local_set("none", None)
+    value, expires_at = wd._wikidata_cache["none"]
+    assert value == ""
+    assert expires_at <= wd.time.time() + wd.WIKIDATA_NEGATIVE_TTL_SECONDS < wd.time.time() + wd.WIKIDATA_TTL_SECONDS
+
+
 def test_escape_sparql_string():
     assert wd._escape_sparql_string('a"b\\') == 'a\\"b\\\\'
 
@@ -54,27 +75,33 @@ def test_partition_cache_hit_falsy_cached_value():
     assert to_fetch == []
 
 
-def test_fetch_batch_parallel_empty_batch():
-    r: dict[str, str | None] = {}
-    wd._fetch_batch_parallel([], r)
-    assert r == {}
+def _sparql_response(bindings):
+    return SimpleNamespace(ok=True, json=lambda: {"results": {"bindings": bindings}})
 
 
-def test_fetch_batch_parallel_and_exception_in_worker(monkeypatch):
-    calls = []
+def _fr(original, label):
+    return {"originalName": {"value": original}, "frLabel": {"value": label}}
+
+
+def test_build_french_labels_query_exact_uses_one_values_block():
+    q = wd.build_french_labels_query(["Halo", 'Say "Hi"'])
+    assert q.count("VALUES") == 1
+    assert '("Halo"@en "Halo")' in q
+    assert '("Say \\"Hi\\""@en "Say \\"Hi\\"")' in q
+    assert "LCASE" not in q
 
-    def fake_fetch(name: str):
-        calls.append(name)
-        if name == "boom":
-            raise RuntimeError("network")
-        return f"FR-{name}"
 
-    monkeypatch.setattr(wd, "fetch_french_label_for_one", fake_fetch)
-    result: dict[str, str | None] = {}
-    wd._fetch_batch_parallel(["ok", "boom"], result)
-    assert set(calls) == {"ok", "boom"}
-    assert result["ok"] == "FR-ok"
-    assert result["boom"] is None
+def test_build_french_labels_query_fuzzy_adds_variants():
+    q = wd.build_french_labels_query(["My Game Edition"], fuzzy=True)
+    assert '("My Game Edition" "My Game Edition")' in q
+    assert '("My Game" "My Game Edition")' in q
+    assert "wd:Q7889" in q
+
+
+def test_merge_french_bindings_keeps_first_non_empty_label():
+    out = {"A": None, "B": None}
+    wd.merge_french_bindings([_fr("A", "  "), _fr("A", " Premier "), _fr("A", "Second"), {"frLabel": {"value": "x"}}], out)
+    assert out == {"A": "Premier", "B": None}
 
 
 def test_fetch_french_label_empty_name():
@@ -83,20 +110,12 @@ def test_fetch_french_label_empty_name():
 
 
 def test_fetch_french_label_success(monkeypatch):
-    def fake_get(url, headers, timeout):
-        assert wd.WIKIDATA_SPARQL_URL in url
+    def fake_get(url, params, headers, timeout):
+        assert url == wd.WIKIDATA_SPARQL_URL
+        assert '"The Legend of Zelda"@en' in params["query"]
         assert headers.get("User-Agent") == wd.USER_AGENT
         assert timeout == wd.WIKIDATA_TIMEOUT_SECONDS
-        return SimpleNamespace(
-            ok=True,
-            json=lambda: {
-                "results": {
-                    "bindings": [
-                        {"frLabel": {"value": "  Zelda  "}},
-                    ]
-                }
-            },
-        )
+        return _sparql_response([_fr("The Legend of Zelda", "  Zelda  ")])
 
     monkeypatch.setattr(wd.requests, "get", fake_get)
     assert wd.fetch_french_label_for_one("The Legend of Zelda") == "Zelda"
@@ -106,25 +125,18 @@ def test_fetch_french_label_response_not_ok(monkeypatch):
     monkeypatch.setattr(
         wd.requests,
         "get",
-        lambda url, headers, timeout: SimpleNamespace(ok=False, status_code=503),
+        lambda url, params, headers, timeout: SimpleNamespace(ok=False, status_code=503),
     )
     assert wd.fetch_french_label_for_one("X") is None
 
 
 def test_fetch_french_label_empty_bindings(monkeypatch):
-    monkeypatch.setattr(
-        wd.requests,
-        "get",
-        lambda url, headers, timeout: SimpleNamespace(
-            ok=True,
-            json=lambda: {"results": {"bindings": []}},
-        ),
-    )
+    monkeypatch.setattr(wd.requests, "get", lambda url, params, headers, timeout: _sparql_response([]))
     assert wd.fetch_french_label_for_one("Unknown Game") is None
 
 
 def test_fetch_french_label_request_exception(monkeypatch):
-    def raise_timeout(url, headers, timeout):
+    def raise_timeout(url, params, headers, timeout):
         raise ConnectionError("timeout")
 
     monkeypatch.setattr(wd.requests, "get", raise_timeout)
@@ -132,38 +144,12 @@ def test_fetch_french_label_request_exception(monkeypatch):
 
 
 def test_fetch_french_label_invalid_fr_value(monkeypatch):
-    monkeypatch.setattr(
-        wd.requests,
-        "get",
-        lambda url, headers, timeout: SimpleNamespace(
-            ok=True,
-            json=lambda: {
-                "results": {
-                    "bindings": [
-                        {"frLabel": {"value": 123}},  # pas une str
-                    ]
-                }
-            },
-        ),
-    )
+    monkeypatch.setattr(wd.requests, "get", lambda url, params, headers, timeout: _sparql_response([_fr("Z", 123)]))
     assert wd.fetch_french_label_for_one("Z") is None
 
 
 def test_fetch_french_label_whitespace_only_fr(monkeypatch):
-    monkeypatch.setattr(
-        wd.requests,
-        "get",
-        lambda url, headers, timeout: SimpleNamespace(
-            ok=True,
-            json=lambda: {
-                "results": {
-                    "bindings": [
-                        {"frLabel": {"value": "   "}},
-                    ]
-                }
-            },
-        ),
-    )
+    monkeypatch.setattr(wd.requests, "get", lambda url, params, headers, timeout: _sparql_response([_fr("W", "   ")]))
     assert wd.fetch_french_label_for_one("W") is None
 
 
@@ -171,13 +157,13 @@ def test_fetch_french_label_json_missing_results(monkeypatch):
     monkeypatch.setattr(
         wd.requests,
         "get",
-        lambda url, headers, timeout: SimpleNamespace(ok=True, json=lambda: None),
+        lambda url, params, headers, timeout: SimpleNamespace(ok=True, json=lambda: None),
     )
     assert wd.fetch_french_label_for_one("Q") is None
 
 
 def test_fetch_french_label_json_raises(monkeypatch):
-    def fake_get(url, headers, timeout):
+    def fake_get(url, params, headers, timeout):
         def bad_json():
             raise ValueError("invalid json")
 
@@ -187,42 +173,100 @@ def test_fetch_french_label_json_raises(monkeypatch):
     assert wd.fetch_french_label_for_one("Err") is None
 
 
-def test_wikidata_french_labels_batches_and_uses_cache(monkeypatch):
-    """Plusieurs noms + dédoublonnage ; 2ᵉ appel utilise le cache."""
-    fetched = []
+def test_wikidata_french_labels_one_query_per_page_and_uses_cache(monkeypatch):
+    """Une seule requête SPARQL pour la page + dédoublonnage ; 2ᵉ appel servi par le cache."""
+    queries = []
 
-    def fake_fetch(name: str):
-        fetched.append(name)
-        return f"fr-{name}"
+    def fake_get(url, params, headers, timeout):
+        queries.append(params["query"])
+        return _sparql_response([_fr("a", "fr-a"), _fr("b", "fr-b")])
 
-    monkeypatch.setattr(wd, "fetch_french_label_for_one", fake_fetch)
+    monkeypatch.setattr(wd.requests, "get", fake_get)
 
-    names = ["a", "b", "a"]  # doublon retiré par _unique_trimmed_names
-    out = wd.wikidata_french_labels_by_english_titles(names)
-    assert out["a"] == "fr-a"
-    assert out["b"] == "fr-b"
-    assert set(fetched) == {"a", "b"} and len(fetched) == 2
+    out = wd.wikidata_french_labels_by_english_titles(["a", "b", "a", "c"])
+    assert out == {"a": "fr-a", "b": "fr-b", "c": None}
+    assert len(queries) == 1
 
-    fetched.clear()
+    queries.clear()
     out2 = wd.wikidata_french_labels_by_english_titles(["a", "b"])
-    assert fetched == []  # tout en cache
+    assert queries == []  # tout en cache
     assert out2["a"] == "fr-a"
 
 
-def test_wikidata_french_labels_large_list_uses_multiple_batches(monkeypatch):
-    """Plus de WIKIDATA_BATCH_CONCURRENCY noms → plusieurs lots."""
-    n = wd.WIKIDATA_BATCH_CONCURRENCY + 3
+def test_wikidata_french_labels_large_list_uses_multiple_pages(monkeypatch):
+    """Plus de WIKIDATA_BATCH_SIZE noms → une requête par page ; une page en erreur n'affecte pas l'autre."""
+    n = wd.WIKIDATA_BATCH_SIZE + 3
     names = [f"g{i}" for i in range(n)]
-    seen = set()
+    queries = []
 
-    def fake_fetch(name: str):
-        seen.add(name)
-        return name
+    def fake_get(url, params, headers, timeout):
+        queries.append(params["query"])
+        if len(queries) == 2:
+            raise ConnectionError("timeout")
+        return _sparql_response([_fr("g0", "G0")])
 
-    monkeypatch.setattr(wd, "fetch_french_label_for_one", fake_fetch)
+    monkeypatch.setattr(wd.requests, "get", fake_get)
     out = wd.wikidata_french_labels_by_english_titles(names)
+    assert len(queries) == 2
     assert len(out) == n
-    assert seen == set(names)
+    assert out["g0"] == "G0"
+    assert out[f"g{n - 1}"] is None
+
+
+def test_titles_without_french_label_are_negatively_cached(monkeypatch):
+    queries = []
+
+    def fake_get(url, params, headers, timeout):
+        queries.append(params["query"])
+        return _sparql_response([])
+
+    monkeypatch.setattr(wd.requests, "get", fake_get)
+
+    assert wd.wikidata_french_labels_by_english_titles(["Obscure"]) == {"Obscure": None}
+    assert wd.wikidata_french_labels_by_english_titles(["Obscure"]) == {"Obscure": None}
+    assert len(queries) == 1
+
+
+def test_failed_page_is_not_negatively_cached(monkeypatch):
+    calls = []
+
+    def fake_get(url, params, headers, timeout):
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("timeout")
+        return _sparql_response([_fr("Halo", "Halo FR")])
+
+    monkeypatch.setattr(wd.requests, "get", fake_get)
+
+    assert wd.wikidata_french_labels_by_english_titles(["Halo"]) == {"Halo": None}
+    assert wd.wikidata_french_labels_by_english_titles(["Halo"]) == {"Halo": "Halo FR"}
+
+
+def test_shared_tier_serves_other_workers_and_counts_hits(monkeypatch):
+    queries = []
+
+    def fake_get(url, params, headers, timeout):
+        queries.append(1)
+        return _sparql_response([_fr("Halo", "Halo FR")])
+
+    monkeypatch.setattr(wd.requests, "get", fake_get)
+
+    wd.wikidata_french_labels_by_english_titles(["Halo", "Nope"])
+    wd._wikidata_cache.clear()  # autre worker : cache local vide
+    out = wd.wikidata_french_labels_by_english_titles(["Halo", "Nope"])
+    wd.wikidata_french_labels_by_english_titles(["Halo"])
+
+    assert out == {"Halo": "Halo FR", "Nope": None}
+    assert len(queries) == 1
+    metrics = wd.get_wikidata_cache_metrics()
+    assert metrics["misses"] == 2
+    assert metrics["shared_hits"] == 2
+    assert metrics["local_hits"] == 1
+    assert metrics["negative_hits"] == 1
+    assert metrics["hit_ratio"] == 0.6
+
+    wd.reset_wikidata_cache_metrics()
+    assert wd.get_wikidata_cache_metrics()["misses"] == 0
 
 
 def test_enrich_with_wikidata_display_name_empty():
@@ -261,6 +305,39 @@ def test_enrich_name_not_in_fr_map(monkeypatch):
     assert out[0]["name"] == "OnlyEn"
 
 
+@pytest.mark.django_db
+def test_enrich_reads_local_name_fr_first_and_queues_new_labels(monkeypatch, publisher, queued_names_fr):
+    """Nom FR déjà en base : pas de Wikidata ; jeu stocké sans nom FR : libellé mis en file ; jeu inconnu : rien."""
+    Game.objects.create(igdb_id=11, name="Halo", name_fr="Halo (FR local)", publisher=publisher)
+    Game.objects.create(igdb_id=12, name="Portal", name_fr="", publisher=publisher)
+    asked = []
+
+    def fake_labels(names):
+        asked.extend(names)
+        return {"Portal": "Portail", "Doom": "Doum"}
+
+    monkeypatch.setattr(wd, "wikidata_french_labels_by_english_titles", fake_labels)
+    out = wd.enrich_with_wikidata_display_name([{"id": 11, "name": "Halo"}, {"id": 12, "name": "Portal"}, {"id": 13, "name": "Doom"}])
+
+    assert asked == ["Portal", "Doom"]
+    assert [g["name"] for g in out] == ["Halo (FR local)", "Portail", "Doum"]
+    assert queued_names_fr == [[12, "Portail"]]
+
+
+@pytest.mark.django_db
+def test_enrich_all_local_names_skips_wikidata(monkeypatch, publisher, queued_names_fr):
+    Game.objects.create(igdb_id=21, name="Halo", name_fr="Halo FR", publisher=publisher)
+
+    def no_wikidata(names):
+        raise AssertionError("Wikidata ne doit pas être appelé")
+
+    monkeypatch.setattr(wd, "wikidata_french_labels_by_english_titles", no_wikidata)
+    out = wd.enrich_with_wikidata_display_name([{"id": 21, "name": "Halo"}])
+
+    assert out[0]["name"] == "Halo FR"
+    assert queued_names_fr == []
+
+
 def test_wikidata_french_label_by_english_title_debug(monkeypatch):
     monkeypatch.setattr(wd, "fetch_french_label_for_one", lambda n: "DBG")
     assert wd.wikidata_french_label_by_english_title_debug("test") == "DBG"
@@ -1,11 +1,14 @@
 """Tests unitaires pour la commande management import_igdb_popular."""
 
+import re
 from io import StringIO
 from unittest.mock import patch
 
 import pytest
 from django.core.management import call_command
 
+from apps.games.models import Game, Genre, IgdbSyncState
+
 
 @pytest.mark.django_db
 class TestImportIgdbPopularCommand:
@@ -40,3 +43,101 @@ class TestImportIgdbPopularCommand:
         mock_import_genres.assert_called_once()
         mock_import_platforms.assert_called_once()
         mock_import_games.assert_called_once()
+
+
+def _fake_catalogue(total, fail_after=None):
+    """Faux IGDB : `total` jeux (ids 1000, 1001, ...) paginés par `id > after`, tri par id ; les autres endpoints sont vides."""
+    calls = []
+
+    def fake_igdb_request(endpoint, query):
+        if endpoint != "games":
+            return []
+        limit = int(re.search(r"limit (\d+);", query).group(1))
+        after = int(re.search(r"id > (\d+)", query).group(1))
+        calls.append((after, limit))
+        if fail_after is not None and after == fail_after:
+            raise RuntimeError("IGDB down")
+        ids = [i for i in range(1000, 1000 + total) if i > after][:limit]
+        return [{"id": i, "name": f"Game {i}", "genres": [{"id": 7, "name": "Seed genre"}]} for i in ids]
+
+    return fake_igdb_request, calls
+
+
+@pytest.fixture
+def fake_catalogue(monkeypatch):
+    def _install(total, fail_after=None):
+        fake, calls = _fake_catalogue(total, fail_after)
+        monkeypatch.setattr("apps.games.management.commands.import_igdb_popular.igdb_request", fake)
+        return calls
+
+    return _install
+
+
+@pytest.mark.django_db
+def test_streams_pages_beyond_500_without_limit(fake_catalogue):
+    Genre.objects.create(igdb_id=7, name="Seed genre")
+    calls = fake_catalogue(1203)
+
+    out = StringIO()
+    call_command("import_igdb_popular", "--skip-meta", "--limit=0", "--page-size=500", stdout=out)
+
+    assert Game.objects.filter(igdb_id__gte=1000).count() == 1203
+    assert Game.genres.through.objects.filter(genre__igdb_id=7).count() == 1203
+    assert calls == [(0, 500), (1499, 500), (1999, 500)]
+    output = out.getvalue()
+    assert "1203 créés, 0 mis à jour" in output
+    assert "jeux/s" in output and "IGDB" in output and "BD" in output
+    assert not IgdbSyncState.objects.filter(name__startswith="import_popular").exists()
+
+
+@pytest.mark.django_db
+def test_limit_caps_last_page(fake_catalogue):
+    calls = fake_catalogue(1000)
+
+    call_command("import_igdb_popular", "--skip-meta", "--limit=250", "--page-size=100", stdout=StringIO())
+
+    assert calls == [(0, 100), (1099, 100), (1199, 50)]
+    assert Game.objects.count() == 250
+
+
+@pytest.mark.django_db
+def test_crash_resumes_after_last_committed_igdb_id(fake_catalogue):
+    fake_catalogue(350, fail_after=1199)
+
+    with pytest.raises(RuntimeError):
+        call_command("import_igdb_popular", "--skip-meta", "--limit=0", "--page-size=100", stdout=StringIO())
+
+    assert Game.objects.count() == 200
+    state = IgdbSyncState.objects.get(name="import_popular:2020:all")
+    assert (state.watermark, state.games_synced) == (1199, 200)
+
+    calls = fake_catalogue(350)
+    out = StringIO()
+    call_command("import_igdb_popular", "--skip-meta", "--limit=0", "--page-size=100", stdout=out)
+
+    assert calls[0] == (1199, 100)
+    assert "Reprise après le jeu IGDB 1199, 200 jeux déjà importés" in out.getvalue()
+    assert Game.objects.count() == 350
+    assert not IgdbSyncState.objects.filter(name="import_popular:2020:all").exists()
+
+
+@pytest.mark.django_db
+def test_resumed_limit_counts_games_already_imported(fake_catalogue):
+    IgdbSyncState.objects.create(name="import_popular:2020:all", watermark=1099, games_synced=100)
+    calls = fake_catalogue(1000)
+
+    call_command("import_igdb_popular", "--skip-meta", "--limit=250", "--page-size=100", stdout=StringIO())
+
+    assert calls == [(1099, 100), (1199, 50)]
+    assert Game.objects.count() == 150
+
+
+@pytest.mark.django_db
+def test_restart_ignores_checkpoint(fake_catalogue):
+    IgdbSyncState.objects.create(name="import_popular:2020:all", watermark=1300, games_synced=300)
+    calls = fake_catalogue(50)
+
+    call_command("import_igdb_popular", "--skip-meta", "--limit=0", "--restart", stdout=StringIO())
+
+    assert calls[0][0] == 0
+    assert Game.objects.count() == 50
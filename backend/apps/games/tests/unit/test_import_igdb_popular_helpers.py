@@ -1,9 +1,7 @@
-import datetime
-
 import pytest
 
 from apps.games.management.commands.import_igdb_popular import Command
-from apps.games.models import Game, Genre, Platform, Publisher
+from apps.games.models import Game, Genre, Platform
 
 
 def make_command():
@@ -69,272 +67,55 @@ def test_import_games_and_publishers_handles_no_games(monkeypatch):
     assert Game.objects.count() == 0
 
 
-def test_fetch_helpers_return_empty_structures_when_no_ids():
-    cmd = make_command()
-
-    assert cmd.fetch_involved_companies([]) == {}
-    assert cmd.fetch_companies([]) == {}
-    assert cmd.fetch_covers([]) == {}
-    assert cmd.fetch_age_ratings([]) == {}
-    assert cmd.fetch_multiplayer_modes([]) == []
-
-
-def test_map_status_handles_none_and_unknown():
-    cmd = make_command()
-
-    assert cmd.map_status(None) == "released"
-    assert cmd.map_status(999) == "released"
-    assert cmd.map_status(0) == "released"
-
-
-def test_map_status_all_igdb_values():
-    """Couvre tous les codes status IGDB mappés (released, alpha, beta, etc.)."""
-    cmd = make_command()
-
-    assert cmd.map_status(0) == "released"
-    assert cmd.map_status(2) == "alpha"
-    assert cmd.map_status(3) == "beta"
-    assert cmd.map_status(4) == "early_access"
-    assert cmd.map_status(5) == "offline"
-    assert cmd.map_status(6) == "cancelled"
-    assert cmd.map_status(7) == "rumored"
-    assert cmd.map_status(8) == "delisted"
-
-
-def test_compute_cover_url_various_cases():
-    cmd = make_command()
-
-    # Pas de cover
-    assert cmd._compute_cover_url({}, {}) is None
-
-    # Cover id mais pas dans la map
-    assert cmd._compute_cover_url({"cover": 1}, {}) is None
-
-    # Cover sans url
-    assert cmd._compute_cover_url({"cover": 1}, {1: {}}) is None
-
-    # Cover avec url vide
-    assert cmd._compute_cover_url({"cover": 1}, {1: {"url": ""}}) is None
-
-    # URL sans protocole
-    game_data = {"cover": 1}
-    covers_map = {1: {"url": "//images.igdb.com/igdb/image/upload/t_cover_big/cover.jpg"}}
-    assert cmd._compute_cover_url(game_data, covers_map).startswith("https://")
-
-    # URL déjà complète
-    covers_map = {1: {"url": "https://cdn.example.com/cover.jpg"}}
-    assert cmd._compute_cover_url(game_data, covers_map) == "https://cdn.example.com/cover.jpg"
-
-
-def test_index_multiplayer_by_game_skips_missing_game_id():
-    cmd = make_command()
-
-    mp_list = [
-        {"id": 1, "game": 10},
-        {"id": 2},  # pas de game
-        {"id": 3, "game": None},
-    ]
-
-    by_game = cmd.index_multiplayer_by_game(mp_list)
-
-    assert list(by_game.keys()) == [10]
-    assert len(by_game[10]) == 1
-
-
-def test_compute_min_age_handles_empty_and_esrb_and_unknown():
-    cmd = make_command()
-
-    # Aucun rating
-    assert cmd.compute_min_age({"id": 1}, {}) is None
-
-    # ESRB mapping
-    game_data = {"id": 1, "age_ratings": [1]}
-    age_ratings_map = {1: {"id": 1, "category": 1, "rating": 4}}  # ESRB T -> 13 ans
-    assert cmd.compute_min_age(game_data, age_ratings_map) == 13
-
-    # Ratings non reconnus -> None
-    game_data = {"id": 1, "age_ratings": [2]}
-    age_ratings_map = {2: {"id": 2, "category": 99, "rating": 999}}
-    assert cmd.compute_min_age(game_data, age_ratings_map) is None
-
-    # Rating id présent dans la liste mais manquant dans la map -> branche "if not ar: continue"
-    game_data = {"id": 1, "age_ratings": [3]}
-    age_ratings_map = {}
-    assert cmd.compute_min_age(game_data, age_ratings_map) is None
+def _page(games_data):
+    from apps.games.management.commands.import_igdb_popular import _Page
 
+    return _Page(after_id=0, requested=len(games_data), games_data=games_data, igdb_seconds=0.0)
 
-def test_compute_player_counts_various_cases():
-    cmd = make_command()
-
-    # Aucun mode pour ce jeu
-    assert cmd.compute_player_counts({"id": 1}, {}) == (None, None)
-
-    # Modes sans valeurs max -> None, None
-    mp_by_game = {1: [{"id": 10}]}
-    assert cmd.compute_player_counts({"id": 1}, mp_by_game) == (None, None)
-
-    # Modes avec valeurs et sans coop -> min_players=1
-    mp_by_game = {
-        1: [
-            {
-                "id": 10,
-                "offlinemax": 2,
-                "onlinemax": 4,
-                "offlinecoopmax": None,
-                "onlinecoopmax": None,
-                "offlinecoop": False,
-                "onlinecoop": False,
-                "campaigncoop": False,
-            }
-        ]
-    }
-    min_players, max_players = cmd.compute_player_counts({"id": 1}, mp_by_game)
-    assert min_players == 1
-    assert max_players == 4
 
+def test_games_where_pages_by_igdb_id():
+    where = make_command()._games_where(1_577_836_800, genre_id=12, after_id=4242)
 
-def test_sync_games_logs_error_when_upsert_fails(monkeypatch, capsys):
-    cmd = make_command()
-
-    def failing_upsert(self, *args, **kwargs):
-        raise ValueError("boom")
-
-    monkeypatch.setattr(
-        "apps.games.management.commands.import_igdb_popular.Command._upsert_single_game",
-        failing_upsert,
-    )
-
-    cmd._sync_games(
-        games_data=[{"id": 1}],
-        involved_map={},
-        publishers_map={},
-        covers_map={},
-        age_ratings_map={},
-        mp_by_game={},
-    )
-
-    captured = capsys.readouterr()
-    assert "ERREUR" in captured.out
-
-
-def test_sync_games_counts_updated_when_upsert_returns_false(monkeypatch, capsys):
-    cmd = make_command()
-
-    def upsert_returns_false(self, *args, **kwargs):
-        return False
-
-    monkeypatch.setattr(
-        "apps.games.management.commands.import_igdb_popular.Command._upsert_single_game",
-        upsert_returns_false,
-    )
-
-    cmd._sync_games(
-        games_data=[{"id": 1}],
-        involved_map={},
-        publishers_map={},
-        covers_map={},
-        age_ratings_map={},
-        mp_by_game={},
-    )
-
-    captured = capsys.readouterr()
-    # Le message final doit contenir "0 créés, 1 mis à jour"
-    assert "0 créés, 1 mis à jour" in captured.out
+    assert where.endswith("id > 4242 & genres = (12)")
+    assert "offset" not in where
 
 
 @pytest.mark.django_db
-def test_find_publisher_for_game_returns_default_when_missing():
-    cmd = make_command()
-
-    game_data = {"id": 1, "involved_companies": [10]}
-    involved_map = {10: {"id": 10, "company": 99, "publisher": False}}
-    publishers_map = {}
-
-    publisher = cmd.find_publisher_for_game(game_data, involved_map, publishers_map)
-
-    assert isinstance(publisher, Publisher)
-    assert publisher.name == "Unknown publisher"
-
-
-@pytest.mark.django_db
-def test_find_publisher_for_game_skips_missing_involved_ids():
-    cmd = make_command()
-
-    # L'ID 999 est dans la liste mais pas dans involved_map -> branche "if not ic: continue"
-    game_data = {"id": 1, "involved_companies": [999]}
-    involved_map = {}
-    publishers_map = {}
-
-    publisher = cmd.find_publisher_for_game(game_data, involved_map, publishers_map)
-
-    assert isinstance(publisher, Publisher)
-    assert publisher.name == "Unknown publisher"
-
-
-@pytest.mark.django_db
-def test_ensure_publishers_counts_updates():
-    cmd = make_command()
-
-    # Publisher déjà existant avec igdb_id=1
-    Publisher.objects.create(igdb_id=1, name="Old Name", description="Old")
-
-    companies_map = {
-        1: {"id": 1, "name": "New Name", "description": "New"},
+def test_write_page_goes_through_mirror_upsert():
+    """Même écriture que le miroir : collections, franchises, médias et éditeur par défaut « IGDB »."""
+    cmd = make_command()
+    state = cmd._checkpoint(2020, None, restart=True)
+    game_data = {
+        "id": 1,
+        "name": "Ok",
+        "game_status": 6,
+        "collections": [{"id": 30, "name": "Series"}],
+        "franchises": [{"id": 31, "name": "Franchise"}],
+        "screenshots": [{"id": 600, "url": "//images.igdb.com/igdb/image/upload/t_thumb/shot.jpg"}],
+        "videos": [{"id": 700, "name": "Trailer", "video_id": "yt123"}],
     }
 
-    mapping = cmd.ensure_publishers(companies_map)
+    result = cmd._write_page(_page([game_data]), state, last_id=1)
 
-    assert 1 in mapping
-    publisher = mapping[1]
-    assert publisher.name == "New Name"
+    assert result == (1, 0)
+    game = Game.objects.get(igdb_id=1)
+    assert (game.status, game.publisher.name) == ("cancelled", "IGDB")
+    assert list(game.collections.values_list("igdb_id", flat=True)) == [30]
+    assert list(game.franchises.values_list("igdb_id", flat=True)) == [31]
+    assert game.screenshots.get().url.startswith("https://")
+    assert list(game.game_videos.values_list("video_id", flat=True)) == ["yt123"]
 
 
 @pytest.mark.django_db
-def test_sync_game_relations_clears_when_no_ids():
+def test_write_page_counts_updated_games(publisher):
     cmd = make_command()
+    state = cmd._checkpoint(2020, None, restart=True)
+    Game.objects.create(igdb_id=1, name="Old", publisher=publisher)
+
+    result = cmd._write_page(_page([{"id": 1, "name": "New", "total_rating": 87.5, "total_rating_count": 40}]), state, last_id=1)
 
-    genre = Genre.objects.create(igdb_id=1, name="Action", description="")
-    platform = Platform.objects.create(igdb_id=2, name="PC", description="")
-    publisher = Publisher.objects.create(name="Pub", description="")
-
-    game = Game.objects.create(
-        igdb_id=1,
-        name="Test Game",
-        description="",
-        release_date=datetime.date(2020, 1, 1),
-        publisher=publisher,
-    )
-    game.genres.add(genre)
-    game.platforms.add(platform)
-
-    # Appel avec listes vides -> devrait faire clear()
-    cmd._sync_game_relations({"genres": [], "platforms": []}, game)
-
-    assert game.genres.count() == 0
-    assert game.platforms.count() == 0
-
-
-# @pytest.mark.django_db
-# def test_sync_game_relations_sets_genres_and_platforms_when_ids_present():
-#     """Couvre la branche où on fait .set() sur les M2M (genres et plateformes)."""
-#     cmd = make_command()
-
-#     genre1 = Genre.objects.create(igdb_id=10, name="Action", description="")
-#     genre2 = Genre.objects.create(igdb_id=11, name="RPG", description="")
-#     platform1 = Platform.objects.create(igdb_id=20, name="PC", description="")
-#     platform2 = Platform.objects.create(igdb_id=21, name="PS5", description="")
-#     publisher = Publisher.objects.create(name="Pub", description="")
-
-#     game = Game.objects.create(
-#         igdb_id=1,
-#         name="Test Game",
-#         description="",
-#         release_date=datetime.date(2020, 1, 1),
-#         publisher=publisher,
-#     )
-
-#     game_data = {"genres": [10, 11], "platforms": [20, 21]}
-#     cmd._sync_game_relations(game_data, game)
-
-#     assert set(game.genres.values_list("igdb_id", flat=True)) == {10, 11}
-#     assert set(game.platforms.values_list("igdb_id", flat=True)) == {20, 21}
+    assert result == (0, 1)
+    game = Game.objects.get(igdb_id=1)
+    assert (game.name, game.igdb_total_rating, game.igdb_rating_count) == ("New", 87.5, 40)
+    state.refresh_from_db()
+    assert (state.watermark, state.games_synced) == (1, 1)
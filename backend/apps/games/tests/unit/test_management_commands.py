@@ -135,6 +135,23 @@ class TestQueryPerformanceCommand:
 
         assert "Order by -popularity_score" in output
 
+    def test_query_performance_tests_search(self):
+        """La commande doit tester la recherche GameFilter.search"""
+        out = StringIO()
+        call_command("test_query_performance", stdout=out)
+
+        assert "Search 'zelda'" in out.getvalue()
+
+    def test_search_query_plan_uses_gin_indexes(self):
+        """Sans Seq Scan possible, la recherche passe par les index trigram et tsvector (préfiltre indexable)"""
+        out = StringIO()
+        call_command("test_query_performance", "--no-seqscan", stdout=out)
+        search_plan = out.getvalue().split("Search 'zelda'")[1]
+
+        assert "games_name_trgm_idx" in search_plan
+        assert "games_name_fr_trgm_idx" in search_plan
+        assert "games_search_vector_idx" in search_plan
+
     def test_query_performance_shows_query_plans(self):
         """La commande doit afficher les plans de requêtes EXPLAIN"""
         out = StringIO()
@@ -351,6 +351,59 @@ class TestRatingAggregates:
         assert game.average_rating == pytest.approx(8.0)
         assert game.rating_count == 1
 
+    def test_update_applies_difference_without_aggregate_queries(self, user, another_user, game):
+        """Updating a rating adjusts the running sum in one UPDATE, without AVG/COUNT over the game's ratings."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        rating = Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=8)
+        Rating.objects.create(user=another_user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=6)
+        rating = Rating.objects.get(pk=rating.pk)
+
+        rating.value = 10
+        with CaptureQueriesContext(connection) as ctx:
+            rating.save()
+
+        sql = " ".join(q["sql"] for q in ctx.captured_queries).upper()
+        assert "AVG(" not in sql and "COUNT(" not in sql
+        game.refresh_from_db()
+        assert game.average_rating == pytest.approx(8.0)
+        assert game.rating_sum == pytest.approx(16.0)
+        assert game.rating_count == 2
+
+    def test_unchanged_value_does_not_touch_game(self, user, game, django_assert_num_queries):
+        Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=8)
+        rating = Rating.objects.get(user=user, game=game)
+
+        with django_assert_num_queries(1):
+            rating.save()
+
+    def test_update_or_create_uses_loaded_value(self, user, game):
+        Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_ETOILES, value=4)
+
+        Rating.objects.update_or_create(user=user, game=game, defaults={"rating_type": Rating.RATING_TYPE_SUR_100, "value": 50})
+
+        game.refresh_from_db()
+        assert (game.rating_count, game.average_rating, game.rating_sum) == (1, pytest.approx(5.0), pytest.approx(5.0))
+
+    def test_deleting_last_rating_resets_aggregates(self, user, game):
+        rating = Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=7)
+
+        rating.delete()
+
+        game.refresh_from_db()
+        assert (game.rating_count, game.average_rating, game.rating_avg, game.rating_sum) == (0, 0.0, 0.0, 0.0)
+
+    def test_delete_on_drifted_game_does_not_go_negative(self, user, game):
+        rating = Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=7)
+        # Dérive : écriture en masse qui contourne les signaux
+        Game.objects.filter(pk=game.pk).update(rating_count=0, rating_sum=0.0)
+
+        rating.delete()
+
+        game.refresh_from_db()
+        assert (game.rating_count, game.average_rating, game.rating_sum) == (0, 0.0, 0.0)
+
 
 class TestNormalizeRating:
     def test_normalize_rating_returns_zero_for_none_value(self):
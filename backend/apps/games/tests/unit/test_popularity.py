@@ -0,0 +1,168 @@
+"""Tests unitaires du calcul de popularity_score (apps.games.popularity)."""
+
+import math
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.games import popularity
+from apps.games.models import Game, IgdbSyncState, Rating
+from apps.library.models import UserGame
+from apps.reviews.models import Review
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def make_game(publisher):
+    counter = iter(range(65000, 66000))
+
+    def _make(**kwargs):
+        igdb_id = next(counter)
+        return Game.objects.create(name=f"Popular {igdb_id}", igdb_id=igdb_id, publisher=publisher, **kwargs)
+
+    return _make
+
+
+def _score(game):
+    game.refresh_from_db()
+    return game.popularity_score
+
+
+def _age(model, days, **filters):
+    field = "date_added" if model is UserGame else "date_created"
+    model.objects.filter(**filters).update(**{field: timezone.now() - timedelta(days=days)})
+
+
+def test_recent_activity_outranks_older_activity(user, make_game):
+    old, recent = make_game(), make_game()
+    UserGame.objects.create(user=user, game=old)
+    UserGame.objects.create(user=user, game=recent)
+    _age(UserGame, 30, game=old)
+
+    popularity.rescore_popularity()
+
+    # 30 jours = 30/7 demi-vies d'écart
+    assert _score(recent) - _score(old) == pytest.approx(30 / popularity.POPULARITY_HALF_LIFE_DAYS, abs=1e-3)
+
+
+def test_weights_combine_library_ratings_and_reviews(user, another_user, make_game):
+    library_only, reviewed = make_game(), make_game()
+    UserGame.objects.create(user=user, game=library_only)
+    UserGame.objects.create(user=user, game=reviewed)
+    Rating.objects.create(user=another_user, game=reviewed, rating_type=Rating.RATING_TYPE_SUR_10, value=8)
+    Review.objects.create(user=another_user, game=reviewed, content="Avis")
+
+    popularity.rescore_popularity()
+
+    expected = popularity.LIBRARY_WEIGHT + popularity.RATING_WEIGHT + popularity.REVIEW_WEIGHT
+    assert _score(reviewed) - _score(library_only) == pytest.approx(math.log2(expected / popularity.LIBRARY_WEIGHT), abs=1e-3)
+
+
+def test_igdb_rating_count_ranks_games_without_local_activity(make_game):
+    unknown, known, famous = make_game(), make_game(igdb_rating_count=50), make_game(igdb_rating_count=5000)
+    Game.objects.update(igdb_rating_count_updated_at=timezone.now())
+
+    popularity.rescore_popularity()
+
+    assert _score(unknown) == 0.0
+    assert _score(famous) - _score(known) == pytest.approx(math.log2(math.log1p(5000) / math.log1p(50)), abs=1e-3)
+
+
+def test_igdb_popularity_competes_with_local_activity(user, make_game):
+    blockbuster, touched_once = make_game(igdb_rating_count=10000), make_game()
+    UserGame.objects.create(user=user, game=touched_once)
+    _age(UserGame, 90, game=touched_once)
+
+    popularity.rescore_popularity()
+
+    # Même niveau de temps : le socle IGDB d'un jeu rafraîchi bat un ajout vieux de 90 jours...
+    assert _score(blockbuster) > _score(touched_once)
+    # ... et vieillit comme une activité si le compteur IGDB ne bouge plus
+    Game.objects.filter(pk=blockbuster.pk).update(igdb_rating_count_updated_at=timezone.now() - timedelta(days=90))
+    popularity.rescore_popularity(full=True)
+    assert _score(blockbuster) - _score(touched_once) == pytest.approx(math.log2(math.log1p(10000)), abs=1e-3)
+
+
+def test_unrelated_write_does_not_refresh_igdb_popularity(make_game):
+    classic, obscure = make_game(igdb_rating_count=5000), make_game(igdb_rating_count=10)
+    Game.objects.filter(pk=classic.pk).update(igdb_rating_count_updated_at=timezone.now() - timedelta(days=14))
+    Game.objects.filter(pk=obscure.pk).update(igdb_rating_count_updated_at=timezone.now() - timedelta(days=200))
+    # Réécriture à l'identique (resynchronisation, traduction) : updated_at avance, pas la date du compteur IGDB
+    obscure.refresh_from_db()
+    obscure.name_fr = "Obscur"
+    obscure.save()
+
+    popularity.rescore_popularity()
+
+    assert _score(classic) > _score(obscure)
+    # Le compteur de l'obscur change : son signal IGDB est daté de maintenant
+    Game.objects.filter(pk=obscure.pk).update(igdb_rating_count=11)
+    popularity.rescore_popularity(full=True)
+    assert _score(obscure) > _score(classic)
+
+
+def test_score_of_inactive_game_does_not_depend_on_run_time(user, make_game):
+    game = make_game()
+    UserGame.objects.create(user=user, game=game)
+    now = timezone.now()
+
+    first = popularity.compute_scores([game.pk], now)
+    later = popularity.compute_scores([game.pk], now + timedelta(days=60))
+
+    assert later == pytest.approx(first, abs=1e-5)
+
+
+def test_incremental_run_only_rescores_active_games(user, make_game):
+    idle, active = make_game(), make_game()
+    popularity.rescore_popularity(now=timezone.now() - timedelta(hours=1))
+    # Aucun des deux jeux n'a d'activité ni de compteur IGDB modifié depuis le passage
+    Game.objects.filter(pk__in=[idle.pk, active.pk]).update(popularity_score=-1.0, igdb_rating_count_updated_at=timezone.now() - timedelta(hours=2))
+
+    UserGame.objects.create(user=user, game=active)
+    rescored, changed = popularity.rescore_popularity()
+
+    assert (rescored, changed) == (1, 1)
+    assert _score(idle) == -1.0
+    assert _score(active) > 0
+    state = IgdbSyncState.objects.get(name=popularity.POPULARITY_STATE_NAME)
+    assert state.games_synced == 3
+
+
+def test_catalogue_update_marks_game_active(make_game):
+    game = make_game()
+    popularity.rescore_popularity(now=timezone.now() - timedelta(hours=1))
+    assert _score(game) == 0.0
+
+    game.igdb_rating_count = 100
+    game.save()
+    popularity.rescore_popularity()
+
+    assert _score(game) > 0.0
+
+
+def test_scores_written_in_one_bulk_update(make_game):
+    games = [make_game(igdb_rating_count=i * 10) for i in range(1, 6)]
+
+    with CaptureQueriesContext(connection) as ctx:
+        changed = popularity.write_scores(popularity.compute_scores([g.pk for g in games], timezone.now()))
+
+    updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+    assert changed == 5
+    assert len(updates) == 1 and "FROM (VALUES" in updates[0]
+    assert popularity.write_scores(popularity.compute_scores([g.pk for g in games], timezone.now())) == 0
+
+
+def test_command_full_rescores_every_game(make_game):
+    make_game(), make_game()
+    popularity.rescore_popularity()
+
+    out = StringIO()
+    call_command("rescore_popularity", "--full", stdout=out)
+
+    assert "2 jeux recalculés, 0 scores modifiés" in out.getvalue()
@@ -6,6 +6,8 @@ from types import SimpleNamespace
 import pytest
 from django.core.management import call_command
 
+from apps.games import igdb_wikidata as wd
+from apps.games.circuit_breaker import CircuitOpenError
 from apps.games.management.commands import populate_name_fr as mod
 from apps.games.models import Game
 
@@ -20,12 +22,10 @@ def test_fetch_french_names_empty_list():
 
 
 def test_fetch_french_names_success_from_bindings(monkeypatch):
-    monkeypatch.setattr(mod.time, "sleep", lambda _: None)
-
     def fake_get(url, params=None, headers=None, timeout=None):
-        assert mod.SPARQL_ENDPOINT in url
+        assert wd.WIKIDATA_SPARQL_URL in url
         assert timeout == 15
-        assert headers.get("User-Agent") == mod.WIKIDATA_USER_AGENT
+        assert headers.get("User-Agent") == wd.USER_AGENT
         return SimpleNamespace(
             ok=True,
             json=lambda: {
@@ -40,36 +40,30 @@ def test_fetch_french_names_success_from_bindings(monkeypatch):
             },
         )
 
-    monkeypatch.setattr(mod.requests, "get", fake_get)
+    monkeypatch.setattr(wd.requests, "get", fake_get)
     out = mod.fetch_french_names(["Zelda"])
     assert out["Zelda"] == "The Legend"
 
 
 def test_fetch_french_names_response_not_ok(monkeypatch):
-    monkeypatch.setattr(mod.time, "sleep", lambda _: None)
-
     def fake_get(url, params=None, headers=None, timeout=None):
         return SimpleNamespace(ok=False, status_code=500)
 
-    monkeypatch.setattr(mod.requests, "get", fake_get)
+    monkeypatch.setattr(wd.requests, "get", fake_get)
     out = mod.fetch_french_names(["X"])
     assert out["X"] is None
 
 
 def test_fetch_french_names_request_exception(monkeypatch):
-    monkeypatch.setattr(mod.time, "sleep", lambda _: None)
-
     def boom(url, params=None, headers=None, timeout=None):
         raise ConnectionError("timeout")
 
-    monkeypatch.setattr(mod.requests, "get", boom)
+    monkeypatch.setattr(wd.requests, "get", boom)
     out = mod.fetch_french_names(["Y"])
     assert out["Y"] is None
 
 
 def test_fetch_french_names_skips_empty_fr_label(monkeypatch):
-    monkeypatch.setattr(mod.time, "sleep", lambda _: None)
-
     def fake_get(url, params=None, headers=None, timeout=None):
         return SimpleNamespace(
             ok=True,
@@ -85,37 +79,36 @@ def test_fetch_french_names_skips_empty_fr_label(monkeypatch):
             },
         )
 
-    monkeypatch.setattr(mod.requests, "get", fake_get)
+    monkeypatch.setattr(wd.requests, "get", fake_get)
     out = mod.fetch_french_names(["A"])
     assert out["A"] is None
 
 
-def test_fetch_french_names_chunks_and_sleeps(monkeypatch):
-    """Plusieurs chunks : CHUNK_SIZE réduit pour le test."""
-    monkeypatch.setattr(mod, "CHUNK_SIZE", 2)
-    sleeps = []
-    monkeypatch.setattr(mod.time, "sleep", lambda s: sleeps.append(s))
+def test_fetch_french_names_pages_by_wikidata_batch_size(monkeypatch):
+    """Une requête SPARQL par page de WIKIDATA_BATCH_SIZE titres, sans pause entre les pages."""
+    queries = []
 
     def fake_get(url, params=None, headers=None, timeout=None):
+        queries.append(params["query"])
         return SimpleNamespace(ok=True, json=lambda: {"results": {"bindings": []}})
 
-    monkeypatch.setattr(mod.requests, "get", fake_get)
-    mod.fetch_french_names(["a", "b", "c", "d"])
-    assert len(sleeps) == 2  # 2 chunks
-    assert all(s == 0.5 for s in sleeps)
+    monkeypatch.setattr(wd.requests, "get", fake_get)
+    names = [f"Game {i}" for i in range(wd.WIKIDATA_BATCH_SIZE + 1)]
+    mod.fetch_french_names(names)
+
+    assert len(queries) == 2
+    assert f'"Game {wd.WIKIDATA_BATCH_SIZE - 1}"' in queries[0] and f'"Game {wd.WIKIDATA_BATCH_SIZE}"' in queries[1]
 
 
 def test_fetch_french_names_builds_variant_values(monkeypatch):
     """Nom avec 'Version' / 'Edition' → variantes dans VALUES (l. 26-33)."""
-    monkeypatch.setattr(mod.time, "sleep", lambda _: None)
-
     captured = {}
 
     def fake_get(url, params=None, headers=None, timeout=None):
         captured["query"] = params.get("query", "")
         return SimpleNamespace(ok=True, json=lambda: {"results": {"bindings": []}})
 
-    monkeypatch.setattr(mod.requests, "get", fake_get)
+    monkeypatch.setattr(wd.requests, "get", fake_get)
     mod.fetch_french_names(["My Game Version"])
     q = captured["query"]
     assert "VALUES" in q
@@ -200,3 +193,22 @@ class TestPopulateNameFrCommand:
         g = Game.objects.get(igdb_id=91005)
         assert g.name_fr == "Nouveau"
         assert "mis à jour" in out.getvalue()
+
+    def test_open_breaker_fails_the_batch(self, publisher, monkeypatch):
+        g = Game.objects.create(
+            igdb_id=91006,
+            name="Halo",
+            name_fr="",
+            publisher=publisher,
+        )
+
+        def open_breaker(*_a, **_k):
+            raise CircuitOpenError("wikidata_backfill", 30)
+
+        monkeypatch.setattr(mod, "fetch_wikidata_bindings", open_breaker)
+        out, err = StringIO(), StringIO()
+        call_command("populate_name_fr", stdout=out, stderr=err)
+        g.refresh_from_db()
+        assert g.name_fr == ""
+        assert f"Lot {g.id}-{g.id} en échec" in err.getvalue()
+        assert "0 jeux mis à jour" in out.getvalue()
@@ -0,0 +1,49 @@
+"""Tests unitaires pour la commande reconcile_rating_stats."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.games.models import Game, Rating
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def drifted_game(user, publisher):
+    game = Game.objects.create(name="Drifted", igdb_id=63001, publisher=publisher)
+    Rating.objects.create(user=user, game=game, rating_type=Rating.RATING_TYPE_SUR_10, value=8)
+    # Écriture en masse : contourne les signaux, les agrégats du jeu dérivent
+    Rating.objects.filter(game=game).update(value=4, normalized_value=4.0)
+    return game
+
+
+def test_reconcile_repairs_drift(drifted_game, publisher):
+    clean = Game.objects.create(name="Clean", igdb_id=63002, publisher=publisher)
+
+    out = StringIO()
+    call_command("reconcile_rating_stats", stdout=out)
+
+    drifted_game.refresh_from_db()
+    assert (drifted_game.rating_count, drifted_game.rating_sum, drifted_game.average_rating, drifted_game.rating_avg) == (1, 4.0, 4.0, 4.0)
+    assert f"Game {clean.pk}" not in out.getvalue()
+    assert "Done. 1 game(s) repaired." in out.getvalue()
+
+
+def test_reconcile_resets_games_without_ratings(publisher):
+    game = Game.objects.create(name="Ghost", igdb_id=63003, publisher=publisher, rating_count=3, rating_sum=20.0, average_rating=6.6)
+
+    call_command("reconcile_rating_stats", stdout=StringIO())
+
+    game.refresh_from_db()
+    assert (game.rating_count, game.rating_sum, game.average_rating) == (0, 0.0, 0.0)
+
+
+def test_reconcile_dry_run_reports_only(drifted_game):
+    out = StringIO()
+    call_command("reconcile_rating_stats", "--dry-run", stdout=out)
+
+    drifted_game.refresh_from_db()
+    assert drifted_game.average_rating == 8.0
+    assert "Done. 1 game(s) would be repaired." in out.getvalue()
@@ -0,0 +1,110 @@
+"""Tests unitaires des tâches Celery de apps.games (exécutées en synchrone)."""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.games import tasks
+from apps.games.models import Game, IgdbGameDemographics
+from apps.games.tasks import persist_games_name_fr, refresh_igdb_demographics
+
+
+@pytest.mark.django_db
+def test_persist_games_name_fr_fills_only_empty_names(publisher):
+    empty = Game.objects.create(igdb_id=1, name="Portal", name_fr="", publisher=publisher)
+    manual = Game.objects.create(igdb_id=2, name="Halo", name_fr="Halo (saisie manuelle)", publisher=publisher)
+
+    updated = persist_games_name_fr([[1, " Portail "], [2, "Halo Wikidata"], [3, "Inconnu"], [4, "  "]])
+
+    assert updated == 1
+    empty.refresh_from_db()
+    manual.refresh_from_db()
+    assert empty.name_fr == "Portail"
+    assert manual.name_fr == "Halo (saisie manuelle)"
+
+
+@pytest.mark.django_db
+def test_persist_games_name_fr_empty_payload():
+    assert persist_games_name_fr([]) == 0
+
+
+@pytest.mark.django_db
+def test_refresh_igdb_demographics_targets_missing_then_stale_rows(monkeypatch, publisher):
+    Game.objects.create(igdb_id=10, name="Sans ligne", publisher=publisher)
+    Game.objects.create(igdb_id=11, name="Ligne fraîche", publisher=publisher)
+    IgdbGameDemographics.objects.create(igdb_id=11, min_age=3)
+    IgdbGameDemographics.objects.create(igdb_id=12, min_age=7)
+    IgdbGameDemographics.objects.create(igdb_id=13, min_age=12)
+    IgdbGameDemographics.objects.filter(igdb_id__in=[12, 13]).update(updated_at=timezone.now() - timedelta(days=30))
+    IgdbGameDemographics.objects.filter(igdb_id=13).update(updated_at=timezone.now() - timedelta(days=60))
+    refreshed = []
+    monkeypatch.setattr(tasks, "refresh_stored_demographics", lambda _req, ids: refreshed.append(ids) or (len(ids), 0))
+
+    assert refresh_igdb_demographics(batch_size=2) == 2
+    assert refreshed == [[10, 13]]
+
+
+@pytest.mark.django_db
+def test_refresh_igdb_demographics_nothing_to_do(monkeypatch):
+    monkeypatch.setattr(tasks, "refresh_stored_demographics", lambda *_a: pytest.fail("rien à rafraîchir"))
+    assert refresh_igdb_demographics() == 0
+
+
+@pytest.mark.django_db
+def test_sync_igdb_catalogue_skips_when_another_run_holds_the_lock(monkeypatch):
+    monkeypatch.setattr(tasks.igdb_cache, "try_lock", lambda *_a, **_k: False)
+    monkeypatch.setattr(tasks.igdb_mirror, "sync_catalogue", lambda *_a, **_k: pytest.fail("exécution concurrente"))
+    assert tasks.sync_igdb_catalogue() == 0
+
+
+@pytest.mark.django_db
+def test_sync_igdb_catalogue_runs_mirror_and_releases_lock(monkeypatch):
+    released = []
+    monkeypatch.setattr(tasks.igdb_cache, "try_lock", lambda *_a, **_k: True)
+    monkeypatch.setattr(tasks.igdb_cache, "release_lock", released.append)
+    monkeypatch.setattr(tasks.igdb_mirror, "sync_catalogue", lambda _req, max_pages: max_pages * 10)
+
+    assert tasks.sync_igdb_catalogue(max_pages=3) == 30
+    assert released == [tasks.MIRROR_LOCK_KEY]
+
+
+def test_rescore_popularity_skips_when_another_run_holds_the_lock(monkeypatch):
+    monkeypatch.setattr(tasks.igdb_cache, "try_lock", lambda *_a, **_k: False)
+    monkeypatch.setattr(tasks.popularity, "rescore_popularity", lambda **_k: pytest.fail("exécution concurrente"))
+    assert tasks.rescore_popularity() == 0
+
+
+def test_rescore_popularity_runs_and_releases_lock(monkeypatch):
+    released = []
+    monkeypatch.setattr(tasks.igdb_cache, "try_lock", lambda *_a, **_k: True)
+    monkeypatch.setattr(tasks.igdb_cache, "release_lock", released.append)
+    monkeypatch.setattr(tasks.popularity, "rescore_popularity", lambda **_k: (12, 4))
+
+    assert tasks.rescore_popularity() == 12
+    assert released == [tasks.POPULARITY_LOCK_KEY]
+
+
+def test_warm_igdb_trending_cache_skips_when_another_run_holds_the_lock(monkeypatch):
+    monkeypatch.setattr(tasks.igdb_cache, "try_lock", lambda *_a, **_k: False)
+    monkeypatch.setattr(tasks.igdb_trending, "warm_trending_cache", lambda *_a: pytest.fail("exécution concurrente"))
+    assert tasks.warm_igdb_trending_cache() == {}
+
+
+def test_warm_igdb_trending_cache_runs_warmup_and_releases_lock(monkeypatch):
+    released = []
+    monkeypatch.setattr(tasks.igdb_cache, "try_lock", lambda *_a, **_k: True)
+    monkeypatch.setattr(tasks.igdb_cache, "release_lock", released.append)
+    monkeypatch.setattr(tasks.igdb_trending, "warm_trending_cache", lambda enrich_fn, top_n: {"refreshed": top_n})
+
+    assert tasks.warm_igdb_trending_cache(top_n=5) == {"refreshed": 5}
+    assert released == [tasks.TRENDING_WARMUP_LOCK_KEY]
+
+
+@pytest.mark.django_db
+def test_heal_stub_game_task_delegates_to_healing(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tasks.healing, "heal_stub_game", lambda igdb_id: calls.append(igdb_id) or True)
+
+    assert tasks.heal_stub_game(42) is True
+    assert calls == [42]
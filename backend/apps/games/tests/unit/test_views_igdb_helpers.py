@@ -1,33 +1,57 @@
 """Tests unitaires des helpers de views_igdb (sans requêtes HTTP)."""
 
+import asyncio
+import threading
+import time
+import uuid
 from unittest.mock import MagicMock
 
 import pytest
 from django.core.exceptions import ImproperlyConfigured
 
+from apps.games import views_igdb_helpers as helpers_mod
 from apps.games.igdb_proxy_constants import MAX_TRANSLATE_TEXT_LEN
+from apps.games.models import Game
+from apps.games.tests.conftest import igdb_multiquery_aware
 from apps.games.views_igdb import _clamp_limit, _clamp_offset, _is_igdb_unavailable
 from apps.games.views_igdb_helpers import (
     IgdbFilters,
-    franchises_collections_fetch_terms,
+    afranchises_collections_fetch_terms,
+    aigdb_search_non_suggest_results,
+    aigdb_search_suggest_results,
+    asearch_page_results,
     franchises_search_build_payload,
-    igdb_search_non_suggest_results,
-    igdb_search_suggest_results,
     merge_igdb_where_predicates,
     merge_trending_where_with_filters,
     parse_genre_id_param,
     parse_igdb_id_list_param,
     parse_optional_int_query,
-    search_page_fallback_search,
-    search_page_name_matches,
     split_sentences_for_translate,
     translate_request_body_to_french,
     trending_enrich_for_response,
-    trending_fetch_games_array,
-    trending_fetch_total_count,
+    trending_fetch_page,
 )
 
 
+def _async_igdb(fake):
+    sync_fake = igdb_multiquery_aware(fake)
+
+    async def _request(ep, q):
+        return sync_fake(ep, q)
+
+    return _request
+
+
+@pytest.fixture
+def async_passthrough_demographics(monkeypatch):
+    """Filtre démographique asynchrone neutralisé (aucun appel age_ratings / multiplayer_modes)."""
+
+    async def _passthrough(_req, games_raw, _ma, _mn, _mx):
+        return games_raw
+
+    monkeypatch.setattr("apps.games.views_igdb_helpers.afilter_games_raw_by_demographics", _passthrough)
+
+
 def test_split_sentences_splits_on_punctuation():
     """Les segments incluent les espaces après la ponctuation (l. 63)."""
     assert split_sentences_for_translate("Hello. World! Yes?") == [
@@ -133,177 +157,125 @@ def test_merge_trending_where_no_extras_only_base_condition():
     assert out.strip().startswith("where total_rating_count > 0")
 
 
-def test_trending_fetch_games_array_use_demo_applies_slice(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_asearch_page_results_post_slice_with_demographics(async_passthrough_demographics):
+    queries = []
 
-    def mock_igdb(_ep, _q):
+    def mock_igdb(_ep, q):
+        queries.append(q)
         return [{"id": i, "total_rating_count": 1} for i in range(100)]
 
-    f = IgdbFilters(min_age=12, sort="popularity")
-    out = trending_fetch_games_array(
-        mock_igdb,
-        limit=5,
-        offset=10,
-        filters=f,
-    )
-    assert len(out) == 5
-    assert out[0]["id"] == 10
+    f = IgdbFilters(genre_ids=[1], platform_ids=[], min_age=7)
+    out = asyncio.run(asearch_page_results(_async_igdb(mock_igdb), "x", "x", limit=5, offset=10, filters=f))
+    assert len(out["results"]) == 5
+    assert out["results"][0]["id"] == 10
+    assert out["total_count"] == 100
+    assert ",genres" in queries[0]
+    assert "age_ratings" in queries[0]
+    assert "offset 0" in queries[0]
 
 
-def test_trending_fetch_games_array_use_demo_with_genre_uses_list_with_genres(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_asearch_page_results_second_query_when_accent_differs():
     queries = []
 
-    def mock_igdb(_ep, q):
+    def mock_igdb(ep, q):
         queries.append(q)
-        return [{"id": 1}]
-
-    f = IgdbFilters(genre_ids=[4], min_age=12, sort="popularity")
-    trending_fetch_games_array(
-        mock_igdb,
-        limit=1,
-        offset=0,
-        filters=f,
-    )
-    assert queries and "genres" in queries[0] and "age_ratings" in queries[0]
+        if "count" in ep:
+            return {"count": 1}
+        if len(queries) == 1:
+            return []
+        return [{"id": 1, "total_rating_count": 1}]
+
+    # Page suivante : pas de recherche de secours, nom brut et nom sans accents avec leurs counts
+    out = asyncio.run(asearch_page_results(_async_igdb(mock_igdb), "café", "cafe", limit=5, offset=5, filters=IgdbFilters()))
+    assert len(queries) == 4
+    assert len(out["results"]) == 1
+    assert out["total_count"] == 1
 
 
-def test_trending_fetch_games_array_multiple_genres_no_demo(monkeypatch):
+def test_trending_fetch_page_single_multiquery_round_trip():
     calls = []
 
-    def mock_igdb(_ep, q):
-        calls.append(q)
-        return []
+    def mock_igdb(ep, q):
+        calls.append(ep)
+        if ep == "games/count":
+            return {"count": 321}
+        return [{"id": 1}, {"id": 2}]
 
-    f = IgdbFilters(genre_ids=[3, 4], sort="popularity")
-    trending_fetch_games_array(mock_igdb, limit=5, offset=0, filters=f)
-    assert len(calls) == 1
-    assert "genres = (3)" in calls[0] and "genres = (4)" in calls[0]
+    arr, total = trending_fetch_page(igdb_multiquery_aware(mock_igdb), limit=2, offset=4, filters=IgdbFilters())
+
+    assert arr == [{"id": 1}, {"id": 2}]
+    assert total == 321
+    assert calls == ["games", "games/count"]
 
 
-def test_trending_fetch_total_count_use_demo_branch(monkeypatch):
+def test_trending_fetch_page_demo_mode_uses_one_raw_fetch(monkeypatch):
     monkeypatch.setattr(
         "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw[:3],
+        lambda _req, games_raw, _ma, _mn, _mx: games_raw[::2],
     )
+    queries = []
 
-    def mock_igdb(_ep, _q):
-        return [{"id": i} for i in range(50)]
+    def mock_igdb(ep, q):
+        queries.append((ep, q))
+        return [{"id": i} for i in range(40)]
 
-    f = IgdbFilters(min_age=12, sort="popularity")
-    n = trending_fetch_total_count(
-        mock_igdb,
-        filters=f,
-    )
-    assert n == 3
+    arr, total = trending_fetch_page(mock_igdb, limit=5, offset=5, filters=IgdbFilters(min_players=2))
 
+    assert len(queries) == 1
+    assert "limit 500; offset 0;" in queries[0][1]
+    assert total == 20
+    assert [g["id"] for g in arr] == [10, 12, 14, 16, 18]
 
-def test_trending_fetch_total_count_non_demo_returns_len_raw(monkeypatch):
-    def mock_igdb(ep, _q):
-        if "count" in ep:
-            return {"count": 2}
-        return [{"id": 1}, {"id": 2}]
 
-    f = IgdbFilters(sort="popularity")
-    n = trending_fetch_total_count(mock_igdb, filters=f)
-    assert n == 2
+def test_asearch_page_results_fallback_in_same_round_trip(async_passthrough_demographics):
+    round_trips = []
 
+    def mock_igdb(ep, q):
+        if "where name ~" in q or ep == "games/count":
+            return {"count": 0} if ep == "games/count" else []
+        return [{"id": 5, "total_rating_count": 3}, {"id": 6, "total_rating_count": 9}]
 
-def test_search_page_name_matches_post_slice_with_demographics(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
-    queries = []
+    wrapped = _async_igdb(mock_igdb)
 
-    def mock_igdb(_ep, q):
-        queries.append(q)
-        return [{"id": i, "total_rating_count": 1} for i in range(100)]
+    async def counting(ep, q):
+        round_trips.append(ep)
+        return await wrapped(ep, q)
 
-    f = IgdbFilters(genre_ids=[1], platform_ids=[], min_age=7)
-    out = search_page_name_matches(
-        mock_igdb,
-        "x",
-        "x",
-        limit=5,
-        offset=10,
-        filters=f,
-    )
-    assert len(out["results"]) == 5
-    assert out["results"][0]["id"] == 10
-    assert out["total_count"] == 100
-    assert ",genres" in queries[0]
-    assert "age_ratings" in queries[0]
-    assert "offset 0" in queries[0]
+    out = asyncio.run(asearch_page_results(counting, "café", "cafe", limit=5, offset=0, filters=IgdbFilters()))
 
+    assert round_trips == ["multiquery"]
+    assert [g["id"] for g in out["results"]] == [6, 5]
+    assert out["total_count"] == 2
 
-def test_search_page_name_matches_second_query_when_accent_differs(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
-    queries = []
+
+def test_asearch_page_results_no_fallback_after_first_page():
+    seen = []
 
     def mock_igdb(ep, q):
-        queries.append(q)
-        if "count" in ep:
-            return {"count": 1}
-        if len(queries) == 1:
-            return []
-        return [{"id": 1, "total_rating_count": 1}]
+        seen.append(q)
+        return {"count": 0} if ep == "games/count" else []
 
-    f = IgdbFilters()
-    out = search_page_name_matches(
-        mock_igdb,
-        "café",
-        "cafe",
-        limit=5,
-        offset=0,
-        filters=f,
-    )
-    # On a maintenant 4 requêtes car chaque recherche par nom fait aussi un count
-    # Sauf si on a trouvé des résultats dès la première recherche.
-    # Dans ce test, la première recherche par nom renvoie [], donc on tente la seconde.
-    # Mais attendez, si la première renvoie [], on tente la seconde.
-    # Dans mon code :
-    # arr, total = fetch_for_q(q_esc)
-    #   -> fetch_for_q fait : 1 games request + 1 count request (si pas demo)
-    #   -> total = 2 queries.
-    # if not arr ... :
-    #   arr, total = fetch_for_q(q_norm_esc)
-    #   -> 2 more queries.
-    # Total = 4.
-    assert len(queries) == 4
-    assert len(out["results"]) == 1
-    assert out["total_count"] == 1
+    out = asyncio.run(asearch_page_results(_async_igdb(mock_igdb), "x", "x", limit=5, offset=10, filters=IgdbFilters()))
 
+    assert out == {"results": [], "total_count": 0}
+    assert not any("search " in q for q in seen)
 
-def test_search_page_fallback_search_exception_returns_empty():
-    def boom(_ep, _q):
-        raise RuntimeError("igdb down")
 
-    f = IgdbFilters(genre_ids=[1])
-    assert search_page_fallback_search(
-        boom,
-        "q",
-        limit=5,
-        filters=f,
-    ) == {"results": [], "total_count": 0}
+def test_asearch_page_results_fallback_failure_returns_empty():
+    def mock_igdb(ep, q):
+        if 'search "' in q:
+            raise RuntimeError("igdb down")
+        return {"count": 0} if ep == "games/count" else []
 
+    out = asyncio.run(asearch_page_results(_async_igdb(mock_igdb), "q", "q", limit=5, offset=0, filters=IgdbFilters(genre_ids=[1])))
 
-def test_search_page_fallback_search_success_filters_sorts_and_limits(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+    assert out == {"results": [], "total_count": 0}
 
-    def mock_igdb(_ep, _q):
+
+def test_asearch_page_results_fallback_filters_sorts_and_limits(async_passthrough_demographics):
+    def mock_igdb(ep, q):
+        if 'search "' not in q:
+            return {"count": 0} if ep == "games/count" else []
         return [
             {"id": 1, "total_rating_count": 5, "genres": [{"id": 1}]},
             {"id": 2, "total_rating_count": 20, "genres": [{"id": 1}]},
@@ -311,12 +283,7 @@ def test_search_page_fallback_search_success_filters_sorts_and_limits(monkeypatc
         ]
 
     f = IgdbFilters(genre_ids=[1])
-    out = search_page_fallback_search(
-        mock_igdb,
-        "q",
-        limit=1,
-        filters=f,
-    )
+    out = asyncio.run(asearch_page_results(_async_igdb(mock_igdb), "q", "q", limit=1, offset=0, filters=f))
     assert len(out["results"]) == 1
     assert out["results"][0]["id"] == 2
 
@@ -329,11 +296,7 @@ def test_merge_trending_where_injects_genre_and_platform():
     assert "total_rating_count > 0" in out
 
 
-def test_igdb_search_non_suggest_with_genre_uses_extended_fields(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_aigdb_search_non_suggest_with_genre_uses_extended_fields(async_passthrough_demographics):
     queries = []
 
     def mock_igdb(_ep, q):
@@ -341,22 +304,12 @@ def test_igdb_search_non_suggest_with_genre_uses_extended_fields(monkeypatch):
         return [{"id": 1, "total_rating_count": 5, "genres": [{"id": 2}]}]
 
     f = IgdbFilters(genre_ids=[2])
-    out = igdb_search_non_suggest_results(
-        mock_igdb,
-        "zelda",
-        "zelda",
-        limit=3,
-        filters=f,
-    )
+    out = asyncio.run(aigdb_search_non_suggest_results(_async_igdb(mock_igdb), "zelda", "zelda", limit=3, filters=f))
     assert len(out) == 1
     assert ",genres" in queries[0]
 
 
-def test_igdb_search_non_suggest_second_query_when_first_empty(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_aigdb_search_non_suggest_second_query_when_first_empty(async_passthrough_demographics):
     calls = []
 
     def mock_igdb(_ep, q):
@@ -366,16 +319,12 @@ def test_igdb_search_non_suggest_second_query_when_first_empty(monkeypatch):
         return [{"id": 1, "total_rating_count": 1}]
 
     f = IgdbFilters()
-    out = igdb_search_non_suggest_results(mock_igdb, "a", "b", limit=5, filters=f)
+    out = asyncio.run(aigdb_search_non_suggest_results(_async_igdb(mock_igdb), "a", "b", limit=5, filters=f))
     assert len(calls) == 2
     assert len(out) == 1
 
 
-def test_igdb_search_non_suggest_with_min_age_adds_demographics_fields(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_aigdb_search_non_suggest_with_min_age_adds_demographics_fields(async_passthrough_demographics):
     queries = []
 
     def mock_igdb(_ep, q):
@@ -383,21 +332,11 @@ def test_igdb_search_non_suggest_with_min_age_adds_demographics_fields(monkeypat
         return [{"id": 1, "total_rating_count": 5}]
 
     f = IgdbFilters(min_age=12)
-    igdb_search_non_suggest_results(
-        mock_igdb,
-        "x",
-        "x",
-        limit=2,
-        filters=f,
-    )
+    asyncio.run(aigdb_search_non_suggest_results(_async_igdb(mock_igdb), "x", "x", limit=2, filters=f))
     assert "age_ratings" in queries[0]
 
 
-def test_igdb_search_suggest_swallows_name_request_exception(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_aigdb_search_suggest_swallows_name_request_exception(async_passthrough_demographics):
     calls = []
 
     def mock_igdb(_ep, q):
@@ -407,33 +346,25 @@ def test_igdb_search_suggest_swallows_name_request_exception(monkeypatch):
         return [{"id": 1, "total_rating_count": 10}]
 
     f = IgdbFilters()
-    out = igdb_search_suggest_results(mock_igdb, "x", "x", limit=5, filters=f)
+    out = asyncio.run(aigdb_search_suggest_results(_async_igdb(mock_igdb), "x", "x", limit=5, filters=f))
     assert len(out) == 1
 
 
-def test_igdb_search_suggest_swallows_search_request_exception(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_aigdb_search_suggest_swallows_search_request_exception(async_passthrough_demographics):
     calls = []
 
     def mock_igdb(_ep, q):
         calls.append(q)
-        if len(calls) == 1:
+        if "where name ~" in q:
             return [{"id": 2, "total_rating_count": 5}]
         raise RuntimeError("search down")
 
     f = IgdbFilters()
-    out = igdb_search_suggest_results(mock_igdb, "x", "x", limit=5, filters=f)
+    out = asyncio.run(aigdb_search_suggest_results(_async_igdb(mock_igdb), "x", "x", limit=5, filters=f))
     assert len(out) == 1 and out[0]["id"] == 2
 
 
-def test_igdb_search_suggest_accent_fallback_merges_filters(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_aigdb_search_suggest_accent_fallback_merges_filters(async_passthrough_demographics):
     calls = []
 
     def mock_igdb(_ep, q):
@@ -443,22 +374,12 @@ def test_igdb_search_suggest_accent_fallback_merges_filters(monkeypatch):
         return [{"id": 1, "total_rating_count": 10, "genres": [{"id": 1}]}]
 
     f = IgdbFilters(genre_ids=[1])
-    out = igdb_search_suggest_results(
-        mock_igdb,
-        "café",
-        "cafe",
-        limit=3,
-        filters=f,
-    )
+    out = asyncio.run(aigdb_search_suggest_results(_async_igdb(mock_igdb), "café", "cafe", limit=3, filters=f))
     assert len(calls) == 3
     assert len(out) == 1
 
 
-def test_igdb_search_suggest_fallback_swallows_exception(monkeypatch):
-    monkeypatch.setattr(
-        "apps.games.views_igdb_helpers.filter_games_raw_by_demographics",
-        lambda _req, games_raw, _ma, _mn, _mx: games_raw,
-    )
+def test_aigdb_search_suggest_fallback_swallows_exception(async_passthrough_demographics):
     calls = []
 
     def mock_igdb(_ep, q):
@@ -468,7 +389,7 @@ def test_igdb_search_suggest_fallback_swallows_exception(monkeypatch):
         raise RuntimeError("fallback")
 
     f = IgdbFilters()
-    out = igdb_search_suggest_results(mock_igdb, "café", "cafe", limit=2, filters=f)
+    out = asyncio.run(aigdb_search_suggest_results(_async_igdb(mock_igdb), "café", "cafe", limit=2, filters=f))
     assert out == []
 
 
@@ -498,17 +419,6 @@ def test_is_igdb_unavailable(exc, expected):
     assert _is_igdb_unavailable(exc) is expected
 
 
-def _igdb_request_that_raises(_endpoint, _query):
-    raise RuntimeError("IGDB unavailable")
-
-
-@pytest.mark.parametrize("genre_ids", [[], [42]])
-def test_trending_fetch_total_count_returns_zero_on_igdb_error(genre_ids):
-    """Branche except si la requête IGDB échoue."""
-    f = IgdbFilters(genre_ids=genre_ids)
-    assert trending_fetch_total_count(_igdb_request_that_raises, f) == 0
-
-
 def test_trending_enrich_for_response_enrich_true(monkeypatch):
     monkeypatch.setattr(
         "apps.games.views_igdb_helpers.enrich_normalized_games",
@@ -535,7 +445,7 @@ def test_trending_enrich_for_response_enrich_false_normalizes(monkeypatch):
     assert out[0]["name"] == "RawName"
 
 
-def test_franchises_collections_fetch_terms_happy_path():
+def test_afranchises_collections_fetch_terms_happy_path():
     def mock_igdb(ep, q):
         if ep == "franchises":
             return [{"id": 1, "name": "Fr"}]
@@ -543,16 +453,16 @@ def test_franchises_collections_fetch_terms_happy_path():
             return [{"id": 2, "name": "Col"}]
         return []
 
-    fr, col = franchises_collections_fetch_terms(mock_igdb, ["mario"])
+    fr, col = asyncio.run(afranchises_collections_fetch_terms(_async_igdb(mock_igdb), ["mario"]))
     assert len(fr) == 1 and fr[0]["name"] == "Fr"
     assert len(col) == 1 and col[0]["name"] == "Col"
 
 
-def test_franchises_collections_fetch_terms_swallows_errors():
+def test_afranchises_collections_fetch_terms_swallows_errors():
     def mock_igdb(_ep, _q):
         raise RuntimeError("down")
 
-    fr, col = franchises_collections_fetch_terms(mock_igdb, ["x"])
+    fr, col = asyncio.run(afranchises_collections_fetch_terms(_async_igdb(mock_igdb), ["x"]))
     assert fr == [] and col == []
 
 
@@ -589,7 +499,95 @@ def test_translate_request_body_not_ok(monkeypatch):
     assert translate_request_body_to_french("hello") == "hello"
 
 
-def test_igdb_search_non_suggest_exception_swallowed(monkeypatch):
+@pytest.fixture
+def translation_cache(monkeypatch):
+    """Cache des traductions avec un espace de clés propre au test."""
+    monkeypatch.setattr(helpers_mod, "_TRANSLATE_KEY_PREFIX", f"test:translate:{uuid.uuid4().hex}")
+
+
+def test_translate_chunks_runs_concurrently_with_cap(monkeypatch):
+    monkeypatch.setattr(helpers_mod, "TRANSLATE_MAX_CONCURRENCY", 2)
+    lock = threading.Lock()
+    state = {"now": 0, "max": 0}
+
+    def fake_translate(chunk):
+        with lock:
+            state["now"] += 1
+            state["max"] = max(state["max"], state["now"])
+        time.sleep(0.02)
+        with lock:
+            state["now"] -= 1
+        return chunk.upper()
+
+    monkeypatch.setattr(helpers_mod, "_mymemory_translate", fake_translate)
+    out, complete = helpers_mod.translate_chunks_to_french(["a", "b", "c", "d", "a"])
+
+    assert out == ["A", "B", "C", "D", "A"]
+    assert complete is True
+    assert state["max"] == 2
+
+
+def test_translate_chunks_served_from_cache_by_content_hash(monkeypatch, translation_cache):
+    calls = []
+
+    def fake_translate(chunk):
+        calls.append(chunk)
+        return None if chunk == "fails" else f"fr:{chunk}"
+
+    monkeypatch.setattr(helpers_mod, "_mymemory_translate", fake_translate)
+
+    assert helpers_mod.translate_chunks_to_french(["one", "fails"]) == (["fr:one", "fails"], False)
+    assert helpers_mod.translate_chunks_to_french(["one", "fails"]) == (["fr:one", "fails"], False)
+    # Un morceau traduit n'est demandé qu'une fois ; un échec n'est pas mis en cache
+    assert calls == ["one", "fails", "fails"]
+
+
+@pytest.mark.django_db
+def test_translate_game_summary_stores_and_reuses_description_fr(monkeypatch, publisher):
+    game = Game.objects.create(igdb_id=77, name="Portal", description="A puzzle game.", publisher=publisher)
+    calls = []
+
+    def fake_translate(chunk):
+        calls.append(chunk)
+        return "Un jeu de réflexion."
+
+    monkeypatch.setattr(helpers_mod, "_mymemory_translate", fake_translate)
+
+    assert helpers_mod.translate_game_summary_to_french("A puzzle game.", 77) == "Un jeu de réflexion."
+    game.refresh_from_db()
+    assert game.description_fr == "Un jeu de réflexion."
+
+    assert helpers_mod.translate_game_summary_to_french("A puzzle game.", 77) == "Un jeu de réflexion."
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_translate_game_summary_retranslates_after_description_change(monkeypatch, publisher):
+    game = Game.objects.create(igdb_id=79, name="Doom", description="Old summary.", publisher=publisher)
+    monkeypatch.setattr(helpers_mod, "_mymemory_translate", lambda chunk: f"fr:{chunk}")
+    assert helpers_mod.translate_game_summary_to_french("Old summary.", 79) == "fr:Old summary."
+
+    # Le miroir / l'import réécrivent description sans toucher description_fr
+    Game.objects.filter(pk=game.pk).update(description="New summary.")
+
+    assert helpers_mod.translate_game_summary_to_french("New summary.", 79) == "fr:New summary."
+    game.refresh_from_db()
+    assert game.description_fr == "fr:New summary."
+
+
+@pytest.mark.django_db
+def test_translate_game_summary_ignores_other_text_and_partial_translation(monkeypatch, publisher):
+    game = Game.objects.create(igdb_id=78, name="Halo", description="Shooter.", publisher=publisher)
+    monkeypatch.setattr(helpers_mod, "_mymemory_translate", lambda chunk: None)
+
+    assert helpers_mod.translate_game_summary_to_french("Shooter.", 78) == "Shooter."
+    monkeypatch.setattr(helpers_mod, "_mymemory_translate", lambda chunk: "Autre")
+    assert helpers_mod.translate_game_summary_to_french("Something else.", 78) == "Autre"
+    game.refresh_from_db()
+    assert game.description_fr == ""
+
+
+def test_aigdb_search_non_suggest_norm_exception_swallowed():
     def mock_igdb(ep, q):
         if "search" in q:
             if "cafe" in q:  # only fail on the second query
@@ -599,16 +597,60 @@ def test_igdb_search_non_suggest_exception_swallowed(monkeypatch):
 
     f = IgdbFilters()
     # Should not raise even if second query fails
-    out = igdb_search_non_suggest_results(mock_igdb, "café", "cafe", 5, f)
+    out = asyncio.run(aigdb_search_non_suggest_results(_async_igdb(mock_igdb), "café", "cafe", 5, f))
     assert out == []
 
 
-def test_trending_fetch_total_count_old_coverage():
-    from apps.games.views_igdb_helpers import trending_fetch_total_count_old
+def test_afranchises_replays_subqueries_concurrently_when_multiquery_fails():
+    """Multiquery en échec : les sous-requêtes sont rejouées en parallèle (elles se chevauchent)."""
+    in_flight = {"now": 0, "max": 0}
+
+    async def mock_igdb(ep, q):
+        if ep == "multiquery":
+            raise RuntimeError("multiquery down")
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0)
+        in_flight["now"] -= 1
+        if ep == "collections":
+            raise RuntimeError("collections down")
+        return [{"id": 1, "name": "Zelda"}]
+
+    f, c = asyncio.run(afranchises_collections_fetch_terms(mock_igdb, ["zelda", "zeld"]))
+
+    assert f == [{"id": 1, "name": "Zelda"}, {"id": 1, "name": "Zelda"}]
+    assert c == []
+    assert in_flight["max"] == 4
+
+
+def test_aigdb_search_suggest_results_merges_name_and_search(async_passthrough_demographics):
+
+    def mock_igdb(_ep, q):
+        if "where name ~" in q:
+            return [{"id": 1, "total_rating_count": 5}]
+        return [{"id": 2, "total_rating_count": 9}, {"id": 1, "total_rating_count": 5}]
+
+    out = asyncio.run(aigdb_search_suggest_results(_async_igdb(mock_igdb), "x", "x", limit=5, filters=IgdbFilters()))
 
+    assert [g["id"] for g in out] == [2, 1]
+
+
+def test_asearch_page_results_uses_fallback_on_first_page():
     def mock_igdb(ep, q):
-        if "count" in ep:
-            return {"count": 1}
-        return [{"id": 1}]
+        if ep == "games/count":
+            return {"count": 0}
+        if "where name ~" in q:
+            return []
+        return [{"id": 5, "total_rating_count": 3}]
+
+    out = asyncio.run(asearch_page_results(_async_igdb(mock_igdb), "x", "x", limit=5, offset=0, filters=IgdbFilters()))
+
+    assert out == {"results": [{"id": 5, "total_rating_count": 3}], "total_count": 1}
+
+
+def test_aigdb_search_non_suggest_main_failure_propagates():
+    async def mock_igdb(ep, q):
+        raise RuntimeError("igdb down")
 
-    assert trending_fetch_total_count_old(mock_igdb, [], [], "popularity") == 1
+    with pytest.raises(RuntimeError):
+        asyncio.run(aigdb_search_non_suggest_results(mock_igdb, "a", "b", limit=5, filters=IgdbFilters()))
@@ -0,0 +1,76 @@
+"""
+Données utilisateur superposées aux jeux (user_library, user_rating, collection_ids), chargées par lot.
+
+Patron DataLoader : les ids de jeux d'une liste sont d'abord accumulés (prime), puis chargés en un seul
+lot au premier accès — 3 requêtes pour toute la liste (ludothèque, collections, notes) au lieu de 1 à 3
+par jeu. Le chargeur est mémorisé sur la requête HTTP (game_overlay_loader) : les sérialiseurs d'une
+même requête partagent ses résultats.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db.models import Prefetch
+
+from apps.games.models import Rating
+from apps.library.models import UserGame, UserLibrary, UserLibraryEntry
+
+_REQUEST_ATTR = "_game_overlay_loader"
+
+
+class GameOverlayLoader:
+    def __init__(self, user):
+        self.user = user if user is not None and user.is_authenticated else None
+        self._pending: set[int] = set()
+        self._libraries: dict[int, dict | None] = {}
+        self._ratings: dict[int, dict | None] = {}
+
+    def prime(self, game_ids: Iterable[int]) -> None:
+        """Ajoute des jeux au prochain lot ; sans requête tant qu'aucune donnée n'est lue."""
+        if self.user is None:
+            return
+        self._pending.update(game_id for game_id in game_ids if game_id is not None and game_id not in self._libraries)
+
+    def user_library(self, game_id: int) -> dict | None:
+        self._load(game_id)
+        return self._libraries.get(game_id)
+
+    def user_rating(self, game_id: int) -> dict | None:
+        self._load(game_id)
+        return self._ratings.get(game_id)
+
+    def _load(self, game_id: int) -> None:
+        if self.user is None or game_id in self._libraries:
+            return
+        game_ids = self._pending | {game_id}
+        self._pending = set()
+
+        entries = UserLibraryEntry.objects.exclude(library__system_key=UserLibrary.SystemKey.MA_LUDOTHEQUE).only("library_id", "user_game_id")
+        user_games = UserGame.objects.filter(user=self.user, game_id__in=game_ids).prefetch_related(
+            Prefetch("library_entries", queryset=entries, to_attr="overlay_entries")
+        )
+        ratings = Rating.objects.filter(user=self.user, game_id__in=game_ids).only("game_id", "value", "rating_type")
+
+        self._libraries.update(dict.fromkeys(game_ids))
+        self._ratings.update(dict.fromkeys(game_ids))
+        for user_game in user_games:
+            self._libraries[user_game.game_id] = {
+                "id": user_game.id,
+                "status": user_game.status,
+                "is_favorite": user_game.is_favorite,
+                "collection_ids": [entry.library_id for entry in user_game.overlay_entries],
+            }
+        for rating in ratings:
+            self._ratings[rating.game_id] = {"value": float(rating.value), "rating_type": rating.rating_type}
+
+
+def game_overlay_loader(request) -> GameOverlayLoader:
+    """Chargeur de la requête (créé au premier appel) ; un chargeur éphémère si aucune requête n'est fournie."""
+    user = getattr(request, "user", None)
+    loader = getattr(request, _REQUEST_ATTR, None)
+    if loader is None or loader.user != (user if user is not None and user.is_authenticated else None):
+        loader = GameOverlayLoader(user)
+        if request is not None:
+            setattr(request, _REQUEST_ATTR, loader)
+    return loader
@@ -4,7 +4,7 @@ from typing import Optional
 from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
-from django.db.models import Avg, Count, Max, Prefetch
+from django.db.models import Avg, Count
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -21,9 +21,11 @@ from rest_framework.viewsets import ModelViewSet
 from apps.core.query_params import parse_multi_ids
 from apps.core.reports_export import MSG_EXPORT_FORBIDDEN, PERMISSION_REPORTS_EXPORT, build_games_csv, build_games_pdf
 from apps.games import igdb_client
-from apps.games.filters import GameFilter
+from apps.games.filters import GameFilter, GameOrderingFilter, search_similarity_threshold
+from apps.games.healing import is_stub_game, request_stub_healing
 from apps.games.igdb_proxy_constants import FIELDS_GAME_DETAIL
-from apps.games.models import Game, Genre, Platform, Publisher, Rating
+from apps.games.models import Game, GameStats, Genre, Platform, Publisher, Rating
+from apps.games.pagination import GameKeysetPagination
 from apps.games.permissions import CanDeleteGame, CanDeleteRating, CanEditGame, CanReadGame, CanReadRating
 from apps.games.serializers import (
     AdminGameDetailSerializer,
@@ -49,12 +51,12 @@ from apps.users.utils import log_admin_action
 class GameViewSet(ModelViewSet):
     queryset = (
         Game.objects.select_related("publisher")
-        .prefetch_related("genres", "platforms", "screenshots", "game_videos")
+        .prefetch_related("genres", "platforms", "collections", "franchises", "screenshots", "game_videos")
         .order_by("-popularity_score")
-        .distinct()  # Éviter les doublons lors de filtrage Many-to-Many
+        # Pas de .distinct() : les filtres genre / plateforme sont des EXISTS (GameFilter) et ne dupliquent aucun jeu
     )
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, GameOrderingFilter]  # sans ?ordering, ?search trie par pertinence
     filterset_class = GameFilter  # Utiliser le FilterSet personnalisé
     ordering_fields = [
         "release_date",
@@ -65,24 +67,24 @@ class GameViewSet(ModelViewSet):
     ]
     ordering = ["-popularity_score"]
 
-    def get_queryset(self):
-        qs = super().get_queryset()
-        user = self.request.user
-        if user.is_authenticated:
-            # On prefetch les données utilisateur pour éviter le N+1 dans le serializer
-            qs = qs.prefetch_related(
-                Prefetch(
-                    "user_games",
-                    queryset=UserGame.objects.filter(user=user),
-                    to_attr="prefetched_user_games",
-                ),
-                Prefetch(
-                    "ratings",
-                    queryset=Rating.objects.filter(user=user),
-                    to_attr="prefetched_user_ratings",
-                ),
-            )
-        return qs
+    @property
+    def paginator(self):
+        """Pagination par page par défaut ; par curseur (keyset) avec ?pagination=cursor ou ?cursor=... ."""
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            params = request.query_params if request is not None else {}
+            if params.get("pagination") == "cursor" or "cursor" in params:
+                self._paginator = GameKeysetPagination()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class is not None else None
+        return self._paginator
+
+    def list(self, request, *args, **kwargs):
+        if not str(request.query_params.get("search", "")).strip():
+            return super().list(request, *args, **kwargs)
+        # ?search : seuil trigram de la recherche posé pour la seule transaction de la liste
+        with search_similarity_threshold():
+            return super().list(request, *args, **kwargs)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -93,40 +95,12 @@ class GameViewSet(ModelViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
+        data = self.get_serializer(instance).data
 
-        # Healing Strategy: If the game is a "stub" (missing description or M2M),
-        # trigger an update from IGDB.
-        is_stub = not instance.description or (instance.genres.count() == 0 and instance.platforms.count() == 0)
-
-        if is_stub and instance.igdb_id:
-            try:
-                query = f"{FIELDS_GAME_DETAIL} where id = {instance.igdb_id}; limit 1;"
-                igdb_data = igdb_client.igdb_request("games", query)
-                if igdb_data and isinstance(igdb_data, list):
-                    from apps.games.igdb_wikidata import enrich_with_wikidata_display_name
-
-                    enriched = enrich_with_wikidata_display_name(igdb_data)
-                    norm = enriched[0]
-
-                    get_or_create_game_from_igdb(
-                        igdb_id=instance.igdb_id,
-                        name=norm.get("name"),
-                        cover_url=norm.get("cover_url"),
-                        release_date=norm.get("release_date"),
-                        summary=norm.get("summary"),
-                        platforms=norm.get("platforms"),
-                        genres=norm.get("genres"),
-                        screenshots=norm.get("screenshots"),
-                        videos=norm.get("videos"),
-                        min_players=norm.get("min_players"),
-                        max_players=norm.get("max_players"),
-                    )
-                    instance.refresh_from_db()
-            except Exception:
-                pass
-
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        # Jeu « stub » : la fiche est renvoyée telle quelle, sa complétion IGDB part en tâche de fond
+        if is_stub_game(instance) and request_stub_healing(instance):
+            data["healing"] = True
+        return Response(data)
 
 
 class PublisherViewSet(ModelViewSet):
@@ -253,10 +227,11 @@ class GameByIgdbIdView(APIView):
     GET /api/games/igdb/<igdb_id>/
 
     Lecture pure d'un jeu par son IGDB ID. Retourne toujours un NormalizedGame.
-    Ne crée jamais de Game, ne déclenche aucune persistance.
+    Ne crée jamais de Game ; un jeu stub est complété en tâche de fond (apps.games.healing).
 
     Stratégie en cascade :
-      1. Si le jeu existe en base → GameReadSerializer (NormalizedGame complet avec django_id).
+      1. Si le jeu existe en base → GameReadSerializer (NormalizedGame complet avec django_id,
+         `healing: true` si une complétion IGDB est en file).
       2. Sinon → appel IGDB, normalisation, enrichissement (django_id=null).
       3. Introuvable partout → 404.
     """
@@ -265,52 +240,20 @@ class GameByIgdbIdView(APIView):
 
     def _get_local_game(self, igdb_id: int) -> Optional[Game]:
         """Fetch game from local DB with necessary relations."""
-        return Game.objects.filter(igdb_id=igdb_id).select_related("publisher").prefetch_related("genres", "platforms").first()
-
-    def _is_stub_game(self, game: Game) -> bool:
-        """Check if the local record is a stub (missing metadata)."""
-        return not game.description or (game.genres.count() == 0 and game.platforms.count() == 0)
-
-    def _handle_igdb_result(self, game: Optional[Game], norm: dict, request) -> Response:
-        """Heal existing stub or return proxy data for new game."""
-        if game is not None:
-            # Case 1: Game in DB as stub -> HEAL
-            from apps.games.services import get_or_create_game_from_igdb
-
-            game_obj, _ = get_or_create_game_from_igdb(
-                igdb_id=game.igdb_id,
-                name=norm.get("name"),
-                cover_url=norm.get("cover_url"),
-                release_date=norm.get("release_date"),
-                summary=norm.get("summary"),
-                platforms=norm.get("platforms"),
-                genres=norm.get("genres"),
-                screenshots=norm.get("screenshots"),
-                videos=norm.get("videos"),
-                min_players=norm.get("min_players"),
-                max_players=norm.get("max_players"),
-            )
-            serializer = GameReadSerializer(game_obj, context={"request": request})
-            return Response(serializer.data)
-
-        # Case 2: Game not in DB -> PROXY ONLY (Read-Only)
-        from apps.games.igdb_normalizer import enrich_normalized_games
-
-        final_arr = enrich_normalized_games([norm], request.user)
-        return Response(final_arr[0])
+        return (
+            Game.objects.filter(igdb_id=igdb_id)
+            .select_related("publisher")
+            .prefetch_related("genres", "platforms", "collections", "franchises")
+            .first()
+        )
 
-    def _handle_igdb_error(self, game: Optional[Game], e: Exception, request) -> Response:
+    def _handle_igdb_error(self, e: Exception) -> Response:
         """Common error handling logic for IGDB failures."""
         if isinstance(e, ImproperlyConfigured):
-            if game:
-                return Response(GameReadSerializer(game, context={"request": request}).data)
             return Response(
                 {"error": "IGDB connection not configured"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-
-        if game:
-            return Response(GameReadSerializer(game, context={"request": request}).data)
         return Response(
             {"error": "Game not found or error fetching"},
             status=status.HTTP_404_NOT_FOUND,
@@ -320,29 +263,30 @@ class GameByIgdbIdView(APIView):
         # --- 1. Lookup in local DB ---
         game = self._get_local_game(igdb_id)
 
-        if game is not None and not self._is_stub_game(game):
-            # Complete record found
-            serializer = GameReadSerializer(game, context={"request": request})
-            return Response(serializer.data)
+        if game is not None:
+            data = GameReadSerializer(game, context={"request": request}).data
+            # Stub : réponse immédiate, complétion IGDB en tâche de fond
+            if is_stub_game(game) and request_stub_healing(game):
+                data["healing"] = True
+            return Response(data)
 
-        # --- 2. Fallback to IGDB ---
+        # --- 2. Fallback to IGDB (proxy only, read-only) ---
         query = f"{FIELDS_GAME_DETAIL} where id = {igdb_id}; limit 1;"
         try:
             data = igdb_client.igdb_request("games", query)
             arr = data if isinstance(data, list) else []
             if not arr:
-                if game:
-                    return Response(GameReadSerializer(game, context={"request": request}).data)
                 return Response({"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND)
 
             # Normalization + Enrichment
+            from apps.games.igdb_normalizer import enrich_normalized_games
             from apps.games.igdb_wikidata import enrich_with_wikidata_display_name
 
             enriched = enrich_with_wikidata_display_name(arr)
-            return self._handle_igdb_result(game, enriched[0], request)
+            return Response(enrich_normalized_games([enriched[0]], request.user)[0])
 
         except Exception as e:
-            return self._handle_igdb_error(game, e, request)
+            return self._handle_igdb_error(e)
 
 
 class ImportIgdbGameView(APIView):
@@ -807,76 +751,31 @@ class GameStatsView(APIView):
     )
     def get(self, request, game_id):
         """
-        Retourne les statistiques d'un jeu.
+        Retourne les statistiques d'un jeu : une lecture par clé primaire de la projection GameStats
+        (tenue à jour à chaque écriture, donc sans cache). Sans ligne, le jeu n'a aucune activité.
         """
-        use_cache = not settings.DEBUG
-
-        if use_cache:
-            cache_key = f"game:stats:{game_id}"
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                return Response(cached_data, status=status.HTTP_200_OK)
-
-        game = get_object_or_404(Game, id=game_id)
-
-        # ---------- OWNERS ----------
-        owners_qs = UserGame.objects.filter(game=game).values("status").annotate(count=Count("id"))
-
-        owners_by_status = {
-            "en_cours": 0,
-            "termine": 0,
-            "abandonne": 0,
-        }
-
-        status_mapping = {
-            UserGame.GameStatus.EN_COURS: "en_cours",
-            UserGame.GameStatus.TERMINE: "termine",
-            UserGame.GameStatus.ABANDONNE: "abandonne",
-        }
-
-        owners_count = 0
-        for row in owners_qs:
-            owners_count += row["count"]
-            api_key = status_mapping.get(row["status"])
-            if api_key:
-                owners_by_status[api_key] = row["count"]
-
-        # ---------- RATINGS ----------
-        # Histogramme = toutes les notes étoiles (Rating), aligné sur rating_count.
-        ratings_distribution = {str(i): 0 for i in range(1, 6)}
-
-        stars_qs = Rating.objects.filter(game=game, rating_type=Rating.RATING_TYPE_ETOILES).values("value").annotate(count=Count("id"))
-
-        for row in stars_qs:
-            ratings_distribution[str(int(row["value"]))] = row["count"]
-
-        ratings_data = {
-            "average": game.average_rating,
-            "count": game.rating_count,
-            "distribution": ratings_distribution,
-        }
-
-        # ---------- REVIEWS ----------
-        reviews_agg = Review.objects.filter(game=game).aggregate(
-            count=Count("id"),
-            last_created_at=Max("date_created"),
-        )
-
-        reviews_data = {
-            "count": reviews_agg["count"],
-            "last_created_at": reviews_agg["last_created_at"],
-        }
+        stats = GameStats.objects.select_related("game").filter(pk=game_id).first()
+        if stats is None:
+            stats = GameStats(game=get_object_or_404(Game, id=game_id))
+        game = stats.game
 
         response_data = {
             "game_id": game.id,
-            "owners_count": owners_count,
-            "owners_by_status": owners_by_status,
-            "ratings": ratings_data,
-            "reviews": reviews_data,
+            "owners_count": stats.owners_count,
+            "owners_by_status": {
+                "en_cours": stats.owners_en_cours,
+                "termine": stats.owners_termine,
+                "abandonne": stats.owners_abandonne,
+            },
+            "ratings": {
+                "average": game.average_rating,
+                "count": game.rating_count,
+                # Histogramme = toutes les notes étoiles (Rating), aligné sur rating_count.
+                "distribution": {str(star): getattr(stats, f"stars_{star}") for star in range(1, 6)},
+            },
+            "reviews": {
+                "count": stats.reviews_count,
+                "last_created_at": stats.last_review_at,
+            },
         }
-
-        if use_cache:
-            cache_key = f"game:stats:{game_id}"
-            cache.set(cache_key, response_data, timeout=300)
-
         return Response(response_data, status=status.HTTP_200_OK)
@@ -2,10 +2,18 @@
 Vues proxy IGDB : exposent les endpoints de recherche / trending / détails / traduction
 pour le frontend, en s'appuyant sur igdb_client, igdb_search et igdb_wikidata.
 Préfixe URL : api/igdb/
+
+Les recherches (search, search-page, franchises) sont asynchrones : sous ASGI, un worker
+sert plusieurs recherches en attente d'IGDB au lieu d'un thread bloqué par requête.
+
+Trending et les jeux d'une série / franchise sont servis depuis le miroir local du catalogue quand
+il est à jour (igdb_local_catalogue) ; si IGDB est injoignable, le miroir même en retard prend le relais.
+Les réponses trending sont mises en cache et les plus demandées préchauffées (igdb_trending).
 """
 
 import logging
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from rest_framework import status
@@ -13,23 +21,25 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.async_views import AsyncAPIView
 from apps.games import igdb_client
+from apps.games.circuit_breaker import CircuitOpenError
+from apps.games.igdb_local_catalogue import local_related_games
 from apps.games.igdb_normalizer import enrich_normalized_games, normalize_igdb_game
-from apps.games.igdb_proxy_constants import FIELDS_GAME_DETAIL, PLATFORMS_CACHE_TTL, TRENDING_CACHE_TTL
+from apps.games.igdb_proxy_constants import FIELDS_GAME_DETAIL, PLATFORMS_CACHE_TTL
 from apps.games.igdb_search import escape_igdb_string, normalize_query
+from apps.games.igdb_trending import record_trending_request, render_trending_response, trending_cache_key
 from apps.games.igdb_wikidata import enrich_with_wikidata_display_name, wikidata_french_label_by_english_title_debug
 from apps.games.views_igdb_helpers import (
     IgdbFilters,
-    franchises_collections_fetch_terms,
+    afranchises_collections_fetch_terms,
+    aigdb_search_non_suggest_results,
+    aigdb_search_suggest_results,
+    asearch_page_results,
     franchises_search_build_payload,
-    igdb_search_non_suggest_results,
-    igdb_search_suggest_results,
-    search_page_fallback_search,
-    search_page_name_matches,
+    parse_optional_int_query,
+    translate_game_summary_to_french,
     translate_request_body_to_french,
-    trending_enrich_for_response,
-    trending_fetch_games_array,
-    trending_fetch_total_count,
 )
 
 logger = logging.getLogger(__name__)
@@ -52,12 +62,41 @@ def _clamp_offset(offset_raw):
 
 
 def _is_igdb_unavailable(exc):
-    if isinstance(exc, ImproperlyConfigured):
+    # Disjoncteur ouvert : même réponse vide que sans configuration IGDB, sans attendre le timeout
+    if isinstance(exc, (ImproperlyConfigured, CircuitOpenError)):
         return True
     msg = str(exc).lower()
     return any(x in msg for x in ["igdb error 401", "authorization failure", "improperlyconfigured"])
 
 
+async def _aenrich_for_response(games: list, user) -> list:
+    """Noms français (base locale puis Wikidata) puis données locales de l'utilisateur, hors boucle (ORM)."""
+    enriched = await sync_to_async(enrich_with_wikidata_display_name)(games)
+    return await sync_to_async(enrich_normalized_games)(enriched, user)
+
+
+def _related_games_page(relation: str, igdb_id: int, limit: int, offset: int) -> list:
+    """Jeux d'une série / franchise (payloads IGDB bruts) : base locale d'abord, IGDB sinon."""
+    local = local_related_games(relation, igdb_id, limit, offset)
+    if local is not None:
+        return local
+    q = (
+        f"fields name,cover.url,first_release_date,summary,platforms.name,"
+        f"total_rating,total_rating_count,{relation}.id; "
+        f"where {relation} = ({igdb_id}); sort total_rating_count desc; "
+        f"limit {limit}; offset {offset};"
+    )
+    try:
+        data = igdb_client.igdb_request("games", q)
+    except Exception:
+        stale = local_related_games(relation, igdb_id, limit, offset, require_fresh=False)
+        if stale is None:
+            raise
+        logger.warning("IGDB %s indisponible, réponse servie par le catalogue local.", relation)
+        return stale
+    return data if isinstance(data, list) else []
+
+
 class IgdbGamesListView(APIView):
     """GET /api/igdb/games/ — Liste de jeux (ex. 10 derniers)."""
 
@@ -86,19 +125,13 @@ class IgdbTrendingView(APIView):
         offset = _clamp_offset(request.query_params.get("offset"))
         enrich = request.query_params.get("enrich", "1") != "0"
 
-        cache_key = f"igdb:trending:{filters}:{limit}:{offset}:{enrich}"
-        cached = cache.get(cache_key)
+        cached = cache.get(trending_cache_key(filters, limit, offset, enrich))
+        record_trending_request(filters, limit, offset, enrich, hit=cached is not None)
         if cached is not None:
             return Response(cached)
 
         try:
-            arr = trending_fetch_games_array(igdb_client.igdb_request, limit, offset, filters)
-            enriched = trending_enrich_for_response(arr, enrich, enrich_with_wikidata_display_name, request.user)
-            total_count = trending_fetch_total_count(igdb_client.igdb_request, filters)
-
-            res = {"results": enriched, "total_count": total_count}
-            cache.set(cache_key, res, TRENDING_CACHE_TTL)
-            return Response(res)
+            return Response(render_trending_response(filters, limit, offset, enrich, enrich_with_wikidata_display_name, request.user))
         except Exception as e:
             logger.exception("IGDB trending error: %s", e)
             if _is_igdb_unavailable(e):
@@ -106,12 +139,12 @@ class IgdbTrendingView(APIView):
             return Response({"error": "Erreur IGDB trending", "details": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class IgdbSearchView(APIView):
+class IgdbSearchView(AsyncAPIView):
     """GET /api/igdb/search/ — Recherche IGDB (q, suggest, filtres)."""
 
     permission_classes = [AllowAny]
 
-    def get(self, request):
+    async def get(self, request):
         q = (request.query_params.get("q") or "").strip()
         if not q:
             return Response({"error": "Missing query param: q"}, status=status.HTTP_400_BAD_REQUEST)
@@ -125,24 +158,23 @@ class IgdbSearchView(APIView):
 
         try:
             if suggest:
-                arr = igdb_search_suggest_results(igdb_client.igdb_request, q_esc, q_norm_esc, limit, filters)
+                arr = await aigdb_search_suggest_results(igdb_client.aigdb_request, q_esc, q_norm_esc, limit, filters)
             else:
-                arr = igdb_search_non_suggest_results(igdb_client.igdb_request, q_esc, q_norm_esc, limit, filters)
+                arr = await aigdb_search_non_suggest_results(igdb_client.aigdb_request, q_esc, q_norm_esc, limit, filters)
 
-            enriched = enrich_with_wikidata_display_name(arr)
-            return Response(enrich_normalized_games(enriched, request.user))
+            return Response(await _aenrich_for_response(arr, request.user))
         except Exception as e:
             if _is_igdb_unavailable(e):
                 return Response([])
             return Response({"error": "Erreur IGDB search", "details": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class IgdbSearchPageView(APIView):
+class IgdbSearchPageView(AsyncAPIView):
     """GET /api/igdb/search-page/ — Recherche paginée par nom."""
 
     permission_classes = [AllowAny]
 
-    def get(self, request):
+    async def get(self, request):
         q = (request.query_params.get("q") or "").strip()
         if not q:
             return Response({"error": "Missing q"}, status=status.HTTP_400_BAD_REQUEST)
@@ -155,12 +187,9 @@ class IgdbSearchPageView(APIView):
         q_norm_esc = escape_igdb_string(normalize_query(q))
 
         try:
-            data = search_page_name_matches(igdb_client.igdb_request, q_esc, q_norm_esc, limit, offset, filters)
-            if not data["results"] and offset == 0:
-                data = search_page_fallback_search(igdb_client.igdb_request, q_esc, limit, filters)
+            data = await asearch_page_results(igdb_client.aigdb_request, q_esc, q_norm_esc, limit, offset, filters)
 
-            enriched = enrich_with_wikidata_display_name(data["results"])
-            return Response({"results": enrich_normalized_games(enriched, request.user), "total_count": data["total_count"]})
+            return Response({"results": await _aenrich_for_response(data["results"], request.user), "total_count": data["total_count"]})
         except Exception as e:
             if _is_igdb_unavailable(e):
                 return Response({"results": [], "total_count": 0})
@@ -235,14 +264,7 @@ class IgdbCollectionGamesView(APIView):
         limit = _clamp_limit(request.query_params.get("limit"), 1, 200)
         offset = _clamp_offset(request.query_params.get("offset"))
         try:
-            q = (
-                f"fields name,cover.url,first_release_date,summary,platforms.name,"
-                f"total_rating,total_rating_count,collections.id; "
-                f"where collections = ({val_id}); sort total_rating_count desc; "
-                f"limit {limit}; offset {offset};"
-            )
-            data = igdb_client.igdb_request("games", q)
-            arr = [normalize_igdb_game(g) for g in data] if isinstance(data, list) else []
+            arr = [normalize_igdb_game(g) for g in _related_games_page("collections", val_id, limit, offset)]
             return Response(enrich_normalized_games(arr, request.user))
         except Exception as e:
             if _is_igdb_unavailable(e):
@@ -264,14 +286,7 @@ class IgdbFranchiseGamesView(APIView):
         limit = _clamp_limit(request.query_params.get("limit"), 1, 200)
         offset = _clamp_offset(request.query_params.get("offset"))
         try:
-            q = (
-                f"fields name,cover.url,first_release_date,summary,platforms.name,"
-                f"total_rating,total_rating_count,franchises.id; "
-                f"where franchises = ({val_id}); sort total_rating_count desc; "
-                f"limit {limit}; offset {offset};"
-            )
-            data = igdb_client.igdb_request("games", q)
-            arr = [normalize_igdb_game(g) for g in data] if isinstance(data, list) else []
+            arr = [normalize_igdb_game(g) for g in _related_games_page("franchises", val_id, limit, offset)]
             return Response(enrich_normalized_games(arr, request.user))
         except Exception as e:
             if _is_igdb_unavailable(e):
@@ -279,31 +294,35 @@ class IgdbFranchiseGamesView(APIView):
             return Response({"error": "Erreur IGDB franchise", "details": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class IgdbFranchisesSearchView(APIView):
+class IgdbFranchisesSearchView(AsyncAPIView):
     """GET /api/igdb/franchises/ — Recherche franchises + collections."""
 
     permission_classes = [AllowAny]
 
-    def get(self, request):
+    async def get(self, request):
         q = (request.query_params.get("q") or "").strip()
         if not q:
             return Response({"error": "Missing q"}, status=status.HTTP_400_BAD_REQUEST)
         q_esc = escape_igdb_string(q)
         q_norm_esc = escape_igdb_string(normalize_query(q))
         terms = [q_esc] if q_norm_esc == q_esc else [q_esc, q_norm_esc]
-        f, c = franchises_collections_fetch_terms(igdb_client.igdb_request, terms)
+        f, c = await afranchises_collections_fetch_terms(igdb_client.aigdb_request, terms)
         return Response(franchises_search_build_payload(f, c))
 
 
 class IgdbTranslateView(APIView):
-    """POST /api/igdb/translate/"""
+    """POST /api/igdb/translate/ — body { text, igdb_id? } ; avec igdb_id, le résumé traduit est conservé sur le jeu."""
 
     permission_classes = [AllowAny]
 
     def post(self, request):
-        text = (request.data.get("text") if isinstance(request.data, dict) else "") or ""
+        data = request.data if isinstance(request.data, dict) else {}
+        text = data.get("text") or ""
         if not text.strip():
             return Response({"error": "Missing text"}, status=status.HTTP_400_BAD_REQUEST)
+        igdb_id = parse_optional_int_query(data.get("igdb_id"))
+        if igdb_id:
+            return Response({"translated": translate_game_summary_to_french(text, igdb_id)})
         return Response({"translated": translate_request_body_to_french(text)})
 
 
@@ -3,18 +3,37 @@ Logique métier du proxy IGDB (hors classes APIView).
 
 Les fonctions prennent `igdb_request` (bound method) pour que les tests qui
 mockent `apps.games.views_igdb.igdb_client` restent valides.
+
+Les couples de requêtes indépendantes (liste + count, recherche + fallback, franchises + collections)
+partent en un seul aller-retour via `igdb_multiquery` (endpoint IGDB /multiquery).
+
+La recherche (page, suggestions) et les franchises / collections n'existent qu'en version asynchrone
+(section « Async », `aigdb_request`, servies par les vues asynchrones) : les rejeux et requêtes secondaires
+indépendantes y partent en parallèle. Les requêtes IGDB sont construites par les helpers synchrones partagés.
+
+Traduction (MyMemory) : morceaux traduits en parallèle et mis en cache Redis par hash du contenu ;
+le résumé complet d'un jeu stocké est conservé dans Game.description_fr. Disjoncteur MyMemory ouvert,
+les morceaux sont rendus non traduits sans appel.
 """
 
 from __future__ import annotations
 
+import asyncio
 import datetime
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
 from urllib.parse import urlencode
 
 import requests
+from django.conf import settings
+from django.core.cache import cache
 
-from apps.games.igdb_demographics import filter_games_raw_by_demographics
+from apps.games.circuit_breaker import MYMEMORY_BREAKER, is_upstream_error_response
+from apps.games.igdb_client import aigdb_multiquery, igdb_multiquery
+from apps.games.igdb_demographics import afilter_games_raw_by_demographics, filter_games_raw_by_demographics
 from apps.games.igdb_normalizer import enrich_normalized_games, normalize_igdb_game
 from apps.games.igdb_proxy_constants import (
     FIELDS_GAMES_LIST,
@@ -23,10 +42,18 @@ from apps.games.igdb_proxy_constants import (
     FIELDS_SEARCH_PAGE,
     MAX_TRANSLATE_TEXT_LEN,
     MYMEMORY_URL,
+    TRANSLATE_CACHE_TTL,
+    TRANSLATE_MAX_CONCURRENCY,
     TRENDING_SORTS,
 )
+from apps.games.models import Game
+
+logger = logging.getLogger(__name__)
+
+_TRANSLATE_KEY_PREFIX = "translate:en-fr"
 
 IgdbRequestFn = Callable[[str, str], Any]
+AsyncIgdbRequestFn = Callable[[str, str], Awaitable[Any]]
 
 
 @dataclass
@@ -191,70 +218,61 @@ def _fields_with_optional_genres_and_demographics(base_fields: str, include_genr
 
 # --- Search-page ---
 
+SEARCH_PAGE_DEMO_RAW_CAP = 500  # profondeur brute en mode démographique (post-filtrage local)
 
-def search_page_name_matches(
-    igdb_request: IgdbRequestFn,
-    q_esc: str,
-    q_norm_esc: str,
-    limit: int,
-    offset: int,
-    filters: IgdbFilters,
-) -> dict:
-    needs_post_slice = filters.has_demographics
-
-    def fetch_for_q(q_inner: str) -> tuple[list, int]:
-        fields = _fields_with_optional_genres_and_demographics(FIELDS_SEARCH_PAGE, bool(filters.genre_ids), needs_post_slice)
-        core = f'name ~ *"{q_inner}"* & total_rating_count > 0'
-        where_line = merge_igdb_where_predicates(core, filters)
 
-        sort_clause = TRENDING_SORTS.get(filters.sort, TRENDING_SORTS["popularity"])
-        parts = sort_clause.split(";")
-        gen = (p.strip() + ";" for p in parts if p.strip().startswith("sort"))
-        sort_part = next(gen, "sort total_rating_count desc;")
+def _single_result(endpoint: str, data: Any) -> Any:
+    if endpoint.endswith("/count"):
+        return data.get("count", 0) if isinstance(data, dict) else 0
+    return igdb_response_as_list(data)
 
-        if needs_post_slice:
-            # On augmente à 500 pour avoir une meilleure profondeur en mode démo
-            raw_cap = 500
-            name_body = f"{fields} {where_line}; {sort_part} limit {raw_cap}; offset 0;"
-        else:
-            name_body = f"{fields} {where_line}; {sort_part} limit {limit}; offset {offset};"
 
-        arr = igdb_response_as_list(igdb_request("games", name_body))
+def _search_page_sort_part(filters: IgdbFilters) -> str:
+    sort_clause = TRENDING_SORTS.get(filters.sort, TRENDING_SORTS["popularity"])
+    parts = sort_clause.split(";")
+    gen = (p.strip() + ";" for p in parts if p.strip().startswith("sort"))
+    return next(gen, "sort total_rating_count desc;")
 
-        if needs_post_slice:
-            full_filtered = filter_games_raw_by_demographics(igdb_request, arr, filters.min_age, filters.min_players, filters.max_players)
-            total_count = len(full_filtered)
-            arr = full_filtered[offset : offset + limit]
-        else:
-            # Mode standard : on demande le count réel à IGDB
-            where_only = where_line.split("sort")[0].strip()
-            count_data = igdb_request("games/count", where_only)
-            total_count = count_data.get("count", 0) if isinstance(count_data, dict) else 0
 
-        return arr, total_count
+def _search_page_name_queries(key: str, q_inner: str, limit: int, offset: int, filters: IgdbFilters) -> dict[str, tuple[str, str]]:
+    """Sous-requêtes « nom contient q » (+ count IGDB hors mode démographique)."""
+    needs_post_slice = filters.has_demographics
+    fields = _fields_with_optional_genres_and_demographics(FIELDS_SEARCH_PAGE, bool(filters.genre_ids), needs_post_slice)
+    core = f'name ~ *"{q_inner}"* & total_rating_count > 0'
+    where_line = merge_igdb_where_predicates(core, filters)
+    sort_part = _search_page_sort_part(filters)
 
-    arr, total = fetch_for_q(q_esc)
-    if not arr and q_norm_esc != q_esc:
-        arr, total = fetch_for_q(q_norm_esc)
+    if needs_post_slice:
+        # On augmente à 500 pour avoir une meilleure profondeur en mode démo
+        return {key: ("games", f"{fields} {where_line}; {sort_part} limit {SEARCH_PAGE_DEMO_RAW_CAP}; offset 0;")}
 
-    return {"results": arr, "total_count": total}
+    # Mode standard : on demande le count réel à IGDB dans le même aller-retour
+    where_only = where_line.split("sort")[0].strip()
+    return {
+        key: ("games", f"{fields} {where_line}; {sort_part} limit {limit}; offset {offset};"),
+        f"{key}_count": ("games/count", where_only),
+    }
 
 
-def search_page_fallback_search(
-    igdb_request: IgdbRequestFn,
-    q_esc: str,
-    limit: int,
-    filters: IgdbFilters,
-) -> dict:
+def _search_page_fallback_body(q_esc: str, filters: IgdbFilters) -> str:
     fields = _fields_with_optional_genres_and_demographics(FIELDS_SEARCH_PAGE, bool(filters.genre_ids), filters.has_demographics)
-    search_body = f'{fields} search "{q_esc}"; limit 50;'
-    try:
-        search_arr = igdb_response_as_list(igdb_request("games", search_body))
-        search_arr = _apply_raw_list_filters(igdb_request, search_arr, filters)
-        search_arr.sort(key=lambda x: -(x.get("total_rating_count") or 0))
-        return {"results": search_arr[:limit], "total_count": min(len(search_arr), 50)}
-    except Exception:
-        return {"results": [], "total_count": 0}
+    return f'{fields} search "{q_esc}"; limit 50;'
+
+
+def _search_page_fallback_payload(search_arr: list, limit: int) -> dict:
+    search_arr.sort(key=lambda x: -(x.get("total_rating_count") or 0))
+    return {"results": search_arr[:limit], "total_count": min(len(search_arr), 50)}
+
+
+def _search_page_queries(
+    q_esc: str, q_norm_esc: str, limit: int, offset: int, filters: IgdbFilters, with_fallback: bool
+) -> dict[str, tuple[str, str]]:
+    queries = _search_page_name_queries("name", q_esc, limit, offset, filters)
+    if q_norm_esc != q_esc:
+        queries.update(_search_page_name_queries("name_norm", q_norm_esc, limit, offset, filters))
+    if with_fallback:
+        queries["fallback"] = ("games", _search_page_fallback_body(q_esc, filters))
+    return queries
 
 
 # --- Trending ---
@@ -267,42 +285,34 @@ def _trending_use_demo_and_merged_clause(filters: IgdbFilters) -> tuple[bool, st
     return filters.has_demographics, merged
 
 
-def trending_fetch_games_array(
+def trending_fetch_page(
     igdb_request: IgdbRequestFn,
     limit: int,
     offset: int,
     filters: IgdbFilters,
-) -> list:
+) -> tuple[list, int]:
+    """
+    Page de tendances + total en un seul aller-retour IGDB (multiquery games + games/count).
+    En mode démographique, une seule liste brute sert à la fois à la page et au total.
+    """
     use_demo, merged_clause = _trending_use_demo_and_merged_clause(filters)
-
     fields = _fields_with_optional_genres_and_demographics(FIELDS_GAMES_LIST, bool(filters.genre_ids), use_demo)
-    if use_demo:
-        # On augmente raw_cap pour permettre une navigation plus profonde en mode démographique
-        raw_cap = min(max((offset + limit) * 5, 100), 1000)
-        query = f"{fields} {merged_clause} limit {raw_cap}; offset 0;"
-        raw = igdb_response_as_list(igdb_request("games", query))
-        raw = filter_games_raw_by_demographics(igdb_request, raw, filters.min_age, filters.min_players, filters.max_players)
-        return raw[offset : offset + limit]
 
-    query = f"{fields} {merged_clause} limit {limit}; offset {offset};"
-    return igdb_response_as_list(igdb_request("games", query))
-
-
-def trending_fetch_total_count(igdb_request: IgdbRequestFn, filters: IgdbFilters) -> int:
-    try:
-        use_demo, merged_clause = _trending_use_demo_and_merged_clause(filters)
-        where_part = merged_clause.split("sort")[0].strip()
-        if use_demo:
-            fields = _fields_with_optional_genres_and_demographics(FIELDS_GAMES_LIST, bool(filters.genre_ids), True)
-            # On augmente la limite à 500 pour permettre plus de pages en mode démo
-            raw = igdb_response_as_list(igdb_request("games", f"{fields} {where_part} limit 500;"))
-            return len(filter_games_raw_by_demographics(igdb_request, raw, filters.min_age, filters.min_players, filters.max_players))
-
-        # Mode standard : on utilise le endpoint count d'IGDB pour la précision
-        count_data = igdb_request("games/count", where_part)
-        return count_data.get("count", 0) if isinstance(count_data, dict) else 0
-    except Exception:
-        return 0
+    if use_demo:
+        raw_cap = min(max((offset + limit) * 5, 500), 1000)
+        raw = igdb_response_as_list(igdb_request("games", f"{fields} {merged_clause} limit {raw_cap}; offset 0;"))
+        filtered = filter_games_raw_by_demographics(igdb_request, raw, filters.min_age, filters.min_players, filters.max_players)
+        return filtered[offset : offset + limit], len(filtered)
+
+    where_part = merged_clause.split("sort")[0].strip()
+    data = igdb_multiquery(
+        {
+            "results": ("games", f"{fields} {merged_clause} limit {limit}; offset {offset};"),
+            "count": ("games/count", where_part),
+        },
+        igdb_request,
+    )
+    return igdb_response_as_list(data["results"]), int(data["count"] or 0)
 
 
 def trending_enrich_for_response(arr: list, enrich: bool, enrich_fn, user=None) -> list:
@@ -317,7 +327,8 @@ def trending_enrich_for_response(arr: list, enrich: bool, enrich_fn, user=None)
 # --- Search suggest/non-suggest ---
 
 
-def _apply_raw_list_filters(igdb_request: IgdbRequestFn, games: list, filters: IgdbFilters) -> list:
+def _apply_local_list_filters(games: list, filters: IgdbFilters) -> list:
+    """Filtres applicables sans appel IGDB (relations déjà présentes dans les payloads)."""
     out = filter_raw_games_by_genre_platform_ids(games, filters.genre_ids, filters.platform_ids)
     if filters.theme_ids:
         out = [g for g in out if _ids_from_igdb_relation(g, "themes").intersection(filters.theme_ids)]
@@ -341,7 +352,7 @@ def _apply_raw_list_filters(igdb_request: IgdbRequestFn, games: list, filters: I
                 or datetime.datetime.fromtimestamp(g["first_release_date"], tz=datetime.timezone.utc).year <= filters.release_year_max
             )
         ]
-    return filter_games_raw_by_demographics(igdb_request, out, filters.min_age, filters.min_players, filters.max_players)
+    return out
 
 
 def _igdb_search_games_list_query_setup(limit: int, filters: IgdbFilters) -> tuple[int, str]:
@@ -354,57 +365,41 @@ def _igdb_search_games_list_query_setup(limit: int, filters: IgdbFilters) -> tup
     return fetch_limit, fields
 
 
-def igdb_search_suggest_results(igdb_request: IgdbRequestFn, q_esc: str, q_norm_esc: str, limit: int, filters: IgdbFilters) -> list:
+def _sort_rated_desc(games: list) -> list:
+    return sorted([g for g in games if (g.get("total_rating_count") or 0) > 0], key=lambda x: -(x.get("total_rating_count") or 0))
+
+
+def _search_suggest_queries(q_esc: str, q_norm_esc: str, limit: int, filters: IgdbFilters) -> dict[str, tuple[str, str]]:
+    """Nom, recherche plein texte et fallback sans accents : un seul aller-retour IGDB."""
     fetch_limit, fields = _igdb_search_games_list_query_setup(limit, filters)
     core = f'name ~ *"{q_esc}"* & total_rating_count > 0'
     where_line = merge_igdb_where_predicates(core, filters)
+    queries = {
+        "name": ("games", f"{fields} {where_line}; sort total_rating_count desc; limit {fetch_limit};"),
+        "search": ("games", f'{fields} search "{q_esc}"; limit 50;'),
+    }
+    if q_norm_esc != q_esc:
+        queries["search_norm"] = ("games", f'{fields} search "{q_norm_esc}"; limit 50;')
+    return queries
 
-    name_res = []
-    try:
-        name_res = igdb_response_as_list(igdb_request("games", f"{fields} {where_line}; sort total_rating_count desc; limit {fetch_limit};"))
-    except Exception:
-        pass
-
-    search_res = []
-    try:
-        search_res = igdb_response_as_list(igdb_request("games", f'{fields} search "{q_esc}"; limit 50;'))
-    except Exception:
-        pass
 
+def _merge_unique_by_id(games: list) -> list:
     seen = set()
     merged = []
-    for g in name_res + search_res:
+    for g in games:
         gid = g.get("id")
         if gid is not None and gid not in seen:
             seen.add(gid)
             merged.append(g)
-
-    filtered = _apply_raw_list_filters(igdb_request, merged, filters)
-    arr = sorted([g for g in filtered if (g.get("total_rating_count") or 0) > 0], key=lambda x: -(x.get("total_rating_count") or 0))[:limit]
-
-    if not arr and q_norm_esc != q_esc:
-        fallback = []
-        try:
-            fallback = igdb_response_as_list(igdb_request("games", f'{fields} search "{q_norm_esc}"; limit 50;'))
-        except Exception:
-            pass
-        arr = sorted(
-            [g for g in _apply_raw_list_filters(igdb_request, fallback, filters) if (g.get("total_rating_count") or 0) > 0],
-            key=lambda x: -(x.get("total_rating_count") or 0),
-        )[:limit]
-    return arr
+    return merged
 
 
-def igdb_search_non_suggest_results(igdb_request: IgdbRequestFn, q_esc: str, q_norm_esc: str, limit: int, filters: IgdbFilters) -> list:
+def _search_non_suggest_queries(q_esc: str, q_norm_esc: str, limit: int, filters: IgdbFilters) -> dict[str, tuple[str, str]]:
     fetch_limit, fields = _igdb_search_games_list_query_setup(limit, filters)
-    query = f'{fields} search "{q_esc}"; limit {fetch_limit};'
-    arr = igdb_response_as_list(igdb_request("games", query))
-    if not arr and q_norm_esc != q_esc:
-        try:
-            arr = igdb_response_as_list(igdb_request("games", f'{fields} search "{q_norm_esc}"; limit {fetch_limit};'))
-        except Exception:
-            pass
-    return _apply_raw_list_filters(igdb_request, arr, filters)[:limit]
+    queries = {"search": ("games", f'{fields} search "{q_esc}"; limit {fetch_limit};')}
+    if q_norm_esc != q_esc:
+        queries["search_norm"] = ("games", f'{fields} search "{q_norm_esc}"; limit {fetch_limit};')
+    return queries
 
 
 # --- Aliases for tests ---
@@ -435,38 +430,6 @@ def merge_trending_where_with_filters(
     return merge_igdb_where_predicates(base, f)
 
 
-def trending_fetch_total_count_old(
-    igdb_request,
-    genre_ids,
-    platform_ids,
-    sort,
-    min_age=None,
-    min_players=None,
-    max_players=None,
-    theme_ids=None,
-    game_mode_ids=None,
-    player_perspective_ids=None,
-    min_rating=None,
-    release_year_min=None,
-    release_year_max=None,
-) -> int:
-    f = IgdbFilters(
-        genre_ids=genre_ids,
-        platform_ids=platform_ids,
-        sort=sort,
-        min_age=min_age,
-        min_players=min_players,
-        max_players=max_players,
-        theme_ids=theme_ids or [],
-        game_mode_ids=game_mode_ids or [],
-        player_perspective_ids=player_perspective_ids or [],
-        min_rating=min_rating,
-        release_year_min=release_year_min,
-        release_year_max=release_year_max,
-    )
-    return trending_fetch_total_count(igdb_request, f)
-
-
 # --- Translation ---
 
 
@@ -504,46 +467,120 @@ def _chunk_text_for_translation(text: str, max_chunk_size: int = 480) -> list[st
     return chunks
 
 
-def _fetch_single_translation_chunk(chunk: str) -> str:
-    """Appelle l'API MyMemory pour traduire un seul morceau de texte."""
+def _mymemory_translate(chunk: str) -> str | None:
+    """Appelle l'API MyMemory pour un morceau de texte ; None si la traduction a échoué (ou disjoncteur ouvert)."""
     try:
         url = f"{MYMEMORY_URL}?{urlencode({'q': chunk, 'langpair': 'en|fr'})}"
-        r = requests.get(url, headers={"User-Agent": "LudoKan/1.0"}, timeout=10)
+        r = MYMEMORY_BREAKER.call(requests.get, url, headers={"User-Agent": "LudoKan/1.0"}, timeout=10, is_failure=is_upstream_error_response)
         if not r.ok:
-            return chunk
+            return None
         data = r.json()
         trans = (data or {}).get("responseData", {}).get("translatedText")
         if isinstance(trans, str) and trans.strip():
             return str(trans).replace("q=", "").strip()
-        return chunk
+        return None
     except Exception:
-        return chunk
+        return None
+
+
+def _fetch_single_translation_chunk(chunk: str) -> str:
+    """Appelle l'API MyMemory pour traduire un seul morceau de texte (le morceau d'origine en cas d'échec)."""
+    return _mymemory_translate(chunk) or chunk
+
+
+def _translation_cache_key(chunk: str) -> str:
+    return f"{_TRANSLATE_KEY_PREFIX}:{hashlib.sha256(chunk.encode('utf-8')).hexdigest()}"
+
+
+def _cached_translations(chunks: list[str]) -> dict[str, str]:
+    if not settings.TRANSLATE_CACHE_ENABLED:
+        return {}
+    keys = {_translation_cache_key(c): c for c in chunks}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception:
+        logger.warning("Traduction: lecture du cache impossible.", exc_info=True)
+        return {}
+    return {keys[k]: v for k, v in found.items() if isinstance(v, str)}
+
+
+def _store_translations(translated: dict[str, str]) -> None:
+    if not settings.TRANSLATE_CACHE_ENABLED or not translated:
+        return
+    try:
+        cache.set_many({_translation_cache_key(c): t for c, t in translated.items()}, timeout=TRANSLATE_CACHE_TTL)
+    except Exception:
+        logger.warning("Traduction: écriture du cache impossible.", exc_info=True)
+
+
+def translate_chunks_to_french(chunks: list[str]) -> tuple[list[str], bool]:
+    """
+    Traduit les morceaux : cache Redis (hash du contenu) d'abord, puis MyMemory en parallèle
+    (au plus TRANSLATE_MAX_CONCURRENCY appels). Un morceau non traduit est rendu tel quel.
+    Retourne (morceaux traduits dans l'ordre, True si tous ont été traduits).
+    """
+    translated = _cached_translations(chunks)
+    missing = [c for c in dict.fromkeys(chunks) if c not in translated]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(TRANSLATE_MAX_CONCURRENCY, len(missing))) as executor:
+            fresh = {c: t for c, t in zip(missing, executor.map(_mymemory_translate, missing)) if t}
+        _store_translations(fresh)
+        translated.update(fresh)
+    return [translated.get(c, c) for c in chunks], all(c in translated for c in chunks)
+
+
+def _translate_to_french(text: str) -> tuple[str, bool]:
+    chunks = _chunk_text_for_translation(text[:MAX_TRANSLATE_TEXT_LEN])
+    res, complete = translate_chunks_to_french(chunks)
+    return " ".join(res).strip(), complete
 
 
 def translate_request_body_to_french(text: str) -> str:
     if not text:
         return ""
-    text = text[:MAX_TRANSLATE_TEXT_LEN]
-    chunks = _chunk_text_for_translation(text)
-    res = [_fetch_single_translation_chunk(c) for c in chunks]
-    return " ".join(res).strip()
+    return _translate_to_french(text)[0]
+
+
+def _summary_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def translate_game_summary_to_french(text: str, igdb_id: int | None) -> str:
+    """
+    Traduction du résumé d'un jeu : si le texte est la description du jeu stocké, la traduction
+    est lue depuis / enregistrée dans Game.description_fr (seulement si tous les morceaux sont traduits).
+    description_fr_source (hash de la description traduite) écarte une traduction d'un ancien résumé IGDB.
+    """
+    if not text:
+        return ""
+    game = Game.objects.filter(igdb_id=igdb_id).only("id", "description", "description_fr", "description_fr_source").first() if igdb_id else None
+    is_game_summary = game is not None and game.description.strip() == text.strip()
+    source = _summary_hash(text)
+    if is_game_summary and game.description_fr and game.description_fr_source == source:
+        return game.description_fr
+    translated, complete = _translate_to_french(text)
+    if is_game_summary and complete and translated:
+        Game.objects.filter(pk=game.pk).update(description_fr=translated, description_fr_source=source)
+    return translated
 
 
 # --- Others ---
 
 
-def franchises_collections_fetch_terms(igdb_request: IgdbRequestFn, terms: list[str]) -> tuple[list, list]:
-    f, c = [], []
-    for term in terms:
+def _franchises_collections_queries(terms: list[str]) -> dict[str, tuple[str, str]]:
+    queries: dict[str, tuple[str, str]] = {}
+    for i, term in enumerate(terms):
         q = f'fields id, name; where name ~ *"{term}"*; limit 5;'
-        try:
-            f.extend(igdb_response_as_list(igdb_request("franchises", q)))
-        except Exception:
-            pass
-        try:
-            c.extend(igdb_response_as_list(igdb_request("collections", q)))
-        except Exception:
-            pass
+        queries[f"franchises_{i}"] = ("franchises", q)
+        queries[f"collections_{i}"] = ("collections", q)
+    return queries
+
+
+def _franchises_collections_split(data: dict[str, Any], n_terms: int) -> tuple[list, list]:
+    f, c = [], []
+    for i in range(n_terms):
+        f.extend(data[f"franchises_{i}"])
+        c.extend(data[f"collections_{i}"])
     return f, c
 
 
@@ -556,3 +593,109 @@ def franchises_search_build_payload(all_franchises: list, all_collections: list)
                 seen.add(fid)
                 res.append({"id": fid, "name": i.get("name", ""), "type": t})
     return res
+
+
+# --- Async (vues ASGI) ---
+
+
+async def _arequest_or_empty(igdb_request: AsyncIgdbRequestFn, endpoint: str, query: str) -> Any:
+    """Requête unitaire tolérante : liste vide (ou 0 pour un */count) si IGDB échoue."""
+    try:
+        data = await igdb_request(endpoint, query)
+    except Exception:
+        data = None
+    return _single_result(endpoint, data)
+
+
+async def _amultiquery_or_each(igdb_request: AsyncIgdbRequestFn, queries: dict[str, tuple[str, str]]) -> dict[str, Any]:
+    """
+    Multiquery tolérante : si l'aller-retour groupé échoue, rejoue chaque sous-requête seule, en parallèle
+    (une sous-requête en erreur donne un résultat vide sans faire échouer les autres).
+    """
+    try:
+        return await aigdb_multiquery(queries, igdb_request)
+    except Exception:
+        results = await asyncio.gather(*(_arequest_or_empty(igdb_request, endpoint, query) for endpoint, query in queries.values()))
+        return dict(zip(queries, results))
+
+
+async def _aapply_raw_list_filters(igdb_request: AsyncIgdbRequestFn, games: list, filters: IgdbFilters) -> list:
+    out = _apply_local_list_filters(games, filters)
+    return await afilter_games_raw_by_demographics(igdb_request, out, filters.min_age, filters.min_players, filters.max_players)
+
+
+async def aigdb_search_suggest_results(igdb_request: AsyncIgdbRequestFn, q_esc: str, q_norm_esc: str, limit: int, filters: IgdbFilters) -> list:
+    data = await _amultiquery_or_each(igdb_request, _search_suggest_queries(q_esc, q_norm_esc, limit, filters))
+    merged = _merge_unique_by_id(data["name"] + data["search"])
+
+    arr = _sort_rated_desc(await _aapply_raw_list_filters(igdb_request, merged, filters))[:limit]
+
+    if not arr and "search_norm" in data:
+        arr = _sort_rated_desc(await _aapply_raw_list_filters(igdb_request, data["search_norm"], filters))[:limit]
+    return arr
+
+
+async def aigdb_search_non_suggest_results(igdb_request: AsyncIgdbRequestFn, q_esc: str, q_norm_esc: str, limit: int, filters: IgdbFilters) -> list:
+    queries = _search_non_suggest_queries(q_esc, q_norm_esc, limit, filters)
+    try:
+        data = await aigdb_multiquery(queries, igdb_request)
+        arr = data["search"] or data.get("search_norm") or []
+    except Exception:
+        if "search_norm" not in queries:
+            raise
+        # Recherche principale (bloquante) et variante sans accents (optionnelle) en parallèle
+        main, norm = await asyncio.gather(igdb_request(*queries["search"]), _arequest_or_empty(igdb_request, *queries["search_norm"]))
+        arr = igdb_response_as_list(main) or norm
+    return (await _aapply_raw_list_filters(igdb_request, arr, filters))[:limit]
+
+
+async def _asearch_page_name_result(
+    igdb_request: AsyncIgdbRequestFn, data: dict[str, Any], key: str, limit: int, offset: int, filters: IgdbFilters
+) -> tuple[list, int]:
+    arr = igdb_response_as_list(data.get(key))
+    if filters.has_demographics:
+        full_filtered = await afilter_games_raw_by_demographics(igdb_request, arr, filters.min_age, filters.min_players, filters.max_players)
+        return full_filtered[offset : offset + limit], len(full_filtered)
+    return arr, int(data.get(f"{key}_count") or 0)
+
+
+async def asearch_page_results(
+    igdb_request: AsyncIgdbRequestFn,
+    q_esc: str,
+    q_norm_esc: str,
+    limit: int,
+    offset: int,
+    filters: IgdbFilters,
+) -> dict:
+    """
+    Page de recherche complète en un aller-retour IGDB : correspondances par nom (q brut et q sans accents)
+    avec leurs counts, plus la recherche plein texte de secours en première page. Résultats choisis dans cet ordre.
+    """
+    with_fallback = offset == 0
+    queries = _search_page_queries(q_esc, q_norm_esc, limit, offset, filters, with_fallback)
+
+    try:
+        data = await aigdb_multiquery(queries, igdb_request)
+    except Exception:
+        if not with_fallback:
+            raise
+        # Requêtes par nom (bloquantes) et recherche de secours (tolérante) en parallèle
+        name_queries = {k: v for k, v in queries.items() if k != "fallback"}
+        data, fallback = await asyncio.gather(aigdb_multiquery(name_queries, igdb_request), _arequest_or_empty(igdb_request, *queries["fallback"]))
+        data["fallback"] = fallback
+
+    arr, total = await _asearch_page_name_result(igdb_request, data, "name", limit, offset, filters)
+    if not arr and "name_norm" in queries:
+        arr, total = await _asearch_page_name_result(igdb_request, data, "name_norm", limit, offset, filters)
+    if not arr and with_fallback:
+        try:
+            filtered = await _aapply_raw_list_filters(igdb_request, igdb_response_as_list(data["fallback"]), filters)
+        except Exception:
+            return {"results": [], "total_count": 0}
+        return _search_page_fallback_payload(filtered, limit)
+    return {"results": arr, "total_count": total}
+
+
+async def afranchises_collections_fetch_terms(igdb_request: AsyncIgdbRequestFn, terms: list[str]) -> tuple[list, list]:
+    data = await _amultiquery_or_each(igdb_request, _franchises_collections_queries(terms))
+    return _franchises_collections_split(data, len(terms))
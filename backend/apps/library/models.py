@@ -144,5 +144,13 @@ class UserGame(models.Model):
     def __str__(self):
         return f"UserGame: {self.user} - {self.game} ({self.status})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # (jeu, statut) tels que chargés : base des deltas appliqués à GameStats
+        if "game_id" in instance.__dict__ and "status" in instance.__dict__:
+            instance._stats_snapshot = (instance.game_id, instance.status)
+        return instance
+
     def is_owned_by(self, user):
         return self.user == user
@@ -9,7 +9,7 @@ from django.utils import timezone
 from apps.games.models import Game
 from apps.library.models import UserGame
 from apps.library.services_collections import sync_steam_entries_for_matched_games
-from apps.library.sync_utils import fetch_external_games, fetch_igdb_games_by_ids, process_single_igdb_game
+from apps.library.sync_utils import fetch_external_games, fetch_igdb_games_by_ids, process_igdb_games
 from apps.users.models import CustomUser
 
 logger = logging.getLogger("system_logs")
@@ -131,7 +131,4 @@ def _resolve_and_save_missing_games(appids: List[int]) -> None:
     if igdb_games:
         logger.info(f"IGDB request for {len(appids)} missing appids returned {len(igdb_games)} mapped games")
 
-    for igdb_game in igdb_games:
-        external_id = igdb_id_to_steam.get(igdb_game.get("id"))
-        if external_id:
-            process_single_igdb_game(igdb_game, external_id, "steam_appid")
+    process_igdb_games(igdb_games, igdb_id_to_steam, "steam_appid")
@@ -4,7 +4,8 @@ from typing import List
 
 from apps.games.igdb_client import igdb_request
 from apps.games.igdb_proxy_constants import FIELDS_GAME_DETAIL
-from apps.games.services import get_or_create_game_from_igdb
+from apps.games.models import Game
+from apps.games.services import upsert_games_from_igdb
 
 logger = logging.getLogger("system_logs")
 
@@ -37,11 +38,7 @@ def fetch_igdb_games_by_ids(igdb_ids: list[int]) -> list[dict]:
         return []
 
 
-def process_single_igdb_game(igdb_game: dict, external_id: str | int, platform_field: str) -> None:
-    igdb_id = igdb_game.get("id")
-    if not igdb_id:
-        return
-
+def _igdb_game_payload(igdb_game: dict) -> dict:
     cover_url = None
     if igdb_game.get("cover") and isinstance(igdb_game["cover"], dict):
         cover_url = igdb_game["cover"].get("url")
@@ -50,18 +47,30 @@ def process_single_igdb_game(igdb_game: dict, external_id: str | int, platform_f
     if igdb_game.get("first_release_date"):
         release_date = datetime.date.fromtimestamp(igdb_game["first_release_date"])
 
-    game, created = get_or_create_game_from_igdb(
-        igdb_id=igdb_id,
-        name=igdb_game.get("name"),
-        cover_url=cover_url,
-        summary=igdb_game.get("summary"),
-        release_date=release_date,
-        platforms=igdb_game.get("platforms"),
-        genres=igdb_game.get("genres"),
-        screenshots=igdb_game.get("screenshots"),
-        videos=igdb_game.get("videos"),
-    )
+    return {
+        "igdb_id": igdb_game["id"],
+        "name": igdb_game.get("name"),
+        "cover_url": cover_url,
+        "summary": igdb_game.get("summary"),
+        "release_date": release_date,
+        "platforms": igdb_game.get("platforms"),
+        "genres": igdb_game.get("genres"),
+        "screenshots": igdb_game.get("screenshots"),
+        "videos": igdb_game.get("videos"),
+    }
+
+
+def process_igdb_games(igdb_games: list[dict], external_ids: dict[int, str | int], platform_field: str) -> None:
+    """Upsert a batch of raw IGDB games and set their external id (steam_appid, xbox_id) when created or missing."""
+    payloads = [_igdb_game_payload(g) for g in igdb_games if g.get("id") and external_ids.get(g["id"])]
+    if not payloads:
+        return
 
-    if created or not getattr(game, platform_field):
-        setattr(game, platform_field, external_id)
-        game.save(update_fields=[platform_field])
+    games, created = upsert_games_from_igdb(payloads)
+    to_update = []
+    for igdb_id, game in games.items():
+        if igdb_id in created or not getattr(game, platform_field):
+            setattr(game, platform_field, external_ids[igdb_id])
+            to_update.append(game)
+    if to_update:
+        Game.objects.bulk_update(to_update, [platform_field])
@@ -201,11 +201,12 @@ class XboxSyncTest(TestCase):
         mock_igdb.side_effect = mock_igdb_backend
         _resolve_and_save_missing_games(["100"])  # should catch and return cleanly
 
-    def test_process_single_igdb_game_no_id(self):
-        # Cette fonction doit s'arrêter net si l'objet n'a pas d'ID
-        from apps.library.sync_utils import process_single_igdb_game
+    def test_process_igdb_games_skips_games_without_id(self):
+        # Un jeu IGDB sans ID est ignoré : aucun jeu créé
+        from apps.library.sync_utils import process_igdb_games
 
-        process_single_igdb_game({"name": "Fake"}, "xbox1", "xbox_id")
+        process_igdb_games([{"name": "Fake"}], {None: "xbox1"}, "xbox_id")
+        assert not Game.objects.filter(xbox_id="xbox1").exists()
 
     @patch("apps.library.xbox_sync.XboxLiveClient")
     @patch("apps.library.xbox_sync.AuthenticationManager")
@@ -15,7 +15,7 @@ from xbox.webapi.common.signed_session import SignedSession
 from apps.games.models import Game
 from apps.library.models import UserGame
 from apps.library.services_collections import sync_xbox_entries_for_matched_games
-from apps.library.sync_utils import fetch_external_games, fetch_igdb_games_by_ids, process_single_igdb_game
+from apps.library.sync_utils import fetch_external_games, fetch_igdb_games_by_ids, process_igdb_games
 from apps.users.models import CustomUser
 
 logger = logging.getLogger("system_logs")
@@ -166,10 +166,7 @@ def _resolve_and_save_missing_games(xbox_ids: List[str]) -> None:
     if igdb_games:
         logger.info(f"IGDB request for {len(xbox_ids)} missing xbox_ids returned {len(igdb_games)} mapped games")
 
-    for igdb_game in igdb_games:
-        external_id = igdb_id_to_xbox.get(igdb_game.get("id"))
-        if external_id:
-            process_single_igdb_game(igdb_game, external_id, "xbox_id")
+    process_igdb_games(igdb_games, igdb_id_to_xbox, "xbox_id")
 
 
 def _update_social_token(social_token: SocialToken, oauth: OAuth2TokenResponse) -> None:
@@ -53,6 +53,22 @@ app.conf.beat_schedule = {
         "task": "apps.parties.tasks.process_party_deadlines",
         "schedule": crontab(minute="*"),  # chaque minute (MVP parties)
     },
+    "refresh-igdb-demographics": {
+        "task": "apps.games.tasks.refresh_igdb_demographics",
+        "schedule": crontab(minute=30),  # toutes les heures (âge / joueurs des jeux IGDB)
+    },
+    "sync-igdb-catalogue": {
+        "task": "apps.games.tasks.sync_igdb_catalogue",
+        "schedule": crontab(minute="*/15"),  # miroir incrémental IGDB (updated_at)
+    },
+    "rescore-game-popularity": {
+        "task": "apps.games.tasks.rescore_popularity",
+        "schedule": crontab(minute="*/10"),  # popularity_score des jeux actifs depuis le dernier passage
+    },
+    "warm-igdb-trending-cache": {
+        "task": "apps.games.tasks.warm_igdb_trending_cache",
+        "schedule": crontab(minute="*"),  # re-rendu des trending les plus demandés avant expiration (TTL 2 min)
+    },
 }
 
 # Configuration des résultats (optionnel)
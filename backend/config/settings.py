@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "channels",
     "django.contrib.sites",
     "rest_framework",
@@ -401,6 +402,27 @@ CACHES = {
 }
 
 
+# -------------------------------------------------------------------
+# Jeux / IGDB : couches activables (lues à chaque appel, surchargeables en test)
+# -------------------------------------------------------------------
+
+# Cache Redis des réponses IGDB, des traductions MyMemory et des libellés Wikidata
+IGDB_CACHE_ENABLED = config("IGDB_CACHE_ENABLED", default=True, cast=bool)
+TRANSLATE_CACHE_ENABLED = config("TRANSLATE_CACHE_ENABLED", default=True, cast=bool)
+WIKIDATA_SHARED_CACHE_ENABLED = config("WIKIDATA_SHARED_CACHE_ENABLED", default=True, cast=bool)
+# Noms français résolus par Wikidata recopiés en base (Game.name_fr)
+WIKIDATA_WRITE_THROUGH_ENABLED = config("WIKIDATA_WRITE_THROUGH_ENABLED", default=True, cast=bool)
+# Âge / joueurs des jeux IGDB stockés en base (IgdbGameDemographics) pour les filtres démographiques
+IGDB_DEMOGRAPHICS_STORE_ENABLED = config("IGDB_DEMOGRAPHICS_STORE_ENABLED", default=True, cast=bool)
+# Trending / séries / franchises servis depuis le miroir local du catalogue quand il est à jour
+IGDB_LOCAL_CATALOGUE_ENABLED = config("IGDB_LOCAL_CATALOGUE_ENABLED", default=True, cast=bool)
+IGDB_TRENDING_WARMUP_ENABLED = config("IGDB_TRENDING_WARMUP_ENABLED", default=True, cast=bool)
+# Disjoncteurs IGDB / Wikidata / MyMemory partagés entre workers
+CIRCUIT_BREAKERS_ENABLED = config("CIRCUIT_BREAKERS_ENABLED", default=True, cast=bool)
+# Fiches de jeux incomplètes (stubs) complétées par une tâche Celery
+GAMES_STUB_HEALING_ENABLED = config("GAMES_STUB_HEALING_ENABLED", default=True, cast=bool)
+
+
 # -------------------------------------------------------------------
 # Channels (WebSockets via Redis)
 # -------------------------------------------------------------------
@@ -291,8 +291,12 @@ export async function searchGamesPage(
   return { games: data.results, totalCount: data.total_count };
 }
 
-export async function translateDescription(text: string): Promise<string> {
-  const data = (await apiPost('/api/igdb/translate/', { text })) as {
+export async function translateDescription(
+  text: string,
+  igdbId?: number
+): Promise<string> {
+  const body = igdbId ? { text, igdb_id: igdbId } : { text };
+  const data = (await apiPost('/api/igdb/translate/', body)) as {
     translated: string;
   };
   return data.translated;
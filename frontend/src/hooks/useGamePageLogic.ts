@@ -93,11 +93,11 @@ export function useGamePageLogic(): GamePageLogic {
     if (!game?.summary) return;
     setTranslating(true);
     setTranslatedDesc(null);
-    translateDescription(game.summary)
+    translateDescription(game.summary, game.igdb_id)
       .then(setTranslatedDesc)
       .catch(() => {})
       .finally(() => setTranslating(false));
-  }, [game?.summary]);
+  }, [game?.summary, game?.igdb_id]);
 
   useEffect(() => {
     if (!isAuthenticated || !djangoId) {
@@ -143,6 +143,16 @@ describe('IGDB API calls', () => {
       expect(res).toBe('Bonjour');
     });
 
+    it('translateDescription transmet igdb_id pour conserver le résumé traduit', async () => {
+      vi.mocked(apiPost).mockResolvedValueOnce({ translated: 'Bonjour' });
+      await igdb.translateDescription('Hello', 42);
+
+      expect(apiPost).toHaveBeenCalledWith('/api/igdb/translate/', {
+        text: 'Hello',
+        igdb_id: 42,
+      });
+    });
+
     it('fetchFranchiseGames appelle la bonne route', async () => {
       vi.mocked(apiGet).mockResolvedValueOnce([]);
       await igdb.fetchFranchiseGames(123);